@@ -11,6 +11,9 @@ class AbstractConfig(ABC):
 
     _unsub_proactive_report = None
 
+    # Reporter of state changes while proactive mode is enabled
+    state_reporter = None
+
     def __init__(self, hass):
         """Initialize abstract config."""
         self.hass = hass
@@ -68,6 +71,7 @@ class AbstractConfig(ABC):
         if unsub_func:
             unsub_func()
         self._unsub_proactive_report = None
+        self.state_reporter = None
 
     @callback
     def should_expose(self, entity_id):
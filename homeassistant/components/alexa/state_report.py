@@ -2,17 +2,27 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Mapping
 import json
 import logging
+import time
+from typing import Any, Callable
 
 import aiohttp
 import async_timeout
 
-from homeassistant.const import HTTP_ACCEPTED, MATCH_ALL, STATE_ON
-from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.const import (
+    HTTP_ACCEPTED,
+    HTTP_TOO_MANY_REQUESTS,
+    MATCH_ALL,
+    STATE_ON,
+)
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.significant_change import create_checker
 import homeassistant.util.dt as dt_util
 
+from .capabilities import AlexaCapability
 from .const import API_CHANGE, DOMAIN, Cause
 from .entities import ENTITY_ADAPTERS, AlexaEntity, generate_alexa_id
 from .messages import AlexaResponse
@@ -20,6 +30,13 @@ from .messages import AlexaResponse
 _LOGGER = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 10
 
+# Changes of an entity within this many seconds are sent as one report
+REPORT_COALESCE_WINDOW = 0.1
+MAX_CONCURRENT_REPORTS = 4
+REPORT_RETRIES = 3
+# Seconds before the first retry, doubled for every following one
+REPORT_RETRY_DELAY = 1
+
 
 async def async_enable_proactive_mode(hass, smart_home_config):
     """Enable the proactive mode.
@@ -44,33 +61,131 @@ async def async_enable_proactive_mode(hass, smart_home_config):
 
     checker = await create_checker(hass, DOMAIN, extra_significant_check)
 
-    async def async_entity_state_listener(
-        changed_entity: str,
-        old_state: State | None,
-        new_state: State | None,
-    ):
-        if not hass.is_running:
-            return
+    reporter = AlexaStateReporter(hass, smart_home_config, checker)
+    smart_home_config.state_reporter = reporter
+    return reporter.async_start()
 
-        if not new_state:
-            return
 
-        if new_state.domain not in ENTITY_ADAPTERS:
-            return
+class AlexaStateReporter:
+    """Report state changes of exposed entities to Alexa.
 
-        if not smart_home_config.should_expose(changed_entity):
-            _LOGGER.debug("Not exposing %s because filtered by config", changed_entity)
-            return
+    The Alexa adapter and interfaces of an entity are reused as long as its
+    attributes don't change. Changes of an entity are coalesced for a short
+    while and sent by a limited number of concurrent requests, which are
+    retried with backoff when they fail.
+    """
+
+    def __init__(self, hass: HomeAssistant, config, checker) -> None:
+        """Initialize the reporter."""
+        self.hass = hass
+        self.config = config
+        self._checker = checker
+        # entity_id -> (attributes, adapter, interfaces, report, doorbell)
+        self._entities: dict[
+            str, tuple[Mapping, AlexaEntity, list[AlexaCapability], bool, bool]
+        ] = {}
+        # entity_id -> (adapter, properties, time queued)
+        self._pending: dict[str, tuple[AlexaEntity, list[dict], float]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REPORTS)
+        self._unsubs: list[Callable[[], None]] = []
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.coalesced = 0
+        self._latency_total = 0.0
+        self.latency_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of entities waiting to be reported."""
+        return len(self._pending)
+
+    @property
+    def latency_average(self) -> float:
+        """Return the average time from a change to its report in seconds."""
+        if not self.sent:
+            return 0.0
+        return self._latency_total / self.sent
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return statistics of the reports."""
+        return {
+            "queue_depth": self.queue_depth,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "coalesced": self.coalesced,
+            "latency_average": self.latency_average,
+            "latency_max": self.latency_max,
+        }
 
-        alexa_changed_entity: AlexaEntity = ENTITY_ADAPTERS[new_state.domain](
-            hass, smart_home_config, new_state
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start listening for state changes and return a function to stop."""
+        self._unsubs.append(
+            self.hass.helpers.event.async_track_state_change(
+                MATCH_ALL, self._async_entity_state_listener
+            )
+        )
+        self._unsubs.append(
+            self.hass.bus.async_listen(
+                EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+            )
+        )
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop reporting and drop the pending reports."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        for task in self._workers.values():
+            task.cancel()
+        self._workers.clear()
+        self._pending.clear()
+        self._entities.clear()
+
+    @callback
+    def async_invalidate_cache(self, entity_id: str | None = None) -> None:
+        """Drop the cached adapters of an entity, or of all entities."""
+        if entity_id is None:
+            self._entities.clear()
+        else:
+            self._entities.pop(entity_id, None)
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Drop the cached adapter of an updated entity."""
+        self.async_invalidate_cache(event.data["entity_id"])
+        if "old_entity_id" in event.data:
+            self.async_invalidate_cache(event.data["old_entity_id"])
+
+    @callback
+    def _async_get_entity(
+        self, new_state: State
+    ) -> tuple[Mapping, AlexaEntity, list[AlexaCapability], bool, bool]:
+        """Return the adapter of an entity, reusing it if the attributes match."""
+        entity_id = new_state.entity_id
+        cached = self._entities.get(entity_id)
+        if cached is not None and cached[0] == new_state.attributes:
+            # Adapters and interfaces only depend on the attributes
+            cached[1].entity = new_state
+            for interface in cached[2]:
+                interface.entity = new_state
+            return cached
+
+        alexa_entity: AlexaEntity = ENTITY_ADAPTERS[new_state.domain](
+            self.hass, self.config, new_state
         )
+        interfaces = list(alexa_entity.interfaces())
 
         # Determine how entity should be reported on
         should_report = False
         should_doorbell = False
 
-        for interface in alexa_changed_entity.interfaces():
+        for interface in interfaces:
             if not should_report and interface.properties_proactively_reported():
                 should_report = True
 
@@ -78,30 +193,122 @@ async def async_enable_proactive_mode(hass, smart_home_config):
                 should_doorbell = True
                 break
 
+        cached = self._entities[entity_id] = (
+            new_state.attributes,
+            alexa_entity,
+            interfaces,
+            should_report,
+            should_doorbell,
+        )
+        return cached
+
+    @callback
+    def _async_entity_state_listener(
+        self,
+        changed_entity: str,
+        old_state: State | None,
+        new_state: State | None,
+    ) -> None:
+        """Queue a report of a state change."""
+        if not self.hass.is_running:
+            return
+
+        if not new_state:
+            self._entities.pop(changed_entity, None)
+            return
+
+        if new_state.domain not in ENTITY_ADAPTERS:
+            return
+
+        if not self.config.should_expose(changed_entity):
+            _LOGGER.debug("Not exposing %s because filtered by config", changed_entity)
+            return
+
+        (
+            _,
+            alexa_entity,
+            interfaces,
+            should_report,
+            should_doorbell,
+        ) = self._async_get_entity(new_state)
+
         if not should_report and not should_doorbell:
             return
 
         if should_doorbell:
             if new_state.state == STATE_ON:
-                await async_send_doorbell_event_message(
-                    hass, smart_home_config, alexa_changed_entity
+                self.hass.async_create_task(
+                    async_send_doorbell_event_message(
+                        self.hass, self.config, alexa_entity
+                    )
                 )
             return
 
-        alexa_properties = list(alexa_changed_entity.serialize_properties())
+        alexa_properties = [
+            prop
+            for interface in interfaces
+            if interface.properties_proactively_reported()
+            for prop in interface.serialize_properties()
+        ]
 
-        if not checker.async_is_significant_change(
+        if not self._checker.async_is_significant_change(
             new_state, extra_arg=alexa_properties
         ):
             return
 
-        await async_send_changereport_message(
-            hass, smart_home_config, alexa_changed_entity, alexa_properties
-        )
+        pending = self._pending.get(changed_entity)
+        if pending is not None:
+            # Only the latest change of an entity is reported
+            self.coalesced += 1
+            queued = pending[2]
+        else:
+            queued = time.monotonic()
+        self._pending[changed_entity] = (alexa_entity, alexa_properties, queued)
+
+        if changed_entity not in self._workers:
+            self._workers[changed_entity] = self.hass.async_create_task(
+                self._async_report_entity(changed_entity)
+            )
 
-    return hass.helpers.event.async_track_state_change(
-        MATCH_ALL, async_entity_state_listener
-    )
+    async def _async_report_entity(self, entity_id: str) -> None:
+        """Report the queued changes of an entity in order."""
+        try:
+            while entity_id in self._pending:
+                await asyncio.sleep(REPORT_COALESCE_WINDOW)
+                alexa_entity, alexa_properties, queued = self._pending.pop(entity_id)
+                async with self._semaphore:
+                    delivered = await self._async_send(alexa_entity, alexa_properties)
+                if not delivered:
+                    self.failed += 1
+                    continue
+                latency = time.monotonic() - queued
+                self.sent += 1
+                self._latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+        finally:
+            if self._workers.get(entity_id) is asyncio.current_task():
+                del self._workers[entity_id]
+
+    async def _async_send(
+        self, alexa_entity: AlexaEntity, alexa_properties: list[dict]
+    ) -> bool:
+        """Send a ChangeReport, retrying with backoff when it fails."""
+        delay = REPORT_RETRY_DELAY
+        for attempt in range(REPORT_RETRIES + 1):
+            if attempt:
+                self.retried += 1
+                await asyncio.sleep(delay)
+                delay *= 2
+            status = await async_send_changereport_message(
+                self.hass, self.config, alexa_entity, alexa_properties
+            )
+            if status is not None and status < 500 and status != HTTP_TOO_MANY_REQUESTS:
+                return status == HTTP_ACCEPTED
+
+        _LOGGER.error(
+            "Unable to send ChangeReport to Alexa for %s", alexa_entity.entity_id
+        )
+        return False
 
 
 async def async_send_changereport_message(
@@ -109,6 +316,8 @@ async def async_send_changereport_message(
 ):
     """Send a ChangeReport message for an Alexa entity.
 
+    Returns the HTTP status of the response, or None if the request failed.
+
     https://developer.amazon.com/docs/smarthome/state-reporting-for-a-smart-home-skill.html#report-state-with-changereport-events
     """
     token = await config.async_get_access_token()
@@ -141,15 +350,19 @@ async def async_send_changereport_message(
 
     except (asyncio.TimeoutError, aiohttp.ClientError):
         _LOGGER.error("Timeout sending report to Alexa")
-        return
+        return None
 
     response_text = await response.text()
 
     _LOGGER.debug("Sent: %s", json.dumps(message_serialized))
     _LOGGER.debug("Received (%s): %s", response.status, response_text)
 
-    if response.status == HTTP_ACCEPTED:
-        return
+    if (
+        response.status == HTTP_ACCEPTED
+        or response.status >= 500
+        or response.status == HTTP_TOO_MANY_REQUESTS
+    ):
+        return response.status
 
     response_json = json.loads(response_text)
 
@@ -167,6 +380,7 @@ async def async_send_changereport_message(
         response_json["payload"]["code"],
         response_json["payload"]["description"],
     )
+    return response.status
 
 
 async def async_send_add_or_update_message(hass, config, entity_ids):
@@ -8,6 +8,7 @@ import voluptuous as vol
 from voluptuous.humanize import humanize_error
 
 from homeassistant.components import blueprint
+from homeassistant.components.trace import async_remove_stale_traces
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_MODE,
@@ -690,6 +691,10 @@ async def _async_process_config(
     if entities:
         await component.async_add_entities(entities)
 
+    async_remove_stale_traces(
+        hass, DOMAIN, {entity.unique_id for entity in entities if entity.unique_id}
+    )
+
     return blueprints_used
 
 
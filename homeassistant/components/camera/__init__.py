@@ -19,7 +19,7 @@ import attr
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
-from homeassistant.components.http import KEY_AUTHENTICATED, HomeAssistantView
+from homeassistant.components.http import KEY_AUTHENTICATED, KEY_HASS, HomeAssistantView
 from homeassistant.components.media_player.const import (
     ATTR_MEDIA_CONTENT_ID,
     ATTR_MEDIA_CONTENT_TYPE,
@@ -34,7 +34,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     CONF_FILENAME,
-    CONTENT_TYPE_MULTIPART,
     EVENT_HOMEASSISTANT_START,
     SERVICE_TURN_OFF,
     SERVICE_TURN_ON,
@@ -61,6 +60,7 @@ from .const import (
     DOMAIN,
     SERVICE_RECORD,
 )
+from .mjpeg import async_stream_still_images
 from .prefs import CameraPreferences
 
 # mypy: allow-untyped-calls
@@ -175,44 +175,12 @@ async def async_get_still_stream(
 ) -> web.StreamResponse:
     """Generate an HTTP MJPEG stream from camera images.
 
-    This method must be run in the event loop.
+    Clients requesting the same image callback at the same interval share a
+    single polling loop. This method must be run in the event loop.
     """
-    response = web.StreamResponse()
-    response.content_type = CONTENT_TYPE_MULTIPART.format("--frameboundary")
-    await response.prepare(request)
-
-    async def write_to_mjpeg_stream(img_bytes: bytes) -> None:
-        """Write image to stream."""
-        await response.write(
-            bytes(
-                "--frameboundary\r\n"
-                "Content-Type: {}\r\n"
-                "Content-Length: {}\r\n\r\n".format(content_type, len(img_bytes)),
-                "utf-8",
-            )
-            + img_bytes
-            + b"\r\n"
-        )
-
-    last_image = None
-
-    while True:
-        img_bytes = await image_cb()
-        if not img_bytes:
-            break
-
-        if img_bytes != last_image:
-            await write_to_mjpeg_stream(img_bytes)
-
-            # Chrome seems to always ignore first picture,
-            # print it twice.
-            if last_image is None:
-                await write_to_mjpeg_stream(img_bytes)
-            last_image = img_bytes
-
-        await asyncio.sleep(interval)
-
-    return response
+    return await async_stream_still_images(
+        request.app[KEY_HASS], request, image_cb, content_type, interval
+    )
 
 
 def _get_camera_from_entity_id(hass: HomeAssistant, entity_id: str) -> Camera:
@@ -4,6 +4,7 @@ from typing import Final
 DOMAIN: Final = "camera"
 
 DATA_CAMERA_PREFS: Final = "camera_prefs"
+DATA_STILL_STREAMS: Final = "camera_still_streams"
 
 PREF_PRELOAD_STREAM: Final = "preload_stream"
 
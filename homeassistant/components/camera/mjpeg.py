@@ -0,0 +1,197 @@
+"""Shared MJPEG still-image streams for the camera component."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Hashable
+import logging
+from typing import Callable, Final, Tuple
+
+from aiohttp import web
+
+from homeassistant.const import CONTENT_TYPE_MULTIPART
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_STILL_STREAMS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Frames buffered per client before the oldest one is dropped
+CLIENT_BUFFER_SIZE: Final = 2
+
+FRAME_TRAILER: Final = b"\r\n"
+
+# A frame is the multipart part header and the raw image, written separately
+Frame = Tuple[bytes, bytes]
+
+
+def _frame_header(content_type: str, length: int) -> bytes:
+    """Return the multipart part header for an image."""
+    return (
+        "--frameboundary\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {length}\r\n\r\n"
+    ).encode()
+
+
+class StillStreamSubscriber:
+    """Bounded frame buffer of a single MJPEG client."""
+
+    def __init__(self) -> None:
+        """Initialize the subscriber."""
+        self._frames: deque[Frame | None] = deque(maxlen=CLIENT_BUFFER_SIZE)
+        self._event = asyncio.Event()
+        self.dropped = 0
+
+    @callback
+    def async_put(self, frame: Frame | None) -> None:
+        """Queue a frame, dropping the oldest one for slow clients.
+
+        A None frame marks the end of the stream.
+        """
+        if len(self._frames) == CLIENT_BUFFER_SIZE:
+            self.dropped += 1
+        self._frames.append(frame)
+        self._event.set()
+
+    async def async_get(self) -> Frame | None:
+        """Wait for the next frame."""
+        while not self._frames:
+            self._event.clear()
+            await self._event.wait()
+        return self._frames.popleft()
+
+
+class StillStreamProducer:
+    """Poll a camera image callback once and publish frames to all clients."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: Hashable,
+        image_cb: Callable[[], Awaitable[bytes | None]],
+        content_type: str,
+        interval: float,
+    ) -> None:
+        """Initialize the producer."""
+        self.hass = hass
+        self._key = key
+        self._image_cb = image_cb
+        self._content_type = content_type
+        self._interval = interval
+        self._subscribers: set[StillStreamSubscriber] = set()
+        self._last_frame: Frame | None = None
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_subscribe(self) -> StillStreamSubscriber:
+        """Add a client and start polling if needed."""
+        subscriber = StillStreamSubscriber()
+        self._subscribers.add(subscriber)
+        if self._last_frame is not None:
+            subscriber.async_put(self._last_frame)
+        if self._task is None:
+            self._task = self.hass.loop.create_task(self._async_poll())
+        return subscriber
+
+    @callback
+    def async_unsubscribe(self, subscriber: StillStreamSubscriber) -> None:
+        """Remove a client and stop polling once nobody is watching."""
+        self._subscribers.discard(subscriber)
+        if self._subscribers:
+            return
+        self._async_remove()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def _async_remove(self) -> None:
+        """Remove this producer from the registry."""
+        producers = self.hass.data[DATA_STILL_STREAMS]
+        if producers.get(self._key) is self:
+            del producers[self._key]
+
+    @callback
+    def _async_publish(self, frame: Frame | None) -> None:
+        """Hand a frame to every client."""
+        for subscriber in self._subscribers:
+            subscriber.async_put(frame)
+
+    async def _async_poll(self) -> None:
+        """Poll the image callback until it stops returning images."""
+        last_hash: tuple[int, int] | None = None
+
+        try:
+            while True:
+                img_bytes = await self._image_cb()
+                if not img_bytes:
+                    break
+
+                # hash() of bytes is cached on the object and much cheaper to
+                # keep around than a reference to the previous image.
+                img_hash = (len(img_bytes), hash(img_bytes))
+                if img_hash != last_hash:
+                    last_hash = img_hash
+                    self._last_frame = (
+                        _frame_header(self._content_type, len(img_bytes)),
+                        img_bytes,
+                    )
+                    self._async_publish(self._last_frame)
+
+                await asyncio.sleep(self._interval)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error fetching image for MJPEG stream")
+
+        # The producer is exhausted, new clients must start a fresh one.
+        self._async_remove()
+        self._task = None
+        self._async_publish(None)
+
+
+async def _async_write_frame(response: web.StreamResponse, frame: Frame) -> None:
+    """Write a frame without copying the image into a new buffer."""
+    header, img_bytes = frame
+    await response.write(header)
+    await response.write(img_bytes)
+    await response.write(FRAME_TRAILER)
+
+
+async def async_stream_still_images(
+    hass: HomeAssistant,
+    request: web.Request,
+    image_cb: Callable[[], Awaitable[bytes | None]],
+    content_type: str,
+    interval: float,
+) -> web.StreamResponse:
+    """Serve an MJPEG stream from a producer shared with other clients."""
+    response = web.StreamResponse()
+    response.content_type = CONTENT_TYPE_MULTIPART.format("--frameboundary")
+    await response.prepare(request)
+
+    producers: dict[Hashable, StillStreamProducer] = hass.data.setdefault(
+        DATA_STILL_STREAMS, {}
+    )
+    key = (image_cb, content_type, interval)
+    producer = producers.get(key)
+    if producer is None:
+        producer = producers[key] = StillStreamProducer(
+            hass, key, image_cb, content_type, interval
+        )
+
+    subscriber = producer.async_subscribe()
+    first_frame = True
+
+    try:
+        while (frame := await subscriber.async_get()) is not None:
+            await _async_write_frame(response, frame)
+
+            # Chrome seems to always ignore first picture,
+            # print it twice.
+            if first_frame:
+                await _async_write_frame(response, frame)
+                first_frame = False
+    finally:
+        producer.async_unsubscribe(subscriber)
+
+    return response
@@ -200,6 +200,10 @@ class AlexaConfig(alexa_config.AbstractConfig):
             self._alexa_sync_unsub()
             self._alexa_sync_unsub = None
 
+        # Entity configs are part of the cached Alexa entities
+        if self.state_reporter is not None:
+            self.state_reporter.async_invalidate_cache()
+
         if self._cur_default_expose is not prefs.alexa_default_expose:
             await self.async_sync_entities()
             return
@@ -5,11 +5,15 @@ import logging
 from hass_nabucasa import Cloud, cloud_api
 from hass_nabucasa.google_report_state import ErrorResponse
 
-from homeassistant.components.google_assistant.const import DOMAIN as GOOGLE_DOMAIN
+from homeassistant.components.google_assistant.const import (
+    DOMAIN as GOOGLE_DOMAIN,
+    SIGNAL_EXPOSED_ENTITIES_UPDATED,
+)
 from homeassistant.components.google_assistant.helpers import AbstractConfig
 from homeassistant.const import CLOUD_NEVER_EXPOSED_ENTITIES, HTTP_OK
 from homeassistant.core import CoreState, split_entity_id
 from homeassistant.helpers import entity_registry, start
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.setup import async_setup_component
 
 from .const import (
@@ -191,6 +195,7 @@ class CloudGoogleConfig(AbstractConfig):
             self._cur_entity_prefs is not prefs.google_entity_configs
             or self._cur_default_expose is not prefs.google_default_expose
         ) and self._config["filter"].empty_filter:
+            async_dispatcher_send(self.hass, SIGNAL_EXPOSED_ENTITIES_UPDATED)
             self.async_schedule_google_sync_all()
 
         if self.enabled and not self.is_local_sdk_active:
@@ -5,8 +5,9 @@ import asyncio
 from collections.abc import Coroutine, Sequence
 from datetime import timedelta
 import hashlib
+import os
 from types import ModuleType
-from typing import Any, Callable, Final, final
+from typing import Any, Callable, Final, cast, final
 
 import attr
 import voluptuous as vol
@@ -17,10 +18,8 @@ from homeassistant.config import async_log_exception, load_yaml_config_file
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_GPS_ACCURACY,
-    ATTR_ICON,
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
-    ATTR_NAME,
     CONF_ICON,
     CONF_MAC,
     CONF_NAME,
@@ -38,6 +37,8 @@ from homeassistant.helpers.event import (
     async_track_utc_time_change,
 )
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType, GPSType, StateType
 from homeassistant.setup import async_prepare_setup_platform, async_start_setup
 from homeassistant.util import dt as dt_util
@@ -70,6 +71,8 @@ from .const import (
 )
 
 SERVICE_SEE: Final = "see"
+SERVICE_EXPORT_KNOWN_DEVICES: Final = "export_known_devices"
+SERVICE_IMPORT_KNOWN_DEVICES: Final = "import_known_devices"
 
 SOURCE_TYPES: Final[tuple[str, ...]] = (
     SOURCE_TYPE_GPS,
@@ -120,6 +123,11 @@ SERVICE_SEE_PAYLOAD_SCHEMA: Final[vol.Schema] = vol.Schema(
 YAML_DEVICES: Final = "known_devices.yaml"
 EVENT_NEW_DEVICE: Final = "device_tracker_new_device"
 
+DATA_KNOWN_DEVICES: Final = "device_tracker_known_devices"
+KNOWN_DEVICES_STORAGE_KEY: Final = "device_tracker.known_devices"
+KNOWN_DEVICES_STORAGE_VERSION: Final = 1
+KNOWN_DEVICES_SAVE_DELAY: Final = 10
+
 
 def see(
     hass: HomeAssistant,
@@ -195,6 +203,23 @@ async def async_setup_integration(hass: HomeAssistant, config: ConfigType) -> No
         DOMAIN, SERVICE_SEE, async_see_service, SERVICE_SEE_PAYLOAD_SCHEMA
     )
 
+    async def async_import_known_devices_service(call: ServiceCall) -> None:
+        """Service to import known_devices.yaml."""
+        known_devices = await async_get_known_devices(hass)
+        await known_devices.async_import_yaml(hass.config.path(YAML_DEVICES))
+
+    async def async_export_known_devices_service(call: ServiceCall) -> None:
+        """Service to export the known devices to known_devices.yaml."""
+        known_devices = await async_get_known_devices(hass)
+        await known_devices.async_export_yaml(hass.config.path(YAML_DEVICES))
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_IMPORT_KNOWN_DEVICES, async_import_known_devices_service
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_EXPORT_KNOWN_DEVICES, async_export_known_devices_service
+    )
+
     # restore
     await tracker.async_setup_tracked_device()
 
@@ -389,8 +414,6 @@ def async_setup_scanner_platform(
 
 async def get_tracker(hass: HomeAssistant, config: ConfigType) -> DeviceTracker:
     """Create a tracker."""
-    yaml_path = hass.config.path(YAML_DEVICES)
-
     conf = config.get(DOMAIN, [])
     conf = conf[0] if conf else {}
     consider_home = conf.get(CONF_CONSIDER_HOME, DEFAULT_CONSIDER_HOME)
@@ -400,7 +423,7 @@ async def get_tracker(hass: HomeAssistant, config: ConfigType) -> DeviceTracker:
     if track_new is None:
         track_new = defaults.get(CONF_TRACK_NEW, DEFAULT_TRACK_NEW)
 
-    devices = await async_load_config(yaml_path, hass, consider_home)
+    devices = await async_load_known_devices(hass, consider_home)
     tracker = DeviceTracker(hass, consider_home, track_new, defaults, devices)
     return tracker
 
@@ -427,7 +450,6 @@ class DeviceTracker:
             else defaults.get(CONF_TRACK_NEW, DEFAULT_TRACK_NEW)
         )
         self.defaults = defaults
-        self._is_updating = asyncio.Lock()
 
         for dev in devices:
             if self.devices[dev.dev_id] is not dev:
@@ -562,22 +584,16 @@ class DeviceTracker:
             },
         )
 
-        # update known_devices.yaml
-        self.hass.async_create_task(
-            self.async_update_config(
-                self.hass.config.path(YAML_DEVICES), dev_id, device
-            )
-        )
+        # update the known devices
+        self.hass.async_create_task(self.async_update_config(dev_id, device))
 
-    async def async_update_config(self, path: str, dev_id: str, device: Device) -> None:
-        """Add device to YAML configuration file.
+    async def async_update_config(self, dev_id: str, device: Device) -> None:
+        """Add device to the known devices.
 
         This method is a coroutine.
         """
-        async with self._is_updating:
-            await self.hass.async_add_executor_job(
-                update_config, self.hass.config.path(YAML_DEVICES), dev_id, device
-            )
+        known_devices = await async_get_known_devices(self.hass)
+        known_devices.async_update_device(device)
 
     @callback
     def async_update_stale(self, now: dt_util.dt.datetime) -> None:
@@ -658,6 +674,7 @@ class Device(RestoreEntity):
 
         # Configured picture
         self.config_picture: str | None
+        self.gravatar = gravatar
         if gravatar is not None:
             self.config_picture = get_gravatar_for_email(gravatar)
         else:
@@ -851,13 +868,178 @@ class DeviceScanner:
         return await self.hass.async_add_executor_job(self.get_extra_attributes, device)
 
 
-async def async_load_config(
-    path: str, hass: HomeAssistant, consider_home: timedelta
+class KnownDevices:
+    """Devices known to the legacy device tracker, kept in storage.
+
+    known_devices.yaml is imported when the storage is empty. Afterwards it is
+    only read and written by the import and export services, a notification
+    tells when it was changed since.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the known devices."""
+        self.hass = hass
+        self._store = Store(
+            hass, KNOWN_DEVICES_STORAGE_VERSION, KNOWN_DEVICES_STORAGE_KEY
+        )
+        # dev_id -> device config, consider_home is stored in seconds
+        self.devices: dict[str, dict[str, Any]] = {}
+        # Modification time of known_devices.yaml when it was last imported or
+        # exported
+        self._yaml_mtime: float | None = None
+
+    async def async_load(self) -> None:
+        """Load the known devices, importing known_devices.yaml if needed."""
+        data = await self._store.async_load()
+        path = self.hass.config.path(YAML_DEVICES)
+
+        if data is None:
+            if await self.async_import_yaml(path):
+                LOGGER.info(
+                    "Imported %s into storage, use the %s.%s service to apply "
+                    "later changes to it",
+                    path,
+                    DOMAIN,
+                    SERVICE_IMPORT_KNOWN_DEVICES,
+                )
+            return
+
+        data = cast(dict, data)
+        self.devices = data["devices"]
+        self._yaml_mtime = data.get("yaml_mtime")
+        yaml_mtime = await self.hass.async_add_executor_job(_get_mtime, path)
+        if yaml_mtime is not None and yaml_mtime != self._yaml_mtime:
+            LOGGER.warning(
+                "%s changed since it was imported, use the %s.%s service to "
+                "apply the changes",
+                path,
+                DOMAIN,
+                SERVICE_IMPORT_KNOWN_DEVICES,
+            )
+            self.hass.components.persistent_notification.async_create(
+                f"{YAML_DEVICES} changed since it was imported. Changes to it "
+                f"are only applied by the {DOMAIN}.{SERVICE_IMPORT_KNOWN_DEVICES} "
+                "service.",
+                "Known devices changed",
+                f"{DOMAIN}_{SERVICE_IMPORT_KNOWN_DEVICES}",
+            )
+
+    @callback
+    def async_create_devices(self, consider_home: timedelta) -> list[Device]:
+        """Create the known devices."""
+        return [
+            Device(
+                self.hass,
+                timedelta(seconds=config[CONF_CONSIDER_HOME])
+                if CONF_CONSIDER_HOME in config
+                else consider_home,
+                config["track"],
+                dev_id,
+                config[CONF_MAC],
+                config[CONF_NAME],
+                config["picture"],
+                config["gravatar"],
+                config[CONF_ICON],
+            )
+            for dev_id, config in self.devices.items()
+        ]
+
+    @callback
+    def async_update_device(self, device: Device) -> None:
+        """Add or update a device, the storage is written in batches."""
+        config = {
+            CONF_NAME: device.name,
+            CONF_MAC: device.mac,
+            CONF_ICON: device.icon,
+            "gravatar": device.gravatar,
+            "picture": None if device.gravatar is not None else device.config_picture,
+            "track": device.track,
+        }
+        self.devices[device.dev_id] = config
+        self._store.async_delay_save(self._data_to_save, KNOWN_DEVICES_SAVE_DELAY)
+
+    async def async_import_yaml(self, path: str) -> int:
+        """Import the devices of a YAML file.
+
+        Devices are replaced by the imported device with the same ID or MAC
+        address. Changes to devices that are already set up are applied
+        after a restart.
+        """
+        configs = await _async_load_yaml_devices(path, self.hass, None)
+        mac_to_dev_id = {
+            config[CONF_MAC]: dev_id
+            for dev_id, config in self.devices.items()
+            if config[CONF_MAC] is not None
+        }
+
+        for config in configs:
+            dev_id = config.pop("dev_id")
+            if CONF_CONSIDER_HOME in config:
+                config[CONF_CONSIDER_HOME] = config[CONF_CONSIDER_HOME].total_seconds()
+            if config[CONF_MAC] is not None:
+                old_dev_id = mac_to_dev_id.get(config[CONF_MAC])
+                if old_dev_id is not None and old_dev_id != dev_id:
+                    self.devices.pop(old_dev_id, None)
+                mac_to_dev_id[config[CONF_MAC]] = dev_id
+            self.devices[dev_id] = config
+
+        self._yaml_mtime = await self.hass.async_add_executor_job(_get_mtime, path)
+        if configs:
+            await self._store.async_save(self._data_to_save())
+        return len(configs)
+
+    async def async_export_yaml(self, path: str) -> None:
+        """Export the known devices to a YAML file."""
+        devices = {
+            dev_id: {
+                key: value
+                for key, value in config.items()
+                if value is not None or key == CONF_MAC
+            }
+            for dev_id, config in self.devices.items()
+        }
+        self._yaml_mtime = await self.hass.async_add_executor_job(
+            _write_yaml_devices, path, devices
+        )
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"devices": self.devices, "yaml_mtime": self._yaml_mtime}
+
+
+@singleton(DATA_KNOWN_DEVICES)
+async def async_get_known_devices(hass: HomeAssistant) -> KnownDevices:
+    """Load the known devices."""
+    known_devices = KnownDevices(hass)
+    await known_devices.async_load()
+    return known_devices
+
+
+async def async_load_known_devices(
+    hass: HomeAssistant, consider_home: timedelta
 ) -> list[Device]:
-    """Load devices from YAML configuration file.
+    """Create the devices known to the legacy device tracker.
 
     This method is a coroutine.
     """
+    known_devices: KnownDevices = await async_get_known_devices(hass)
+    return known_devices.async_create_devices(consider_home)
+
+
+async def _async_load_yaml_devices(
+    path: str, hass: HomeAssistant, consider_home: timedelta | None
+) -> list[dict[str, Any]]:
+    """Load the validated device configs of a YAML file.
+
+    Without consider_home, it is only set for devices that configure it.
+    """
+    consider_home_key = (
+        vol.Optional(CONF_CONSIDER_HOME)
+        if consider_home is None
+        else vol.Optional(CONF_CONSIDER_HOME, default=consider_home)
+    )
     dev_schema = vol.Schema(
         {
             vol.Required(CONF_NAME): cv.string,
@@ -868,12 +1050,10 @@ async def async_load_config(
             ),
             vol.Optional("gravatar", default=None): vol.Any(None, cv.string),
             vol.Optional("picture", default=None): vol.Any(None, cv.string),
-            vol.Optional(CONF_CONSIDER_HOME, default=consider_home): vol.All(
-                cv.time_period, cv.positive_timedelta
-            ),
+            consider_home_key: vol.All(cv.time_period, cv.positive_timedelta),
         }
     )
-    result: list[Device] = []
+    result: list[dict[str, Any]] = []
     try:
         devices = await hass.async_add_executor_job(load_yaml_config_file, path)
     except HomeAssistantError as err:
@@ -892,24 +1072,36 @@ async def async_load_config(
         except vol.Invalid as exp:
             async_log_exception(exp, dev_id, devices, hass)
         else:
-            result.append(Device(hass, **device))
+            result.append(device)
     return result
 
 
-def update_config(path: str, dev_id: str, device: Device) -> None:
-    """Add device to YAML configuration file."""
-    with open(path, "a") as out:
-        device_config = {
-            device.dev_id: {
-                ATTR_NAME: device.name,
-                ATTR_MAC: device.mac,
-                ATTR_ICON: device.icon,
-                "picture": device.config_picture,
-                "track": device.track,
-            }
-        }
-        out.write("\n")
-        out.write(dump(device_config))
+async def async_load_config(
+    path: str, hass: HomeAssistant, consider_home: timedelta
+) -> list[Device]:
+    """Load devices from YAML configuration file.
+
+    This method is a coroutine.
+    """
+    return [
+        Device(hass, **device)
+        for device in await _async_load_yaml_devices(path, hass, consider_home)
+    ]
+
+
+def _write_yaml_devices(path: str, devices: dict[str, dict[str, Any]]) -> float:
+    """Write devices to a YAML configuration file and return its mtime."""
+    with open(path, "w") as out:
+        out.write(dump(devices))
+    return os.stat(path).st_mtime
+
+
+def _get_mtime(path: str) -> float | None:
+    """Return the modification time of a file, None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
 
 
 def get_gravatar_for_email(email: str) -> str:
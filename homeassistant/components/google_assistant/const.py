@@ -118,6 +118,9 @@ EVENT_COMMAND_RECEIVED = "google_assistant_command"
 EVENT_QUERY_RECEIVED = "google_assistant_query"
 EVENT_SYNC_RECEIVED = "google_assistant_sync"
 
+# Sent when the entities exposed to Google may have changed
+SIGNAL_EXPOSED_ENTITIES_UPDATED = "google_assistant_exposed_entities_updated"
+
 DOMAIN_TO_GOOGLE_TYPES = {
     alarm_control_panel.DOMAIN: TYPE_ALARM,
     camera.DOMAIN: TYPE_CAMERA,
@@ -2,33 +2,221 @@
 from __future__ import annotations
 
 from collections import deque
+from collections.abc import Mapping
 import logging
-
-from homeassistant.const import MATCH_ALL
-from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
-from homeassistant.helpers.event import async_call_later
+from typing import Callable
+
+from homeassistant.const import CLOUD_NEVER_EXPOSED_ENTITIES, MATCH_ALL
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HassJob,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+from homeassistant.helpers.event import (
+    TrackStates,
+    async_call_later,
+    async_track_state_added_domain,
+    async_track_state_change_filtered,
+)
 from homeassistant.helpers.significant_change import create_checker
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_EXPOSED_ENTITIES_UPDATED
 from .error import SmartHomeError
-from .helpers import AbstractConfig, GoogleEntity, async_get_entities
+from .helpers import AbstractConfig, GoogleEntity
 
 # Time to wait until the homegraph updates
 # https://github.com/actions-on-google/smart-home-nodejs/issues/196#issuecomment-439156639
 INITIAL_REPORT_DELAY = 60
 
+# Number of entities sent per request of the initial report
+INITIAL_REPORT_CHUNK_SIZE = 100
+
 # Seconds to wait to group states
 REPORT_STATE_WINDOW = 1
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class ExposedEntities:
+    """Index of the entities exposed to Google.
+
+    For every exposed entity the Google entity is kept, or None if it is not
+    supported. The decisions are evaluated again when the attributes of the
+    entity change.
+    """
+
+    def __init__(self, hass: HomeAssistant, google_config: AbstractConfig) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self.google_config = google_config
+        self._entities: dict[str, tuple[Mapping, GoogleEntity | None]] = {}
+        self._tracker = None
+        self._action: Callable[[str, State], None] | None = None
+
+    def __contains__(self, entity_id: str) -> bool:
+        """Return if an entity is exposed."""
+        return entity_id in self._entities
+
+    @property
+    def entity_ids(self) -> set[str]:
+        """Return the ids of the exposed entities."""
+        return set(self._entities)
+
+    @callback
+    def async_get_entity(self, state: State) -> GoogleEntity | None:
+        """Return the Google entity of a state if it is exposed and supported."""
+        cached = self._entities.get(state.entity_id)
+        if cached is not None and cached[0] == state.attributes:
+            entity = cached[1]
+            if entity is not None:
+                # Traits only depend on the attributes
+                entity.state = state
+                for trt in entity.traits():
+                    trt.state = state
+            return entity
+
+        entity = GoogleEntity(self.hass, self.google_config, state)
+        if (
+            state.entity_id in CLOUD_NEVER_EXPOSED_ENTITIES
+            or not entity.should_expose()
+        ):
+            self._entities.pop(state.entity_id, None)
+            return None
+        if not entity.is_supported():
+            entity = None
+        self._entities[state.entity_id] = (state.attributes, entity)
+        return entity
+
+    @callback
+    def async_get_entities(self) -> list[GoogleEntity | None]:
+        """Return the Google entities of all exposed entities."""
+        return [entity for _, entity in self._entities.values()]
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Forget an entity."""
+        self._entities.pop(entity_id, None)
+
+    @callback
+    def async_refresh(self, entity_id: str) -> None:
+        """Evaluate an entity again."""
+        self._entities.pop(entity_id, None)
+        state = self.hass.states.get(entity_id)
+        if state is not None:
+            self.async_get_entity(state)
+
+    @callback
+    def async_refresh_all(self) -> None:
+        """Evaluate all entities again."""
+        self._entities.clear()
+        for state in self.hass.states.async_all():
+            self.async_get_entity(state)
+
+    @callback
+    def async_track(self, action: Callable[[str, State], None]) -> CALLBACK_TYPE:
+        """Call an action for state changes of exposed entities.
+
+        Added entities and changes of the entity registry or the config that
+        expose other entities are followed.
+        """
+        self._action = action
+        self._tracker = async_track_state_change_filtered(
+            self.hass,
+            TrackStates(False, self.entity_ids, set()),
+            self._async_state_listener,
+        )
+        unsubs = [
+            self._tracker.async_remove,
+            async_track_state_added_domain(
+                self.hass, MATCH_ALL, self._async_added_listener
+            ),
+            self.hass.bus.async_listen(
+                EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+            ),
+            async_dispatcher_connect(
+                self.hass, SIGNAL_EXPOSED_ENTITIES_UPDATED, self._async_config_updated
+            ),
+        ]
+
+        @callback
+        def unsub_all():
+            while unsubs:
+                unsubs.pop()()
+            self._tracker = None
+
+        return unsub_all
+
+    @callback
+    def _async_update_tracker(self) -> None:
+        """Track state changes of the exposed entities."""
+        if self._tracker is not None:
+            self._tracker.async_update_listeners(
+                TrackStates(False, self.entity_ids, set())
+            )
+
+    @callback
+    def _async_state_listener(self, event: Event) -> None:
+        """Handle a state change of an exposed entity."""
+        entity_id = event.data["entity_id"]
+        new_state = event.data["new_state"]
+
+        if new_state is None:
+            self.async_remove(entity_id)
+            self._async_update_tracker()
+            return
+
+        # Added entities are handled by _async_added_listener
+        if event.data["old_state"] is None:
+            return
+
+        self._action(entity_id, new_state)
+
+        if entity_id not in self._entities:
+            self._async_update_tracker()
+
+    @callback
+    def _async_added_listener(self, event: Event) -> None:
+        """Start tracking an added entity if it is exposed."""
+        entity_id = event.data["entity_id"]
+        new_state = event.data["new_state"]
+
+        self.async_remove(entity_id)
+        self.async_get_entity(new_state)
+        if entity_id not in self._entities:
+            return
+
+        self._async_update_tracker()
+        self._action(entity_id, new_state)
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Evaluate an entity again when its registry entry changed."""
+        self.async_refresh(event.data["entity_id"])
+        if "old_entity_id" in event.data:
+            self.async_refresh(event.data["old_entity_id"])
+        self._async_update_tracker()
+
+    @callback
+    def _async_config_updated(self) -> None:
+        """Evaluate all entities again after the config changed."""
+        self.async_refresh_all()
+        self._async_update_tracker()
+
+
 @callback
 def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig):
     """Enable state reporting."""
     checker = None
     unsub_pending: CALLBACK_TYPE | None = None
     pending = deque([{}])
+    unsubs: list[CALLBACK_TYPE] = []
+
+    exposed = ExposedEntities(hass, google_config)
 
     async def report_states(now=None):
         """Report the states."""
@@ -53,40 +241,36 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
 
     report_states_job = HassJob(report_states)
 
-    async def async_entity_state_listener(changed_entity, old_state, new_state):
+    @callback
+    def async_report_entity(entity_id: str, new_state: State):
+        """Queue a state report of an entity."""
         nonlocal unsub_pending
 
         if not hass.is_running:
             return
 
-        if not new_state:
-            return
+        entity = exposed.async_get_entity(new_state)
 
-        if not google_config.should_expose(new_state):
-            return
-
-        entity = GoogleEntity(hass, google_config, new_state)
-
-        if not entity.is_supported():
+        if entity is None:
             return
 
         try:
             entity_data = entity.query_serialize()
         except SmartHomeError as err:
-            _LOGGER.debug("Not reporting state for %s: %s", changed_entity, err.code)
+            _LOGGER.debug("Not reporting state for %s: %s", entity_id, err.code)
             return
 
         if not checker.async_is_significant_change(new_state, extra_arg=entity_data):
             return
 
-        _LOGGER.debug("Scheduling report state for %s: %s", changed_entity, entity_data)
+        _LOGGER.debug("Scheduling report state for %s: %s", entity_id, entity_data)
 
         # If a significant change is already scheduled and we have another significant one,
         # let's create a new batch of changes
-        if changed_entity in pending[-1]:
+        if entity_id in pending[-1]:
             pending.append({})
 
-        pending[-1][changed_entity] = entity_data
+        pending[-1][entity_id] = entity_data
 
         if unsub_pending is None:
             unsub_pending = async_call_later(
@@ -108,13 +292,15 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
 
     async def initial_report(_now):
         """Report initially all states."""
-        nonlocal unsub, checker
+        nonlocal checker
+        unsubs.clear()
         entities = {}
 
         checker = await create_checker(hass, DOMAIN, extra_significant_check)
 
-        for entity in async_get_entities(hass, google_config):
-            if not entity.should_expose():
+        exposed.async_refresh_all()
+        for entity in exposed.async_get_entities():
+            if entity is None:
                 continue
 
             try:
@@ -131,20 +317,22 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
 
             entities[entity.entity_id] = entity_data
 
-        if not entities:
-            return
-
-        await google_config.async_report_state_all({"devices": {"states": entities}})
+        unsubs.append(exposed.async_track(async_report_entity))
 
-        unsub = hass.helpers.event.async_track_state_change(
-            MATCH_ALL, async_entity_state_listener
-        )
+        # Large installs are reported in multiple requests
+        entity_ids = list(entities)
+        for idx in range(0, len(entity_ids), INITIAL_REPORT_CHUNK_SIZE):
+            chunk = entity_ids[idx : idx + INITIAL_REPORT_CHUNK_SIZE]
+            await google_config.async_report_state_all(
+                {"devices": {"states": {eid: entities[eid] for eid in chunk}}}
+            )
 
-    unsub = async_call_later(hass, INITIAL_REPORT_DELAY, initial_report)
+    unsubs.append(async_call_later(hass, INITIAL_REPORT_DELAY, initial_report))
 
     @callback
     def unsub_all():
-        unsub()
+        while unsubs:
+            unsubs.pop()()
         if unsub_pending:
             unsub_pending()  # pylint: disable=not-callable
 
@@ -1,19 +1,23 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
-from collections.abc import Iterable
+import asyncio
+from collections.abc import Generator, Iterable, Iterator
 from datetime import datetime as dt, timedelta
 import logging
 import time
-from typing import cast
 
-from aiohttp import web
+from aiohttp import hdrs, web
 from sqlalchemy import not_, or_
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder import history, models as history_models
+from homeassistant.components.recorder import (
+    DATA_INSTANCE,
+    history,
+    models as history_models,
+)
 from homeassistant.components.recorder.statistics import (
     list_statistic_ids,
     statistics_during_period,
@@ -24,9 +28,10 @@ from homeassistant.const import (
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.deprecation import deprecated_class, deprecated_function
 from homeassistant.helpers.entityfilter import (
@@ -42,6 +47,9 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
 
+# States joined into one write of a streamed history response
+HISTORY_WRITE_SIZE = 1000
+
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
     46: "_",  # .
@@ -109,6 +117,9 @@ async def async_setup(hass, config):
         ws_get_statistics_during_period
     )
     hass.components.websocket_api.async_register_command(ws_get_list_statistic_ids)
+    hass.components.websocket_api.async_register_command(ws_get_read_pool_stats)
+    hass.components.websocket_api.async_register_command(ws_get_purge_progress)
+    hass.components.websocket_api.async_register_command(ws_get_query_stats)
 
     return True
 
@@ -181,6 +192,39 @@ async def ws_get_list_statistic_ids(
     connection.send_result(msg["id"], statistic_ids)
 
 
+@websocket_api.websocket_command({vol.Required("type"): "history/read_pool_stats"})
+@websocket_api.require_admin
+@callback
+def ws_get_read_pool_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the wait and query times of the read-only database connections."""
+    stats = hass.data[DATA_INSTANCE].read_pool_stats
+    connection.send_result(msg["id"], stats.as_dict() if stats else None)
+
+
+@websocket_api.websocket_command({vol.Required("type"): "history/purge_progress"})
+@websocket_api.require_admin
+@callback
+def ws_get_purge_progress(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the progress of the latest purge of the recorder."""
+    progress = hass.data[DATA_INSTANCE].purge_progress
+    connection.send_result(msg["id"], progress.as_dict() if progress else None)
+
+
+@websocket_api.websocket_command({vol.Required("type"): "history/query_stats"})
+@websocket_api.require_admin
+@callback
+def ws_get_query_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the latency, rows and plans of the recorder database queries."""
+    stats = hass.data[DATA_INSTANCE].query_instrumentation
+    connection.send_result(msg["id"], stats.as_dict() if stats else None)
+
+
 class HistoryPeriodView(HomeAssistantView):
     """Handle history period requests."""
 
@@ -195,7 +239,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: str | None = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
         datetime_ = None
         if datetime:
@@ -244,67 +288,144 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
-        return cast(
-            web.Response,
-            await hass.async_add_executor_job(
-                self._sorted_significant_states_json,
+        chunks = self._significant_states_json_chunks(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+        )
+        return await _async_stream_chunks(hass, request, chunks)
+
+    def _significant_states_json_chunks(
+        self,
+        hass: HomeAssistant,
+        start_time: dt,
+        end_time: dt,
+        entity_ids: list[str] | None,
+        include_start_time_state: bool,
+        significant_changes_only: bool,
+        minimal_response: bool,
+    ) -> Generator[str, None, None]:
+        """Yield the JSON of the significant states of each entity in chunks."""
+        timer_start = time.perf_counter()
+
+        # Optionally reorder the result to respect the ordering given
+        # by any entities explicitly included in the configuration.
+        entity_order: list[str] = []
+        if self.filters and self.use_include_order:
+            entity_order.extend(self.filters.included_entities)
+        if entity_ids:
+            entity_order.extend(entity_ids)
+        entity_order = list(dict.fromkeys(entity_order))
+
+        instance = hass.data[DATA_INSTANCE]
+        with session_scope(session=instance.new_read_session()) as session:
+            # pylint: disable=protected-access
+            entity_states = history._get_significant_states_json(  # type: ignore[no-untyped-call]
                 hass,
+                session,
                 start_time,
                 end_time,
                 entity_ids,
+                self.filters,
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
-            ),
-        )
-
-    def _sorted_significant_states_json(
-        self,
-        hass,
-        start_time,
-        end_time,
-        entity_ids,
-        include_start_time_state,
-        significant_changes_only,
-        minimal_response,
-    ):
-        """Fetch significant stats from the database as json."""
-        timer_start = time.perf_counter()
-
-        with session_scope(hass=hass) as session:
-            result = (
-                history._get_significant_states(  # pylint: disable=protected-access
-                    hass,
-                    session,
-                    start_time,
-                    end_time,
-                    entity_ids,
-                    self.filters,
-                    include_start_time_state,
-                    significant_changes_only,
-                    minimal_response,
-                )
+            )
+            yield from _history_json_chunks(
+                _ordered_entity_states(entity_states, entity_order)
             )
 
-        result = list(result.values())
         if _LOGGER.isEnabledFor(logging.DEBUG):
             elapsed = time.perf_counter() - timer_start
-            _LOGGER.debug("Extracted %d states in %fs", sum(map(len, result)), elapsed)
-
-        # Optionally reorder the result to respect the ordering given
-        # by any entities explicitly included in the configuration.
-        if self.filters and self.use_include_order:
-            sorted_result = []
-            for order_entity in self.filters.included_entities:
-                for state_list in result:
-                    if state_list[0].entity_id == order_entity:
-                        sorted_result.append(state_list)
-                        result.remove(state_list)
-                        break
-            sorted_result.extend(result)
-            result = sorted_result
-
-        return self.json(result)
+            _LOGGER.debug("Streamed the significant states in %fs", elapsed)
+
+
+async def _async_stream_chunks(
+    hass: HomeAssistant, request: web.Request, chunks: Generator[str, None, None]
+) -> web.StreamResponse:
+    """Write the chunks of a response as the executor produces them.
+
+    The generator is advanced one chunk at a time in the executor, so only
+    the chunk that is being written is held in memory. When the request ends
+    early, the generator is closed in the executor once its current chunk is
+    done, which closes its database session.
+    """
+    pending = asyncio.ensure_future(hass.async_add_executor_job(_next_chunk, chunks))
+    try:
+        # The first chunk is read before the response is prepared, so a
+        # failing query is still answered with an error status
+        chunk = await asyncio.shield(pending)
+        response = web.StreamResponse(headers={hdrs.CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+        while chunk is not None:
+            await response.write(chunk.encode("UTF-8"))
+            pending = asyncio.ensure_future(
+                hass.async_add_executor_job(_next_chunk, chunks)
+            )
+            chunk = await asyncio.shield(pending)
+        await response.write_eof()
+        return response
+    finally:
+        pending.add_done_callback(lambda _: hass.async_add_executor_job(chunks.close))
+
+
+def _next_chunk(chunks: Iterator[str]) -> str | None:
+    """Return the next chunk or None once there are no more."""
+    return next(chunks, None)
+
+
+def _ordered_entity_states(
+    entity_states: Iterable[tuple[str, list[str]]], entity_order: list[str]
+) -> Iterable[list[str]]:
+    """Yield the states of the entities in entity_order, then the others.
+
+    The states of an entity are yielded as soon as the entities before it in
+    entity_order are done, the entities that come early are held until then.
+    """
+    held: dict[str, list[str]] = {}
+    position = 0
+    for entity_id, states in entity_states:
+        if position == len(entity_order):
+            yield states
+            continue
+        held[entity_id] = states
+        while position < len(entity_order) and entity_order[position] in held:
+            yield held.pop(entity_order[position])
+            position += 1
+        if position == len(entity_order):
+            yield from held.values()
+            held.clear()
+
+    for entity_id in entity_order[position:]:
+        if entity_id in held:
+            yield held.pop(entity_id)
+    yield from held.values()
+
+
+def _history_json_chunks(entity_states: Iterable[list[str]]) -> Iterable[str]:
+    """Yield the JSON of the states of the entities in chunks of states.
+
+    A chunk holds the states of whole entities, at least HISTORY_WRITE_SIZE
+    of them unless it is the last one.
+    """
+    parts = ["["]
+    size = 0
+    for index, states in enumerate(entity_states):
+        parts.append(",[" if index else "[")
+        parts.append(",".join(states))
+        parts.append("]")
+        size += len(states)
+        if size >= HISTORY_WRITE_SIZE:
+            yield "".join(parts)
+            parts = []
+            size = 0
+    parts.append("]")
+    yield "".join(parts)
 
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
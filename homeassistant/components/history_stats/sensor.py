@@ -1,4 +1,5 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
@@ -45,6 +46,7 @@ UNITS = {
 }
 ICON = "mdi:chart-line"
 
+ATTR_DATABASE_READS = "database_reads"
 ATTR_VALUE = "value"
 
 
@@ -120,6 +122,15 @@ class HistoryStatsSensor(SensorEntity):
         self._period = (datetime.datetime.now(), datetime.datetime.now())
         self.value = None
         self.count = None
+        self.database_reads = 0
+
+        # State changes since the period start as (timestamp, in entity states),
+        # the first one being the state at the period start
+        self._history = None
+        self._history_start = None
+        self._history_changed = False
+        # State changes received while the history is loaded
+        self._pending_changes = None
 
     async def async_added_to_hass(self):
         """Create listeners when the entity is added."""
@@ -133,10 +144,16 @@ class HistoryStatsSensor(SensorEntity):
                 """Force the component to refresh."""
                 self.async_schedule_update_ha_state(True)
 
+            @callback
+            def state_changed(event):
+                """Track the state change and refresh."""
+                self._async_add_state_change(event)
+                force_refresh()
+
             force_refresh()
             self.async_on_remove(
                 async_track_state_change_event(
-                    self.hass, [self._entity_id], force_refresh
+                    self.hass, [self._entity_id], state_changed
                 )
             )
 
@@ -179,7 +196,10 @@ class HistoryStatsSensor(SensorEntity):
             return {}
 
         hsh = HistoryStatsHelper
-        return {ATTR_VALUE: hsh.pretty_duration(self.value)}
+        return {
+            ATTR_VALUE: hsh.pretty_duration(self.value),
+            ATTR_DATABASE_READS: self.database_reads,
+        }
 
     @property
     def icon(self):
@@ -209,39 +229,119 @@ class HistoryStatsSensor(SensorEntity):
         p_end_timestamp = math.floor(dt_util.as_timestamp(p_end))
         now_timestamp = math.floor(dt_util.as_timestamp(now))
 
-        # If period has not changed and current time after the period end...
+        # If period and history have not changed and current time after the
+        # period end...
         if (
-            start_timestamp == p_start_timestamp
+            not self._history_changed
+            and start_timestamp == p_start_timestamp
             and end_timestamp == p_end_timestamp
             and end_timestamp <= now_timestamp
         ):
             # Don't compute anything as the value cannot have changed
             return
 
-        await self.hass.async_add_executor_job(
-            self._update, start, end, now_timestamp, start_timestamp, end_timestamp
-        )
+        if self._pending_changes is not None:
+            # The history is being loaded by another update
+            return
 
-    def _update(self, start, end, now_timestamp, start_timestamp, end_timestamp):
-        # Get history between start and end
-        history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
+        # History is only loaded from the database when the period start moves
+        # back, otherwise it is kept up to date from state changes.
+        if self._history is None or start < self._history_start:
+            await self._async_load_history(start, end)
+        else:
+            self._trim_history(start)
+
+        if not self._history:
+            # The entity has no recorded states yet
+            return
+
+        self._history_changed = False
+        self._update(start, end, now_timestamp, start_timestamp, end_timestamp)
+
+    async def _async_load_history(self, start, end):
+        """Load the state changes during the period from the database."""
+        self._history = None
+        self._pending_changes = []
+        self.database_reads += 1
+        try:
+            history_list = await self.hass.async_add_executor_job(
+                history.state_changes_during_period,
+                self.hass,
+                start,
+                end,
+                str(self._entity_id),
+            )
+        finally:
+            pending_changes, self._pending_changes = self._pending_changes, None
+
+        changes = deque(
+            (item.last_changed.timestamp(), item.state in self._entity_states)
+            for item in history_list.get(self._entity_id, ())
         )
+        # The recorder may not have committed the latest state yet
+        current_state = self.hass.states.get(self._entity_id)
+        if current_state is not None:
+            pending_changes.insert(
+                0,
+                (
+                    current_state.last_changed.timestamp(),
+                    current_state.state in self._entity_states,
+                ),
+            )
 
-        if self._entity_id not in history_list:
+        for change in pending_changes:
+            if not changes or change[0] > changes[-1][0]:
+                changes.append(change)
+
+        self._history = changes
+        self._history_start = start
+
+    @callback
+    def _async_add_state_change(self, event):
+        """Add a state change to the history."""
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            change = (event.time_fired.timestamp(), False)
+        elif new_state.last_changed == new_state.last_updated:
+            change = (
+                new_state.last_changed.timestamp(),
+                new_state.state in self._entity_states,
+            )
+        else:
+            # Only the attributes changed
             return
 
-        # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state in self._entity_states
+        if self._pending_changes is not None:
+            self._pending_changes.append(change)
+        elif self._history is not None:
+            self._history.append(change)
+            self._history_changed = True
+
+    def _trim_history(self, start):
+        """Drop state changes that are superseded at the period start."""
+        start_time = start.timestamp()
+        changes = self._history
+        while len(changes) > 1 and changes[1][0] <= start_time:
+            changes.popleft()
+        self._history_start = start
+
+    def _update(self, start, end, now_timestamp, start_timestamp, end_timestamp):
+        """Calculate the time and count of the tracked states in the period."""
+        start_time = start.timestamp()
+        end_time = end.timestamp()
+        last_state = False
         last_time = start_timestamp
         elapsed = 0
         count = 0
 
         # Make calculations
-        for item in history_list.get(self._entity_id):
-            current_state = item.state in self._entity_states
-            current_time = item.last_changed.timestamp()
+        for current_time, current_state in self._history:
+            if current_time >= end_time:
+                break
+            if current_time < start_time:
+                # The state at the period start is not a change in the period
+                last_state = current_state
+                continue
 
             if last_state:
                 elapsed += current_time - last_time
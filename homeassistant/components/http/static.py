@@ -1,26 +1,215 @@
 """Static file handling for HTTP component."""
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Mapping
+from email.utils import formatdate
+import gzip
+from io import BytesIO
+import logging
+import mimetypes
+import os
 from pathlib import Path
-from typing import Final
+import time
+from typing import Any, BinaryIO, Final
 
 from aiohttp import hdrs
-from aiohttp.web import FileResponse, Request, StreamResponse
-from aiohttp.web_exceptions import HTTPForbidden, HTTPNotFound
+from aiohttp.web import Request, Response, StreamResponse
+from aiohttp.web_exceptions import (
+    HTTPForbidden,
+    HTTPNotFound,
+    HTTPRequestRangeNotSatisfiable,
+)
 from aiohttp.web_urldispatcher import StaticResource
 
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
 CACHE_TIME: Final = 31 * 86400  # = 1 month
 CACHE_HEADERS: Final[Mapping[str, str]] = {
     hdrs.CACHE_CONTROL: f"public, max-age={CACHE_TIME}"
 }
 
+# How long a resolved path and the sidecars found for it are reused
+PATH_CACHE_TIME: Final = 60  # seconds
+PATH_CACHE_SIZE: Final = 1024
+
+# Sidecar encodings in order of preference
+ENCODING_SUFFIXES: Final = (("br", ".br"), ("gzip", ".gz"))
+
+COMPRESS_MIN_SIZE: Final = 1024
+# Files compressed in memory when they have no gzip sidecar
+COMPRESS_MAX_SIZE: Final = 1024 * 1024
+COMPRESS_CACHE_SIZE: Final = 128
+COMPRESSIBLE_TYPES: Final = {
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+def _etag(stat: os.stat_result) -> str:
+    """Return the ETag of a file, matching the one aiohttp generates."""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+class StaticFile:
+    """A resolved static path and the representations it can be served as."""
+
+    __slots__ = ("is_dir", "content_type", "representations", "compressible")
+
+    def __init__(self, is_dir: bool, content_type: str | None = None) -> None:
+        """Initialize the static file."""
+        self.is_dir = is_dir
+        self.content_type = content_type
+        # encoding (None for identity) -> (path, etag, mtime)
+        self.representations: dict[str | None, tuple[Path, str, float]] = {}
+        self.compressible = False
+
+
+def _resolve_static_file(
+    directory: Path, filename: Path, follow_symlinks: bool
+) -> StaticFile | None:
+    """Resolve a path and stat it and its sidecars.
+
+    This method must be run in the executor.
+    """
+    filepath = directory.joinpath(filename).resolve()
+    if not follow_symlinks:
+        filepath.relative_to(directory)
+
+    if filepath.is_dir():
+        return StaticFile(True)
+    if not filepath.is_file():
+        return None
+
+    stat = filepath.stat()
+    content_type = mimetypes.guess_type(str(filepath))[0] or "application/octet-stream"
+    static_file = StaticFile(False, content_type)
+    static_file.representations[None] = (filepath, _etag(stat), stat.st_mtime)
+    static_file.compressible = COMPRESS_MIN_SIZE <= stat.st_size <= (
+        COMPRESS_MAX_SIZE
+    ) and (content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES)
+
+    for encoding, suffix in ENCODING_SUFFIXES:
+        sidecar = filepath.with_name(filepath.name + suffix)
+        try:
+            sidecar_stat = sidecar.stat()
+        except OSError:
+            continue
+        # Ignore sidecars that are older than the file they were built from
+        if sidecar_stat.st_mtime >= stat.st_mtime:
+            static_file.representations[encoding] = (
+                sidecar,
+                _etag(sidecar_stat),
+                sidecar_stat.st_mtime,
+            )
+
+    return static_file
+
+
+def _open_representation(
+    source: Path, filepath: Path
+) -> tuple[BinaryIO, os.stat_result, os.stat_result]:
+    """Open a representation of a static file.
+
+    Returns the open file, the current stat of the source file and the
+    current stat of the opened file.
+
+    This method must be run in the executor.
+    """
+    fobj = filepath.open("rb")
+    try:
+        stat = os.fstat(fobj.fileno())
+        source_stat = stat if filepath == source else source.stat()
+    except OSError:
+        fobj.close()
+        raise
+    return fobj, source_stat, stat
+
+
+def _gzip_file(filepath: Path) -> tuple[str, bytes]:
+    """Compress a file in memory.
+
+    Returns the ETag of the compressed file and the compressed content.
+
+    This method must be run in the executor.
+    """
+    with filepath.open("rb") as fobj:
+        stat = os.fstat(fobj.fileno())
+        content = fobj.read()
+    return _etag(stat), gzip.compress(content)
+
+
+def _accepted_encodings(request: Request) -> set[str]:
+    """Return the content codings a client accepts."""
+    accepted = set()
+    for coding in request.headers.get(hdrs.ACCEPT_ENCODING, "").split(","):
+        name, _, params = coding.partition(";")
+        params = params.replace(" ", "")
+        if params in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def _if_range_matches(request: Request, etag: str, mtime: float) -> bool:
+    """Return if the Range of a request applies to the current file."""
+    if_range = request.headers.get(hdrs.IF_RANGE)
+    if if_range is None:
+        return True
+    if if_range.startswith(('"', "W/")):
+        # Only a strong ETag validates a range
+        return if_range == etag
+    if (if_range_date := request.if_range) is None:
+        return False
+    return int(mtime) <= if_range_date.timestamp()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Return if an If-None-Match header matches an ETag (weak comparison)."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
 
 class CachingStaticResource(StaticResource):
-    """Static Resource handler that will add cache headers."""
+    """Static Resource handler that will add cache headers.
+
+    Resolved paths and their sidecars are cached for a short while. Every
+    request opens and stats the file it serves in the executor, the cached
+    resolution is dropped as soon as that stat differs from the cached one, so
+    the ETag and the sidecar served always match the files on disk.
+    Precompressed `.br` and `.gz` sidecars are served to clients that accept
+    them. Compressible files without a `.gz` sidecar are compressed in the
+    background and the result is kept in memory, nothing is written to the
+    served directory.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the resource."""
+        super().__init__(*args, **kwargs)
+        self._path_cache: dict[str, tuple[float, StaticFile]] = {}
+        # source path -> (source etag, gzip content or None if it failed)
+        self._compressed: dict[Path, tuple[str, bytes | None]] = {}
+        self._compressing: set[Path] = set()
+
+    async def _async_resolve(
+        self, request: Request, rel_url: str
+    ) -> tuple[StaticFile, bool]:
+        """Return the resolution of a path and if it came from the cache."""
+        now = time.monotonic()
+        cached = self._path_cache.get(rel_url)
+        if cached is not None and now - cached[0] < PATH_CACHE_TIME:
+            return cached[1], True
 
-    async def _handle(self, request: Request) -> StreamResponse:
-        rel_url = request.match_info["filename"]
         try:
             filename = Path(rel_url)
             if filename.anchor:
@@ -28,9 +217,13 @@ class CachingStaticResource(StaticResource):
                 # /static/\\machine_name\c$ or /static/D:\path
                 # where the static dir is totally different
                 raise HTTPForbidden()
-            filepath = self._directory.joinpath(filename).resolve()
-            if not self._follow_symlinks:
-                filepath.relative_to(self._directory)
+            static_file = await asyncio.get_running_loop().run_in_executor(
+                None,
+                _resolve_static_file,
+                self._directory,
+                filename,
+                self._follow_symlinks,
+            )
         except (ValueError, FileNotFoundError) as error:
             # relatively safe
             raise HTTPNotFound() from error
@@ -39,13 +232,211 @@ class CachingStaticResource(StaticResource):
             request.app.logger.exception(error)
             raise HTTPNotFound() from error
 
+        if static_file is None:
+            raise HTTPNotFound
+
+        if len(self._path_cache) >= PATH_CACHE_SIZE:
+            del self._path_cache[next(iter(self._path_cache))]
+        self._path_cache[rel_url] = (now, static_file)
+
+        return static_file, False
+
+    @callback
+    def _async_compress(self, filepath: Path, etag: str) -> None:
+        """Compress a file with an ETag in memory in the background."""
+        if filepath in self._compressing:
+            return
+        self._compressing.add(filepath)
+
+        def _compressed(future: asyncio.Future) -> None:
+            self._compressing.discard(filepath)
+            if future.cancelled():
+                return
+            try:
+                compressed_etag, content = future.result()
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Unable to compress %s: %s", filepath, err)
+                self._async_cache_compressed(filepath, etag, None)
+            else:
+                self._async_cache_compressed(filepath, compressed_etag, content)
+
+        asyncio.ensure_future(
+            asyncio.get_running_loop().run_in_executor(None, _gzip_file, filepath)
+        ).add_done_callback(_compressed)
+
+    @callback
+    def _async_cache_compressed(
+        self, filepath: Path, etag: str, content: bytes | None
+    ) -> None:
+        """Keep the compressed content of a file, or that it failed."""
+        self._compressed.pop(filepath, None)
+        if len(self._compressed) >= COMPRESS_CACHE_SIZE:
+            del self._compressed[next(iter(self._compressed))]
+        self._compressed[filepath] = (etag, content)
+
+    async def _async_open(
+        self, request: Request, rel_url: str, accepted: set[str]
+    ) -> tuple[StaticFile, str | None, BinaryIO, os.stat_result] | None:
+        """Resolve a path and open the representation to serve.
+
+        Returns None for a directory.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            static_file, cached = await self._async_resolve(request, rel_url)
+            if static_file.is_dir:
+                return None
+
+            representations = static_file.representations
+            encoding = None
+            for candidate, _ in ENCODING_SUFFIXES:
+                if candidate in accepted and candidate in representations:
+                    encoding = candidate
+                    break
+
+            source, source_etag, _ = representations[None]
+            filepath, etag, _ = representations[encoding]
+            try:
+                fobj, source_stat, stat = await loop.run_in_executor(
+                    None, _open_representation, source, filepath
+                )
+            except OSError as error:
+                if not cached:
+                    raise HTTPNotFound() from error
+            else:
+                if not cached or (
+                    _etag(source_stat) == source_etag and _etag(stat) == etag
+                ):
+                    return static_file, encoding, fobj, stat
+                await loop.run_in_executor(None, fobj.close)
+
+            # The files changed since the path was resolved
+            self._path_cache.pop(rel_url, None)
+
+    async def _handle(self, request: Request) -> StreamResponse:
+        accepted = _accepted_encodings(request)
+        opened = await self._async_open(
+            request, request.match_info["filename"], accepted
+        )
+
         # on opening a dir, load its contents if allowed
-        if filepath.is_dir():
+        if opened is None:
             return await super()._handle(request)
-        if filepath.is_file():
-            return FileResponse(
-                filepath,
-                chunk_size=self._chunk_size,
-                headers=CACHE_HEADERS,
+
+        static_file, encoding, fobj, stat = opened
+        loop = asyncio.get_running_loop()
+        try:
+            etag = _etag(stat)
+            if (
+                encoding is None
+                and static_file.compressible
+                and "gzip" in accepted
+                and "gzip" not in static_file.representations
+            ):
+                source = static_file.representations[None][0]
+                compressed = self._compressed.get(source)
+                if compressed is None or compressed[0] != etag:
+                    self._async_compress(source, etag)
+                elif compressed[1] is not None:
+                    content = compressed[1]
+                    return await self._async_send(
+                        request,
+                        static_file,
+                        "gzip",
+                        BytesIO(content),
+                        f'"{etag[1:-1]}-gzip"',
+                        stat.st_mtime,
+                        len(content),
+                    )
+
+            return await self._async_send(
+                request, static_file, encoding, fobj, etag, stat.st_mtime, stat.st_size
+            )
+        finally:
+            await loop.run_in_executor(None, fobj.close)
+
+    async def _async_send(
+        self,
+        request: Request,
+        static_file: StaticFile,
+        encoding: str | None,
+        fobj: BinaryIO,
+        etag: str,
+        mtime: float,
+        size: int,
+    ) -> StreamResponse:
+        """Send an open representation of a static file."""
+        headers: dict[str, str] = {
+            **CACHE_HEADERS,
+            hdrs.ETAG: etag,
+            hdrs.LAST_MODIFIED: formatdate(mtime, usegmt=True),
+        }
+        if len(static_file.representations) > 1 or static_file.compressible:
+            headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+
+        if_unmodified_since = request.if_unmodified_since
+        if (
+            if_unmodified_since is not None
+            and int(mtime) > if_unmodified_since.timestamp()
+        ):
+            return Response(status=412, headers=headers)
+
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+        if if_none_match is not None:
+            if _etag_matches(if_none_match, etag):
+                return Response(status=304, headers=headers)
+        else:
+            if_modified_since = request.if_modified_since
+            if (
+                if_modified_since is not None
+                and int(mtime) <= if_modified_since.timestamp()
+            ):
+                return Response(status=304, headers=headers)
+
+        start, end, status = 0, size, 200
+        if _if_range_matches(request, etag, mtime):
+            try:
+                http_range = request.http_range
+            except ValueError as error:
+                raise HTTPRequestRangeNotSatisfiable(
+                    headers={hdrs.CONTENT_RANGE: f"bytes */{size}"}
+                ) from error
+            if http_range.start is not None or http_range.stop is not None:
+                start = http_range.start or 0
+                if start < 0:
+                    # A suffix range of the last bytes
+                    start = max(size + start, 0)
+                end = min(http_range.stop or size, size)
+                if start >= end:
+                    raise HTTPRequestRangeNotSatisfiable(
+                        headers={hdrs.CONTENT_RANGE: f"bytes */{size}"}
+                    )
+                status = 206
+                headers[hdrs.CONTENT_RANGE] = f"bytes {start}-{end - 1}/{size}"
+
+        assert static_file.content_type is not None
+        headers[hdrs.CONTENT_TYPE] = static_file.content_type
+        headers[hdrs.ACCEPT_RANGES] = "bytes"
+        if encoding is not None:
+            headers[hdrs.CONTENT_ENCODING] = encoding
+
+        response = StreamResponse(status=status, headers=headers)
+        response.content_length = end - start
+        await response.prepare(request)
+        if request.method == hdrs.METH_HEAD:
+            return response
+
+        loop = asyncio.get_running_loop()
+        if start:
+            await loop.run_in_executor(None, fobj.seek, start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = await loop.run_in_executor(
+                None, fobj.read, min(self._chunk_size, remaining)
             )
-        raise HTTPNotFound
+            if not chunk:
+                break
+            await response.write(chunk)
+            remaining -= len(chunk)
+        await response.write_eof()
+        return response
@@ -1,22 +1,32 @@
 """Event parser and human readable log generator."""
+from __future__ import annotations
+
+import asyncio
 from contextlib import suppress
 from datetime import timedelta
+from functools import partial
 from itertools import groupby
 import json
+import logging
 import re
+from typing import Any
 
 import sqlalchemy
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
+    CONTINUOUS_DOMAINS,
     Events,
     States,
-    process_timestamp_to_utc_isoformat,
+    entity_id_from_event_data,
+    timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
@@ -27,14 +37,22 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    ATTR_UNIT_OF_MEASUREMENT,
     EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_LOGBOOK_ENTRY,
     EVENT_STATE_CHANGED,
     HTTP_BAD_REQUEST,
+    MATCH_ALL,
+)
+from homeassistant.core import (
+    DOMAIN as HA_DOMAIN,
+    Event,
+    HomeAssistant,
+    callback,
+    split_entity_id,
 )
-from homeassistant.core import DOMAIN as HA_DOMAIN, callback, split_entity_id
 from homeassistant.exceptions import InvalidEntityFormatError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
@@ -47,25 +65,30 @@ from homeassistant.helpers.integration_platform import (
 )
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
+from homeassistant.util.ulid import bytes_to_ulid_hex, ulid_hex_to_bytes
 
-ENTITY_ID_JSON_TEMPLATE = '"entity_id": "{}"'
 ENTITY_ID_JSON_EXTRACT = re.compile('"entity_id": "([^"]+)"')
 DOMAIN_JSON_EXTRACT = re.compile('"domain": "([^"]+)"')
 ICON_JSON_EXTRACT = re.compile('"icon": "([^"]+)"')
 
 ATTR_MESSAGE = "message"
 
-CONTINUOUS_DOMAINS = ["proximity", "sensor"]
-
 DOMAIN = "logbook"
+DATA_FILTERS = "logbook_filters"
 
 GROUP_BY_MINUTES = 15
 
 EMPTY_JSON_OBJECT = "{}"
-UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
 HA_DOMAIN_ENTITY_ID = f"{HA_DOMAIN}."
 
+# Contexts kept in memory to augment the entries of a live event stream
+LIVE_CONTEXT_CACHE_SIZE = 1024
+# Seconds a live event stream waits for the recorder to commit its queue
+RECORDER_COMMIT_TIMEOUT = 10
+
+_LOGGER = logging.getLogger(__name__)
+
 CONFIG_SCHEMA = vol.Schema(
     {DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA}, extra=vol.ALLOW_EXTRA
 )
@@ -89,10 +112,13 @@ ALL_EVENT_TYPES = [
 EVENT_COLUMNS = [
     Events.event_type,
     Events.event_data,
-    Events.time_fired,
+    Events.time_fired_ts,
     Events.context_id,
     Events.context_user_id,
     Events.context_parent_id,
+    Events.context_id_bin,
+    Events.context_user_id_bin,
+    Events.context_parent_id_bin,
 ]
 
 SCRIPT_AUTOMATION_EVENTS = [EVENT_AUTOMATION_TRIGGERED, EVENT_SCRIPT_STARTED]
@@ -160,7 +186,9 @@ async def async_setup(hass, config):
         filters = None
         entities_filter = None
 
+    hass.data[DATA_FILTERS] = (filters, entities_filter)
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
+    websocket_api.async_register_command(hass, ws_event_stream)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -257,6 +285,156 @@ class LogbookView(HomeAssistantView):
         return await hass.async_add_executor_job(json_events)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/event_stream",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("entity_matches_only"): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_event_stream(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Send the logbook entries of a period, then stream new entries.
+
+    The entries recorded before the subscription are read from the database
+    once the recorder committed them, the later ones are humanified from the
+    event bus as they are fired.
+    """
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+    start_time = dt_util.as_utc(start_time)
+
+    end_time = None
+    if "end_time" in msg:
+        end_time = dt_util.parse_datetime(msg["end_time"])
+        if end_time is None:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+        end_time = dt_util.as_utc(end_time)
+
+    entity_ids = msg.get("entity_ids")
+    entity_matches_only = msg.get("entity_matches_only", False)
+    filters, entities_filter = hass.data[DATA_FILTERS]
+    if entity_ids is not None:
+        filters = None
+        entities_filter = generate_filter([], entity_ids, [], [])
+
+    entity_attr_cache = EntityAttributeCache(hass)
+    context_lookup: dict[str | None, Any] = {None: None}
+    live_start = dt_util.utcnow()
+    live = end_time is None or end_time > live_start
+    # Live events are held back until the entries from the database are sent
+    pending: list[dict[str, Any]] | None = []
+
+    @callback
+    def _async_send_entries(entries):
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"events": entries})
+        )
+
+    @callback
+    def _async_forward_event(event: Event) -> None:
+        if (
+            event.event_type not in ALL_EVENT_TYPES
+            and event.event_type not in hass.data[DOMAIN]
+        ):
+            return
+        if end_time is not None and event.time_fired >= end_time:
+            return
+        lazy_event = LiveEventPartialState(event)
+        context_lookup.setdefault(lazy_event.context_id, lazy_event)
+        if len(context_lookup) > LIVE_CONTEXT_CACHE_SIZE:
+            del context_lookup[next(iter(context_lookup))]
+        if not _keep_live_event(
+            hass, lazy_event, entity_ids, entities_filter, entity_matches_only
+        ):
+            return
+        entries = list(humanify(hass, [lazy_event], entity_attr_cache, context_lookup))
+        if not entries:
+            return
+        if pending is None:
+            _async_send_entries(entries)
+        else:
+            pending.extend(entries)
+
+    if live:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            MATCH_ALL, _async_forward_event
+        )
+    connection.send_result(msg["id"])
+
+    # The events fired before the subscription may still be queued in the
+    # recorder
+    try:
+        await asyncio.wait_for(
+            hass.data[DATA_INSTANCE].async_commit(), RECORDER_COMMIT_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        _LOGGER.debug("Recorder did not commit in time, entries may be missing")
+
+    history_end = live_start if end_time is None else min(end_time, live_start)
+    entries = await hass.async_add_executor_job(
+        partial(
+            _get_events,
+            hass,
+            start_time,
+            history_end,
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_matches_only,
+            entity_attr_cache=entity_attr_cache,
+            context_lookup=context_lookup,
+        )
+    )
+    # Only the newest contexts of the period are kept for the live entries
+    for context_id in list(context_lookup)[:-LIVE_CONTEXT_CACHE_SIZE]:
+        del context_lookup[context_id]
+
+    entries.extend(pending)
+    pending = None
+    _async_send_entries(entries)
+
+
+def _keep_live_event(hass, event, entity_ids, entities_filter, entity_matches_only):
+    """Return if an event from the bus belongs in a logbook event stream.
+
+    Mirrors the filters of the database queries of _get_events.
+    """
+    event_type = event.event_type
+    if event_type == EVENT_STATE_CHANGED:
+        old_state = event.old_state
+        new_state = event.new_state
+        if old_state is None or new_state is None:
+            return False
+        if old_state.state == new_state.state:
+            return False
+        if new_state.last_changed != new_state.last_updated:
+            return False
+        if (
+            new_state.domain in CONTINUOUS_DOMAINS
+            and ATTR_UNIT_OF_MEASUREMENT in new_state.attributes
+        ):
+            return False
+        return entities_filter is None or entities_filter(event.entity_id)
+
+    if event_type == EVENT_CALL_SERVICE:
+        return False
+    if (
+        entity_ids is not None
+        and entity_matches_only
+        and entity_id_from_event_data(event_type, event.data) not in entity_ids
+    ):
+        return False
+    return _keep_event(hass, event, entities_filter)
+
+
 def humanify(hass, events, entity_attr_cache, context_lookup):
     """Generate a converted list of events into Entry objects.
 
@@ -420,14 +598,18 @@ def _get_events(
     entities_filter=None,
     entity_matches_only=False,
     context_id=None,
+    entity_attr_cache=None,
+    context_lookup=None,
 ):
     """Get events for a period of time."""
     assert not (
         entity_ids and context_id
     ), "can't pass in both entity_ids and context_id"
 
-    entity_attr_cache = EntityAttributeCache(hass)
-    context_lookup = {None: None}
+    if entity_attr_cache is None:
+        entity_attr_cache = EntityAttributeCache(hass)
+    if context_lookup is None:
+        context_lookup = {None: None}
 
     def yield_events(query):
         """Yield Events that are not filtered away."""
@@ -444,7 +626,7 @@ def _get_events(
     if entity_ids is not None:
         entities_filter = generate_filter([], entity_ids, [], [])
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         old_state = aliased(States, name="old_state")
 
         if entity_ids is not None:
@@ -469,7 +651,7 @@ def _get_events(
             query = _apply_events_types_and_states_filter(
                 hass, query, old_state
             ).filter(
-                (States.last_updated == States.last_changed)
+                (States.last_updated_ts == States.last_changed_ts)
                 | (Events.event_type != EVENT_STATE_CHANGED)
             )
             if filters:
@@ -478,9 +660,9 @@ def _get_events(
                 )
 
             if context_id is not None:
-                query = query.filter(Events.context_id == context_id)
+                query = _apply_event_context_id_filter(query, context_id)
 
-        query = query.order_by(Events.time_fired)
+        query = query.order_by(Events.time_fired_ts)
 
         return list(
             humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
@@ -514,9 +696,12 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
-        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
         .filter(
-            (States.last_updated == States.last_changed)
+            (States.last_updated_ts > start_day.timestamp())
+            & (States.last_updated_ts < end_day.timestamp())
+        )
+        .filter(
+            (States.last_updated_ts == States.last_changed_ts)
             & States.entity_id.in_(entity_ids)
         )
     )
@@ -552,16 +737,15 @@ def _continuous_entity_matcher():
     #
     # Prefilter out continuous domains that have
     # ATTR_UNIT_OF_MEASUREMENT as its much faster in sql.
+    # The recorder flags these states when it records them.
     #
-    return sqlalchemy.or_(
-        sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
-    )
+    return sqlalchemy.not_(States.continuous)
 
 
 def _apply_event_time_filter(events_query, start_day, end_day):
     return events_query.filter(
-        (Events.time_fired > start_day) & (Events.time_fired < end_day)
+        (Events.time_fired_ts > start_day.timestamp())
+        & (Events.time_fired_ts < end_day.timestamp())
     )
 
 
@@ -571,15 +755,15 @@ def _apply_event_types_filter(hass, query, event_types):
     )
 
 
+def _apply_event_context_id_filter(events_query, context_id):
+    context_id_bin = ulid_hex_to_bytes(context_id)
+    if context_id_bin is None:
+        return events_query.filter(Events.context_id == context_id)
+    return events_query.filter(Events.context_id_bin == context_id_bin)
+
+
 def _apply_event_entity_id_matchers(events_query, entity_ids):
-    return events_query.filter(
-        sqlalchemy.or_(
-            *(
-                Events.event_data.contains(ENTITY_ID_JSON_TEMPLATE.format(entity_id))
-                for entity_id in entity_ids
-            )
-        )
-    )
+    return events_query.filter(Events.entity_id.in_(entity_ids))
 
 
 def _keep_event(hass, event, entities_filter):
@@ -704,10 +888,18 @@ class LazyEventPartialState:
         self.entity_id = self._row.entity_id
         self.state = self._row.state
         self.domain = self._row.domain
-        self.context_id = self._row.context_id
-        self.context_user_id = self._row.context_user_id
-        self.context_parent_id = self._row.context_parent_id
-        self.time_fired_minute = self._row.time_fired.minute
+        self.context_id = (
+            bytes_to_ulid_hex(self._row.context_id_bin) or self._row.context_id
+        )
+        self.context_user_id = (
+            bytes_to_ulid_hex(self._row.context_user_id_bin)
+            or self._row.context_user_id
+        )
+        self.context_parent_id = (
+            bytes_to_ulid_hex(self._row.context_parent_id_bin)
+            or self._row.context_parent_id
+        )
+        self.time_fired_minute = int(self._row.time_fired_ts // 60 % 60)
 
     @property
     def attributes_icon(self):
@@ -763,13 +955,86 @@ class LazyEventPartialState:
     def time_fired_isoformat(self):
         """Time event was fired in utc isoformat."""
         if not self._time_fired_isoformat:
-            self._time_fired_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.time_fired or dt_util.utcnow()
-            )
+            if self._row.time_fired_ts is None:
+                self._time_fired_isoformat = dt_util.utcnow().isoformat()
+            else:
+                self._time_fired_isoformat = timestamp_to_utc_isoformat(
+                    self._row.time_fired_ts
+                )
 
         return self._time_fired_isoformat
 
 
+class LiveEventPartialState:
+    """An event from the bus with the interface of LazyEventPartialState."""
+
+    __slots__ = [
+        "_event",
+        "old_state",
+        "new_state",
+        "event_type",
+        "entity_id",
+        "state",
+        "domain",
+        "context_id",
+        "context_user_id",
+        "context_parent_id",
+        "time_fired_minute",
+    ]
+
+    def __init__(self, event):
+        """Init the event."""
+        self._event = event
+        self.event_type = event.event_type
+        self.old_state = self.new_state = None
+        self.entity_id = self.state = self.domain = None
+        if self.event_type == EVENT_STATE_CHANGED:
+            self.old_state = event.data.get("old_state")
+            self.new_state = event.data.get("new_state")
+            self.entity_id = event.data.get(ATTR_ENTITY_ID)
+            if self.new_state is not None:
+                self.state = self.new_state.state
+                self.domain = self.new_state.domain
+        self.context_id = event.context.id
+        self.context_user_id = event.context.user_id
+        self.context_parent_id = event.context.parent_id
+        self.time_fired_minute = event.time_fired.minute
+
+    @property
+    def attributes_icon(self):
+        """Extract the icon from the attributes of the new state."""
+        return self.attributes.get(ATTR_ICON)
+
+    @property
+    def data_entity_id(self):
+        """Extract the entity id from the event data."""
+        entity_id = self._event.data.get(ATTR_ENTITY_ID)
+        return entity_id if isinstance(entity_id, str) else None
+
+    @property
+    def data_domain(self):
+        """Extract the domain from the event data."""
+        domain = self._event.data.get(ATTR_DOMAIN)
+        return domain if isinstance(domain, str) else None
+
+    @property
+    def attributes(self):
+        """State attributes."""
+        if self.new_state is None:
+            return {}
+        return self.new_state.attributes
+
+    @property
+    def data(self):
+        """Event data."""
+        return self._event.data
+
+    @property
+    def time_fired_isoformat(self):
+        """Time event was fired in utc isoformat."""
+        return timestamp_to_utc_isoformat(self._event.time_fired.timestamp())
+
+
 class EntityAttributeCache:
     """A cache to lookup static entity_id attribute.
 
@@ -316,9 +316,9 @@ class Plant(Entity):
                 session.query(States)
                 .filter(
                     (States.entity_id == entity_id.lower())
-                    and (States.last_updated > start_date)
+                    and (States.last_updated_ts > start_date.timestamp())
                 )
-                .order_by(States.last_updated.asc())
+                .order_by(States.last_updated_ts.asc())
             )
             states = execute(query, to_native=True, validate_entity_ids=False)
 
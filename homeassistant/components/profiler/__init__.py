@@ -14,14 +14,16 @@ import objgraph
 from pyprof2calltree import convert
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
 
-from .const import DOMAIN
+from .const import DOMAIN, LOOP_MONITOR
+from .loop_monitor import LoopMonitor
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -30,6 +32,8 @@ SERVICE_STOP_LOG_OBJECTS = "stop_log_objects"
 SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
+SERVICE_START_LOOP_MONITOR = "start_loop_monitor"
+SERVICE_STOP_LOOP_MONITOR = "stop_loop_monitor"
 
 
 SERVICES = (
@@ -40,11 +44,18 @@ SERVICES = (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_START_LOOP_MONITOR,
+    SERVICE_STOP_LOOP_MONITOR,
 )
 
+PLATFORMS = ["sensor"]
+
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 CONF_SECONDS = "seconds"
+CONF_SAMPLE_EVERY = "sample_every"
+
+DEFAULT_SAMPLE_EVERY = 10
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
@@ -113,6 +124,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 "".join(traceback.format_stack(frames.get(thread.ident))).strip(),
             )
 
+    async def _async_start_loop_monitor(call: ServiceCall) -> None:
+        """Start sampling how long jobs block the event loop."""
+        if LOOP_MONITOR in domain_data:
+            domain_data.pop(LOOP_MONITOR).async_stop()
+
+        monitor = domain_data[LOOP_MONITOR] = LoopMonitor(
+            hass, call.data[CONF_SAMPLE_EVERY]
+        )
+        monitor.async_start()
+
+    async def _async_stop_loop_monitor(call: ServiceCall) -> None:
+        """Stop sampling how long jobs block the event loop."""
+        if LOOP_MONITOR in domain_data:
+            domain_data.pop(LOOP_MONITOR).async_stop()
+
     async def _async_dump_scheduled(call: ServiceCall) -> None:
         """Log all scheduled in the event loop."""
         arepr = reprlib.aRepr
@@ -191,19 +217,63 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _async_dump_scheduled,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_LOOP_MONITOR,
+        _async_start_loop_monitor,
+        schema=vol.Schema(
+            {
+                vol.Optional(
+                    CONF_SAMPLE_EVERY, default=DEFAULT_SAMPLE_EVERY
+                ): cv.positive_int
+            }
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_LOOP_MONITOR,
+        _async_stop_loop_monitor,
+    )
+
+    websocket_api.async_register_command(hass, websocket_loop_monitor)
+
+    hass.config_entries.async_setup_platforms(entry, PLATFORMS)
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
     for service in SERVICES:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    if LOOP_MONITOR in hass.data[DOMAIN]:
+        hass.data[DOMAIN][LOOP_MONITOR].async_stop()
     hass.data.pop(DOMAIN)
     return True
 
 
+@websocket_api.websocket_command({vol.Required("type"): "profiler/loop_monitor"})
+@websocket_api.require_admin
+@callback
+def websocket_loop_monitor(hass, connection, msg):
+    """Return the histograms of the event loop monitor."""
+    monitor = hass.data.get(DOMAIN, {}).get(LOOP_MONITOR)
+    if monitor is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Event loop monitor not running"
+        )
+        return
+
+    connection.send_result(msg["id"], monitor.as_dict())
+
+
 async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     start_time = int(time.time() * 1000000)
     hass.components.persistent_notification.async_create(
@@ -0,0 +1,184 @@
+"""Monitor the event loop lag and the time callbacks block the event loop."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine, Generator
+import functools
+from time import perf_counter
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.histogram import DurationHistogram
+
+# Seconds between two probes of the event loop lag
+LAG_PROBE_INTERVAL = 0.5
+
+
+@functools.lru_cache(maxsize=1024)
+def _integration_from_module(module: str) -> str:
+    """Return the integration or core module that owns a Python module."""
+    parts = module.split(".")
+    if parts[:2] == ["homeassistant", "components"] and len(parts) > 2:
+        return parts[2]
+    if parts[0] == "custom_components" and len(parts) > 1:
+        return parts[1]
+    if parts[0] == "homeassistant" and len(parts) > 1:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def job_owner(target: Callable) -> str:
+    """Return the integration that owns a callable."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    target = getattr(target, "__func__", target)
+    module = getattr(target, "__module__", None) or type(target).__module__
+    return _integration_from_module(module)
+
+
+class _TimedCoroutine(Coroutine):
+    """Coroutine that measures every step of another coroutine."""
+
+    __slots__ = ("_coro", "_histogram")
+
+    def __init__(self, coro: Coroutine, histogram: DurationHistogram) -> None:
+        """Initialize the coroutine."""
+        self._coro = coro
+        self._histogram = histogram
+
+    def send(self, value: Any) -> Any:
+        """Run the next step of the coroutine."""
+        start = perf_counter()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._histogram.record(perf_counter() - start)
+
+    def throw(self, *args: Any) -> Any:
+        """Raise an exception in the coroutine."""
+        start = perf_counter()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._histogram.record(perf_counter() - start)
+
+    def close(self) -> None:
+        """Close the coroutine."""
+        self._coro.close()
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        """Return the iterator of the coroutine."""
+        return self  # type: ignore[return-value]
+
+    def __iter__(self) -> _TimedCoroutine:
+        """Return the iterator of the coroutine."""
+        return self
+
+    def __next__(self) -> Any:
+        """Run the next step of the coroutine."""
+        return self.send(None)
+
+
+class LoopMonitor:
+    """Sample how long jobs block the event loop, grouped per integration.
+
+    One in every sample_every callbacks and coroutines is measured, so the
+    counts of the histograms are a sample of all jobs. The event loop lag is
+    how late a probe that is scheduled every LAG_PROBE_INTERVAL runs.
+    """
+
+    def __init__(self, hass: HomeAssistant, sample_every: int) -> None:
+        """Initialize the monitor."""
+        self.hass = hass
+        self.sample_every = sample_every
+        self.lag = DurationHistogram()
+        self.window_max_lag = 0.0
+        self.integrations: dict[str, DurationHistogram] = {}
+        self._jobs = 0
+        self._probe: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start instrumenting jobs and probing the event loop lag."""
+        self.hass.job_instrumentation = self
+        self._async_schedule_probe()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop instrumenting jobs and probing the event loop lag."""
+        if self.hass.job_instrumentation is self:
+            self.hass.job_instrumentation = None
+        if self._probe is not None:
+            self._probe.cancel()
+            self._probe = None
+
+    @callback
+    def _async_schedule_probe(self) -> None:
+        """Schedule the next probe of the event loop lag."""
+        expected = self.hass.loop.time() + LAG_PROBE_INTERVAL
+        self._probe = self.hass.loop.call_at(expected, self._async_probe, expected)
+
+    @callback
+    def _async_probe(self, expected: float) -> None:
+        """Record how late the probe ran."""
+        lag = max(self.hass.loop.time() - expected, 0.0)
+        self.lag.record(lag)
+        self.window_max_lag = max(self.window_max_lag, lag)
+        self._async_schedule_probe()
+
+    def _sampled_histogram(self, target: Callable) -> DurationHistogram | None:
+        """Return the histogram of the owner of a job if it is sampled."""
+        self._jobs += 1
+        if self._jobs % self.sample_every:
+            return None
+        owner = job_owner(target)
+        histogram = self.integrations.get(owner)
+        if histogram is None:
+            histogram = self.integrations[owner] = DurationHistogram()
+        return histogram
+
+    def wrap_callback(self, target: Callable) -> Callable:
+        """Return a callable that runs a callback and measures it."""
+        histogram = self._sampled_histogram(target)
+        if histogram is None:
+            return target
+
+        record = histogram.record
+
+        def _timed_callback(*args: Any) -> Any:
+            start = perf_counter()
+            try:
+                return target(*args)
+            finally:
+                record(perf_counter() - start)
+
+        return _timed_callback
+
+    def wrap_coroutine(self, target: Callable, coro: Coroutine) -> Coroutine:
+        """Return a coroutine that runs the coroutine of a target and measures it."""
+        histogram = self._sampled_histogram(target)
+        if histogram is None:
+            return coro
+        return _TimedCoroutine(coro, histogram)
+
+    @callback
+    def async_pop_window_max_lag(self) -> float:
+        """Return the highest lag since the last call."""
+        max_lag = self.window_max_lag
+        self.window_max_lag = 0.0
+        return max_lag
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the aggregated histograms."""
+        return {
+            "sample_every": self.sample_every,
+            "lag": self.lag.as_dict(),
+            "integrations": {
+                integration: histogram.as_dict()
+                for integration, histogram in sorted(
+                    self.integrations.items(),
+                    key=lambda item: item[1].total,
+                    reverse=True,
+                )
+            },
+        }
@@ -0,0 +1,173 @@
+"""Sensors for the event loop monitor and the database queries of the profiler."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.sensor import STATE_CLASS_MEASUREMENT, SensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import TIME_MILLISECONDS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, LOOP_MONITOR
+from .loop_monitor import LoopMonitor
+
+if TYPE_CHECKING:
+    from homeassistant.components.recorder.instrumentation import QueryInstrumentation
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+# Integrations listed in the attributes of the slowest integration sensor
+TOP_INTEGRATIONS = 10
+# Call sites listed in the attributes of the slowest database query sensor
+TOP_QUERIES = 10
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the event loop monitor and database query sensors."""
+    async_add_entities(
+        [
+            EventLoopLagSensor(),
+            SlowestIntegrationSensor(),
+            DatabaseQueryTimeSensor(),
+            SlowestQuerySensor(),
+        ]
+    )
+
+
+class LoopMonitorSensor(SensorEntity):
+    """Sensor that is available while the event loop monitor runs."""
+
+    @property
+    def monitor(self) -> LoopMonitor | None:
+        """Return the running event loop monitor."""
+        return self.hass.data[DOMAIN].get(LOOP_MONITOR)
+
+    @property
+    def available(self) -> bool:
+        """Return if the event loop monitor runs."""
+        return self.monitor is not None
+
+
+class EventLoopLagSensor(LoopMonitorSensor):
+    """Highest event loop lag since the last update."""
+
+    _attr_name = "Event loop lag"
+    _attr_unique_id = "event_loop_lag"
+    _attr_icon = "mdi:timer-sand"
+    _attr_state_class = STATE_CLASS_MEASUREMENT
+    _attr_unit_of_measurement = TIME_MILLISECONDS
+
+    async def async_update(self) -> None:
+        """Update the lag and its histogram."""
+        if (monitor := self.monitor) is None:
+            return
+        self._attr_state = round(monitor.async_pop_window_max_lag() * 1000, 1)
+        self._attr_extra_state_attributes = monitor.lag.as_dict()
+
+
+class SlowestIntegrationSensor(LoopMonitorSensor):
+    """Integration that blocked the event loop longest since the last update."""
+
+    _attr_name = "Slowest event loop integration"
+    _attr_unique_id = "slowest_event_loop_integration"
+    _attr_icon = "mdi:turtle"
+
+    def __init__(self) -> None:
+        """Initialize the sensor."""
+        self._totals: dict[str, float] = {}
+
+    async def async_update(self) -> None:
+        """Update the integration with the most blocking time."""
+        if (monitor := self.monitor) is None:
+            self._totals = {}
+            return
+
+        window: dict[str, float] = {}
+        for integration, histogram in monitor.integrations.items():
+            window[integration] = histogram.total - self._totals.get(integration, 0)
+            self._totals[integration] = histogram.total
+
+        top = sorted(window.items(), key=lambda item: item[1], reverse=True)
+        top = [item for item in top[:TOP_INTEGRATIONS] if item[1] > 0]
+        self._attr_state = top[0][0] if top else None
+        self._attr_extra_state_attributes = {
+            "sample_every": monitor.sample_every,
+            **{integration: round(total * 1000, 1) for integration, total in top},
+        }
+
+
+class QueryInstrumentationSensor(SensorEntity):
+    """Sensor that is available while the recorder instruments its queries."""
+
+    def __init__(self) -> None:
+        """Initialize the sensor."""
+        self._totals: dict[str, float] = {}
+
+    @property
+    def instrumentation(self) -> QueryInstrumentation | None:
+        """Return the query instrumentation of the recorder."""
+        if (instance := self.hass.data.get(DATA_INSTANCE)) is None:
+            return None
+        return instance.query_instrumentation
+
+    @property
+    def available(self) -> bool:
+        """Return if the recorder instruments its queries."""
+        return self.instrumentation is not None
+
+    def _pop_window(self, instrumentation: QueryInstrumentation) -> dict[str, float]:
+        """Return the query time of every call site since the last update."""
+        window: dict[str, float] = {}
+        for call_site, stats in list(instrumentation.call_sites.items()):
+            window[call_site] = stats.total - self._totals.get(call_site, 0)
+            self._totals[call_site] = stats.total
+        return window
+
+
+class DatabaseQueryTimeSensor(QueryInstrumentationSensor):
+    """Time spent running database queries since the last update."""
+
+    _attr_name = "Database query time"
+    _attr_unique_id = "database_query_time"
+    _attr_icon = "mdi:database-clock"
+    _attr_state_class = STATE_CLASS_MEASUREMENT
+    _attr_unit_of_measurement = TIME_MILLISECONDS
+
+    async def async_update(self) -> None:
+        """Update the query time and the count of slow queries."""
+        if (instrumentation := self.instrumentation) is None:
+            self._totals = {}
+            return
+        self._attr_state = round(
+            sum(self._pop_window(instrumentation).values()) * 1000, 1
+        )
+        self._attr_extra_state_attributes = {
+            "slow_queries": len(instrumentation.slow_queries)
+        }
+
+
+class SlowestQuerySensor(QueryInstrumentationSensor):
+    """Call site that spent the most time in database queries since the last update."""
+
+    _attr_name = "Slowest database query"
+    _attr_unique_id = "slowest_database_query"
+    _attr_icon = "mdi:database-alert"
+
+    async def async_update(self) -> None:
+        """Update the call site with the most query time."""
+        if (instrumentation := self.instrumentation) is None:
+            self._totals = {}
+            return
+
+        window = self._pop_window(instrumentation)
+        top = sorted(window.items(), key=lambda item: item[1], reverse=True)
+        top = [item for item in top[:TOP_QUERIES] if item[1] > 0]
+        self._attr_state = top[0][0] if top else None
+        self._attr_extra_state_attributes = {
+            call_site: round(total * 1000, 1) for call_site, total in top
+        }
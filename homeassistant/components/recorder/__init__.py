@@ -5,6 +5,7 @@ import asyncio
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
+from multiprocessing.connection import Connection
 import queue
 import sqlite3
 import threading
@@ -14,6 +15,7 @@ from typing import Any, Callable, NamedTuple
 from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm.session import Session
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
 
@@ -34,7 +36,6 @@ from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER,
     convert_include_exclude_filter,
-    generate_filter,
 )
 from homeassistant.helpers.event import (
     async_track_time_change,
@@ -48,10 +49,16 @@ from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
-from . import history, migration, purge, statistics
-from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
-from .pool import RecorderPool
+from . import history, instrumentation, migration, purge, statistics, writer
+from .const import (
+    CONF_DB_INTEGRITY_CHECK,
+    DATA_INSTANCE,
+    DOMAIN,
+    SQLITE_URL_PREFIX,
+    STATE_CHECKPOINT_INTERVAL,
+)
+from .models import Base, Events, RecorderRuns, StateCheckpoints, States
+from .pool import ReadPoolStats, RecorderPool, RecorderReadPool
 from .util import (
     dburl_to_path,
     end_incomplete_runs,
@@ -59,6 +66,7 @@ from .util import (
     perodic_db_cleanups,
     session_scope,
     setup_connection_for_dialect,
+    setup_read_connection_for_sqlite,
     validate_or_move_away_sqlite_database,
 )
 
@@ -104,6 +112,8 @@ DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
 KEEPALIVE_TIME = 30
+# Queued events and tasks sent to the writer process at once
+WRITER_BATCH_SIZE = 1000
 
 # Controls how often we clean up
 # States and Events objects
@@ -117,6 +127,8 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_WRITER_PROCESS = "writer_process"
+CONF_QUERY_INSTRUMENTATION = "query_instrumentation"
 
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
@@ -154,6 +166,8 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_WRITER_PROCESS, default=False): cv.boolean,
+                    vol.Optional(CONF_QUERY_INSTRUMENTATION, default=False): cv.boolean,
                 }
             ),
         )
@@ -239,6 +253,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        writer_process=conf[CONF_WRITER_PROCESS],
+        query_instrumentation=conf[CONF_QUERY_INSTRUMENTATION],
     )
     instance.async_initialize()
     instance.start()
@@ -331,6 +347,12 @@ class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+class CommitTask(NamedTuple):
+    """An object to insert into the recorder queue to commit the events queued before it."""
+
+    commit_id: int
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -345,6 +367,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
+        writer_process: bool = False,
+        query_instrumentation: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -362,23 +386,45 @@ class Recorder(threading.Thread):
         self.async_recorder_ready = asyncio.Event()
         self._queue_watch = threading.Event()
         self.engine: Any = None
+        self.read_engine: Any = None
         self.run_info: Any = None
+        self.query_instrumentation: instrumentation.QueryInstrumentation | None = (
+            instrumentation.QueryInstrumentation() if query_instrumentation else None
+        )
 
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
 
+        # The writer process cannot open an in memory database
+        self.writer_process = writer_process and not self._using_memory_sqlite
+        if writer_process and not self.writer_process:
+            _LOGGER.warning(
+                "The recorder writer process is not supported with an in memory database"
+            )
+        self._writer: writer.WriterProcess | None = None
+
         self._timechanges_seen = 0
         self._commits_without_expire = 0
         self._keepalive_count = 0
         self._old_states: dict[str, States] = {}
         self._pending_expunge: list[States] = []
+        # States of the uncommitted events, and the state_id of the latest
+        # committed state of every entity in this run for the next checkpoint
+        self._pending_checkpoint_states: dict[str, States] = {}
+        self._pending_checkpoint_time: datetime | None = None
+        self._checkpoint_state_ids: dict[str, int] = {}
+        self._next_checkpoint: datetime | None = None
+        self.purge_progress: purge.PurgeProgress | None = None
         self.event_session = None
         self.get_session = None
+        self.get_read_session: Any = None
         self._completed_first_database_setup = None
         self._event_listener = None
         self.async_migration_event = asyncio.Event()
         self.migration_in_progress = False
         self._queue_watcher = None
+        self._commit_futures: dict[int, asyncio.Future[None]] = {}
+        self._next_commit_id = 0
 
         self.enabled = True
 
@@ -386,6 +432,26 @@ class Recorder(threading.Thread):
         """Enable or disable recording events and states."""
         self.enabled = enable
 
+    @callback
+    def async_commit(self) -> asyncio.Future[None]:
+        """Return a future that is done once the events queued so far are committed."""
+        self._next_commit_id += 1
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        self._commit_futures[self._next_commit_id] = future
+        self.queue.put(CommitTask(self._next_commit_id))
+        return future
+
+    def _commit_done(self, task: CommitTask) -> None:
+        """Tell the waiter of a commit task that the events were committed."""
+        self.hass.loop.call_soon_threadsafe(self._async_commit_done, task.commit_id)
+
+    @callback
+    def _async_commit_done(self, commit_id: int) -> None:
+        """Resolve the future of a commit task."""
+        future = self._commit_futures.pop(commit_id, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
     @callback
     def async_initialize(self):
         """Initialize the recorder."""
@@ -456,7 +522,7 @@ class Recorder(threading.Thread):
 
     def do_adhoc_purge_entities(self, entity_ids, domains, entity_globs):
         """Trigger an adhoc purge of requested entities."""
-        entity_filter = generate_filter(domains, entity_ids, [], [], entity_globs)
+        entity_filter = writer.PurgeEntitiesFilter(entity_ids, domains, entity_globs)
         self.queue.put(PurgeEntitiesTask(entity_filter))
 
     def do_adhoc_statistics(self, **kwargs):
@@ -611,7 +677,10 @@ class Recorder(threading.Thread):
 
         _LOGGER.debug("Recorder processing the queue")
         self.hass.add_job(self._async_recorder_ready)
-        self._run_event_loop()
+        if self.writer_process:
+            self._run_writer_process()
+        else:
+            self._run_event_loop()
 
     def _run_event_loop(self):
         """Run the event loop for the recorder."""
@@ -626,6 +695,88 @@ class Recorder(threading.Thread):
 
         self._shutdown()
 
+    def _run_writer_process(self):
+        """Forward the queue to the writer process, which owns the event session."""
+        self._close_event_session()
+        self.event_session = None
+        self._writer = writer.WriterProcess(
+            self, self._handle_writer_reply, self._handle_writer_exit
+        )
+        self._writer.start()
+
+        running = True
+        while running:
+            batch = []
+            event = self.queue.get()
+            while True:
+                if event is None:
+                    running = False
+                    batch.append(None)
+                    break
+                if isinstance(event, StatisticsTask):
+                    # The recorder platforms need Home Assistant, only the
+                    # compiled statistics are written by the writer process
+                    start = dt_util.as_utc(event.start)
+                    try:
+                        event = writer.SaveStatisticsTask(
+                            start,
+                            statistics.compile_platform_statistics(self.hass, start),
+                        )
+                    except Exception as err:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error while compiling statistics: %s", err)
+                        event = None
+                if event is not None:
+                    batch.append(event)
+                if len(batch) >= WRITER_BATCH_SIZE:
+                    break
+                try:
+                    event = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if not self._writer.send(batch):
+                self._release_waiters()
+
+        self._writer.stop()
+        self._writer = None
+        self._shutdown()
+
+    def _handle_writer_reply(self, reply):
+        """Handle a reply of the writer process."""
+        if isinstance(reply, WaitTask):
+            self._queue_watch.set()
+        elif isinstance(reply, CommitTask):
+            self._commit_done(reply)
+        elif isinstance(reply, purge.PurgeProgress):
+            self.purge_progress = reply
+
+    def _handle_writer_exit(self):
+        """Stop recording once the writer process exited unexpectedly."""
+        _LOGGER.error(
+            "The recorder writer process exited, events are no longer being recorded"
+        )
+        persistent_notification.create(
+            self.hass,
+            "The recorder writer process exited unexpectedly, events are no longer "
+            "being recorded until Home Assistant is restarted. Check "
+            "[the logs](/config/logs).",
+            "Recorder writer process exited",
+            "recorder_writer_process",
+        )
+        self._release_waiters()
+
+    def _release_waiters(self):
+        """Release the waiters of the tasks the writer process will not reply to."""
+        self._queue_watch.set()
+        self.hass.loop.call_soon_threadsafe(self._async_release_commits)
+
+    @callback
+    def _async_release_commits(self):
+        """Resolve the futures of all pending commit tasks."""
+        futures, self._commit_futures = self._commit_futures, {}
+        for future in futures.values():
+            if not future.done():
+                future.set_result(None)
+
     def _process_one_event_or_recover(self, event):
         """Process an event, reconnect, or recover a malformed database."""
         try:
@@ -740,16 +891,14 @@ class Recorder(threading.Thread):
         if isinstance(event, WaitTask):
             self._queue_watch.set()
             return
+        if isinstance(event, CommitTask):
+            try:
+                self._commit_event_session_or_retry()
+            finally:
+                self._commit_done(event)
+            return
         if event.event_type == EVENT_TIME_CHANGED:
-            self._keepalive_count += 1
-            if self._keepalive_count >= KEEPALIVE_TIME:
-                self._keepalive_count = 0
-                self._send_keep_alive()
-            if self.commit_interval:
-                self._timechanges_seen += 1
-                if self._timechanges_seen >= self.commit_interval:
-                    self._timechanges_seen = 0
-                    self._commit_event_session_or_retry()
+            self._process_time_changed()
             return
 
         if not self.enabled:
@@ -760,35 +909,60 @@ class Recorder(threading.Thread):
                 dbevent = Events.from_event(event, event_data="{}")
             else:
                 dbevent = Events.from_event(event)
-            dbevent.created = event.time_fired
-            self.event_session.add(dbevent)
         except (TypeError, ValueError):
             _LOGGER.warning("Event is not JSON serializable: %s", event)
             return
 
+        dbstate = None
         if event.event_type == EVENT_STATE_CHANGED:
             try:
                 dbstate = States.from_event(event)
-                has_new_state = event.data.get("new_state")
-                if dbstate.entity_id in self._old_states:
-                    old_state = self._old_states.pop(dbstate.entity_id)
-                    if old_state.state_id:
-                        dbstate.old_state_id = old_state.state_id
-                    else:
-                        dbstate.old_state = old_state
-                if not has_new_state:
-                    dbstate.state = None
-                dbstate.event = dbevent
-                dbstate.created = event.time_fired
-                self.event_session.add(dbstate)
-                if has_new_state:
-                    self._old_states[dbstate.entity_id] = dbstate
-                    self._pending_expunge.append(dbstate)
             except (TypeError, ValueError):
                 _LOGGER.warning(
                     "State is not JSON serializable: %s",
                     event.data.get("new_state"),
                 )
+            else:
+                if not event.data.get("new_state"):
+                    dbstate.state = None
+
+        self._add_event(dbevent, dbstate, event.time_fired)
+
+    def _process_time_changed(self):
+        """Send keep alives and commit the event session every commit interval."""
+        self._keepalive_count += 1
+        if self._keepalive_count >= KEEPALIVE_TIME:
+            self._keepalive_count = 0
+            self._send_keep_alive()
+        if self.commit_interval:
+            self._timechanges_seen += 1
+            if self._timechanges_seen >= self.commit_interval:
+                self._timechanges_seen = 0
+                self._commit_event_session_or_retry()
+
+    def _add_event(self, dbevent, dbstate, time_fired):
+        """Add an event and the state it changed to the event session.
+
+        The state of a removed entity is None.
+        """
+        dbevent.created = time_fired
+        self.event_session.add(dbevent)
+
+        if dbstate is not None:
+            if dbstate.entity_id in self._old_states:
+                old_state = self._old_states.pop(dbstate.entity_id)
+                if old_state.state_id:
+                    dbstate.old_state_id = old_state.state_id
+                else:
+                    dbstate.old_state = old_state
+            dbstate.event = dbevent
+            dbstate.created = time_fired
+            self.event_session.add(dbstate)
+            self._pending_checkpoint_states[dbstate.entity_id] = dbstate
+            self._pending_checkpoint_time = time_fired
+            if dbstate.state is not None:
+                self._old_states[dbstate.entity_id] = dbstate
+                self._pending_expunge.append(dbstate)
 
         # If they do not have a commit interval
         # than we commit right away
@@ -840,6 +1014,9 @@ class Recorder(threading.Thread):
             self._pending_expunge = []
         self.event_session.commit()
 
+        if self._pending_checkpoint_states:
+            self._track_checkpoint_states()
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -847,6 +1024,30 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    def _track_checkpoint_states(self):
+        """Remember the committed states and write a checkpoint when it is due."""
+        for entity_id, dbstate in self._pending_checkpoint_states.items():
+            self._checkpoint_state_ids[entity_id] = dbstate.state_id
+        self._pending_checkpoint_states = {}
+
+        checkpoint_time = self._pending_checkpoint_time
+        if checkpoint_time < self._next_checkpoint:
+            return
+
+        self.event_session.add_all(
+            StateCheckpoints(
+                entity_id=entity_id, state_id=state_id, created=checkpoint_time
+            )
+            for entity_id, state_id in self._checkpoint_state_ids.items()
+        )
+        self.event_session.commit()
+        self._next_checkpoint = checkpoint_time + STATE_CHECKPOINT_INTERVAL
+        _LOGGER.debug(
+            "Wrote state checkpoint of %s entities at %s",
+            len(self._checkpoint_state_ids),
+            checkpoint_time,
+        )
+
     def _handle_sqlite_corruption(self):
         """Handle the sqlite3 database being corrupt."""
         self._close_event_session()
@@ -858,6 +1059,7 @@ class Recorder(threading.Thread):
     def _close_event_session(self):
         """Close the event session."""
         self._old_states = {}
+        self._pending_checkpoint_states = {}
 
         if not self.event_session:
             return
@@ -887,8 +1089,16 @@ class Recorder(threading.Thread):
 
     @callback
     def event_listener(self, event):
-        """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+        """Listen for new events and put them in the process queue.
+
+        The events for the writer process are serialized right away.
+        """
+        if not self.writer_process:
+            self.queue.put(event)
+        elif event.event_type == EVENT_TIME_CHANGED:
+            self.queue.put(writer.TimeChangedTask())
+        elif self.enabled and (columns := writer.serialize_event(event)):
+            self.queue.put(columns)
 
     def block_till_done(self):
         """Block till all events processed.
@@ -920,12 +1130,14 @@ class Recorder(threading.Thread):
             )
             self._completed_first_database_setup = True
 
-        if self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url:
+        use_read_pool = False
+        if self._using_memory_sqlite:
             kwargs["connect_args"] = {"check_same_thread": False}
             kwargs["poolclass"] = StaticPool
             kwargs["pool_reset_on_return"] = None
         elif self.db_url.startswith(SQLITE_URL_PREFIX):
             kwargs["poolclass"] = RecorderPool
+            use_read_pool = True
         else:
             kwargs["echo"] = False
 
@@ -935,11 +1147,63 @@ class Recorder(threading.Thread):
         self.engine = create_engine(self.db_url, **kwargs)
 
         sqlalchemy_event.listen(self.engine, "connect", setup_recorder_connection)
+        if self.query_instrumentation is not None:
+            self.query_instrumentation.instrument(self.engine)
 
         Base.metadata.create_all(self.engine)
         self.get_session = scoped_session(sessionmaker(bind=self.engine))
+        if use_read_pool:
+            self._setup_read_connection()
+        else:
+            self.get_read_session = self.get_session
         _LOGGER.debug("Connected to recorder database")
 
+    def _setup_read_connection(self):
+        """Set up the read-only connections used outside the recorder thread.
+
+        The database is in WAL mode, so readers never block the writer.
+        """
+        self.read_engine = create_engine(
+            self.db_url,
+            poolclass=RecorderReadPool,
+            connect_args={"check_same_thread": False},
+        )
+        stats = self.read_engine.pool.stats
+
+        def setup_read_connection(dbapi_connection, connection_record):
+            """Dbapi specific read-only connection settings."""
+            setup_read_connection_for_sqlite(dbapi_connection)
+
+        def record_read_query(conn, statement, parameters, executemany, duration):
+            """Record the latency of a read query."""
+            stats.record_query(duration)
+
+        sqlalchemy_event.listen(self.read_engine, "connect", setup_read_connection)
+        instrumentation.listen_query_time(self.read_engine, record_read_query)
+        if self.query_instrumentation is not None:
+            self.query_instrumentation.instrument(self.read_engine)
+        self.get_read_session = scoped_session(sessionmaker(bind=self.read_engine))
+
+    def new_read_session(self) -> Session:
+        """Return a read-only session that is not bound to the current thread.
+
+        The sessions of get_read_session are shared by the jobs of a thread,
+        a session that is used from several threads in turn needs its own.
+        """
+        return self.get_read_session.session_factory()
+
+    @property
+    def read_pool_stats(self) -> ReadPoolStats | None:
+        """Return the stats of the read-only connections if there are any."""
+        if (read_engine := self.read_engine) is None:
+            return None
+        return read_engine.pool.stats
+
+    @property
+    def _using_memory_sqlite(self):
+        """Short version to check if we are using an in memory sqlite3 database."""
+        return self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url
+
     @property
     def _using_file_sqlite(self):
         """Short version to check if we are using sqlite3 as a file."""
@@ -952,6 +1216,10 @@ class Recorder(threading.Thread):
         self.engine.dispose()
         self.engine = None
         self.get_session = None
+        if self.read_engine is not None:
+            self.read_engine.dispose()
+            self.read_engine = None
+        self.get_read_session = None
 
     def _setup_run(self):
         """Log the start of the current run."""
@@ -963,6 +1231,8 @@ class Recorder(threading.Thread):
             session.flush()
             session.expunge(self.run_info)
 
+        self._checkpoint_state_ids = {}
+        self._next_checkpoint = start + STATE_CHECKPOINT_INTERVAL
         self._open_event_session()
 
     def _end_session(self):
@@ -984,3 +1254,134 @@ class Recorder(threading.Thread):
         self.hass.add_job(self._async_stop_queue_watcher_and_event_listener)
         self._end_session()
         self._close_connection()
+
+
+class RecorderWriter(Recorder):
+    """Write the events and run the tasks of the recorder in the writer process.
+
+    The writer process has no Home Assistant, it receives the events already
+    serialized and the statistics already compiled. The database schema and
+    the run are set up by the recorder before the writer process starts.
+    """
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self,
+        config: writer.WriterConfig,
+        task_reader: Connection,
+        replies: writer.ReplySender,
+    ) -> None:
+        """Initialize the writer."""
+        self.db_url = config.db_url
+        self.commit_interval = config.commit_interval
+        self.db_max_retries = config.db_max_retries
+        self.db_retry_wait = config.db_retry_wait
+        if config.entity_filter_config is None:
+            self.entity_filter = lambda entity_id: True
+        else:
+            self.entity_filter = convert_include_exclude_filter(
+                config.entity_filter_config
+            )
+        self.exclude_t = config.exclude_t
+        self.recording_start = config.recording_start
+        self.queue: Any = queue.SimpleQueue()
+        self.engine: Any = None
+        self.read_engine: Any = None
+        self.run_info: Any = None
+        # The query stats could not be read from the writer process
+        self.query_instrumentation = None
+        self.enabled = True
+
+        self._run_id = config.run_id
+        self._task_reader = task_reader
+        self._replies = replies
+        self._timechanges_seen = 0
+        self._commits_without_expire = 0
+        self._keepalive_count = 0
+        self._old_states: dict[str, States] = {}
+        self._pending_expunge: list[States] = []
+        self._pending_checkpoint_states: dict[str, States] = {}
+        self._pending_checkpoint_time: datetime | None = None
+        self._checkpoint_state_ids: dict[str, int] = {}
+        self._next_checkpoint = config.recording_start + STATE_CHECKPOINT_INTERVAL
+        self.purge_progress: purge.PurgeProgress | None = None
+        self.event_session = None
+        self.get_session = None
+        self.get_read_session = None
+        self._completed_first_database_setup = None
+
+    def run(self):
+        """Connect to the database and write until the recorder shuts down."""
+        threading.Thread(
+            target=self._receive_tasks, name="Recorder writer tasks", daemon=True
+        ).start()
+
+        if self._setup_recorder() is None:
+            _LOGGER.error("The recorder writer could not connect to the database")
+            return
+
+        with session_scope(session=self.get_session()) as session:
+            self.run_info = session.query(RecorderRuns).get(self._run_id)
+            session.expunge(self.run_info)
+        self._open_event_session()
+        self._run_event_loop()
+
+    def _receive_tasks(self):
+        """Put the batches the recorder sends into the queue."""
+        while True:
+            try:
+                batch = self._task_reader.recv()
+            except (EOFError, OSError):
+                # The recorder is gone
+                self.queue.put(None)
+                return
+            for event in batch:
+                self.queue.put(event)
+
+    def _setup_read_connection(self):
+        """Use the writer connection for the reads of the writer."""
+        self.get_read_session = self.get_session
+
+    def _process_one_event(self, event):
+        """Process one serialized event or task."""
+        if isinstance(event, WaitTask):
+            self._replies.send(event)
+            return
+        if isinstance(event, CommitTask):
+            try:
+                self._commit_event_session_or_retry()
+            finally:
+                self._replies.send(event)
+            return
+        if isinstance(event, writer.TimeChangedTask):
+            self._process_time_changed()
+            return
+        if isinstance(event, writer.SaveStatisticsTask):
+            self._run_save_statistics(event)
+            return
+        if isinstance(event, (PurgeTask, PurgeEntitiesTask, PerodicCleanupTask)):
+            super()._process_one_event(event)
+            return
+
+        event_columns, state_columns = event
+        self._add_event(
+            Events(**event_columns),
+            States(**state_columns) if state_columns else None,
+            event_columns["time_fired"],
+        )
+
+    def _run_purge(self, purge_before, repack, apply_filter):
+        """Purge the database and report the progress to the recorder."""
+        super()._run_purge(purge_before, repack, apply_filter)
+        self._replies.send(self.purge_progress)
+
+    def _run_save_statistics(self, task):
+        """Save the statistics compiled by the recorder."""
+        if statistics.save_statistics(self, task.start, task.platform_stats):
+            return
+        # Schedule a new statistics task if this one didn't finish
+        self.queue.put(task)
+
+    def _shutdown(self):
+        """Save end time for current run."""
+        self._end_session()
+        self._close_connection()
@@ -1,4 +1,5 @@
 """Recorder constants."""
+from datetime import timedelta
 
 DATA_INSTANCE = "recorder_instance"
 SQLITE_URL_PREFIX = "sqlite://"
@@ -13,3 +14,17 @@ CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 # We can increase this back to 1000 once most
 # have upgraded their sqlite version
 MAX_ROWS_TO_PURGE = 998
+
+# Purge deletes the rows of one time bucket at a time, starting from the
+# oldest record, with at most PURGE_SLICE_MAX_ROWS rows per table in a slice
+PURGE_TIME_BUCKET = timedelta(hours=1)
+PURGE_SLICE_MAX_ROWS = 5000
+# How long a purge task deletes slices before it yields to the events that
+# were queued meanwhile
+PURGE_TIME_BUDGET = timedelta(seconds=1)
+
+# How often the recorder snapshots the latest state of every entity
+STATE_CHECKPOINT_INTERVAL = timedelta(hours=1)
+# States may be recorded a little after the time they were last updated, so
+# lookups also scan the states recorded shortly before a checkpoint
+STATE_CHECKPOINT_TAIL = timedelta(minutes=1)
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from collections import defaultdict
 from itertools import groupby
+import json
 import logging
+from operator import itemgetter
 import time
 
 from sqlalchemy import and_, bindparam, func
@@ -11,13 +13,21 @@ from sqlalchemy.ext import baked
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.models import (
+    StateCheckpoints,
     States,
-    process_timestamp_to_utc_isoformat,
+    process_timestamp,
+    timestamp_to_utc_isoformat,
+)
+from homeassistant.components.recorder.util import (
+    execute,
+    execute_stream,
+    session_scope,
 )
-from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.core import split_entity_id
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 
+from .const import STATE_CHECKPOINT_TAIL
 from .models import LazyState
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -48,10 +58,29 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
-    States.last_changed,
-    States.last_updated,
+    States.last_changed_ts,
+    States.last_updated_ts,
 ]
 
+# Rows fetched from the database at once when streaming history as JSON
+HISTORY_CHUNK_SIZE = 4096
+# Distinct state values that keep their JSON representation cached
+JSON_STATE_CACHE_SIZE = 8192
+
+# JSON of a LazyState.as_dict() and of a minimal response entry
+FULL_STATE_JSON = (
+    '{"entity_id":%s,"state":%s,"attributes":%s,'
+    '"last_changed":"%s","last_updated":"%s"}'
+)
+MINIMAL_STATE_JSON = '{"state":%s,"last_changed":"%s"}'
+
+# Positions of the QUERY_STATES columns in a row
+_ENTITY_ID_COLUMN = 1
+_STATE_COLUMN = 2
+_ATTRIBUTES_COLUMN = 3
+_LAST_CHANGED_COLUMN = 4
+_LAST_UPDATED_COLUMN = 5
+
 HISTORY_BAKERY = "recorder_history_bakery"
 
 
@@ -62,7 +91,7 @@ def async_setup(hass):
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return _get_significant_states(hass, session, *args, **kwargs)
 
 
@@ -86,6 +115,88 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def _get_significant_states_json(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """
+    Yield the significant states of a period as JSON fragments per entity.
+
+    The rows are streamed from the database in chunks of HISTORY_CHUNK_SIZE
+    and serialized right away, so only the JSON of the entity that is being
+    read is kept in memory. The session must stay open until the generator
+    is exhausted or closed.
+    """
+    rows = execute_stream(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        ),
+        HISTORY_CHUNK_SIZE,
+    )
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        rows,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query for the significant states of a period."""
     baked_query = hass.data[HISTORY_BAKERY](
         lambda session: session.query(*QUERY_STATES)
     )
@@ -94,12 +205,14 @@ def _get_significant_states(
         baked_query += lambda q: q.filter(
             (
                 States.domain.in_(SIGNIFICANT_DOMAINS)
-                | (States.last_changed == States.last_updated)
+                | (States.last_changed_ts == States.last_updated_ts)
             )
-            & (States.last_updated > bindparam("start_time"))
+            & (States.last_updated_ts > bindparam("start_time"))
         )
     else:
-        baked_query += lambda q: q.filter(States.last_updated > bindparam("start_time"))
+        baked_query += lambda q: q.filter(
+            States.last_updated_ts > bindparam("start_time")
+        )
 
     if entity_ids is not None:
         baked_query += lambda q: q.filter(
@@ -111,58 +224,47 @@ def _get_significant_states(
             filters.bake(baked_query)
 
     if end_time is not None:
-        baked_query += lambda q: q.filter(States.last_updated < bindparam("end_time"))
-
-    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
-
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
+        baked_query += lambda q: q.filter(
+            States.last_updated_ts < bindparam("end_time")
         )
-    )
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
+    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated_ts)
 
-    return _sorted_states_to_dict(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+    return baked_query(session).params(
+        start_time=start_time.timestamp(),
+        end_time=_timestamp_or_none(end_time),
+        entity_ids=entity_ids,
     )
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
 
         baked_query += lambda q: q.filter(
-            (States.last_changed == States.last_updated)
-            & (States.last_updated > bindparam("start_time"))
+            (States.last_changed_ts == States.last_updated_ts)
+            & (States.last_updated_ts > bindparam("start_time"))
         )
 
         if end_time is not None:
             baked_query += lambda q: q.filter(
-                States.last_updated < bindparam("end_time")
+                States.last_updated_ts < bindparam("end_time")
             )
 
         if entity_id is not None:
             baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
             entity_id = entity_id.lower()
 
-        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated_ts)
 
         states = execute(
             baked_query(session).params(
-                start_time=start_time, end_time=end_time, entity_id=entity_id
+                start_time=start_time.timestamp(),
+                end_time=_timestamp_or_none(end_time),
+                entity_id=entity_id,
             )
         )
 
@@ -175,18 +277,20 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     """Return the last number_of_states."""
     start_time = dt_util.utcnow()
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
-        baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
+        baked_query += lambda q: q.filter(
+            States.last_changed_ts == States.last_updated_ts
+        )
 
         if entity_id is not None:
             baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
-            States.entity_id, States.last_updated.desc()
+            States.entity_id, States.last_updated_ts.desc()
         )
 
         baked_query += lambda q: q.limit(bindparam("number_of_states"))
@@ -218,12 +322,17 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None)
         if run is None:
             return []
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return _get_states_with_session(
             hass, session, utc_point_in_time, entity_ids, run, filters
         )
 
 
+def _timestamp_or_none(utc_time):
+    """Return the timestamp of a datetime if there is one."""
+    return None if utc_time is None else utc_time.timestamp()
+
+
 def _get_states_with_session(
     hass, session, utc_point_in_time, entity_ids=None, run=None, filters=None
 ):
@@ -240,20 +349,81 @@ def _get_states_with_session(
         if run is None:
             return []
 
+    run_start = process_timestamp(run.start)
+    checkpoint = _get_state_checkpoint(session, run_start, utc_point_in_time)
+
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
-    # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    # last recorder run started, or since the most recent checkpoint.
+    if checkpoint is None:
+        query = _most_recent_states_query(
+            session, run_start, utc_point_in_time, entity_ids
+        )
+        query = _filter_states_query(query, entity_ids, filters)
+        return [LazyState(row) for row in execute(query)]
+
+    # The checkpoint has the latest state of every entity when it was taken,
+    # only the states recorded since then need to be searched.
+    checkpoint_query = session.query(*QUERY_STATES, States.state_id).filter(
+        States.state_id.in_(
+            session.query(StateCheckpoints.state_id).filter(
+                StateCheckpoints.created == checkpoint
+            )
+        ),
+        States.last_updated_ts >= run_start.timestamp(),
+        States.last_updated_ts < utc_point_in_time.timestamp(),
+    )
+    tail_query = _most_recent_states_query(
+        session,
+        max(run_start, process_timestamp(checkpoint) - STATE_CHECKPOINT_TAIL),
+        utc_point_in_time,
+        entity_ids,
+        States.state_id,
+    )
+
+    most_recent_states = {}
+    for query in (checkpoint_query, tail_query):
+        for row in execute(_filter_states_query(query, entity_ids, filters)):
+            current = most_recent_states.get(row.entity_id)
+            if current is None or (row.last_updated_ts, row.state_id) > (
+                current.last_updated_ts,
+                current.state_id,
+            ):
+                most_recent_states[row.entity_id] = row
+
+    return [LazyState(row) for row in most_recent_states.values()]
+
+
+def _get_state_checkpoint(session, run_start, utc_point_in_time):
+    """Return the time of the latest state checkpoint usable for a lookup."""
+    return (
+        session.query(func.max(StateCheckpoints.created))
+        .filter(
+            (StateCheckpoints.created >= run_start)
+            & (StateCheckpoints.created < utc_point_in_time - STATE_CHECKPOINT_TAIL)
+        )
+        .scalar()
+    )
+
+
+def _most_recent_states_query(
+    session, start_time, utc_point_in_time, entity_ids, *extra_columns
+):
+    """Return a query for the latest state of every entity in a period."""
+    query = session.query(*QUERY_STATES, *extra_columns)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
-        func.max(States.last_updated).label("max_last_updated"),
+        func.max(States.last_updated_ts).label("max_last_updated"),
     ).filter(
-        (States.last_updated >= run.start) & (States.last_updated < utc_point_in_time)
+        (States.last_updated_ts >= start_time.timestamp())
+        & (States.last_updated_ts < utc_point_in_time.timestamp())
     )
 
     if entity_ids:
-        most_recent_states_by_date.filter(States.entity_id.in_(entity_ids))
+        most_recent_states_by_date = most_recent_states_by_date.filter(
+            States.entity_id.in_(entity_ids)
+        )
 
     most_recent_states_by_date = most_recent_states_by_date.group_by(States.entity_id)
 
@@ -265,7 +435,7 @@ def _get_states_with_session(
         most_recent_states_by_date,
         and_(
             States.entity_id == most_recent_states_by_date.c.max_entity_id,
-            States.last_updated == most_recent_states_by_date.c.max_last_updated,
+            States.last_updated_ts == most_recent_states_by_date.c.max_last_updated,
         ),
     )
 
@@ -273,19 +443,20 @@ def _get_states_with_session(
 
     most_recent_state_ids = most_recent_state_ids.subquery()
 
-    query = query.join(
+    return query.join(
         most_recent_state_ids,
         States.state_id == most_recent_state_ids.c.max_state_id,
     )
 
-    if entity_ids is not None:
-        query = query.filter(States.entity_id.in_(entity_ids))
-    else:
-        query = query.filter(~States.domain.in_(IGNORE_DOMAINS))
-        if filters:
-            query = filters.apply(query)
 
-    return [LazyState(row) for row in execute(query)]
+def _filter_states_query(query, entity_ids, filters):
+    """Limit a states query to the requested entities."""
+    if entity_ids is not None:
+        return query.filter(States.entity_id.in_(entity_ids))
+    query = query.filter(~States.domain.in_(IGNORE_DOMAINS))
+    if filters:
+        query = filters.apply(query)
+    return query
 
 
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
@@ -295,14 +466,14 @@ def _get_single_entity_states_with_session(hass, session, utc_point_in_time, ent
         lambda session: session.query(*QUERY_STATES)
     )
     baked_query += lambda q: q.filter(
-        States.last_updated < bindparam("utc_point_in_time"),
+        States.last_updated_ts < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
     )
-    baked_query += lambda q: q.order_by(States.last_updated.desc())
+    baked_query += lambda q: q.order_by(States.last_updated_ts.desc())
     baked_query += lambda q: q.limit(1)
 
     query = baked_query(session).params(
-        utc_point_in_time=utc_point_in_time, entity_id=entity_id
+        utc_point_in_time=utc_point_in_time.timestamp(), entity_id=entity_id
     )
 
     return [LazyState(row) for row in execute(query)]
@@ -352,7 +523,7 @@ def _sorted_states_to_dict(
 
     # Called in a tight loop so cache the function
     # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
+    _timestamp_to_utc_isoformat = timestamp_to_utc_isoformat
 
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
@@ -380,8 +551,8 @@ def _sorted_states_to_dict(
             ent_results.append(
                 {
                     STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
+                    LAST_CHANGED_KEY: _timestamp_to_utc_isoformat(
+                        db_state.last_changed_ts
                     ),
                 }
             )
@@ -397,6 +568,130 @@ def _sorted_states_to_dict(
     return {key: val for key, val in result.items() if val}
 
 
+def _sorted_states_to_json(
+    hass,
+    session,
+    states,
+    start_time,
+    entity_ids,
+    filters=None,
+    include_start_time_state=True,
+    minimal_response=False,
+):
+    """Convert SQL results into JSON fragments.
+
+    This is the columnar version of _sorted_states_to_dict for results that
+    are sent as JSON. The rows are tuples of the QUERY_STATES columns and
+    are consumed as they are iterated, so they can be fetched from the
+    database in chunks. The stored attributes are already JSON and are
+    embedded as is, and no LazyState is created for the rows.
+
+    Yields ('entity_id', [JSON of states]) as soon as the states of an entity
+    are complete. The entities are yielded in the order of the rows, followed
+    by the entities that only have a state at the start time.
+
+    States must be sorted by entity_id and last_updated
+    """
+    # The JSON and the state of the start time datapoints
+    start_states_json = {}
+    start_states = {}
+
+    # Get the states at the start time
+    timer_start = time.perf_counter()
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_states[state.entity_id] = state.state
+            start_states_json[state.entity_id] = json.dumps(
+                state.as_dict(), cls=JSONEncoder
+            )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug(
+            "getting %d first datapoints took %fs", len(start_states), elapsed
+        )
+
+    # Called in a tight loop so cache the functions
+    # here
+    _timestamp_to_utc_isoformat = timestamp_to_utc_isoformat
+    json_dumps = json.dumps
+    # Most entities only have a handful of distinct states
+    state_json_cache = {}
+
+    def _state_json(state):
+        try:
+            return state_json_cache[state]
+        except KeyError:
+            pass
+        if len(state_json_cache) >= JSON_STATE_CACHE_SIZE:
+            state_json_cache.clear()
+        state_json = state_json_cache[state] = json_dumps(state)
+        return state_json
+
+    def _full_state_json(entity_id_json, row):
+        last_changed = _timestamp_to_utc_isoformat(row[_LAST_CHANGED_COLUMN])
+        if row[_LAST_UPDATED_COLUMN] == row[_LAST_CHANGED_COLUMN]:
+            last_updated = last_changed
+        else:
+            last_updated = _timestamp_to_utc_isoformat(row[_LAST_UPDATED_COLUMN])
+        return FULL_STATE_JSON % (
+            entity_id_json,
+            _state_json(row[_STATE_COLUMN] or ""),
+            row[_ATTRIBUTES_COLUMN] or "{}",
+            last_changed,
+            last_updated,
+        )
+
+    # Append all changes to it
+    for ent_id, group in groupby(states, itemgetter(_ENTITY_ID_COLUMN)):
+        domain = split_entity_id(ent_id)[0]
+        entity_id_json = json_dumps(ent_id)
+        ent_results = []
+        if (start_state_json := start_states_json.pop(ent_id, None)) is not None:
+            ent_results.append(start_state_json)
+        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+            ent_results.extend(_full_state_json(entity_id_json, row) for row in group)
+            yield ent_id, ent_results
+            continue
+
+        # With minimal response only the first and last entries
+        # are full states, see _sorted_states_to_dict
+        if ent_results:
+            prev_state = start_states[ent_id]
+        else:
+            first_row = next(group)
+            ent_results.append(_full_state_json(entity_id_json, first_row))
+            prev_state = first_row[_STATE_COLUMN] or ""
+
+        last_row = None
+        for row in group:
+            state = row[_STATE_COLUMN]
+            if state == prev_state:
+                continue
+            ent_results.append(
+                MINIMAL_STATE_JSON
+                % (
+                    _state_json(state),
+                    _timestamp_to_utc_isoformat(row[_LAST_CHANGED_COLUMN]),
+                )
+            )
+            prev_state = state
+            last_row = row
+
+        if last_row is not None:
+            ent_results[-1] = _full_state_json(entity_id_json, last_row)
+        yield ent_id, ent_results
+
+    # The entities without changes during the period
+    for ent_id, start_state_json in start_states_json.items():
+        yield ent_id, [start_state_json]
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = get_states(hass, utc_point_in_time, (entity_id,), run)
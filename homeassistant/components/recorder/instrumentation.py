@@ -0,0 +1,245 @@
+"""Latency, row and plan instrumentation of the recorder database reads."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Sequence
+import logging
+import sys
+import threading
+import time
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.engine import Engine
+
+import homeassistant.util.dt as dt_util
+from homeassistant.util.histogram import DurationHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+# Queries slower than this many seconds get their plan captured
+SLOW_QUERY_TIME = 0.5
+# Slow queries kept with their plan
+SLOW_QUERY_HISTORY = 20
+# Distinct statements that keep their plan, so it is only captured once
+PLAN_CACHE_SIZE = 100
+# Rows looked at to estimate the bytes returned by a query
+SIZE_SAMPLE_ROWS = 100
+
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "mysql": "EXPLAIN ",
+    "postgresql": "EXPLAIN ",
+}
+
+# Frames of these modules are not the call site of a query
+_INTERNAL_MODULES = (
+    "sqlalchemy",
+    "contextlib",
+    "homeassistant.components.recorder.util",
+    __name__,
+)
+# Frames of comprehensions run on behalf of the function that contains them
+_COMPREHENSIONS = ("<genexpr>", "<listcomp>", "<dictcomp>", "<setcomp>")
+_QUERY_START_TIME = "instrumentation_start_time"
+
+# Called with the connection, statement, parameters, executemany and latency
+QueryTimeListener = Callable[[Any, str, Any, bool, float], None]
+
+_ENGINE_INSTRUMENTATION: WeakKeyDictionary[
+    Engine, QueryInstrumentation
+] = WeakKeyDictionary()
+_ENGINE_QUERY_TIME_LISTENERS: WeakKeyDictionary[
+    Engine, list[QueryTimeListener]
+] = WeakKeyDictionary()
+
+
+def listen_query_time(engine: Engine, listener: QueryTimeListener) -> None:
+    """Call a listener with the latency of every statement of an engine.
+
+    The statements of an engine are timed once, however many listeners it has.
+    """
+    if (listeners := _ENGINE_QUERY_TIME_LISTENERS.get(engine)) is not None:
+        listeners.append(listener)
+        return
+    listeners = _ENGINE_QUERY_TIME_LISTENERS[engine] = [listener]
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        """Remember when a statement started."""
+        conn.info.setdefault(_QUERY_START_TIME, []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """Pass the latency of a statement to the listeners."""
+        duration = time.perf_counter() - conn.info[_QUERY_START_TIME].pop()
+        for listener in listeners:
+            listener(conn, statement, parameters, executemany, duration)
+
+    sqlalchemy_event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    sqlalchemy_event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+def query_call_site() -> str:
+    """Return the function that runs a query outside SQLAlchemy and the helpers."""
+    frame = sys._getframe(1)  # pylint: disable=protected-access
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if (
+            not module.startswith(_INTERNAL_MODULES)
+            and frame.f_code.co_name not in _COMPREHENSIONS
+        ):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back  # type: ignore[assignment]
+    return "unknown"
+
+
+def _estimate_size(rows: list) -> int:
+    """Estimate the bytes of the values of rows from a sample of them."""
+    sample = rows[:SIZE_SAMPLE_ROWS]
+    size = 0
+    for row in sample:
+        if not isinstance(row, Sequence):
+            continue
+        for value in row:
+            size += len(value) if isinstance(value, (str, bytes)) else 8
+    return size * len(rows) // len(sample) if sample else 0
+
+
+def record_query_rows(qry: Any, rows: list) -> None:
+    """Record the rows a query of an instrumented engine returned."""
+    try:
+        engine = qry.session.bind
+    except AttributeError:
+        return
+    if (instrumentation := _ENGINE_INSTRUMENTATION.get(engine)) is not None:
+        instrumentation.record_rows(query_call_site(), len(rows), _estimate_size(rows))
+
+
+class QueryStats(DurationHistogram):
+    """Latency histogram, rows and bytes of the queries of a call site."""
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        super().__init__()
+        self.rows = 0
+        self.bytes = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the stats."""
+        return {**super().as_dict(), "rows": self.rows, "bytes": self.bytes}
+
+
+class QueryInstrumentation:
+    """Query stats per call site and the plans of the slow queries.
+
+    Only SELECT statements are recorded. The latency is the time the
+    database took to execute a statement, the rows and bytes are recorded
+    for the queries that are fetched with execute(). Finding the call site
+    walks the stack of every SELECT, so the recorder only instruments its
+    engines when query_instrumentation is enabled.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the instrumentation."""
+        self._lock = threading.Lock()
+        self.call_sites: dict[str, QueryStats] = {}
+        self.slow_queries: deque[dict[str, Any]] = deque(maxlen=SLOW_QUERY_HISTORY)
+        self._plans: dict[str, list[str] | None] = {}
+
+    def instrument(self, engine: Engine) -> None:
+        """Record the queries of an engine."""
+        dialect_name = engine.dialect.name
+
+        def record_statement(conn, statement, parameters, executemany, duration):
+            """Record the latency of a query and the plan of a slow query."""
+            if statement.lstrip()[:6].upper() != "SELECT":
+                return
+            call_site = query_call_site()
+            self.record_query(call_site, duration)
+            if duration >= SLOW_QUERY_TIME and not executemany:
+                self._record_slow_query(
+                    conn, dialect_name, call_site, statement, parameters, duration
+                )
+
+        listen_query_time(engine, record_statement)
+        _ENGINE_INSTRUMENTATION[engine] = self
+
+    def _stats(self, call_site: str) -> QueryStats:
+        """Return the stats of a call site, the lock must be held."""
+        stats = self.call_sites.get(call_site)
+        if stats is None:
+            stats = self.call_sites[call_site] = QueryStats()
+        return stats
+
+    def record_query(self, call_site: str, duration: float) -> None:
+        """Record the latency of a query."""
+        with self._lock:
+            self._stats(call_site).record(duration)
+
+    def record_rows(self, call_site: str, rows: int, size: int) -> None:
+        """Record the rows and bytes a query returned."""
+        with self._lock:
+            stats = self._stats(call_site)
+            stats.rows += rows
+            stats.bytes += size
+
+    def _record_slow_query(
+        self, conn, dialect_name, call_site, statement, parameters, duration
+    ) -> None:
+        """Record a slow query and capture its plan once."""
+        with self._lock:
+            cached = statement in self._plans
+            plan = self._plans.get(statement)
+
+        if not cached:
+            plan = _explain(conn, dialect_name, statement, parameters)
+            with self._lock:
+                if len(self._plans) >= PLAN_CACHE_SIZE:
+                    del self._plans[next(iter(self._plans))]
+                self._plans[statement] = plan
+
+        _LOGGER.debug("Slow query from %s took %fs: %s", call_site, duration, plan)
+        with self._lock:
+            self.slow_queries.append(
+                {
+                    "call_site": call_site,
+                    "time": dt_util.utcnow().isoformat(),
+                    "duration": duration,
+                    "statement": statement,
+                    "plan": plan,
+                }
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats of the call sites and the slow queries."""
+        with self._lock:
+            return {
+                "slow_query_time": SLOW_QUERY_TIME,
+                "call_sites": {
+                    call_site: stats.as_dict()
+                    for call_site, stats in sorted(
+                        self.call_sites.items(),
+                        key=lambda item: item[1].total,
+                        reverse=True,
+                    )
+                },
+                "slow_queries": list(self.slow_queries),
+            }
+
+
+def _explain(conn, dialect_name, statement, parameters) -> list[str] | None:
+    """Return the plan of a statement, one line per row of EXPLAIN."""
+    if (prefix := EXPLAIN_PREFIXES.get(dialect_name)) is None:
+        return None
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return [" ".join(str(column) for column in row) for row in cursor]
+        finally:
+            cursor.close()
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Unable to explain %s: %s", statement, err)
+        return None
@@ -1,4 +1,5 @@
 """Schema migration helpers."""
+import json
 import logging
 
 import sqlalchemy
@@ -11,18 +12,28 @@ from sqlalchemy.exc import (
 )
 from sqlalchemy.schema import AddConstraint, DropConstraint
 
+from homeassistant.const import EVENT_STATE_CHANGED, MAX_LENGTH_STATE_ENTITY_ID
+from homeassistant.util.ulid import ulid_hex_to_bytes
+
 from .models import (
+    CONTEXT_ID_BIN_MAX_LENGTH,
+    CONTINUOUS_DOMAINS,
     SCHEMA_VERSION,
     TABLE_STATES,
     Base,
     SchemaChanges,
+    StateCheckpoints,
     Statistics,
     StatisticsMeta,
+    entity_id_from_event_data,
 )
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rows updated per transaction when backfilling a new column
+BACKFILL_BATCH_SIZE = 10000
+
 
 def raise_if_exception_missing_str(ex, match_substrs):
     """Raise an exception if the exception and cause do not contain the match substrs."""
@@ -347,7 +358,7 @@ def _drop_foreign_key_constraints(connection, engine, table, columns):
             )
 
 
-def _apply_update(engine, session, new_version, old_version):
+def _apply_update(engine, session, new_version, old_version):  # noqa: C901
     """Perform operations to bring schema up to date."""
     connection = session.connection()
     if new_version == 1:
@@ -475,10 +486,252 @@ def _apply_update(engine, session, new_version, old_version):
 
         StatisticsMeta.__table__.create(engine)
         Statistics.__table__.create(engine)
+    elif new_version == 19:
+        if not sqlalchemy.inspect(engine).has_table(StateCheckpoints.__tablename__):
+            StateCheckpoints.__table__.create(engine)
+    elif new_version == 20:
+        _add_columns(
+            connection, "events", [f"entity_id VARCHAR({MAX_LENGTH_STATE_ENTITY_ID})"]
+        )
+        _add_columns(connection, "states", ["continuous BOOLEAN"])
+        _backfill_event_entity_ids(session)
+        _backfill_continuous_states(session)
+        # The index of the entity_id column is created with time_fired_ts in 21
+    elif new_version == 21:
+        _add_columns(connection, "events", ["time_fired_ts DOUBLE PRECISION"])
+        _add_columns(
+            connection,
+            "states",
+            ["last_changed_ts DOUBLE PRECISION", "last_updated_ts DOUBLE PRECISION"],
+        )
+        _backfill_timestamps(
+            session,
+            engine.dialect.name,
+            "events",
+            "event_id",
+            {"time_fired_ts": "time_fired"},
+        )
+        _backfill_timestamps(
+            session,
+            engine.dialect.name,
+            TABLE_STATES,
+            "state_id",
+            {"last_changed_ts": "last_changed", "last_updated_ts": "last_updated"},
+        )
+        connection = session.connection()
+        _create_index(connection, "events", "ix_events_time_fired_ts")
+        _create_index(connection, "events", "ix_events_event_type_time_fired_ts")
+        _create_index(connection, "events", "ix_events_entity_id_time_fired_ts")
+        _create_index(connection, TABLE_STATES, "ix_states_last_updated_ts")
+        _create_index(connection, TABLE_STATES, "ix_states_entity_id_last_updated_ts")
+        # The datetime columns are no longer queried, only the timestamps are
+        _drop_index(connection, "events", "ix_events_time_fired")
+        _drop_index(connection, "events", "ix_events_event_type_time_fired")
+        _drop_index(connection, "events", "ix_events_entity_id_time_fired")
+        _drop_index(connection, TABLE_STATES, "ix_states_last_updated")
+        _drop_index(connection, TABLE_STATES, "ix_states_entity_id_last_updated")
+    elif new_version == 22:
+        binary_type = _binary_column_type(engine.dialect.name)
+        _add_columns(
+            connection,
+            "events",
+            [
+                f"context_id_bin {binary_type}",
+                f"context_user_id_bin {binary_type}",
+                f"context_parent_id_bin {binary_type}",
+            ],
+        )
+        # Dropping the string indexes first avoids updating them in the backfill
+        _drop_index(connection, "events", "ix_events_context_id")
+        _drop_index(connection, "events", "ix_events_context_user_id")
+        _drop_index(connection, "events", "ix_events_context_parent_id")
+        _backfill_context_ids(session)
+        connection = session.connection()
+        _create_index(connection, "events", "ix_events_context_id_bin")
+        _create_index(connection, "events", "ix_events_context_user_id_bin")
+        _create_index(connection, "events", "ix_events_context_parent_id_bin")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
 
+def _backfill_event_entity_ids(session):
+    """Set the entity_id of the events that refer to an entity."""
+    _LOGGER.warning(
+        "Linking events to their entities. Note: this can take several "
+        "minutes on large databases and slow computers. Please "
+        "be patient!"
+    )
+    last_event_id = 0
+    while True:
+        rows = session.execute(
+            text(
+                "SELECT event_id, event_type, event_data FROM events "
+                "WHERE event_id > :last_event_id AND event_type != :state_changed "
+                "AND event_data LIKE :entity_id_json "
+                "ORDER BY event_id LIMIT :limit"
+            ),
+            {
+                "last_event_id": last_event_id,
+                "state_changed": EVENT_STATE_CHANGED,
+                "entity_id_json": '%"entity_id": "%',
+                "limit": BACKFILL_BATCH_SIZE,
+            },
+        ).fetchall()
+        if not rows:
+            return
+        last_event_id = rows[-1].event_id
+
+        entity_ids = []
+        for row in rows:
+            try:
+                event_data = json.loads(row.event_data)
+            except ValueError:
+                continue
+            if not isinstance(event_data, dict):
+                continue
+            entity_id = entity_id_from_event_data(row.event_type, event_data)
+            if entity_id is not None:
+                entity_ids.append({"event_id": row.event_id, "entity_id": entity_id})
+
+        if entity_ids:
+            session.execute(
+                text(
+                    "UPDATE events SET entity_id = :entity_id "
+                    "WHERE event_id = :event_id"
+                ),
+                entity_ids,
+            )
+        session.commit()
+
+
+def _binary_column_type(dialect_name):
+    """Return the type of a column of context id bytes."""
+    if dialect_name == "postgresql":
+        return "BYTEA"
+    if dialect_name == "mssql":
+        return f"VARBINARY({CONTEXT_ID_BIN_MAX_LENGTH})"
+    return "BLOB"
+
+
+def _backfill_context_ids(session):
+    """Move the ULID and UUID hex context ids to the binary columns."""
+    _LOGGER.warning(
+        "Compacting the context ids of events. Note: this can take several "
+        "minutes on large databases and slow computers. Please "
+        "be patient!"
+    )
+    last_event_id = 0
+    while True:
+        rows = session.execute(
+            text(
+                "SELECT event_id, context_id, context_user_id, context_parent_id "
+                "FROM events WHERE event_id > :last_event_id "
+                "ORDER BY event_id LIMIT :limit"
+            ),
+            {"last_event_id": last_event_id, "limit": BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            return
+        last_event_id = rows[-1].event_id
+
+        context_ids = []
+        for row in rows:
+            values = {"event_id": row.event_id}
+            for column in ("context_id", "context_user_id", "context_parent_id"):
+                value = getattr(row, column)
+                values[f"{column}_bin"] = binary = ulid_hex_to_bytes(value)
+                values[column] = value if binary is None else None
+            context_ids.append(values)
+
+        session.execute(
+            text(
+                "UPDATE events SET context_id = :context_id, "
+                "context_user_id = :context_user_id, "
+                "context_parent_id = :context_parent_id, "
+                "context_id_bin = :context_id_bin, "
+                "context_user_id_bin = :context_user_id_bin, "
+                "context_parent_id_bin = :context_parent_id_bin "
+                "WHERE event_id = :event_id"
+            ),
+            context_ids,
+        )
+        session.commit()
+
+
+def _backfill_continuous_states(session):
+    """Flag the states of continuous entities."""
+    _LOGGER.warning(
+        "Flagging the states of continuous entities. Note: this can take several "
+        "minutes on large databases and slow computers. Please "
+        "be patient!"
+    )
+    # The domains are constants, not user input
+    domains = ", ".join(f"'{domain}'" for domain in CONTINUOUS_DOMAINS)
+    max_state_id = session.execute(text("SELECT MAX(state_id) FROM states")).scalar()
+    for start in range(0, max_state_id or 0, BACKFILL_BATCH_SIZE):
+        session.execute(
+            text(
+                "UPDATE states SET continuous = "
+                f"(COALESCE(domain, '') IN ({domains}) "  # nosec # not injection
+                "AND COALESCE(attributes, '') LIKE :unit_of_measurement_json) "
+                "WHERE state_id > :start AND state_id <= :end"
+            ),
+            {
+                "unit_of_measurement_json": '%"unit_of_measurement":%',
+                "start": start,
+                "end": start + BACKFILL_BATCH_SIZE,
+            },
+        )
+        session.commit()
+
+
+def _timestamp_expression(dialect_name, column):
+    """Return the SQL that converts a UTC datetime column to an epoch timestamp."""
+    if dialect_name == "sqlite":
+        # Datetimes are stored as YYYY-MM-DD HH:MM:SS.ffffff text
+        return (
+            f"(CAST(strftime('%s', substr({column}, 1, 19)) AS REAL) "
+            f"+ CAST(substr({column}, 20) AS REAL))"
+        )
+    if dialect_name == "mysql":
+        # UNIX_TIMESTAMP would convert from the session time zone
+        return (
+            f"(TIMESTAMPDIFF(MICROSECOND, '1970-01-01 00:00:00', {column}) "
+            "/ 1000000.0)"
+        )
+    return f"EXTRACT(EPOCH FROM {column})"
+
+
+def _backfill_timestamps(session, dialect_name, table, id_column, columns):
+    """Convert the datetime columns of a table to epoch timestamp columns.
+
+    WARNING: The table and column names are interpolated in the query
+    string. DO NOT USE THIS FUNCTION IN ANY OPERATION THAT TAKES USER INPUT.
+    """
+    _LOGGER.warning(
+        "Converting the timestamps of table %s. Note: this can take several "
+        "minutes on large databases and slow computers. Please "
+        "be patient!",
+        table,
+    )
+    assignments = ", ".join(
+        f"{ts_column} = {_timestamp_expression(dialect_name, column)}"
+        for ts_column, column in columns.items()
+    )
+    max_id = session.execute(
+        text(f"SELECT MAX({id_column}) FROM {table}")  # nosec # not injection
+    ).scalar()
+    for start in range(0, max_id or 0, BACKFILL_BATCH_SIZE):
+        session.execute(
+            text(
+                f"UPDATE {table} SET {assignments} "  # nosec # not injection
+                f"WHERE {id_column} > :start AND {id_column} <= :end"
+            ),
+            {"start": start, "end": start + BACKFILL_BATCH_SIZE},
+        )
+        session.commit()
+
+
 def _inspect_schema_version(engine, session):
     """Determine the schema version by inspecting the db structure.
 
@@ -492,7 +745,7 @@ def _inspect_schema_version(engine, session):
     indexes = inspector.get_indexes("events")
 
     for index in indexes:
-        if index["column_names"] == ["time_fired"]:
+        if index["column_names"] in (["time_fired"], ["time_fired_ts"]):
             # Schema addition from version 1 detected. New DB.
             session.add(SchemaChanges(schema_version=SCHEMA_VERSION))
             return SCHEMA_VERSION
@@ -4,7 +4,7 @@ from __future__ import annotations
 from datetime import datetime
 import json
 import logging
-from typing import TypedDict
+from typing import TypedDict, overload
 
 from sqlalchemy import (
     Boolean,
@@ -15,6 +15,7 @@ from sqlalchemy import (
     Identity,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     distinct,
@@ -25,6 +26,10 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_CALL_SERVICE,
+    EVENT_STATE_CHANGED,
     MAX_LENGTH_EVENT_CONTEXT_ID,
     MAX_LENGTH_EVENT_EVENT_TYPE,
     MAX_LENGTH_EVENT_ORIGIN,
@@ -35,12 +40,13 @@ from homeassistant.const import (
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
+from homeassistant.util.ulid import bytes_to_ulid_hex, ulid_hex_to_bytes
 
 # SQLAlchemy Schema
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 18
+SCHEMA_VERSION = 22
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,6 +58,7 @@ TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
+TABLE_STATE_CHECKPOINTS = "state_checkpoints"
 
 ALL_TABLES = [
     TABLE_STATES,
@@ -60,11 +67,36 @@ ALL_TABLES = [
     TABLE_SCHEMA_CHANGES,
     TABLE_STATISTICS,
     TABLE_STATISTICS_META,
+    TABLE_STATE_CHECKPOINTS,
 ]
 
 DATETIME_TYPE = DateTime(timezone=True).with_variant(
     mysql.DATETIME(timezone=True, fsp=6), "mysql"
 )
+# Seconds since the epoch in UTC, MySQL's FLOAT would lose the microseconds
+TIMESTAMP_TYPE = Float().with_variant(mysql.DOUBLE(asdecimal=False), "mysql")
+# Context ids that are ULID or UUID hex are stored as their 16 bytes
+CONTEXT_ID_BIN_MAX_LENGTH = 16
+
+# Domains whose states with a unit of measurement are continuous values
+CONTINUOUS_DOMAINS = ["proximity", "sensor"]
+
+
+def entity_id_from_event_data(event_type: str, event_data: dict) -> str | None:
+    """Return the entity_id an event refers to.
+
+    The entity of a state_changed event is stored in the states table.
+    """
+    if event_type == EVENT_STATE_CHANGED:
+        return None
+    entity_id = event_data.get(ATTR_ENTITY_ID)
+    if entity_id is None and event_type == EVENT_CALL_SERVICE:
+        service_data = event_data.get("service_data")
+        if isinstance(service_data, dict):
+            entity_id = service_data.get(ATTR_ENTITY_ID)
+    if isinstance(entity_id, str) and len(entity_id) <= MAX_LENGTH_STATE_ENTITY_ID:
+        return entity_id
+    return None
 
 
 class Events(Base):  # type: ignore
@@ -73,7 +105,26 @@ class Events(Base):  # type: ignore
     __table_args__ = (
         # Used for fetching events at a specific time
         # see logbook
-        Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        Index("ix_events_event_type_time_fired_ts", "event_type", "time_fired_ts"),
+        # Used for fetching the events of specific entities
+        # see logbook
+        Index("ix_events_entity_id_time_fired_ts", "entity_id", "time_fired_ts"),
+        # Used for looking up the events of a context
+        Index(
+            "ix_events_context_id_bin",
+            "context_id_bin",
+            mysql_length=CONTEXT_ID_BIN_MAX_LENGTH,
+        ),
+        Index(
+            "ix_events_context_user_id_bin",
+            "context_user_id_bin",
+            mysql_length=CONTEXT_ID_BIN_MAX_LENGTH,
+        ),
+        Index(
+            "ix_events_context_parent_id_bin",
+            "context_parent_id_bin",
+            mysql_length=CONTEXT_ID_BIN_MAX_LENGTH,
+        ),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_EVENTS
@@ -81,11 +132,17 @@ class Events(Base):  # type: ignore
     event_type = Column(String(MAX_LENGTH_EVENT_EVENT_TYPE))
     event_data = Column(Text().with_variant(mysql.LONGTEXT, "mysql"))
     origin = Column(String(MAX_LENGTH_EVENT_ORIGIN))
-    time_fired = Column(DATETIME_TYPE, index=True)
+    time_fired = Column(DATETIME_TYPE)
+    time_fired_ts = Column(TIMESTAMP_TYPE, index=True)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
-    context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
-    context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
-    context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
+    # Only set for context ids that can't be stored in the binary columns
+    context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
+    context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
+    context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
+    context_id_bin = Column(LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH))
+    context_user_id_bin = Column(LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH))
+    context_parent_id_bin = Column(LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH))
+    entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID))
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -99,22 +156,38 @@ class Events(Base):  # type: ignore
     @staticmethod
     def from_event(event, event_data=None):
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=event_data or json.dumps(event.data, cls=JSONEncoder),
-            origin=str(event.origin.value),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.columns_from_event(event, event_data))
+
+    @staticmethod
+    def columns_from_event(event, event_data=None):
+        """Return the column values of a native event."""
+        context = event.context
+        columns = {
+            "event_type": event.event_type,
+            "event_data": event_data or json.dumps(event.data, cls=JSONEncoder),
+            "origin": str(event.origin.value),
+            "time_fired": event.time_fired,
+            "time_fired_ts": event.time_fired.timestamp(),
+            "context_id_bin": ulid_hex_to_bytes(context.id),
+            "context_user_id_bin": ulid_hex_to_bytes(context.user_id),
+            "context_parent_id_bin": ulid_hex_to_bytes(context.parent_id),
+            "entity_id": entity_id_from_event_data(event.event_type, event.data),
+        }
+        if columns["context_id_bin"] is None:
+            columns["context_id"] = context.id
+        if columns["context_user_id_bin"] is None:
+            columns["context_user_id"] = context.user_id
+        if columns["context_parent_id_bin"] is None:
+            columns["context_parent_id"] = context.parent_id
+        return columns
 
     def to_native(self, validate_entity_id=True):
         """Convert to a natve HA Event."""
         context = Context(
-            id=self.context_id,
-            user_id=self.context_user_id,
-            parent_id=self.context_parent_id,
+            id=bytes_to_ulid_hex(self.context_id_bin) or self.context_id,
+            user_id=bytes_to_ulid_hex(self.context_user_id_bin) or self.context_user_id,
+            parent_id=bytes_to_ulid_hex(self.context_parent_id_bin)
+            or self.context_parent_id,
         )
         try:
             return Event(
@@ -136,7 +209,7 @@ class States(Base):  # type: ignore
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
         # (get_states in history.py)
-        Index("ix_states_entity_id_last_updated", "entity_id", "last_updated"),
+        Index("ix_states_entity_id_last_updated_ts", "entity_id", "last_updated_ts"),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_STATES
@@ -149,9 +222,12 @@ class States(Base):  # type: ignore
         Integer, ForeignKey("events.event_id", ondelete="CASCADE"), index=True
     )
     last_changed = Column(DATETIME_TYPE, default=dt_util.utcnow)
-    last_updated = Column(DATETIME_TYPE, default=dt_util.utcnow, index=True)
+    last_updated = Column(DATETIME_TYPE, default=dt_util.utcnow)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
+    last_changed_ts = Column(TIMESTAMP_TYPE)
+    last_updated_ts = Column(TIMESTAMP_TYPE, index=True)
     old_state_id = Column(Integer, ForeignKey("states.state_id"), index=True)
+    continuous = Column(Boolean)
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
 
@@ -169,26 +245,43 @@ class States(Base):  # type: ignore
     @staticmethod
     def from_event(event):
         """Create object from a state_changed event."""
+        return States(**States.columns_from_event(event))
+
+    @staticmethod
+    def columns_from_event(event):
+        """Return the column values of a state_changed event."""
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
-        else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
+            time_fired_ts = event.time_fired.timestamp()
+            return {
+                "entity_id": entity_id,
+                "state": "",
+                "domain": split_entity_id(entity_id)[0],
+                "attributes": "{}",
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+                "last_changed_ts": time_fired_ts,
+                "last_updated_ts": time_fired_ts,
+                "continuous": False,
+            }
 
-        return dbstate
+        return {
+            "entity_id": entity_id,
+            "domain": state.domain,
+            "state": state.state,
+            "attributes": json.dumps(dict(state.attributes), cls=JSONEncoder),
+            "continuous": (
+                state.domain in CONTINUOUS_DOMAINS
+                and ATTR_UNIT_OF_MEASUREMENT in state.attributes
+            ),
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
+            "last_changed_ts": state.last_changed.timestamp(),
+            "last_updated_ts": state.last_updated.timestamp(),
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
@@ -210,6 +303,30 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateCheckpoints(Base):  # type: ignore
+    """Snapshot of the latest state of every entity at a point in time."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_STATE_CHECKPOINTS
+    checkpoint_id = Column(Integer, Identity(), primary_key=True)
+    entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID))
+    # Not a foreign key, purging states must not be slowed down by checkpoints
+    state_id = Column(Integer)
+    created = Column(DATETIME_TYPE, index=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StateCheckpoints("
+            f"id={self.checkpoint_id}, entity_id='{self.entity_id}', "
+            f"state_id={self.state_id}, "
+            f"created='{self.created.isoformat(sep=' ', timespec='seconds')}'"
+            f")>"
+        )
+
+
 class StatisticData(TypedDict, total=False):
     """Statistic data class."""
 
@@ -326,13 +443,13 @@ class RecorderRuns(Base):  # type: ignore
         assert session is not None, "RecorderRuns need to be persisted"
 
         query = session.query(distinct(States.entity_id)).filter(
-            States.last_updated >= self.start
+            States.last_updated_ts >= self.start.timestamp()
         )
 
         if point_in_time is not None:
-            query = query.filter(States.last_updated < point_in_time)
+            query = query.filter(States.last_updated_ts < point_in_time.timestamp())
         elif self.end is not None:
-            query = query.filter(States.last_updated < self.end)
+            query = query.filter(States.last_updated_ts < self.end.timestamp())
 
         return [row[0] for row in query]
 
@@ -359,7 +476,17 @@ class SchemaChanges(Base):  # type: ignore
         )
 
 
-def process_timestamp(ts):
+@overload
+def process_timestamp(ts: None) -> None:
+    ...
+
+
+@overload
+def process_timestamp(ts: datetime) -> datetime:
+    ...
+
+
+def process_timestamp(ts: datetime | None) -> datetime | None:
     """Process a timestamp into datetime object."""
     if ts is None:
         return None
@@ -369,6 +496,11 @@ def process_timestamp(ts):
     return dt_util.as_utc(ts)
 
 
+def timestamp_to_utc_isoformat(ts: float) -> str:
+    """Format a timestamp in seconds since the epoch as UTC isotime."""
+    return datetime.fromtimestamp(ts, tz=dt_util.UTC).isoformat()
+
+
 def process_timestamp_to_utc_isoformat(ts: datetime | None) -> str | None:
     """Process a timestamp into UTC isotime."""
     if ts is None:
@@ -436,7 +568,7 @@ class LazyState(State):
     def last_changed(self):
         """Last changed datetime."""
         if not self._last_changed:
-            self._last_changed = process_timestamp(self._row.last_changed)
+            self._last_changed = dt_util.utc_from_timestamp(self._row.last_changed_ts)
         return self._last_changed
 
     @last_changed.setter
@@ -448,7 +580,7 @@ class LazyState(State):
     def last_updated(self):
         """Last updated datetime."""
         if not self._last_updated:
-            self._last_updated = process_timestamp(self._row.last_updated)
+            self._last_updated = dt_util.utc_from_timestamp(self._row.last_updated_ts)
         return self._last_updated
 
     @last_updated.setter
@@ -466,14 +598,20 @@ class LazyState(State):
         if self._last_changed:
             last_changed_isoformat = self._last_changed.isoformat()
         else:
-            last_changed_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_changed
+            last_changed_isoformat = timestamp_to_utc_isoformat(
+                self._row.last_changed_ts
             )
         if self._last_updated:
             last_updated_isoformat = self._last_updated.isoformat()
+        elif (
+            not self._last_changed
+            and self._row.last_updated_ts == self._row.last_changed_ts
+        ):
+            # Most states are updated when they change
+            last_updated_isoformat = last_changed_isoformat
         else:
-            last_updated_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_updated
+            last_updated_isoformat = timestamp_to_utc_isoformat(
+                self._row.last_updated_ts
             )
         return {
             "entity_id": self.entity_id,
@@ -1,7 +1,13 @@
 """A pool for sqlite connections."""
 import threading
+import time
 
-from sqlalchemy.pool import NullPool, StaticPool
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
+
+# Read-only connections kept open for queries made outside the recorder thread
+READ_POOL_SIZE = 4
+# Seconds a query waits for a free read-only connection before failing
+READ_POOL_TIMEOUT = 30
 
 
 class RecorderPool(StaticPool, NullPool):
@@ -32,3 +38,72 @@ class RecorderPool(StaticPool, NullPool):
         return super(  # pylint: disable=bad-super-call
             NullPool, self
         )._create_connection()
+
+
+class ReadPoolStats:
+    """Time spent waiting for read-only connections and running read queries."""
+
+    def __init__(self):
+        """Initialize the stats."""
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.max_query_time = 0.0
+
+    def record_wait(self, duration):
+        """Record the wait for a connection."""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time += duration
+            self.max_wait_time = max(self.max_wait_time, duration)
+
+    def record_query(self, duration):
+        """Record the execution of a query."""
+        with self._lock:
+            self.queries += 1
+            self.query_time += duration
+            self.max_query_time = max(self.max_query_time, duration)
+
+    def as_dict(self):
+        """Return a dictionary representation of the stats."""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_time": self.wait_time,
+                "max_wait_time": self.max_wait_time,
+                "queries": self.queries,
+                "query_time": self.query_time,
+                "max_query_time": self.max_query_time,
+            }
+
+
+class RecorderReadPool(QueuePool):
+    """A bounded pool of read-only connections that records checkout waits.
+
+    The connections are shared by every thread other than the recorder, so
+    they must be created with check_same_thread disabled.
+    """
+
+    def __init__(self, *args, **kw):
+        """Create the pool."""
+        kw.setdefault("pool_size", READ_POOL_SIZE)
+        kw.setdefault("max_overflow", 0)
+        kw.setdefault("timeout", READ_POOL_TIMEOUT)
+        super().__init__(*args, **kw)
+        self.stats = ReadPoolStats()
+
+    def recreate(self):
+        """Return a new pool that keeps recording into the same stats."""
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.record_wait(time.perf_counter() - start)
@@ -3,13 +3,22 @@ from __future__ import annotations
 
 from datetime import datetime
 import logging
-from typing import TYPE_CHECKING, Callable
+import time
+from typing import TYPE_CHECKING, Any, Callable
 
+from sqlalchemy import func
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
-from .const import MAX_ROWS_TO_PURGE
-from .models import Events, RecorderRuns, States
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    MAX_ROWS_TO_PURGE,
+    PURGE_SLICE_MAX_ROWS,
+    PURGE_TIME_BUCKET,
+    PURGE_TIME_BUDGET,
+)
+from .models import Events, RecorderRuns, StateCheckpoints, States
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
 
@@ -19,66 +28,256 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
+class PurgeProgress:
+    """Progress of purging the states and events before a point in time.
+
+    The remaining rows are estimated from the primary keys, so they include
+    the ids that were never used or were already deleted.
+    """
+
+    def __init__(self, purge_before: datetime) -> None:
+        """Initialize the progress."""
+        self.purge_before = purge_before
+        self.started = dt_util.utcnow()
+        self.finished: datetime | None = None
+        self.slices = 0
+        self.states_purged = 0
+        self.events_purged = 0
+        # The first id that may still need to be purged and the id of the
+        # newest row recorded before purge_before
+        self.next_state_id: int | None = None
+        self.last_state_id: int | None = None
+        self.next_event_id: int | None = None
+        self.last_event_id: int | None = None
+
+    @property
+    def remaining_states(self) -> int | None:
+        """Return an estimate of the states that remain to be purged."""
+        return _remaining_ids(self.next_state_id, self.last_state_id)
+
+    @property
+    def remaining_events(self) -> int | None:
+        """Return an estimate of the events that remain to be purged."""
+        return _remaining_ids(self.next_event_id, self.last_event_id)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the progress."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "started": self.started.isoformat(),
+            "finished": self.finished and self.finished.isoformat(),
+            "slices": self.slices,
+            "states_purged": self.states_purged,
+            "events_purged": self.events_purged,
+            "remaining_states": self.remaining_states,
+            "remaining_events": self.remaining_events,
+        }
+
+
+def _remaining_ids(next_id: int | None, last_id: int | None) -> int | None:
+    """Return the number of ids from next_id up to and including last_id."""
+    if last_id is None:
+        return None
+    if next_id is None:
+        return 0
+    return max(last_id - next_id + 1, 0)
+
+
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder, purge_before: datetime, repack: bool, apply_filter: bool = False
 ) -> bool:
     """Purge events and states older than purge_before.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Deletes the rows of one time bucket at a time, based on the oldest record,
+    until PURGE_TIME_BUDGET is used up. The purge is then rescheduled so the
+    events that were queued meanwhile are recorded first.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
 
+    progress = instance.purge_progress
+    if progress is None or progress.finished or progress.purge_before != purge_before:
+        progress = instance.purge_progress = PurgeProgress(purge_before)
+
+    deadline = time.monotonic() + PURGE_TIME_BUDGET.total_seconds()
     with session_scope(session=instance.get_session()) as session:  # type: ignore
-        # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-        event_ids = _select_event_ids_to_purge(session, purge_before)
-        state_ids = _select_state_ids_to_purge(session, purge_before, event_ids)
-        if state_ids:
-            _purge_state_ids(session, state_ids)
-        if event_ids:
-            _purge_event_ids(session, event_ids)
+        if progress.slices == 0:
+            _estimate_rows_to_purge(session, progress)
+        purged = False
+        while _purge_oldest_slice(session, progress):
+            purged = True
+            session.commit()
+            if time.monotonic() >= deadline:
+                break
+        if purged:
             # If states or events purging isn't processing the purge_before yet,
             # return false, as we are not done yet.
-            _LOGGER.debug("Purging hasn't fully completed yet")
+            _LOGGER.debug(
+                "Purging hasn't fully completed yet, about %s states and %s "
+                "events remaining",
+                progress.remaining_states,
+                progress.remaining_events,
+            )
             return False
         if apply_filter and _purge_filtered_data(instance, session) is False:
             _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
             return False
+        _purge_old_state_checkpoints(session, purge_before)
         _purge_old_recorder_runs(instance, session, purge_before)
+    progress.finished = dt_util.utcnow()
     if repack:
         repack_database(instance)
     return True
 
 
-def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list[int]:
-    """Return a list of event ids to purge."""
-    events = (
+def _estimate_rows_to_purge(session: Session, progress: PurgeProgress) -> None:
+    """Find the primary key ranges of the states and events to purge."""
+    progress.next_state_id = session.query(func.min(States.state_id)).scalar()
+    progress.last_state_id = (
+        session.query(States.state_id)
+        .filter(States.last_updated_ts < progress.purge_before.timestamp())
+        .order_by(States.last_updated_ts.desc())
+        .limit(1)
+        .scalar()
+    )
+    progress.next_event_id = session.query(func.min(Events.event_id)).scalar()
+    progress.last_event_id = (
         session.query(Events.event_id)
-        .filter(Events.time_fired < purge_before)
-        .limit(MAX_ROWS_TO_PURGE)
-        .all()
+        .filter(Events.time_fired_ts < progress.purge_before.timestamp())
+        .order_by(Events.time_fired_ts.desc())
+        .limit(1)
+        .scalar()
     )
-    _LOGGER.debug("Selected %s event ids to remove", len(events))
-    return [event.event_id for event in events]
 
 
-def _select_state_ids_to_purge(
-    session: Session, purge_before: datetime, event_ids: list[int]
-) -> list[int]:
-    """Return a list of state ids to purge."""
-    if not event_ids:
-        return []
-    states = (
+def _purge_oldest_slice(session: Session, progress: PurgeProgress) -> bool:
+    """Purge the states and events of the oldest time bucket.
+
+    Returns False if there was nothing to purge.
+    """
+    oldest = [
+        dt_util.utc_from_timestamp(timestamp)
+        for timestamp in (
+            session.query(func.min(States.last_updated_ts)).scalar(),
+            session.query(func.min(Events.time_fired_ts)).scalar(),
+        )
+        if timestamp is not None
+    ]
+    if not oldest or min(oldest) >= progress.purge_before:
+        return False
+
+    bucket_end = min(min(oldest) + PURGE_TIME_BUCKET, progress.purge_before)
+    progress.slices += 1
+
+    id_range = _select_id_range(
+        session, States.state_id, States.last_updated_ts, bucket_end
+    )
+    if id_range is not None:
+        first_id, last_id, limited = id_range
+        progress.states_purged += _purge_state_id_range(
+            session, first_id, last_id, bucket_end
+        )
+        progress.next_state_id = last_id + 1
+        if limited:
+            # The events of the bucket are deleted once its states are,
+            # as the states reference them
+            return True
+
+    id_range = _select_id_range(
+        session, Events.event_id, Events.time_fired_ts, bucket_end
+    )
+    if id_range is not None:
+        first_id, last_id, _ = id_range
+        progress.events_purged += _purge_event_id_range(
+            session, first_id, last_id, bucket_end
+        )
+        progress.next_event_id = last_id + 1
+    return True
+
+
+def _select_id_range(
+    session: Session, id_column: Any, time_column: Any, bucket_end: datetime
+) -> tuple[int, int, bool] | None:
+    """Return the first and last id of the rows recorded before bucket_end.
+
+    The range is limited to PURGE_SLICE_MAX_ROWS ids, the last item of the
+    returned tuple tells if it was.
+    """
+    first_id, last_id = (
+        session.query(func.min(id_column), func.max(id_column))
+        .filter(time_column < bucket_end.timestamp())
+        .one()
+    )
+    if first_id is None:
+        return None
+    if last_id - first_id >= PURGE_SLICE_MAX_ROWS:
+        return first_id, first_id + PURGE_SLICE_MAX_ROWS - 1, True
+    return first_id, last_id, False
+
+
+def _purge_state_id_range(
+    session: Session,
+    first_id: int,
+    last_id: int,
+    purge_before: datetime,
+) -> int:
+    """Disconnect and delete the states of an id range recorded before purge_before."""
+    in_range = States.state_id.between(first_id, last_id)
+    if (
         session.query(States.state_id)
-        .filter(States.last_updated < purge_before)
-        .filter(States.event_id.in_(event_ids))
-        .all()
+        .filter(in_range)
+        .filter(States.last_updated_ts >= purge_before.timestamp())
+        .first()
+        is not None
+    ):
+        # Some states of the range are newer and kept, so only the states
+        # that are deleted are disconnected, by their id
+        state_ids = [
+            state_id
+            for (state_id,) in session.query(States.state_id)
+            .filter(in_range)
+            .filter(States.last_updated_ts < purge_before.timestamp())
+        ]
+        for offset in range(0, len(state_ids), MAX_ROWS_TO_PURGE):
+            _purge_state_ids(session, state_ids[offset : offset + MAX_ROWS_TO_PURGE])
+        return len(state_ids)
+
+    # Update old_state_id to NULL before deleting to ensure
+    # the delete does not fail due to a foreign key constraint
+    # since some databases (MSSQL) cannot do the ON DELETE SET NULL
+    # for us.
+    disconnected_rows = (
+        session.query(States)
+        .filter(States.old_state_id.between(first_id, last_id))
+        .update({"old_state_id": None}, synchronize_session=False)
+    )
+    _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+
+    deleted_rows: int = (
+        session.query(States).filter(in_range).delete(synchronize_session=False)
     )
-    _LOGGER.debug("Selected %s state ids to remove", len(states))
-    return [state.state_id for state in states]
+    _LOGGER.debug("Deleted %s states", deleted_rows)
+    return deleted_rows
+
+
+def _purge_event_id_range(
+    session: Session,
+    first_id: int,
+    last_id: int,
+    purge_before: datetime,
+) -> int:
+    """Delete the events of an id range fired before purge_before."""
+    deleted_rows: int = (
+        session.query(Events)
+        .filter(Events.event_id.between(first_id, last_id))
+        .filter(Events.time_fired_ts < purge_before.timestamp())
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s events", deleted_rows)
+    return deleted_rows
 
 
 def _purge_state_ids(session: Session, state_ids: list[int]) -> None:
@@ -113,6 +312,17 @@ def _purge_event_ids(session: Session, event_ids: list[int]) -> None:
     _LOGGER.debug("Deleted %s events", deleted_rows)
 
 
+def _purge_old_state_checkpoints(session: Session, purge_before: datetime) -> None:
+    """Purge all old state checkpoints."""
+    # Checkpoints are only written once an hour, no need to batch run it
+    deleted_rows = (
+        session.query(StateCheckpoints)
+        .filter(StateCheckpoints.created < purge_before)
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s state checkpoints", deleted_rows)
+
+
 def _purge_old_recorder_runs(
     instance: Recorder, session: Session, purge_before: datetime
 ) -> None:
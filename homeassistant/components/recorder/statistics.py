@@ -5,7 +5,7 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from itertools import groupby
 import logging
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any, Callable, cast
 
 from sqlalchemy import bindparam
 from sqlalchemy.ext import baked
@@ -123,45 +123,67 @@ def _get_metadata_ids(
 
 
 def _get_or_add_metadata_id(
-    hass: HomeAssistant,
     session: scoped_session,
     statistic_id: str,
     metadata: StatisticMetaData,
 ) -> str:
     """Get metadata_id for a statistic_id, add if it doesn't exist."""
-    metadata_id = _get_metadata_ids(hass, session, [statistic_id])
-    if not metadata_id:
-        unit = metadata["unit_of_measurement"]
-        has_mean = metadata["has_mean"]
-        has_sum = metadata["has_sum"]
-        session.add(
-            StatisticsMeta.from_meta(DOMAIN, statistic_id, unit, has_mean, has_sum)
-        )
-        metadata_id = _get_metadata_ids(hass, session, [statistic_id])
-    return metadata_id[0]
+    existing = (
+        session.query(StatisticsMeta.id)
+        .filter(StatisticsMeta.statistic_id == statistic_id)
+        .first()
+    )
+    if existing:
+        return cast(str, existing[0])
+    meta = StatisticsMeta.from_meta(
+        DOMAIN,
+        statistic_id,
+        metadata["unit_of_measurement"],
+        metadata["has_mean"],
+        metadata["has_sum"],
+    )
+    session.add(meta)
+    session.flush()
+    return cast(str, meta.id)
 
 
-@retryable_database_job("statistics")
 def compile_statistics(instance: Recorder, start: datetime) -> bool:
     """Compile statistics."""
     start = dt_util.as_utc(start)
+    return cast(
+        bool,
+        save_statistics(
+            instance, start, compile_platform_statistics(instance.hass, start)
+        ),
+    )
+
+
+def compile_platform_statistics(
+    hass: HomeAssistant, start: datetime
+) -> list[dict[str, Any]]:
+    """Compile the statistics of the recorder platforms for an hour."""
     end = start + timedelta(hours=1)
     _LOGGER.debug("Compiling statistics for %s-%s", start, end)
     platform_stats = []
-    for domain, platform in instance.hass.data[DOMAIN].items():
+    for domain, platform in hass.data[DOMAIN].items():
         if not hasattr(platform, "compile_statistics"):
             continue
-        platform_stats.append(platform.compile_statistics(instance.hass, start, end))
+        platform_stats.append(platform.compile_statistics(hass, start, end))
         _LOGGER.debug(
             "Statistics for %s during %s-%s: %s", domain, start, end, platform_stats[-1]
         )
+    return platform_stats
 
+
+@retryable_database_job("statistics")
+def save_statistics(
+    instance: Recorder, start: datetime, platform_stats: list[dict[str, Any]]
+) -> bool:
+    """Save compiled statistics."""
     with session_scope(session=instance.get_session()) as session:  # type: ignore
         for stats in platform_stats:
             for entity_id, stat in stats.items():
-                metadata_id = _get_or_add_metadata_id(
-                    instance.hass, session, entity_id, stat["meta"]
-                )
+                metadata_id = _get_or_add_metadata_id(session, entity_id, stat["meta"])
                 session.add(Statistics.from_stats(metadata_id, start, stat["stat"]))
 
     return True
@@ -223,7 +245,7 @@ def list_statistic_ids(
     """Return statistic_ids and meta data."""
     units = hass.config.units
     statistic_ids = {}
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         metadata = _get_metadata(hass, session, None, statistic_type)
 
         for meta in metadata.values():
@@ -260,7 +282,7 @@ def statistics_during_period(
 ) -> dict[str, list[dict[str, str]]]:
     """Return states changes during UTC period start_time - end_time."""
     metadata = None
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         metadata = _get_metadata(hass, session, statistic_ids, None)
         if not metadata:
             return {}
@@ -298,7 +320,7 @@ def get_last_statistics(
 ) -> dict[str, list[dict]]:
     """Return the last number_of_stats statistics for a statistic_id."""
     statistic_ids = [statistic_id]
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         metadata = _get_metadata(hass, session, statistic_ids, None)
         if not metadata:
             return {}
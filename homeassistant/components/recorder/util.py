@@ -17,10 +17,12 @@ from homeassistant.core import HomeAssistant
 import homeassistant.util.dt as dt_util
 
 from .const import DATA_INSTANCE, SQLITE_URL_PREFIX
+from .instrumentation import record_query_rows
 from .models import (
     ALL_TABLES,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
+    TABLE_STATE_CHECKPOINTS,
     TABLE_STATISTICS,
     TABLE_STATISTICS_META,
     RecorderRuns,
@@ -50,11 +52,22 @@ RETRYABLE_MYSQL_ERRORS = (1205, 1206, 1213)
 
 @contextmanager
 def session_scope(
-    *, hass: HomeAssistant | None = None, session: Session | None = None
+    *,
+    hass: HomeAssistant | None = None,
+    session: Session | None = None,
+    read_only: bool = False,
 ) -> Generator[Session, None, None]:
-    """Provide a transactional scope around a series of operations."""
+    """Provide a transactional scope around a series of operations.
+
+    Read only sessions of a hass instance use the pool of read-only
+    connections when the database has one.
+    """
     if session is None and hass is not None:
-        session = hass.data[DATA_INSTANCE].get_session()
+        instance = hass.data[DATA_INSTANCE]
+        if read_only:
+            session = instance.get_read_session()
+        else:
+            session = instance.get_session()
 
     if session is None:
         raise RuntimeError("Session required")
@@ -112,6 +125,8 @@ def execute(qry, to_native=False, validate_entity_ids=True) -> list | None:
             else:
                 result = list(qry)
 
+            record_query_rows(qry, result)
+
             if _LOGGER.isEnabledFor(logging.DEBUG):
                 elapsed = time.perf_counter() - timer_start
                 if to_native:
@@ -138,6 +153,24 @@ def execute(qry, to_native=False, validate_entity_ids=True) -> list | None:
     return None
 
 
+def execute_stream(qry, chunk_size: int) -> Generator:
+    """Query the database and yield the rows as they are fetched.
+
+    The rows are fetched chunk_size at a time and are recorded per chunk, so
+    the query instrumentation sees them like the rows of execute(). Unlike
+    execute() the query is not retried, the rows may already be consumed.
+    """
+    chunk: list = []
+    for row in qry.with_post_criteria(lambda q: q.yield_per(chunk_size)):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            record_query_rows(qry, chunk)
+            yield from chunk
+            chunk = []
+    record_query_rows(qry, chunk)
+    yield from chunk
+
+
 def validate_or_move_away_sqlite_database(dburl: str) -> bool:
     """Ensure that the database is valid or move it away."""
     dbpath = dburl_to_path(dburl)
@@ -182,7 +215,7 @@ def basic_sanity_check(cursor):
     """Check tables to make sure select does not fail."""
 
     for table in ALL_TABLES:
-        if table in [TABLE_STATISTICS, TABLE_STATISTICS_META]:
+        if table in [TABLE_STATISTICS, TABLE_STATISTICS_META, TABLE_STATE_CHECKPOINTS]:
             continue
         if table in (TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES):
             cursor.execute(f"SELECT * FROM {table};")  # nosec # not injection
@@ -279,6 +312,15 @@ def setup_connection_for_dialect(dialect_name, dbapi_connection, first_connectio
         execute_on_connection(dbapi_connection, "SET session wait_timeout=28800")
 
 
+def setup_read_connection_for_sqlite(dbapi_connection):
+    """Execute statements needed for a read-only sqlite connection."""
+    execute_on_connection(dbapi_connection, "PRAGMA query_only = ON")
+    # approximately 8MiB of memory
+    execute_on_connection(dbapi_connection, "PRAGMA cache_size = -8192")
+    # Read pages straight from the mapped database file, up to 256MiB
+    execute_on_connection(dbapi_connection, "PRAGMA mmap_size = 268435456")
+
+
 def end_incomplete_runs(session, start_time):
     """End any incomplete recorder runs."""
     for run in session.query(RecorderRuns).filter_by(end=None):
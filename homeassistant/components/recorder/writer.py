@@ -0,0 +1,246 @@
+"""Write the recorder events from a separate process."""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from logging.handlers import QueueHandler
+import multiprocessing
+from multiprocessing.connection import Connection
+import signal
+import threading
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.helpers.entityfilter import generate_filter
+
+from .models import Events, States
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds the writer process gets to commit and close the run on shutdown
+WRITER_STOP_TIMEOUT = 30
+
+
+class TimeChangedTask:
+    """An object to insert into the writer queue for every time changed event."""
+
+
+class SaveStatisticsTask(NamedTuple):
+    """An object to insert into the writer queue to save compiled statistics."""
+
+    start: datetime
+    platform_stats: list[dict[str, Any]]
+
+
+class WriterConfig(NamedTuple):
+    """The recorder settings the writer process needs."""
+
+    db_url: str
+    commit_interval: int
+    db_max_retries: int
+    db_retry_wait: int
+    entity_filter_config: dict[str, Any] | None
+    exclude_t: list[str]
+    run_id: int
+    recording_start: datetime
+    log_level: int
+
+
+class PurgeEntitiesFilter:
+    """Filter of the entities to purge that can be sent to the writer process."""
+
+    def __init__(
+        self, entity_ids: list[str], domains: list[str], entity_globs: list[str]
+    ) -> None:
+        """Initialize the filter."""
+        self._args: tuple[list[str], ...] = (domains, entity_ids, [], [], entity_globs)
+        self._filter: Callable[[str], bool] | None = None
+
+    def __getstate__(self) -> tuple[list[str], ...]:
+        """Return the state to pickle, the generated filter is not picklable."""
+        return self._args
+
+    def __setstate__(self, args: tuple[list[str], ...]) -> None:
+        """Restore the filter from a pickle."""
+        self._args = args
+        self._filter = None
+
+    def __call__(self, entity_id: str) -> bool:
+        """Return if an entity should be purged."""
+        if self._filter is None:
+            self._filter = generate_filter(*self._args)
+        return self._filter(entity_id)
+
+
+def serialize_event(event) -> tuple[dict, dict | None] | None:
+    """Serialize an event to the column values of its event and state rows.
+
+    The state of a removed entity is None. Returns None if the event is not
+    JSON serializable.
+    """
+    try:
+        if event.event_type == EVENT_STATE_CHANGED:
+            event_columns = Events.columns_from_event(event, event_data="{}")
+        else:
+            event_columns = Events.columns_from_event(event)
+    except (TypeError, ValueError):
+        _LOGGER.warning("Event is not JSON serializable: %s", event)
+        return None
+
+    state_columns = None
+    if event.event_type == EVENT_STATE_CHANGED:
+        try:
+            state_columns = States.columns_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning(
+                "State is not JSON serializable: %s", event.data.get("new_state")
+            )
+        else:
+            if not event.data.get("new_state"):
+                state_columns["state"] = None
+
+    return event_columns, state_columns
+
+
+class ReplySender:
+    """Send replies and log records from the writer process to the recorder."""
+
+    def __init__(self, connection: Connection) -> None:
+        """Initialize the sender."""
+        self._connection = connection
+        self._lock = threading.Lock()
+
+    def send(self, reply: Any) -> None:
+        """Send a reply."""
+        with self._lock:
+            self._connection.send(reply)
+
+    # Used by the QueueHandler that forwards the log records
+    put_nowait = send
+
+
+class WriterProcess:
+    """The writer process and the pipes to it.
+
+    Batches of serialized events and tasks are sent to the writer process,
+    the replies and log records of the writer process are handled by a thread
+    of the recorder. If the writer process exits before it was stopped,
+    exit_callback is called once and no more batches are sent.
+    """
+
+    def __init__(
+        self,
+        recorder: Recorder,
+        reply_callback: Callable[[Any], None],
+        exit_callback: Callable[[], None],
+    ) -> None:
+        """Initialize the writer process."""
+        context = multiprocessing.get_context("spawn")
+        task_reader, self._task_writer = context.Pipe(duplex=False)
+        self._reply_reader, reply_writer = context.Pipe(duplex=False)
+        entity_filter_config = getattr(recorder.entity_filter, "config", None)
+        config = WriterConfig(
+            db_url=recorder.db_url,
+            commit_interval=recorder.commit_interval,
+            db_max_retries=recorder.db_max_retries,
+            db_retry_wait=recorder.db_retry_wait,
+            entity_filter_config=entity_filter_config,
+            exclude_t=recorder.exclude_t,
+            run_id=recorder.run_info.run_id,
+            recording_start=recorder.recording_start,
+            log_level=_LOGGER.getEffectiveLevel(),
+        )
+        self._process = context.Process(
+            target=run_writer,
+            args=(config, task_reader, reply_writer),
+            name="Recorder writer",
+            daemon=True,
+        )
+        self._child_connections = (task_reader, reply_writer)
+        self._reply_callback = reply_callback
+        self._exit_callback = exit_callback
+        self._reply_thread = threading.Thread(
+            target=self._handle_replies, name="Recorder writer replies", daemon=True
+        )
+        self._lock = threading.Lock()
+        self._stopping = False
+        self._failed = False
+
+    def start(self) -> None:
+        """Start the writer process."""
+        self._process.start()
+        # Only the writer process uses its ends of the pipes, closing them
+        # here lets both sides see when the other exits
+        for connection in self._child_connections:
+            connection.close()
+        self._reply_thread.start()
+
+    def send(self, batch: list) -> bool:
+        """Send a batch of serialized events and tasks to the writer process.
+
+        Returns False if the writer process exited and the batch was dropped.
+        """
+        if self._failed:
+            return False
+        if batch and batch[-1] is None:
+            # The writer process exits once it handled the stop
+            self._stopping = True
+        try:
+            self._task_writer.send(batch)
+        except OSError:
+            self._exited()
+            return False
+        return True
+
+    def _exited(self) -> None:
+        """Handle the writer process exiting before it was stopped."""
+        with self._lock:
+            if self._failed or self._stopping:
+                return
+            self._failed = True
+        self._exit_callback()
+
+    def stop(self) -> None:
+        """Wait for the writer process to finish after it was sent None."""
+        self._task_writer.close()
+        self._process.join(WRITER_STOP_TIMEOUT)
+        if self._process.is_alive():
+            _LOGGER.error("The recorder writer process did not stop in time")
+            self._process.terminate()
+            self._process.join()
+        self._reply_thread.join()
+        self._reply_reader.close()
+
+    def _handle_replies(self) -> None:
+        """Handle the replies of the writer process until it exits."""
+        while True:
+            try:
+                reply = self._reply_reader.recv()
+            except (EOFError, OSError):
+                self._exited()
+                return
+            if isinstance(reply, logging.LogRecord):
+                logging.getLogger(reply.name).handle(reply)
+            else:
+                self._reply_callback(reply)
+
+
+def run_writer(
+    config: WriterConfig, task_reader: Connection, reply_writer: Connection
+) -> None:
+    """Run the writer process."""
+    # pylint: disable=import-outside-toplevel
+    from . import RecorderWriter
+
+    # The recorder stops the writer process when Home Assistant stops
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    replies = ReplySender(reply_writer)
+    root_logger = logging.getLogger()
+    root_logger.handlers = [QueueHandler(replies)]  # type: ignore[arg-type]
+    root_logger.setLevel(config.log_level)
+
+    RecorderWriter(config, task_reader, replies).run()
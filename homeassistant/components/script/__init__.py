@@ -9,6 +9,7 @@ import voluptuous as vol
 from voluptuous.humanize import humanize_error
 
 from homeassistant.components.blueprint import BlueprintInputs
+from homeassistant.components.trace import async_remove_stale_traces
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_MODE,
@@ -270,6 +271,7 @@ async def _async_process_config(hass, config, component) -> bool:
             )
 
     await component.async_add_entities(entities)
+    async_remove_stale_traces(hass, DOMAIN, {entity.object_id for entity in entities})
 
     async def service_handler(service):
         """Execute a service call to script.<script name>."""
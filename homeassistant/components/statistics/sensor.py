@@ -1,6 +1,11 @@
 """Support for statistics for sensor values."""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
 from collections import deque
+from fractions import Fraction
 import logging
+import math
 import statistics
 
 import voluptuous as vol
@@ -108,6 +113,141 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
     return True
 
 
+class StatisticsWindow:
+    """Statistics of the samples in a sliding window, updated per sample.
+
+    Sums are kept as exact fractions, so the results don't drift as samples
+    leave the window and match the statistics module up to float rounding.
+    The samples are also kept sorted for the median, quantiles, minimum and
+    maximum. Adding or removing a sample finds its position in O(log n), but
+    shifting the sorted list is O(n); that's a memmove of n pointers, which
+    is cheap for the sampling sizes the sensor is used with.
+
+    Infinite and NaN samples have no exact value and no place in the sorted
+    order, while the window holds any of them the statistics are computed
+    from the samples with the statistics module instead.
+    """
+
+    def __init__(self, samples: deque[float]) -> None:
+        """Initialize an empty window of the samples."""
+        self.sorted: list[float] = []
+        self._samples = samples
+        self._non_finite = 0
+        self._sum = Fraction(0)
+        self._sum_squares = Fraction(0)
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self.sorted) + self._non_finite
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        if not math.isfinite(value):
+            self._non_finite += 1
+            return
+        insort(self.sorted, value)
+        exact = Fraction(value)
+        self._sum += exact
+        self._sum_squares += exact * exact
+
+    def remove(self, value: float) -> None:
+        """Remove a sample."""
+        if not math.isfinite(value):
+            self._non_finite -= 1
+            return
+        del self.sorted[bisect_left(self.sorted, value)]
+        exact = Fraction(value)
+        self._sum -= exact
+        self._sum_squares -= exact * exact
+
+    @property
+    def total(self) -> float:
+        """Return the sum of the samples."""
+        if self._non_finite:
+            return sum(self._samples)
+        return float(self._sum)
+
+    def minimum(self) -> float:
+        """Return the smallest sample."""
+        if self._non_finite:
+            return min(self._samples)
+        return self.sorted[0]
+
+    def maximum(self) -> float:
+        """Return the largest sample."""
+        if self._non_finite:
+            return max(self._samples)
+        return self.sorted[-1]
+
+    def mean(self) -> float:
+        """Return the mean of the samples."""
+        if self._non_finite:
+            return statistics.mean(self._samples)
+        if not self.sorted:
+            raise statistics.StatisticsError("mean requires at least one data point")
+        return float(self._sum / len(self.sorted))
+
+    def median(self) -> float:
+        """Return the median of the samples."""
+        if self._non_finite:
+            return statistics.median(self._samples)
+        data = self.sorted
+        count = len(data)
+        if count == 0:
+            raise statistics.StatisticsError("no median for empty data")
+        if count % 2 == 1:
+            return data[count // 2]
+        i = count // 2
+        return (data[i - 1] + data[i]) / 2
+
+    def variance(self) -> float:
+        """Return the sample variance of the samples."""
+        if self._non_finite:
+            return statistics.variance(self._samples)
+        count = len(self.sorted)
+        if count < 2:
+            raise statistics.StatisticsError(
+                "variance requires at least two data points"
+            )
+        squares = self._sum_squares - self._sum * self._sum / count
+        return float(squares / (count - 1))
+
+    def stdev(self) -> float:
+        """Return the sample standard deviation of the samples."""
+        if self._non_finite:
+            return statistics.stdev(self._samples)
+        return math.sqrt(self.variance())
+
+    def quantiles(self, intervals: int, method: str) -> list[float]:
+        """Return the cut points dividing the samples in equal intervals.
+
+        This matches statistics.quantiles, without sorting the samples again.
+        """
+        if self._non_finite:
+            return statistics.quantiles(self._samples, n=intervals, method=method)
+        data = self.sorted
+        count = len(data)
+        if count < 2:
+            raise statistics.StatisticsError("must have at least two data points")
+        result = []
+        if method == "inclusive":
+            scale = count - 1
+            for i in range(1, intervals):
+                j, delta = divmod(i * scale, intervals)
+                result.append(
+                    (data[j] * (intervals - delta) + data[j + 1] * delta) / intervals
+                )
+            return result
+        scale = count + 1
+        for i in range(1, intervals):
+            j = min(max(i * scale // intervals, 1), count - 1)
+            delta = i * scale - j * intervals
+            result.append(
+                (data[j - 1] * (intervals - delta) + data[j] * delta) / intervals
+            )
+        return result
+
+
 class StatisticsSensor(SensorEntity):
     """Representation of a Statistics sensor."""
 
@@ -133,6 +273,7 @@ class StatisticsSensor(SensorEntity):
         self._unit_of_measurement = None
         self.states = deque(maxlen=self._sampling_size)
         self.ages = deque(maxlen=self._sampling_size)
+        self.window = StatisticsWindow(self.states)
 
         self.count = 0
         self.mean = self.median = self.quantiles = self.stdev = self.variance = None
@@ -187,7 +328,11 @@ class StatisticsSensor(SensorEntity):
             if self.is_binary:
                 self.states.append(new_state.state)
             else:
-                self.states.append(float(new_state.state))
+                value = float(new_state.state)
+                if len(self.states) == self._sampling_size:
+                    self.window.remove(self.states[0])
+                self.states.append(value)
+                self.window.add(value)
 
             self.ages.append(new_state.last_updated)
         except ValueError:
@@ -263,7 +408,9 @@ class StatisticsSensor(SensorEntity):
                 (now - self.ages[0]),
             )
             self.ages.popleft()
-            self.states.popleft()
+            value = self.states.popleft()
+            if not self.is_binary:
+                self.window.remove(value)
 
     def _next_to_purge_timestamp(self):
         """Find the timestamp when the next purge would occur."""
@@ -283,23 +430,22 @@ class StatisticsSensor(SensorEntity):
         self.count = len(self.states)
 
         if not self.is_binary:
+            window = self.window
             try:  # require only one data point
-                self.mean = round(statistics.mean(self.states), self._precision)
-                self.median = round(statistics.median(self.states), self._precision)
+                self.mean = round(window.mean(), self._precision)
+                self.median = round(window.median(), self._precision)
             except statistics.StatisticsError as err:
                 _LOGGER.debug("%s: %s", self.entity_id, err)
                 self.mean = self.median = STATE_UNKNOWN
 
             try:  # require at least two data points
-                self.stdev = round(statistics.stdev(self.states), self._precision)
-                self.variance = round(statistics.variance(self.states), self._precision)
+                self.stdev = round(window.stdev(), self._precision)
+                self.variance = round(window.variance(), self._precision)
                 if self._quantile_intervals < self.count:
                     self.quantiles = [
                         round(quantile, self._precision)
-                        for quantile in statistics.quantiles(
-                            self.states,
-                            n=self._quantile_intervals,
-                            method=self._quantile_method,
+                        for quantile in window.quantiles(
+                            self._quantile_intervals, self._quantile_method
                         )
                     ]
             except statistics.StatisticsError as err:
@@ -307,9 +453,9 @@ class StatisticsSensor(SensorEntity):
                 self.stdev = self.variance = self.quantiles = STATE_UNKNOWN
 
             if self.states:
-                self.total = round(sum(self.states), self._precision)
-                self.min = round(min(self.states), self._precision)
-                self.max = round(max(self.states), self._precision)
+                self.total = round(window.total, self._precision)
+                self.min = round(window.minimum(), self._precision)
+                self.max = round(window.maximum(), self._precision)
 
                 self.min_age = self.ages[0]
                 self.max_age = self.ages[-1]
@@ -381,11 +527,13 @@ class StatisticsSensor(SensorEntity):
                     self.entity_id,
                     records_older_then,
                 )
-                query = query.filter(States.last_updated >= records_older_then)
+                query = query.filter(
+                    States.last_updated_ts >= records_older_then.timestamp()
+                )
             else:
                 _LOGGER.debug("%s: retrieving all records", self.entity_id)
 
-            query = query.order_by(States.last_updated.desc()).limit(
+            query = query.order_by(States.last_updated_ts.desc()).limit(
                 self._sampling_size
             )
             states = execute(query, to_native=True, validate_entity_ids=False)
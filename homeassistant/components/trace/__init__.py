@@ -4,11 +4,12 @@ from __future__ import annotations
 from collections import deque
 import datetime as dt
 from itertools import count
-from typing import Any
+from typing import Any, Callable
 
 import voluptuous as vol
 
-from homeassistant.core import Context
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Context, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.trace import (
     TraceElement,
@@ -20,7 +21,13 @@ from homeassistant.helpers.trace import (
 import homeassistant.util.dt as dt_util
 
 from . import websocket_api
-from .const import CONF_STORED_TRACES, DATA_TRACE, DEFAULT_STORED_TRACES
+from .const import (
+    CONF_STORED_TRACES,
+    DATA_TRACE,
+    DATA_TRACE_STORE,
+    DEFAULT_STORED_TRACES,
+)
+from .storage import TraceStorage
 from .utils import LimitedSizeDict
 
 DOMAIN = "trace"
@@ -33,7 +40,15 @@ TRACE_CONFIG_SCHEMA = {
 async def async_setup(hass, config):
     """Initialize the trace integration."""
     hass.data[DATA_TRACE] = {}
+    storage = hass.data[DATA_TRACE_STORE] = TraceStorage(hass)
+    # Scripts and automations depend on trace, so no run can start before
+    # the run ids of the saved traces are reserved
+    ActionTrace.reserve_run_ids(await storage.async_restore())
     websocket_api.async_setup(hass)
+
+    # Save the pending finished traces when stopping hass
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, storage.async_save)
+
     return True
 
 
@@ -47,6 +62,17 @@ def async_store_trace(hass, trace, stored_traces):
         else:
             traces[key].size_limit = stored_traces
         traces[key][trace.run_id] = trace
+        trace.set_finished_callback(hass.data[DATA_TRACE_STORE].async_trace_finished)
+
+
+@callback
+def async_remove_stale_traces(
+    hass: HomeAssistant, domain: str, item_ids: set[str]
+) -> None:
+    """Remove the traces of the scripts or automations that are no longer configured."""
+    hass.async_create_task(
+        hass.data[DATA_TRACE_STORE].async_remove_stale(domain, item_ids)
+    )
 
 
 class ActionTrace:
@@ -69,6 +95,7 @@ class ActionTrace:
         self._error: Exception | None = None
         self._state: str = "running"
         self._script_execution: str | None = None
+        self._finished_callback: Callable[[ActionTrace], None] | None = None
         self.run_id: str = str(next(self._run_ids))
         self._timestamp_finish: dt.datetime | None = None
         self._timestamp_start: dt.datetime = dt_util.utcnow()
@@ -77,6 +104,17 @@ class ActionTrace:
             trace_set_child_id(self.key, self.run_id)
         trace_id_set((key, self.run_id))
 
+    @classmethod
+    def reserve_run_ids(cls, next_run_id: int) -> None:
+        """Hand out run ids from next_run_id on."""
+        cls._run_ids = count(next_run_id)
+
+    def set_finished_callback(
+        self, finished_callback: Callable[[ActionTrace], None]
+    ) -> None:
+        """Set the callback to call when the trace is finished."""
+        self._finished_callback = finished_callback
+
     def set_trace(self, trace: dict[str, deque[TraceElement]]) -> None:
         """Set trace."""
         self._trace = trace
@@ -90,28 +128,34 @@ class ActionTrace:
         self._timestamp_finish = dt_util.utcnow()
         self._state = "stopped"
         self._script_execution = script_execution_get()
+        if self._finished_callback is not None:
+            self._finished_callback(self)
 
     def as_dict(self) -> dict[str, Any]:
         """Return dictionary version of this ActionTrace."""
+        return {**self.as_short_dict(), **self.as_extended_dict()}
 
-        result = self.as_short_dict()
+    def as_extended_dict(self) -> dict[str, Any]:
+        """Return the details of this ActionTrace not in the short version."""
 
         traces = {}
         if self._trace:
             for key, trace_list in self._trace.items():
                 traces[key] = [item.as_dict() for item in trace_list]
 
-        result.update(
-            {
-                "trace": traces,
-                "config": self._config,
-                "blueprint_inputs": self._blueprint_inputs,
-                "context": self.context,
-            }
-        )
-        if self._error is not None:
-            result["error"] = str(self._error)
-        return result
+        return {
+            "trace": traces,
+            "config": self._config,
+            "blueprint_inputs": self._blueprint_inputs,
+            "context": self.context,
+        }
+
+    def as_stored_dict(self) -> dict[str, Any]:
+        """Return a version of this ActionTrace suitable for storage."""
+        return {
+            "short_dict": self.as_short_dict(),
+            "extended_dict": self.as_extended_dict(),
+        }
 
     def as_short_dict(self) -> dict[str, Any]:
         """Return a brief dictionary version of this ActionTrace."""
@@ -2,4 +2,5 @@
 
 CONF_STORED_TRACES = "stored_traces"
 DATA_TRACE = "trace"
+DATA_TRACE_STORE = "trace_store"
 DEFAULT_STORED_TRACES = 5  # Stored traces per script or automation
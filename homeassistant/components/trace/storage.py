@@ -0,0 +1,239 @@
+"""Storage of finished script and automation traces."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, cast
+
+from homeassistant.core import CALLBACK_TYPE, Context, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import ExtendedJSONEncoder
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_TRACE
+from .utils import LimitedSizeDict
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = "trace.saved_traces"
+STORAGE_VERSION = 1
+
+# Seconds finished traces wait to be saved together
+SAVE_DELAY = 30
+# Full traces kept in memory per script or automation, older traces are
+# loaded from storage when requested
+TRACES_IN_MEMORY = 5
+
+
+def trace_storage_key(key: tuple[str, str]) -> str:
+    """Return the key of the store of the traces of a script or automation."""
+    digest = hashlib.sha256(key[1].encode("utf-8")).hexdigest()[:16]
+    return f"{STORAGE_KEY}.{key[0]}.{digest}"
+
+
+class StoredTrace:
+    """Summary of a trace whose full version is only kept in storage."""
+
+    def __init__(self, short_dict: dict[str, Any], context: dict[str, Any]) -> None:
+        """Initialize the summary."""
+        self._short_dict = short_dict
+        self.context = Context(**context)
+        self.key: tuple[str, str] = (short_dict["domain"], short_dict["item_id"])
+        self.run_id: str = str(short_dict["run_id"])
+
+    def as_short_dict(self) -> dict[str, Any]:
+        """Return a brief dictionary version of the trace."""
+        return self._short_dict
+
+
+class TraceStorage:
+    """Save finished traces and load the ones no longer kept in memory.
+
+    An index with the summary of every saved trace is loaded at startup. The
+    full traces are saved in a store per script or automation, which is
+    loaded the first time finished traces are added or a trace that is no
+    longer kept in memory is requested, and kept loaded afterwards. The store
+    is removed with its script or automation.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the storage."""
+        self.hass = hass
+        self._index = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY, encoder=ExtendedJSONEncoder
+        )
+        self._lock = asyncio.Lock()
+        self._pending: dict[tuple[str, str], list[Any]] = {}
+        self._saved: dict[tuple[str, str], set[str]] = {}
+        self._stored: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._unsub_save: CALLBACK_TYPE | None = None
+
+    def _trace_store(self, key: tuple[str, str]) -> Store:
+        """Return the store of the traces of a script or automation."""
+        return Store(
+            self.hass,
+            STORAGE_VERSION,
+            trace_storage_key(key),
+            encoder=ExtendedJSONEncoder,
+        )
+
+    async def _async_load_stored(
+        self, key: tuple[str, str]
+    ) -> list[dict[str, Any]] | None:
+        """Return the saved traces of a script or automation, None on errors."""
+        if (stored := self._stored.get(key)) is not None:
+            return stored
+        if key not in self._saved:
+            return []
+        try:
+            stored = cast(
+                "list[dict[str, Any]]", await self._trace_store(key).async_load() or []
+            )
+        except HomeAssistantError:
+            _LOGGER.exception("Error loading traces of %s.%s", *key)
+            return None
+        self._stored[key] = stored
+        return stored
+
+    async def async_restore(self) -> int:
+        """Restore the summaries of the saved traces.
+
+        Returns the first run id that is not used by a saved trace.
+        """
+        try:
+            data = cast("dict[str, Any]", await self._index.async_load() or {})
+        except HomeAssistantError:
+            _LOGGER.exception("Error loading traces")
+            data = {}
+
+        traces = self.hass.data[DATA_TRACE]
+        for key_str, saved in data.get("traces", {}).items():
+            domain, item_id = key_str.split(".", 1)
+            key = (domain, item_id)
+            restored = traces[key] = LimitedSizeDict(size_limit=saved["stored_traces"])
+            for summary in saved["traces"]:
+                try:
+                    trace = StoredTrace(summary["short_dict"], summary["context"])
+                except (KeyError, TypeError, ValueError):
+                    _LOGGER.warning("Failed to restore trace of %s", key_str)
+                    continue
+                restored[trace.run_id] = trace
+            self._saved[key] = set(restored)
+
+        return int(data.get("next_run_id", 0))
+
+    @callback
+    def async_trace_finished(self, trace: Any) -> None:
+        """Save a finished trace with the next batch."""
+        self._pending.setdefault(trace.key, []).append(trace)
+        if self._unsub_save is None:
+            self._unsub_save = async_call_later(
+                self.hass, SAVE_DELAY, self._async_save_later
+            )
+
+    async def _async_save_later(self, _now: Any) -> None:
+        """Save the pending traces after the delay."""
+        self._unsub_save = None
+        await self.async_save()
+
+    async def async_save(self, *_: Any) -> None:
+        """Save the pending finished traces and the index."""
+        if self._unsub_save is not None:
+            self._unsub_save()
+            self._unsub_save = None
+
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            for key, finished in pending.items():
+                await self._async_save_traces(key, finished)
+            try:
+                await self._index.async_save(self._index_data())
+            except HomeAssistantError:
+                _LOGGER.exception("Error storing traces")
+
+    async def _async_save_traces(self, key: tuple[str, str], finished: list) -> None:
+        """Add finished traces to the store of a script or automation."""
+        if (traces := self.hass.data[DATA_TRACE].get(key)) is None:
+            # The script or automation was removed
+            return
+        saved = await self._async_load_stored(key) or []
+
+        saved.extend(trace.as_stored_dict() for trace in finished)
+        # Traces dropped by the size limit of the script or automation are
+        # dropped from storage too
+        saved = [stored for stored in saved if stored["short_dict"]["run_id"] in traces]
+        try:
+            await self._trace_store(key).async_save(saved)
+        except HomeAssistantError:
+            _LOGGER.exception("Error storing traces of %s.%s", *key)
+            return
+
+        self._stored[key] = saved
+        saved_run_ids = self._saved[key] = {
+            stored["short_dict"]["run_id"] for stored in saved
+        }
+        # Only keep the newest full traces in memory
+        for run_id in list(traces)[:-TRACES_IN_MEMORY]:
+            trace = traces[run_id]
+            if run_id in saved_run_ids and not isinstance(trace, StoredTrace):
+                traces[run_id] = StoredTrace(
+                    trace.as_short_dict(), trace.context.as_dict()
+                )
+
+    @callback
+    def _index_data(self) -> dict[str, Any]:
+        """Return the summaries of the saved traces and the next run id."""
+        next_run_id = 0
+        index = {}
+        for key, traces in self.hass.data[DATA_TRACE].items():
+            for run_id in traces:
+                if run_id.isdigit():
+                    next_run_id = max(next_run_id, int(run_id) + 1)
+            saved_run_ids = self._saved.get(key, set())
+            index[f"{key[0]}.{key[1]}"] = {
+                "stored_traces": traces.size_limit,
+                "traces": [
+                    {
+                        "short_dict": trace.as_short_dict(),
+                        "context": trace.context.as_dict(),
+                    }
+                    for run_id, trace in traces.items()
+                    if run_id in saved_run_ids
+                ],
+            }
+        return {"next_run_id": next_run_id, "traces": index}
+
+    async def async_load_trace(
+        self, key: tuple[str, str], run_id: str
+    ) -> dict[str, Any] | None:
+        """Load a saved trace."""
+        for stored in await self._async_load_stored(key) or []:
+            if stored["short_dict"]["run_id"] == run_id:
+                return {**stored["short_dict"], **stored["extended_dict"]}
+        return None
+
+    async def async_remove_stale(self, domain: str, item_ids: set[str]) -> None:
+        """Remove the traces of the scripts or automations that no longer exist."""
+        async with self._lock:
+            traces = self.hass.data[DATA_TRACE]
+            stale = {
+                key
+                for key in (*traces, *self._saved)
+                if key[0] == domain and key[1] not in item_ids
+            }
+            if not stale:
+                return
+            for key in stale:
+                traces.pop(key, None)
+                self._pending.pop(key, None)
+                self._stored.pop(key, None)
+                if self._saved.pop(key, None) is not None:
+                    await self._trace_store(key).async_remove()
+            try:
+                await self._index.async_save(self._index_data())
+            except HomeAssistantError:
+                _LOGGER.exception("Error storing traces")
@@ -24,7 +24,8 @@ from homeassistant.helpers.script import (
     debug_stop,
 )
 
-from .const import DATA_TRACE
+from .const import DATA_TRACE, DATA_TRACE_STORE
+from .storage import StoredTrace
 
 # mypy: allow-untyped-calls, allow-untyped-defs
 
@@ -46,7 +47,6 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, websocket_subscribe_breakpoint_events)
 
 
-@callback
 @websocket_api.require_admin
 @websocket_api.websocket_command(
     {
@@ -56,7 +56,8 @@ def async_setup(hass: HomeAssistant) -> None:
         vol.Required("run_id"): str,
     }
 )
-def websocket_trace_get(hass, connection, msg):
+@websocket_api.async_response
+async def websocket_trace_get(hass, connection, msg):
     """Get a script or automation trace."""
     key = (msg["domain"], msg["item_id"])
     run_id = msg["run_id"]
@@ -64,6 +65,11 @@ def websocket_trace_get(hass, connection, msg):
     try:
         trace = hass.data[DATA_TRACE][key][run_id]
     except KeyError:
+        trace = None
+    if isinstance(trace, StoredTrace):
+        trace = await hass.data[DATA_TRACE_STORE].async_load_trace(key, run_id)
+
+    if trace is None:
         connection.send_error(
             msg["id"], websocket_api.ERR_NOT_FOUND, "The trace could not be found"
         )
@@ -21,6 +21,7 @@ from homeassistant.exceptions import (
 )
 from homeassistant.helpers import config_validation as cv, entity, template
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
 from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
@@ -28,6 +29,7 @@ from homeassistant.helpers.event import (
 )
 from homeassistant.helpers.json import ExtendedJSONEncoder
 from homeassistant.helpers.service import async_get_all_descriptions
+from homeassistant.helpers.update_coordinator import async_get_refresh_scheduler
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_get_loaded_integrations
 
@@ -43,6 +45,7 @@ def async_register_commands(
     """Register commands."""
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_entity_source)
+    async_reg(hass, handle_entity_platform_diagnostics)
     async_reg(hass, handle_execute_script)
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_get_services)
@@ -51,6 +54,7 @@ def async_register_commands(
     async_reg(hass, handle_integration_setup_info)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_ping)
+    async_reg(hass, handle_refresh_diagnostics)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
     async_reg(hass, handle_subscribe_events)
@@ -305,6 +309,35 @@ async def handle_integration_setup_info(
     )
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "entity_platform/diagnostics"})
+@decorators.require_admin
+def handle_entity_platform_diagnostics(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle the update statistics of entity platforms command."""
+    connection.send_result(
+        msg["id"],
+        [
+            platform.async_update_diagnostics()
+            for platforms in hass.data.get(DATA_ENTITY_PLATFORM, {}).values()
+            for platform in platforms
+        ],
+    )
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "update_coordinator/diagnostics"})
+@decorators.require_admin
+def handle_refresh_diagnostics(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle the refresh statistics of update coordinators command."""
+    connection.send_result(
+        msg["id"], async_get_refresh_scheduler(hass).async_diagnostics()
+    )
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(
@@ -250,6 +250,18 @@ async def websocket_get_devices(hass, connection, msg):
     connection.send_result(msg[ID], devices)
 
 
+@websocket_api.require_admin
+@websocket_api.async_response
+@websocket_api.websocket_command({vol.Required(TYPE): "zha/devices/initialization"})
+async def websocket_get_devices_initialization(hass, connection, msg):
+    """Get the progress of the ZHA device initialization."""
+    zha_gateway = hass.data[DATA_ZHA][DATA_ZHA_GATEWAY]
+
+    progress = [scheduler.as_dict() for scheduler in zha_gateway.initialization]
+
+    connection.send_result(msg[ID], progress)
+
+
 @websocket_api.require_admin
 @websocket_api.async_response
 @websocket_api.websocket_command({vol.Required(TYPE): "zha/devices/groupable"})
@@ -1227,6 +1239,7 @@ def async_load_api(hass):
 
     websocket_api.async_register_command(hass, websocket_permit_devices)
     websocket_api.async_register_command(hass, websocket_get_devices)
+    websocket_api.async_register_command(hass, websocket_get_devices_initialization)
     websocket_api.async_register_command(hass, websocket_get_groupable_devices)
     websocket_api.async_register_command(hass, websocket_get_groups)
     websocket_api.async_register_command(hass, websocket_get_device)
@@ -359,6 +359,11 @@ class ChannelPool:
         """Send a signal through hass dispatcher."""
         self._channels.async_send_signal(signal, *args)
 
+    @callback
+    def async_record_read(self, duration: float, success: bool) -> None:
+        """Record an attribute read of a channel."""
+        self._channels.zha_device.async_record_read(duration, success)
+
     @callback
     def claim_channels(self, channels: list[zha_typing.ChannelType]) -> None:
         """Claim a channel."""
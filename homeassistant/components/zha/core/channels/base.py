@@ -5,6 +5,7 @@ import asyncio
 from enum import Enum
 from functools import wraps
 import logging
+import time
 from typing import Any
 
 import zigpy.exceptions
@@ -88,6 +89,8 @@ class ZigbeeChannel(LogMixin):
     """Base channel for a Zigbee cluster."""
 
     REPORT_CONFIG = ()
+    # Attributes read together with the reported ones during initialization
+    ZCL_INIT_ATTRS: tuple[str, ...] = ()
     BIND: bool = True
 
     def __init__(
@@ -268,6 +271,7 @@ class ZigbeeChannel(LogMixin):
 
         self.debug("initializing channel: from_cache: %s", from_cache)
         attributes = [cfg["attr"] for cfg in self._report_config]
+        attributes.extend(self.ZCL_INIT_ATTRS)
         if attributes:
             await self.get_attributes(attributes, from_cache=from_cache)
 
@@ -332,6 +336,7 @@ class ZigbeeChannel(LogMixin):
         manufacturer_code = self._ch_pool.manufacturer_code
         if self.cluster.cluster_id >= 0xFC00 and manufacturer_code:
             manufacturer = manufacturer_code
+        start = time.monotonic()
         try:
             result, _ = await self.cluster.read_attributes(
                 attributes,
@@ -339,8 +344,10 @@ class ZigbeeChannel(LogMixin):
                 only_cache=from_cache and not self._ch_pool.is_mains_powered,
                 manufacturer=manufacturer,
             )
+            self._ch_pool.async_record_read(time.monotonic() - start, True)
             return result
         except (asyncio.TimeoutError, zigpy.exceptions.ZigbeeException) as ex:
+            self._ch_pool.async_record_read(time.monotonic() - start, False)
             self.debug(
                 "failed to get attributes '%s' on '%s' cluster: %s",
                 attributes,
@@ -447,14 +447,7 @@ class PowerConfigurationChannel(ZigbeeChannel):
         {"attr": "battery_voltage", "config": REPORT_CONFIG_BATTERY_SAVE},
         {"attr": "battery_percentage_remaining", "config": REPORT_CONFIG_BATTERY_SAVE},
     )
-
-    def async_initialize_channel_specific(self, from_cache: bool) -> Coroutine:
-        """Initialize channel specific attrs."""
-        attributes = [
-            "battery_size",
-            "battery_quantity",
-        ]
-        return self.get_attributes(attributes, from_cache=from_cache)
+    ZCL_INIT_ATTRS = ("battery_size", "battery_quantity")
 
 
 @registries.ZIGBEE_CHANNEL_REGISTRY.register(general.PowerProfile.cluster_id)
@@ -72,6 +72,7 @@ from .const import (
     ZHA_OPTIONS,
 )
 from .helpers import LogMixin, async_get_zha_config_value
+from .initialization import DeviceInitTiming
 
 _LOGGER = logging.getLogger(__name__)
 _UPDATE_ALIVE_INTERVAL = (60, 90)
@@ -131,6 +132,8 @@ class ZHADevice(LogMixin):
         )
         self._ha_device_id = None
         self.status = DeviceStatus.CREATED
+        # Set while the gateway initializes the device at startup
+        self.init_timing: DeviceInitTiming | None = None
         self._channels = channels.Channels(self)
 
     @property
@@ -451,6 +454,12 @@ class ZHADevice(LogMixin):
         self.status = DeviceStatus.INITIALIZED
         self.debug("completed initialization")
 
+    @callback
+    def async_record_read(self, duration: float, success: bool) -> None:
+        """Record an attribute read for the initialization timing."""
+        if self.init_timing is not None:
+            self.init_timing.record_read(duration, success)
+
     @callback
     def async_cleanup_handles(self) -> None:
         """Unsubscribe the dispatchers and timers."""
@@ -16,7 +16,8 @@ from zigpy.config import CONF_DEVICE
 import zigpy.device as zigpy_dev
 
 from homeassistant.components.system_log import LogEntry, _figure_out_source
-from homeassistant.core import callback
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import CoreState, Event, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.device_registry import (
     CONNECTION_ZIGBEE,
@@ -79,6 +80,11 @@ from .const import (
 )
 from .device import DeviceStatus, ZHADevice
 from .group import GroupMember, ZHAGroup
+from .initialization import (
+    MAX_CONCURRENCY,
+    DeviceInitScheduler,
+    async_get_priority_devices,
+)
 from .registries import GROUP_ENTITY_DOMAINS
 from .store import async_get_registry
 from .typing import ZhaGroupType, ZigpyEndpointType, ZigpyGroupType
@@ -124,6 +130,7 @@ class ZHAGateway:
         self._log_relay_handler = LogRelayHandler(hass, self)
         self.config_entry = config_entry
         self._unsubs = []
+        self.initialization: list[DeviceInitScheduler] = []
 
     async def async_initialize(self):
         """Initialize controller and connect radio."""
@@ -209,29 +216,43 @@ class ZHAGateway:
 
     async def async_initialize_devices_and_entities(self) -> None:
         """Initialize devices and load entities."""
-        semaphore = asyncio.Semaphore(2)
-
-        async def _throttle(zha_device: zha_typing.ZhaDeviceType, cached: bool):
-            async with semaphore:
-                await zha_device.async_initialize(from_cache=cached)
-
-        _LOGGER.debug("Loading battery powered devices")
-        await asyncio.gather(
-            *(
-                _throttle(dev, cached=True)
-                for dev in self.devices.values()
-                if not dev.is_mains_powered
-            )
+        # Battery powered devices are only loaded from the cache
+        battery = DeviceInitScheduler(
+            "battery powered", concurrency=MAX_CONCURRENCY, adaptive=False
         )
-
-        _LOGGER.debug("Loading mains powered devices")
-        await asyncio.gather(
-            *(
-                _throttle(dev, cached=False)
-                for dev in self.devices.values()
-                if dev.is_mains_powered
+        mains = DeviceInitScheduler("mains powered")
+        self.initialization = [battery, mains]
+
+        for zha_device in self.devices.values():
+            if zha_device.is_mains_powered:
+                mains.add(zha_device, from_cache=False, priority=False)
+            else:
+                battery.add(zha_device, from_cache=True, priority=False)
+
+        @callback
+        def async_prioritize(_: Event | None = None) -> None:
+            """Initialize the devices referenced by automations first."""
+            priority = async_get_priority_devices(self._hass, self)
+            for scheduler in (battery, mains):
+                scheduler.async_prioritize(priority)
+
+        async_prioritize()
+        unsub_started = None
+        if self._hass.state != CoreState.running:
+            # Automations may not be loaded yet
+            unsub_started = self._hass.bus.async_listen(
+                EVENT_HOMEASSISTANT_STARTED, async_prioritize
             )
-        )
+
+        try:
+            _LOGGER.debug("Loading battery powered devices")
+            await battery.async_run()
+
+            _LOGGER.debug("Loading mains powered devices")
+            await mains.async_run()
+        finally:
+            if unsub_started is not None:
+                unsub_started()
 
     def device_joined(self, device):
         """Handle device joined.
@@ -0,0 +1,250 @@
+"""Adaptive scheduling of ZHA device initialization."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Any
+
+from homeassistant.components.automation import (
+    DOMAIN as AUTOMATION_DOMAIN,
+    devices_in_automation,
+    entities_in_automation,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_registry import async_entries_for_device
+
+from . import typing as zha_typing
+
+_LOGGER = logging.getLogger(__name__)
+
+INITIAL_CONCURRENCY = 2
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
+# Reads slower than this multiple of the fastest observed reads mean the
+# radio is congested
+LATENCY_TOLERANCE = 2.5
+# Failing more reads than this means the radio is congested
+MAX_ERROR_RATE = 0.2
+
+
+class DeviceInitTiming:
+    """Progress and timing of the initialization of a device."""
+
+    def __init__(
+        self, zha_device: zha_typing.ZhaDeviceType, from_cache: bool, priority: bool
+    ) -> None:
+        """Initialize the timing."""
+        self.zha_device = zha_device
+        self.from_cache = from_cache
+        self.priority = priority
+        self.queued: float = time.monotonic()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.reads = 0
+        self.failed_reads = 0
+        self.read_time = 0.0
+        self.error: str | None = None
+
+    def record_read(self, duration: float, success: bool) -> None:
+        """Record an attribute read."""
+        self.reads += 1
+        self.read_time += duration
+        if not success:
+            self.failed_reads += 1
+
+    @property
+    def latency(self) -> float | None:
+        """Return the average latency of the attribute reads."""
+        if not self.reads:
+            return None
+        return self.read_time / self.reads
+
+    @property
+    def error_rate(self) -> float:
+        """Return the share of attribute reads that failed."""
+        if not self.reads:
+            return 0.0
+        return self.failed_reads / self.reads
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the timing."""
+        if self.finished is not None:
+            status = "failed" if self.error else "initialized"
+        elif self.started is not None:
+            status = "initializing"
+        else:
+            status = "queued"
+
+        return {
+            "ieee": str(self.zha_device.ieee),
+            "name": self.zha_device.name,
+            "status": status,
+            "from_cache": self.from_cache,
+            "priority": self.priority,
+            "wait_time": _elapsed(self.queued, self.started),
+            "duration": _elapsed(self.started, self.finished),
+            "reads": self.reads,
+            "failed_reads": self.failed_reads,
+            "error": self.error,
+        }
+
+
+def _elapsed(start: float | None, end: float | None) -> float | None:
+    """Return the seconds between two timestamps, rounded for display."""
+    if start is None:
+        return None
+    return round((end or time.monotonic()) - start, 3)
+
+
+@callback
+def async_get_priority_devices(hass: HomeAssistant, gateway) -> set[str]:
+    """Return the ieee of the devices referenced by automations."""
+    device_ids: set[str] = set()
+    entity_ids: set[str] = set()
+    for automation_id in hass.states.async_entity_ids(AUTOMATION_DOMAIN):
+        device_ids.update(devices_in_automation(hass, automation_id))
+        entity_ids.update(entities_in_automation(hass, automation_id))
+
+    priority = set()
+    for zha_device in gateway.devices.values():
+        if zha_device.device_id is None:
+            continue
+        if zha_device.device_id in device_ids or any(
+            entry.entity_id in entity_ids
+            for entry in async_entries_for_device(
+                gateway.ha_entity_registry, zha_device.device_id
+            )
+        ):
+            priority.add(str(zha_device.ieee))
+    return priority
+
+
+class DeviceInitScheduler:
+    """Initialize devices with a concurrency that adapts to the radio.
+
+    Devices referenced by automations go first, the queue is reordered when
+    they are only known once the initialization started. Every finished
+    device of an
+    adaptive scheduler adjusts the concurrency limit: it grows by one device
+    per window of finished devices while attribute reads stay fast and
+    succeed, and is halved once reads slow down or fail.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int = INITIAL_CONCURRENCY,
+        adaptive: bool = True,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.name = name
+        self.adaptive = adaptive
+        self.timings: dict[str, DeviceInitTiming] = {}
+        self.started: float | None = None
+        self.finished: float | None = None
+        self._limit = float(concurrency)
+        self._queue: deque[DeviceInitTiming] = deque()
+        self._base_latency: float | None = None
+        self._finished_since_decrease = 0
+
+    @property
+    def concurrency(self) -> int:
+        """Return the current concurrency limit."""
+        return int(self._limit)
+
+    def add(
+        self, zha_device: zha_typing.ZhaDeviceType, from_cache: bool, priority: bool
+    ) -> None:
+        """Queue a device for initialization."""
+        self.timings[str(zha_device.ieee)] = DeviceInitTiming(
+            zha_device, from_cache, priority
+        )
+
+    @callback
+    def async_prioritize(self, priority: set[str]) -> None:
+        """Initialize the queued devices with these ieee first."""
+        for ieee in priority:
+            if (timing := self.timings.get(ieee)) is not None:
+                timing.priority = True
+        self._queue = deque(sorted(self._queue, key=lambda timing: not timing.priority))
+
+    async def async_run(self) -> None:
+        """Initialize all queued devices."""
+        self.started = time.monotonic()
+        self._queue = deque(
+            sorted(self.timings.values(), key=lambda timing: not timing.priority)
+        )
+        pending: set[asyncio.Future] = set()
+
+        while self._queue or pending:
+            while self._queue and len(pending) < self.concurrency:
+                pending.add(
+                    asyncio.create_task(self._async_initialize(self._queue.popleft()))
+                )
+            _, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+
+        self.finished = time.monotonic()
+        _LOGGER.debug(
+            "Initialized %s %s devices in %.1fs, final concurrency: %s",
+            len(self.timings),
+            self.name,
+            self.finished - self.started,
+            self.concurrency,
+        )
+
+    async def _async_initialize(self, timing: DeviceInitTiming) -> None:
+        """Initialize a device and record its timing."""
+        zha_device = timing.zha_device
+        zha_device.init_timing = timing
+        timing.started = time.monotonic()
+        try:
+            await zha_device.async_initialize(from_cache=timing.from_cache)
+        except Exception as err:  # pylint: disable=broad-except
+            timing.error = str(err) or type(err).__name__
+            zha_device.warning("failed to initialize: %s", timing.error)
+        finally:
+            timing.finished = time.monotonic()
+            zha_device.init_timing = None
+        self._async_adjust(timing)
+
+    @callback
+    def _async_adjust(self, timing: DeviceInitTiming) -> None:
+        """Adjust the concurrency limit to a finished device."""
+        latency = timing.latency
+        if not self.adaptive or latency is None:
+            return
+
+        if self._base_latency is None or latency < self._base_latency:
+            self._base_latency = latency
+
+        self._finished_since_decrease += 1
+        congested = (
+            timing.error is not None
+            or timing.error_rate > MAX_ERROR_RATE
+            or latency > self._base_latency * LATENCY_TOLERANCE
+        )
+
+        if not congested:
+            # Additive increase, one device per window of finished devices
+            self._limit = min(MAX_CONCURRENCY, self._limit + 1 / self._limit)
+        elif self._finished_since_decrease >= self.concurrency:
+            # Multiplicative decrease, at most once per window so the devices
+            # that were already running do not collapse the limit
+            self._limit = max(MIN_CONCURRENCY, self._limit / 2)
+            self._finished_since_decrease = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress of the initialization."""
+        done = sum(timing.finished is not None for timing in self.timings.values())
+        return {
+            "name": self.name,
+            "total": len(self.timings),
+            "done": done,
+            "concurrency": self.concurrency,
+            "duration": _elapsed(self.started, self.finished),
+            "devices": [timing.as_dict() for timing in self.timings.values()],
+        }
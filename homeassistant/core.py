@@ -18,7 +18,7 @@ import re
 import threading
 from time import monotonic
 from types import MappingProxyType
-from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar, cast
+from typing import TYPE_CHECKING, Any, Callable, Optional, Protocol, TypeVar, cast
 
 import attr
 import voluptuous as vol
@@ -67,8 +67,8 @@ from homeassistant.util.async_ import (
 )
 import homeassistant.util.dt as dt_util
 from homeassistant.util.timeout import TimeoutManager
+import homeassistant.util.ulid as ulid_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
-import homeassistant.util.uuid as uuid_util
 
 # Typing imports that create a circular dependency
 if TYPE_CHECKING:
@@ -177,6 +177,16 @@ class HassJob:
         return f"<Job {self.job_type} {self.target}>"
 
 
+class JobInstrumentation(Protocol):
+    """Instrumentation of the jobs that run in the event loop."""
+
+    def wrap_callback(self, target: Callable) -> Callable:
+        """Return a callable that runs a callback and measures it."""
+
+    def wrap_coroutine(self, target: Callable, coro: Coroutine) -> Coroutine:
+        """Return a coroutine that runs the coroutine of a target and measures it."""
+
+
 def _get_callable_job_type(target: Callable) -> HassJobType:
     """Determine the job type from the callable."""
     # Check for partials to properly determine if coroutine function
@@ -232,6 +242,8 @@ class HomeAssistant:
         self._stopped: asyncio.Event | None = None
         # Timeout handler for Core/Helper namespace
         self.timeout: TimeoutManager = TimeoutManager()
+        # If not None, measures the callbacks and coroutines of jobs
+        self.job_instrumentation: JobInstrumentation | None = None
 
     @property
     def is_running(self) -> bool:
@@ -358,10 +370,19 @@ class HomeAssistant:
         hassjob: HassJob to call.
         args: parameters for method to call.
         """
+        instrumentation = self.job_instrumentation
         if hassjob.job_type == HassJobType.Coroutinefunction:
-            task = self.loop.create_task(hassjob.target(*args))
+            coro = hassjob.target(*args)
+            if instrumentation is not None:
+                coro = instrumentation.wrap_coroutine(hassjob.target, coro)
+            task = self.loop.create_task(coro)
         elif hassjob.job_type == HassJobType.Callback:
-            self.loop.call_soon(hassjob.target, *args)
+            if instrumentation is None:
+                self.loop.call_soon(hassjob.target, *args)
+            else:
+                self.loop.call_soon(
+                    instrumentation.wrap_callback(hassjob.target), *args
+                )
             return None
         else:
             task = self.loop.run_in_executor(  # type: ignore
@@ -429,7 +450,10 @@ class HomeAssistant:
         args: parameters for method to call.
         """
         if hassjob.job_type == HassJobType.Callback:
-            hassjob.target(*args)
+            if self.job_instrumentation is None:
+                hassjob.target(*args)
+            else:
+                self.job_instrumentation.wrap_callback(hassjob.target)(*args)
             return None
 
         return self.async_add_hass_job(hassjob, *args)
@@ -580,7 +604,7 @@ class Context:
 
     user_id: str = attr.ib(default=None)
     parent_id: str | None = attr.ib(default=None)
-    id: str = attr.ib(factory=uuid_util.random_uuid_hex)
+    id: str = attr.ib(factory=ulid_util.ulid_hex)
 
     def as_dict(self) -> dict[str, str | None]:
         """Return a dictionary representation of the context."""
@@ -721,8 +745,11 @@ class EventBus:
         if not listeners:
             return
 
+        instrumentation = self._hass.job_instrumentation
         for job, event_filter in listeners:
             if event_filter is not None:
+                if instrumentation is not None:
+                    event_filter = instrumentation.wrap_callback(event_filter)
                 try:
                     if not event_filter(event):
                         continue
@@ -34,10 +34,12 @@ from homeassistant.exceptions import HomeAssistantError, NoEntitySpecifiedError
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import EntityPlatform
 from homeassistant.helpers.entity_registry import RegistryEntry
+from homeassistant.helpers.entity_values import EntityValues
 from homeassistant.helpers.event import Event, async_track_entity_registry_updated_event
 from homeassistant.helpers.typing import StateType
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util, ensure_unique_string, slugify
+from homeassistant.util.unit_system import UnitSystem
 
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
@@ -49,6 +51,25 @@ SOURCE_PLATFORM_CONFIG = "platform_config"
 # epsilon to make the string representation readable
 FLOAT_PRECISION = abs(int(math.floor(math.log10(abs(sys.float_info.epsilon))))) - 1
 
+# Entity properties that rarely change, mapped to the attribute backing them.
+# As long as a subclass doesn't override the property, the state attribute
+# is cached until the backing attribute is set.
+STATIC_ATTRIBUTE_PROPERTIES = {
+    "unit_of_measurement": "_attr_unit_of_measurement",
+    "name": "_attr_name",
+    "icon": "_attr_icon",
+    "entity_picture": "_attr_entity_picture",
+    "assumed_state": "_attr_assumed_state",
+    "supported_features": "_attr_supported_features",
+    "device_class": "_attr_device_class",
+}
+_STATIC_ATTRIBUTE_BACKING = frozenset(STATIC_ATTRIBUTE_PROPERTIES.values())
+_STATIC_ATTRIBUTE_KEYS = {
+    "unit_of_measurement": ATTR_UNIT_OF_MEASUREMENT,
+    "entity_picture": ATTR_ENTITY_PICTURE,
+    "supported_features": ATTR_SUPPORTED_FEATURES,
+}
+
 
 @callback
 @bind_hass
@@ -161,6 +182,58 @@ def get_unit_of_measurement(hass: HomeAssistant, entity_id: str) -> str | None:
     return entry.unit_of_measurement
 
 
+class _StaticAttribute:
+    """Attribute backing a static property.
+
+    Setting it on an entity drops the cached state attributes of the entity.
+    Class level defaults are only wrapped when the class is created: assigning
+    a backing attribute on a class afterwards, like `SomeEntity._attr_icon =
+    ...`, replaces the descriptor and its later changes no longer invalidate
+    the cache. Set the attribute on the entity or in the class body instead.
+    """
+
+    __slots__ = ("name", "default")
+
+    def __init__(self, name: str, default: Any) -> None:
+        """Initialize the attribute."""
+        self.name = name
+        self.default = default
+
+    def __get__(self, obj: Entity | None, objtype: type | None = None) -> Any:
+        """Return the value of the attribute."""
+        if obj is None:
+            return self.default
+        return obj.__dict__.get(self.name, self.default)
+
+    def __set__(self, obj: Entity, value: Any) -> None:
+        """Set the value and invalidate the cached state attributes."""
+        obj.__dict__[self.name] = value
+        obj.__dict__["_static_attributes"] = None
+
+
+def _set_static_attribute(
+    attr: dict[str, Any], prop: str, value: Any, entry: RegistryEntry | None
+) -> None:
+    """Add the state attribute of a static entity property."""
+    if prop == "name":
+        # pylint: disable=consider-using-ternary
+        value = (entry and entry.name) or value
+        if value is not None:
+            attr[ATTR_FRIENDLY_NAME] = value
+    elif prop == "icon":
+        value = (entry and entry.icon) or value
+        if value is not None:
+            attr[ATTR_ICON] = value
+    elif prop == "assumed_state":
+        if value:
+            attr[ATTR_ASSUMED_STATE] = value
+    elif prop == "device_class":
+        if value is not None:
+            attr[ATTR_DEVICE_CLASS] = str(value)
+    elif value is not None:
+        attr[_STATIC_ATTRIBUTE_KEYS[prop]] = value
+
+
 class DeviceInfo(TypedDict, total=False):
     """Entity device information for device registry."""
 
@@ -203,6 +276,16 @@ class Entity(ABC):
     # Protect for multiple updates
     _update_staged = False
 
+    # State attributes of the static properties, with the registry entry,
+    # customize config and unit system they were calculated for
+    _static_attributes: tuple[Any, ...] | None = None
+
+    # Static properties overridden by the class, evaluated on every write
+    _dynamic_static_properties: tuple[str, ...] = ()
+
+    # A coalesced state write is scheduled for the next loop iteration
+    _state_write_pending = False
+
     # Process updates in parallel
     parallel_updates: asyncio.Semaphore | None = None
 
@@ -222,6 +305,7 @@ class Entity(ABC):
     # Entity Properties
     _attr_assumed_state: bool = False
     _attr_available: bool = True
+    _attr_coalesce_state_writes: bool = False
     _attr_context_recent_time: timedelta = timedelta(seconds=5)
     _attr_device_class: str | None = None
     _attr_device_info: DeviceInfo | None = None
@@ -237,6 +321,20 @@ class Entity(ABC):
     _attr_unique_id: str | None = None
     _attr_unit_of_measurement: str | None = None
 
+    def __init_subclass__(cls) -> None:
+        """Find the static properties the subclass calculates itself."""
+        super().__init_subclass__()
+        cls._dynamic_static_properties = tuple(
+            prop
+            for prop in STATIC_ATTRIBUTE_PROPERTIES
+            if getattr(cls, prop) is not getattr(Entity, prop)
+        )
+        # Class level defaults of backing attributes replace the descriptor
+        for name in _STATIC_ATTRIBUTE_BACKING:
+            default = cls.__dict__.get(name, _StaticAttribute)
+            if not hasattr(default, "__get__"):
+                setattr(cls, name, _StaticAttribute(name, default))
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -350,6 +448,15 @@ class Entity(ABC):
         """Flag supported features."""
         return self._attr_supported_features
 
+    @property
+    def coalesce_state_writes(self) -> bool:
+        """Return True if state writes within one loop iteration are folded.
+
+        The state is written once at the start of the next event loop
+        iteration, so attributes changed in between are only written once.
+        """
+        return self._attr_coalesce_state_writes
+
     @property
     def context_recent_time(self) -> timedelta:
         """Time that a context is considered recent."""
@@ -416,8 +523,60 @@ class Entity(ABC):
                 f"No entity id specified for entity {self.name}"
             )
 
+        if self._state_write_pending:
+            if self.platform:
+                self.platform.coalesced_state_writes += 1
+            return
+
+        if self.coalesce_state_writes:
+            self._state_write_pending = True
+            self.hass.loop.call_soon(self._async_write_coalesced_ha_state)
+            return
+
         self._async_write_ha_state()
 
+    @callback
+    def _async_write_coalesced_ha_state(self) -> None:
+        """Write a state write that was coalesced."""
+        self._state_write_pending = False
+        # The entity was removed while the write was pending
+        if self.platform and not self._added:
+            return
+        self._async_write_ha_state()
+
+    def _calculate_static_attributes(
+        self,
+        entry: RegistryEntry | None,
+        customize: EntityValues | None,
+        units: UnitSystem,
+    ) -> tuple[Any, ...]:
+        """Calculate the state attributes of the static properties.
+
+        Properties overridden by the entity class are left out, they are
+        evaluated on every state write.
+        """
+        attr: dict[str, Any] = {}
+        dynamic = self._dynamic_static_properties
+        for prop in STATIC_ATTRIBUTE_PROPERTIES:
+            if prop not in dynamic:
+                _set_static_attribute(attr, prop, getattr(self, prop), entry)
+
+        customize_attr = customize.get(self.entity_id) if customize else {}
+
+        # Decide if the state is a temperature to convert, unless that depends
+        # on attributes which are evaluated on every write.
+        convert_temperature: bool | None = None
+        unit_of_measure = customize_attr.get(ATTR_UNIT_OF_MEASUREMENT)
+        if unit_of_measure is None and "unit_of_measurement" not in dynamic:
+            unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
+        if unit_of_measure is not None:
+            convert_temperature = (
+                unit_of_measure in (TEMP_CELSIUS, TEMP_FAHRENHEIT)
+                and unit_of_measure != units.temperature_unit
+            )
+
+        return entry, customize, units, attr, customize_attr, convert_temperature
+
     def _stringify_state(self) -> str:
         """Convert state to string."""
         if not self.available:
@@ -460,35 +619,26 @@ class Entity(ABC):
                 extra_state_attributes = self.device_state_attributes
             attr.update(extra_state_attributes or {})
 
-        unit_of_measurement = self.unit_of_measurement
-        if unit_of_measurement is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
         entry = self.registry_entry
-        # pylint: disable=consider-using-ternary
-        name = (entry and entry.name) or self.name
-        if name is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        icon = (entry and entry.icon) or self.icon
-        if icon is not None:
-            attr[ATTR_ICON] = icon
-
-        entity_picture = self.entity_picture
-        if entity_picture is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
+        hass = self.hass
+        customize = hass.data.get(DATA_CUSTOMIZE)
+        units = hass.config.units
 
-        assumed_state = self.assumed_state
-        if assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        supported_features = self.supported_features
-        if supported_features is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+        static = self._static_attributes
+        if (
+            static is None
+            or static[0] is not entry
+            or static[1] is not customize
+            or static[2] is not units
+        ):
+            static = self._static_attributes = self._calculate_static_attributes(
+                entry, customize, units
+            )
+        _, _, _, static_attr, customize_attr, convert_temperature = static
 
-        device_class = self.device_class
-        if device_class is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
+        attr.update(static_attr)
+        for prop in self._dynamic_static_properties:
+            _set_static_attribute(attr, prop, getattr(self, prop), entry)
 
         end = timer()
 
@@ -516,24 +666,24 @@ class Entity(ABC):
             )
 
         # Overwrite properties that have been set in the config file.
-        if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+        attr.update(customize_attr)
 
         # Convert temperature if we detect one
-        try:
+        if convert_temperature is None:
             unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
-            units = self.hass.config.units
-            if (
+            convert_temperature = (
                 unit_of_measure in (TEMP_CELSIUS, TEMP_FAHRENHEIT)
                 and unit_of_measure != units.temperature_unit
-            ):
+            )
+        if convert_temperature:
+            try:
                 prec = len(state) - state.index(".") - 1 if "." in state else 0
-                temp = units.temperature(float(state), unit_of_measure)
+                temp = units.temperature(float(state), attr[ATTR_UNIT_OF_MEASUREMENT])
                 state = str(round(temp) if prec == 0 else round(temp, prec))
                 attr[ATTR_UNIT_OF_MEASUREMENT] = units.temperature_unit
-        except ValueError:
-            # Could not convert state to float
-            pass
+            except ValueError:
+                # Could not convert state to float
+                pass
 
         if (
             self._context_set is not None
@@ -814,6 +964,10 @@ class Entity(ABC):
                 self.parallel_updates.release()
 
 
+for _name in _STATIC_ATTRIBUTE_BACKING:
+    setattr(Entity, _name, _StaticAttribute(_name, Entity.__dict__[_name]))
+
+
 class ToggleEntity(Entity):
     """An abstract class for entities that can be turned on and off."""
 
@@ -7,6 +7,8 @@ from contextvars import ContextVar
 from datetime import datetime, timedelta
 import logging
 from logging import Logger
+import math
+from time import monotonic
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Callable, Protocol
 
@@ -34,6 +36,7 @@ from homeassistant.exceptions import (
 )
 from homeassistant.setup import async_start_setup
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.histogram import DurationHistogram
 
 from . import (
     config_validation as cv,
@@ -59,6 +62,13 @@ PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
 PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 
+# Share of the scan interval that spread updates of a platform may take
+DEFAULT_UPDATE_LATENCY_BUDGET = 0.5
+MAX_SPREAD_PARALLEL_UPDATES = 16
+# Weight of the latest update duration in the average update latency
+UPDATE_LATENCY_SMOOTHING = 0.2
+UPDATE_HISTOGRAM_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -110,6 +120,23 @@ class EntityPlatform:
         # which powers entity_component.add_entities
         self.parallel_updates_created = platform is None
 
+        # Fold repeated state writes of entities within one event loop iteration
+        self.coalesce_state_writes: bool = getattr(
+            platform, "COALESCE_STATE_WRITES", False
+        )
+        # Number of state writes that were folded into an already pending write
+        self.coalesced_state_writes = 0
+
+        # Spread polling updates over a latency budget instead of starting
+        # them all at once, adapting the concurrency to the update latency
+        self.spread_updates: bool = getattr(platform, "SPREAD_UPDATES", False)
+        self.update_latency_budget: timedelta = (
+            getattr(platform, "UPDATE_LATENCY_BUDGET", None)
+            or scan_interval * DEFAULT_UPDATE_LATENCY_BUDGET
+        )
+        self.update_latency: float | None = None
+        self.update_histograms: dict[str, DurationHistogram] = {}
+
         hass.data.setdefault(DATA_ENTITY_PLATFORM, {}).setdefault(
             self.platform_name, []
         ).append(self)
@@ -586,6 +613,11 @@ class EntityPlatform:
 
         await entity.add_to_platform_finish()
 
+        # The initial state is written right away, coalesce later writes
+        if self.coalesce_state_writes:
+            # pylint: disable=protected-access
+            entity._attr_coalesce_state_writes = True
+
     async def async_reset(self) -> None:
         """Remove all entities and reset data.
 
@@ -601,6 +633,7 @@ class EntityPlatform:
         await asyncio.gather(*tasks)
 
         self.async_unsub_polling()
+        self.update_histograms.clear()
         self._setup_complete = False
 
     @callback
@@ -698,14 +731,93 @@ class EntityPlatform:
             return
 
         async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
+            entities = [
+                entity for entity in self.entities.values() if entity.should_poll
+            ]
+            if not entities:
+                return
 
-            if tasks:
-                await asyncio.gather(*tasks)
+            if self.spread_updates:
+                await self._async_spread_updates(entities)
+            else:
+                await asyncio.gather(
+                    *(self._async_poll_entity(entity) for entity in entities)
+                )
+
+    async def _async_poll_entity(self, entity: Entity) -> None:
+        """Update an entity and record the duration of the update."""
+        start = monotonic()
+        await entity.async_update_ha_state(True)
+        duration = monotonic() - start
+
+        if entity.entity_id not in self.entities:
+            return
+        histogram = self.update_histograms.get(entity.entity_id)
+        if histogram is None:
+            histogram = self.update_histograms[entity.entity_id] = DurationHistogram(
+                UPDATE_HISTOGRAM_BUCKETS
+            )
+        histogram.record(duration)
+
+        if self.update_latency is None:
+            self.update_latency = duration
+        else:
+            self.update_latency += UPDATE_LATENCY_SMOOTHING * (
+                duration - self.update_latency
+            )
+
+    @callback
+    def async_update_concurrency(self, entity_count: int) -> int:
+        """Return how many updates may run at once to meet the latency budget."""
+        if self.update_latency is None:
+            return 1
+        budget = self.update_latency_budget.total_seconds()
+        needed = math.ceil(entity_count * self.update_latency / budget)
+        return min(max(needed, 1), MAX_SPREAD_PARALLEL_UPDATES)
+
+    async def _async_spread_updates(self, entities: list[Entity]) -> None:
+        """Start the updates evenly over the latency budget."""
+        step = self.update_latency_budget.total_seconds() / len(entities)
+        start = monotonic()
+        running: set[asyncio.Future] = set()
+
+        for index, entity in enumerate(entities):
+            delay = start + index * step - monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            while len(running) >= self.async_update_concurrency(len(entities)):
+                _, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+            if self.hass.is_stopping:
+                break
+            if self.entities.get(entity.entity_id) is not entity:
+                continue
+            running.add(self.hass.async_create_task(self._async_poll_entity(entity)))
+
+        if running:
+            await asyncio.wait(running)
+
+    @callback
+    def async_update_diagnostics(self) -> dict[str, Any]:
+        """Return the update latency and durations of the polling entities."""
+        entity_count = sum(entity.should_poll for entity in self.entities.values())
+        return {
+            "domain": self.domain,
+            "platform": self.platform_name,
+            "scan_interval": self.scan_interval.total_seconds(),
+            "spread_updates": self.spread_updates,
+            "latency_budget": self.update_latency_budget.total_seconds(),
+            "update_latency": self.update_latency,
+            "concurrency": self.async_update_concurrency(entity_count)
+            if self.spread_updates
+            else None,
+            "entities": {
+                entity_id: histogram.as_dict()
+                for entity_id, histogram in self.update_histograms.items()
+                if entity_id in self.entities
+            },
+        }
 
 
 current_platform: ContextVar[EntityPlatform | None] = ContextVar(
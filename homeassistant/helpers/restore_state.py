@@ -2,13 +2,21 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import suppress
 from datetime import datetime, timedelta
+import json
 import logging
+import os
 from typing import Any, cast
 
-from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
+)
 from homeassistant.core import (
     CoreState,
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -20,7 +28,7 @@ from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.singleton import singleton
-from homeassistant.helpers.storage import Store
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 import homeassistant.util.dt as dt_util
 
 DATA_RESTORE_STATE_TASK = "restore_state_task"
@@ -29,6 +37,7 @@ _LOGGER = logging.getLogger(__name__)
 
 STORAGE_KEY = "core.restore_state"
 STORAGE_VERSION = 1
+JOURNAL_KEY = f"{STORAGE_KEY}.journal"
 
 # How long between periodically saving the current states to disk
 STATE_DUMP_INTERVAL = timedelta(minutes=15)
@@ -36,6 +45,12 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# The journal is compacted into a new snapshot once it holds more entries than
+# the snapshot itself (but at least this many), or when it gets this old.
+# Compacting also refreshes when unchanged entities were last seen.
+JOURNAL_COMPACT_MIN_ENTRIES = 1000
+JOURNAL_COMPACT_INTERVAL = timedelta(days=1)
+
 
 class StoredState:
     """Object to represent a stored state."""
@@ -60,6 +75,46 @@ class StoredState:
         return cls(State.from_dict(json_dict["state"]), last_seen)
 
 
+class StateJournal:
+    """Append-only log of the states stored since the last snapshot.
+
+    Every line is a stored state in the same format as the snapshot. All
+    methods do I/O and must be run in the executor.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the journal."""
+        self.path = path
+
+    def load(self) -> list[dict[str, Any]]:
+        """Load the entries of the journal."""
+        entries = []
+        with suppress(FileNotFoundError), open(self.path, encoding="utf-8") as fil:
+            for line in fil:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # The last write was interrupted
+                    _LOGGER.warning("Ignoring corrupt entry in %s", self.path)
+        return entries
+
+    def append(self, stored_states: list[StoredState]) -> None:
+        """Append stored states to the journal."""
+        lines = [
+            json.dumps(stored_state.as_dict(), cls=JSONEncoder) + "\n"
+            for stored_state in stored_states
+        ]
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as fil:
+            fil.writelines(lines)
+
+    def clear(self) -> None:
+        """Remove all entries of the journal."""
+        with suppress(FileNotFoundError):
+            os.remove(self.path)
+
+
 class RestoreStateData:
     """Helper class for managing the helper saved data."""
 
@@ -89,6 +144,14 @@ class RestoreStateData:
                 }
                 _LOGGER.debug("Created cache with %s", list(data.last_states))
 
+            try:
+                entries = await hass.async_add_executor_job(data.journal.load)
+            except OSError as exc:
+                _LOGGER.error("Error loading last states journal", exc_info=exc)
+                entries = []
+
+            data.async_apply_journal(entries)
+
             if hass.state == CoreState.running:
                 data.async_setup_dump()
             else:
@@ -106,8 +169,44 @@ class RestoreStateData:
         self.store: Store = Store(
             hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
         )
+        self.journal = StateJournal(hass.config.path(STORAGE_DIR, JOURNAL_KEY))
         self.last_states: dict[str, StoredState] = {}
         self.entity_ids: set[str] = set()
+        # Entities whose stored state changed since it was last written
+        self._dirty: set[str] = set()
+        self._journal_entries = 0
+        self._last_compacted = dt_util.utcnow()
+        self._dump_lock = asyncio.Lock()
+
+    @callback
+    def async_apply_journal(self, entries: list[dict[str, Any]]) -> None:
+        """Apply journal entries on top of the loaded snapshot.
+
+        An entry only replaces a state that was not seen later, which also
+        makes entries of a journal that was not cleared after the last
+        snapshot harmless.
+        """
+        for item in entries:
+            try:
+                if not valid_entity_id(item["state"]["entity_id"]):
+                    continue
+                if dt_util.parse_datetime(item["last_seen"]) is None:
+                    raise ValueError(f"Invalid last_seen {item['last_seen']}")
+                stored_state = StoredState.from_dict(item)
+                entity_id = stored_state.state.entity_id
+                current = self.last_states.get(entity_id)
+                if current is None or stored_state.last_seen >= current.last_seen:
+                    self.last_states[entity_id] = stored_state
+            except (
+                AttributeError,
+                HomeAssistantError,
+                KeyError,
+                TypeError,
+                ValueError,
+            ) as err:
+                # A corrupt entry only loses the state it holds
+                _LOGGER.warning("Ignoring invalid state journal entry: %s", err)
+        self._journal_entries = len(entries)
 
     @callback
     def async_get_stored_states(self) -> list[StoredState]:
@@ -152,17 +251,97 @@ class RestoreStateData:
         return stored_states
 
     async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
+        """Save a snapshot of the current state machine to storage."""
         _LOGGER.debug("Dumping states")
-        try:
-            await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+        async with self._dump_lock:
+            dirty = set(self._dirty)
+            self._dirty.clear()
+            stored_states = self.async_get_stored_states()
+            try:
+                await self.store.async_save(
+                    [stored_state.as_dict() for stored_state in stored_states]
+                )
+            except HomeAssistantError as exc:
+                _LOGGER.error("Error saving current states", exc_info=exc)
+                # The changes are written again with the next dump
+                self._dirty.update(dirty)
+                return
+
+            self._last_compacted = dt_util.utcnow()
+            # The snapshot is only written at the final write when stopping.
+            # The journal is left alone, its entries have all been superseded.
+            if self.hass.state == CoreState.stopping:
+                return
+
+            try:
+                await self.hass.async_add_executor_job(self.journal.clear)
+            except OSError as exc:
+                _LOGGER.error("Error clearing last states journal", exc_info=exc)
+                return
+            self._journal_entries = 0
+
+    async def async_dump_changed_states(self) -> None:
+        """Append the states that changed since they were last written."""
+        if self._journal_needs_compaction():
+            await self.async_dump_states()
+            return
+
+        async with self._dump_lock:
+            stored_states = self._async_get_changed_stored_states()
+            if not stored_states:
+                return
+
+            _LOGGER.debug("Dumping %s changed states", len(stored_states))
+            try:
+                await self.hass.async_add_executor_job(
+                    self.journal.append, stored_states
+                )
+            except (OSError, TypeError, ValueError) as exc:
+                _LOGGER.error("Error saving changed states", exc_info=exc)
+                self._dirty.update(
+                    stored_state.state.entity_id for stored_state in stored_states
+                )
+                return
+            self._journal_entries += len(stored_states)
+
+    def _journal_needs_compaction(self) -> bool:
+        """Return if the journal should be compacted into a new snapshot."""
+        return (
+            self._journal_entries
+            >= max(
+                JOURNAL_COMPACT_MIN_ENTRIES,
+                len(self.entity_ids) + len(self.last_states),
             )
-        except HomeAssistantError as exc:
-            _LOGGER.error("Error saving current states", exc_info=exc)
+            or dt_util.utcnow() - self._last_compacted >= JOURNAL_COMPACT_INTERVAL
+        )
+
+    @callback
+    def _async_get_changed_stored_states(self) -> list[StoredState]:
+        """Get the stored states of the entities that changed."""
+        now = dt_util.utcnow()
+        stored_states = []
+
+        for entity_id in self._dirty:
+            if entity_id in self.entity_ids:
+                state = self.hass.states.get(entity_id)
+                if state is None or state.attributes.get(entity_registry.ATTR_RESTORED):
+                    continue
+                stored_states.append(StoredState(state, now))
+            elif entity_id in self.last_states:
+                stored_states.append(self.last_states[entity_id])
+
+        self._dirty.clear()
+        return stored_states
+
+    @callback
+    def _async_is_restore_entity_event(self, event: Event) -> bool:
+        """Return if a state changed event belongs to a restore entity."""
+        return event.data["entity_id"] in self.entity_ids
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Mark an entity as changed."""
+        self._dirty.add(event.data["entity_id"])
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
@@ -171,18 +350,28 @@ class RestoreStateData:
         async def _async_dump_states(*_: Any) -> None:
             await self.async_dump_states()
 
+        async def _async_dump_changed_states(*_: Any) -> None:
+            await self.async_dump_changed_states()
+
+        cancel_state_listener = self.hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            self._async_state_changed,
+            event_filter=self._async_is_restore_entity_event,
+        )
+
         # Dump the initial states now. This helps minimize the risk of having
         # old states loaded by overwriting the last states once Home Assistant
         # has started and the old states have been read.
         self.hass.async_create_task(_async_dump_states())
 
-        # Dump states periodically
+        # Dump changed states periodically
         cancel_interval = async_track_time_interval(
-            self.hass, _async_dump_states, STATE_DUMP_INTERVAL
+            self.hass, _async_dump_changed_states, STATE_DUMP_INTERVAL
         )
 
         async def _async_dump_states_at_stop(*_: Any) -> None:
             cancel_interval()
+            cancel_state_listener()
             await self.async_dump_states()
 
         # Dump states when stopping hass
@@ -194,6 +383,7 @@ class RestoreStateData:
     def async_restore_entity_added(self, entity_id: str) -> None:
         """Store this entity's state when hass is shutdown."""
         self.entity_ids.add(entity_id)
+        self._dirty.add(entity_id)
 
     @callback
     def async_restore_entity_removed(self, entity_id: str) -> None:
@@ -210,6 +400,7 @@ class RestoreStateData:
             self.last_states[entity_id] = StoredState(state, dt_util.utcnow())
 
         self.entity_ids.remove(entity_id)
+        self._dirty.add(entity_id)
 
 
 def _encode(value: Any) -> Any:
@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 import logging
+import random
 from time import monotonic
-from typing import Callable, Generic, TypeVar
+from typing import Any, Callable, Generic, TypeVar
 import urllib.error
+import weakref
 
 import aiohttp
 import requests
@@ -19,10 +22,19 @@ from homeassistant.helpers import entity, event
 from homeassistant.util.dt import utcnow
 
 from .debounce import Debouncer
+from .singleton import singleton
 
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 10
 REQUEST_REFRESH_DEFAULT_IMMEDIATE = True
 
+DATA_REFRESH_SCHEDULER = "update_coordinator_refresh_scheduler"
+DEFAULT_RESOURCE_CONCURRENCY = 1
+DEFAULT_RESOURCE_MIN_INTERVAL = timedelta(0)
+# Refreshes of different resources are spread over this many seconds
+MAX_REFRESH_JITTER = 5
+# Failing coordinators of a resource refresh at most this many times slower
+MAX_BACKOFF_FACTOR = 8
+
 T = TypeVar("T")
 
 
@@ -42,13 +54,21 @@ class DataUpdateCoordinator(Generic[T]):
         update_interval: timedelta | None = None,
         update_method: Callable[[], Awaitable[T]] | None = None,
         request_refresh_debouncer: Debouncer | None = None,
+        resource_key: str | None = None,
     ) -> None:
-        """Initialize global data updater."""
+        """Initialize global data updater.
+
+        Coordinators that pass the same resource_key, like a host or an API,
+        are refreshed together by the refresh scheduler, which limits how
+        many of them refresh at once and backs off when they fail.
+        """
         self.hass = hass
         self.logger = logger
         self.name = name
         self.update_method = update_method
         self.update_interval = update_interval
+        self.resource_key = resource_key
+        self.refresh_stats = RefreshStats(name, resource_key)
         self.config_entry = config_entries.current_entry.get()
 
         # It's None before the first successful update.
@@ -78,6 +98,11 @@ class DataUpdateCoordinator(Generic[T]):
 
         self._debounced_refresh = request_refresh_debouncer
 
+    @property
+    def refresh_scheduled(self) -> bool:
+        """Return if a refresh is scheduled."""
+        return self._unsub_refresh is not None
+
     @callback
     def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
         """Listen for data updates."""
@@ -118,14 +143,21 @@ class DataUpdateCoordinator(Generic[T]):
             self._unsub_refresh()
             self._unsub_refresh = None
 
+        if self.resource_key is not None:
+            self._unsub_refresh = async_get_refresh_scheduler(self.hass).async_schedule(
+                self, self._job
+            )
+            return
+
         # We _floor_ utcnow to create a schedule on a rounded second,
         # minimizing the time between the point and the real activation.
         # That way we obtain a constant update frequency,
         # as long as the update process takes less than a second
+        self.refresh_stats.next_refresh = (
+            utcnow().replace(microsecond=0) + self.update_interval
+        )
         self._unsub_refresh = event.async_track_point_in_utc_time(
-            self.hass,
-            self._job,
-            utcnow().replace(microsecond=0) + self.update_interval,
+            self.hass, self._job, self.refresh_stats.next_refresh
         )
 
     async def _handle_refresh_interval(self, _now: datetime) -> None:
@@ -182,9 +214,17 @@ class DataUpdateCoordinator(Generic[T]):
 
         start = monotonic()
         auth_failed = False
+        success = False
 
         try:
-            self.data = await self._async_update_data()
+            if self.resource_key is None:
+                self.data = await self._async_update_data()
+            else:
+                resource = async_get_refresh_scheduler(self.hass).async_get_resource(
+                    self.resource_key
+                )
+                async with resource.async_slot():
+                    self.data = await self._async_update_data()
 
         except (asyncio.TimeoutError, requests.exceptions.Timeout) as err:
             self.last_exception = err
@@ -248,15 +288,20 @@ class DataUpdateCoordinator(Generic[T]):
                 )
 
         else:
+            success = True
             if not self.last_update_success:
                 self.last_update_success = True
                 self.logger.info("Fetching %s data recovered", self.name)
 
         finally:
+            duration = monotonic() - start
             self.logger.debug(
                 "Finished fetching %s data in %.3f seconds",
                 self.name,
-                monotonic() - start,
+                duration,
+            )
+            async_get_refresh_scheduler(self.hass).async_record_refresh(
+                self, duration, success
             )
             if not auth_failed and self._listeners and not self.hass.is_stopping:
                 self._schedule_refresh()
@@ -295,6 +340,267 @@ class DataUpdateCoordinator(Generic[T]):
             self._unsub_refresh = None
 
 
+class RefreshStats:
+    """Refresh statistics of a coordinator."""
+
+    def __init__(self, name: str, resource_key: str | None) -> None:
+        """Initialize the statistics."""
+        self.name = name
+        self.resource_key = resource_key
+        self.refreshes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.total_duration = 0.0
+        self.last_duration: float | None = None
+        self.last_refresh: datetime | None = None
+        self.next_refresh: datetime | None = None
+
+    @callback
+    def async_record(self, duration: float, success: bool) -> None:
+        """Record a finished refresh."""
+        self.refreshes += 1
+        self.total_duration += duration
+        self.last_duration = duration
+        self.last_refresh = utcnow()
+        if success:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+    def as_dict(self, scheduled: bool) -> dict[str, Any]:
+        """Return a dictionary representation of the statistics."""
+        return {
+            "name": self.name,
+            "resource_key": self.resource_key,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_duration": self.last_duration,
+            "average_duration": (
+                self.total_duration / self.refreshes if self.refreshes else None
+            ),
+            "last_refresh": self.last_refresh,
+            "next_refresh": self.next_refresh if scheduled else None,
+        }
+
+
+class RefreshResource:
+    """A host or API shared by coordinators.
+
+    Scheduled refreshes of the coordinators are aligned to a grid of their
+    update interval, shifted by a random offset per resource, so that they
+    are batched by one timer. The number of concurrent refreshes and the
+    time between their starts are limited. Changing the limits doesn't affect
+    the refreshes that already started.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: str,
+        concurrency: int = DEFAULT_RESOURCE_CONCURRENCY,
+        min_interval: timedelta = DEFAULT_RESOURCE_MIN_INTERVAL,
+    ) -> None:
+        """Initialize the resource."""
+        self.hass = hass
+        self.key = key
+        self.anchor = utcnow().replace(microsecond=0) + timedelta(
+            seconds=random.uniform(0, MAX_REFRESH_JITTER)
+        )
+        self.active = 0
+        self._slots = 0
+        self._waiters: list[asyncio.Future[None]] = []
+        self._due: dict[DataUpdateCoordinator, tuple[datetime, HassJob]] = {}
+        self._job = HassJob(self._async_handle_timer)
+        self._timer_at: datetime | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._next_start = 0.0
+        self.async_configure(concurrency, min_interval)
+
+    @callback
+    def async_configure(self, concurrency: int, min_interval: timedelta) -> None:
+        """Set the limits of the resource."""
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self._async_wake_waiters()
+
+    @callback
+    def _async_wake_waiters(self) -> None:
+        """Wake as many waiting refreshes as there are free slots."""
+        free = self.concurrency - self._slots
+        for waiter in self._waiters:
+            if free <= 0:
+                return
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        """Wait until the limits of the resource allow a refresh."""
+        while self._slots >= self.concurrency:
+            waiter: asyncio.Future[None] = self.hass.loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass on a wake up that came before the cancellation
+                if waiter.done() and not waiter.cancelled():
+                    self._waiters.remove(waiter)
+                    self._async_wake_waiters()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+        self._slots += 1
+        try:
+            delay = self._next_start - monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = monotonic() + self.min_interval.total_seconds()
+            self.active += 1
+            try:
+                yield
+            finally:
+                self.active -= 1
+        finally:
+            self._slots -= 1
+            self._async_wake_waiters()
+
+    @callback
+    def async_next_refresh(self, interval: timedelta, delay: timedelta) -> datetime:
+        """Return the point of the interval grid closest to a delay from now."""
+        target = utcnow() + delay
+        aligned = self.anchor + interval * round((target - self.anchor) / interval)
+        if aligned < target - delay / 2:
+            aligned += interval
+        return aligned
+
+    @callback
+    def async_schedule(
+        self, coordinator: DataUpdateCoordinator, when: datetime, job: HassJob
+    ) -> CALLBACK_TYPE:
+        """Schedule a refresh of a coordinator, the job is run with the time."""
+        due = self._due[coordinator] = (when, job)
+        if self._timer_at is None or when < self._timer_at:
+            self._async_set_timer(when)
+
+        @callback
+        def cancel() -> None:
+            """Cancel the refresh."""
+            if self._due.get(coordinator) is not due:
+                return
+            del self._due[coordinator]
+            if not self._due and self._unsub_timer:
+                self._unsub_timer()
+                self._unsub_timer = None
+                self._timer_at = None
+
+        return cancel
+
+    @callback
+    def _async_set_timer(self, when: datetime) -> None:
+        """Set the timer of the next batch of refreshes."""
+        if self._unsub_timer:
+            self._unsub_timer()
+        self._timer_at = when
+        self._unsub_timer = event.async_track_point_in_utc_time(
+            self.hass, self._job, when
+        )
+
+    @callback
+    def _async_handle_timer(self, now: datetime) -> None:
+        """Refresh the coordinators that are due."""
+        self._unsub_timer = None
+        self._timer_at = None
+        due = [crd for crd, (when, _) in self._due.items() if when <= now]
+        for coordinator in due:
+            _, job = self._due.pop(coordinator)
+            self.hass.async_run_hass_job(job, now)
+        if self._due:
+            self._async_set_timer(min(when for when, _ in self._due.values()))
+
+
+class RefreshScheduler:
+    """Schedule refreshes of coordinators and keep their statistics."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._resources: dict[str, RefreshResource] = {}
+        self._coordinators: weakref.WeakSet[DataUpdateCoordinator] = weakref.WeakSet()
+
+    @callback
+    def async_get_resource(self, key: str) -> RefreshResource:
+        """Return a resource, creating it with the default limits."""
+        resource = self._resources.get(key)
+        if resource is None:
+            resource = self._resources[key] = RefreshResource(self.hass, key)
+        return resource
+
+    @callback
+    def async_configure_resource(
+        self,
+        key: str,
+        *,
+        concurrency: int = DEFAULT_RESOURCE_CONCURRENCY,
+        min_interval: timedelta = DEFAULT_RESOURCE_MIN_INTERVAL,
+    ) -> None:
+        """Limit the concurrent refreshes and the time between their starts."""
+        self.async_get_resource(key).async_configure(concurrency, min_interval)
+
+    @callback
+    def async_schedule(
+        self, coordinator: DataUpdateCoordinator, job: HassJob
+    ) -> CALLBACK_TYPE:
+        """Schedule the next refresh of a coordinator with a resource key."""
+        assert coordinator.resource_key is not None
+        assert coordinator.update_interval is not None
+        self._coordinators.add(coordinator)
+        stats = coordinator.refresh_stats
+        interval = coordinator.update_interval
+        delay = interval * min(2 ** stats.consecutive_failures, MAX_BACKOFF_FACTOR)
+        resource = self.async_get_resource(coordinator.resource_key)
+        stats.next_refresh = resource.async_next_refresh(interval, delay)
+        return resource.async_schedule(coordinator, stats.next_refresh, job)
+
+    @callback
+    def async_record_refresh(
+        self, coordinator: DataUpdateCoordinator, duration: float, success: bool
+    ) -> None:
+        """Record a finished refresh of a coordinator."""
+        self._coordinators.add(coordinator)
+        coordinator.refresh_stats.async_record(duration, success)
+
+    @callback
+    def async_diagnostics(self) -> dict[str, Any]:
+        """Return the statistics of the coordinators and resources."""
+        return {
+            "resources": [
+                {
+                    "key": resource.key,
+                    "concurrency": resource.concurrency,
+                    "min_interval": resource.min_interval.total_seconds(),
+                    "active": resource.active,
+                }
+                for resource in self._resources.values()
+            ],
+            "coordinators": [
+                coordinator.refresh_stats.as_dict(coordinator.refresh_scheduled)
+                for coordinator in self._coordinators
+            ],
+        }
+
+
+@callback
+@singleton(DATA_REFRESH_SCHEDULER)
+def async_get_refresh_scheduler(hass: HomeAssistant) -> RefreshScheduler:
+    """Return the refresh scheduler."""
+    return RefreshScheduler(hass)
+
+
 class CoordinatorEntity(Generic[T], entity.Entity):
     """A class for entities using DataUpdateCoordinator."""
 
@@ -377,6 +377,37 @@ async def valid_entity_id(hass):
     return timer() - start
 
 
+@benchmark
+async def write_entity_states(hass):
+    """Write 100k states of 5000 sensor entities."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.sensor import SensorEntity
+
+    class BenchmarkSensor(SensorEntity):
+        """Sensor with the attributes of a typical temperature sensor."""
+
+        _attr_device_class = "temperature"
+        _attr_icon = "mdi:thermometer"
+        _attr_unit_of_measurement = "°C"
+
+    entities = []
+    for idx in range(5000):
+        entity = BenchmarkSensor()
+        entity.hass = hass
+        entity.entity_id = f"sensor.benchmark_{idx}"
+        entity._attr_name = f"Benchmark {idx}"  # pylint: disable=protected-access
+        entities.append(entity)
+
+    start = timer()
+
+    for value in range(20):
+        for entity in entities:
+            entity._attr_state = value  # pylint: disable=protected-access
+            entity.async_write_ha_state()
+
+    return timer() - start
+
+
 @benchmark
 async def json_serialize_states(hass):
     """Serialize million states with websocket default encoder."""
@@ -390,6 +421,77 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def sorted_states_to_dict(hass):
+    """Serialize a million history rows with LazyState and the default encoder."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder import history
+
+    rows = _create_history_rows(10 ** 6)
+
+    start = timer()
+    # pylint: disable=protected-access
+    result = history._sorted_states_to_dict(
+        hass, None, rows, dt_util.utcnow(), None, include_start_time_state=False
+    )
+    JSON_DUMP(list(result.values()))
+    return timer() - start
+
+
+@benchmark
+async def sorted_states_to_json(hass):
+    """Serialize a million history rows with the columnar JSON fragments."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder import history
+
+    rows = _create_history_rows(10 ** 6)
+
+    start = timer()
+    # pylint: disable=protected-access
+    result = history._sorted_states_to_json(
+        hass, None, rows, dt_util.utcnow(), None, include_start_time_state=False
+    )
+    ",".join("[%s]" % ",".join(states) for _, states in result)
+    return timer() - start
+
+
+def _create_history_rows(count):
+    """Create history rows of sensors that change state every update."""
+    row = collections.namedtuple(
+        "Row",
+        [
+            "domain",
+            "entity_id",
+            "state",
+            "attributes",
+            "last_changed_ts",
+            "last_updated_ts",
+        ],
+    )
+    entities = 100
+    per_entity = count // entities
+    start_ts = dt_util.utcnow().timestamp()
+    rows = []
+    for entity in range(entities):
+        entity_id = f"sensor.power_{entity}"
+        attributes = json.dumps(
+            {"unit_of_measurement": "W", "friendly_name": f"Power {entity}"}
+        )
+        for index in range(per_entity):
+            row_ts = start_ts + index * 5
+            rows.append(
+                row(
+                    "sensor",
+                    entity_id,
+                    str(index % 250),
+                    attributes,
+                    row_ts,
+                    row_ts,
+                )
+            )
+    return rows
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -405,7 +507,7 @@ def _create_state_changed_event_from_old_new(
         [
             "event_type"
             "event_data"
-            "time_fired"
+            "time_fired_ts"
             "context_id"
             "context_user_id"
             "state"
@@ -420,12 +522,16 @@ def _create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
-    row.time_fired = event_time_fired
+    row.time_fired_ts = event_time_fired.timestamp()
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
     row.domain = entity_id and core.split_entity_id(entity_id)[0]
     row.context_id = None
     row.context_user_id = None
+    row.context_parent_id = None
+    row.context_id_bin = None
+    row.context_user_id_bin = None
+    row.context_parent_id_bin = None
     row.old_state_id = old_state and 1
     row.state_id = new_state and 1
 
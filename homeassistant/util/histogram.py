@@ -0,0 +1,40 @@
+"""Histogram of durations with fixed buckets."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Any
+
+# Upper bounds in seconds of the buckets of a histogram, an extra bucket
+# holds the durations above the last bound.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+
+class DurationHistogram:
+    """Count, total, maximum and bucketed counts of durations in seconds."""
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize the histogram."""
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float) -> None:
+        """Record a duration."""
+        self.buckets[bisect_left(self.bounds, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the histogram."""
+        bounds = [str(bound) for bound in self.bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "total": self.total,
+            "average": self.total / self.count if self.count else None,
+            "max": self.max,
+            "buckets": dict(zip(bounds, self.buckets)),
+        }
@@ -0,0 +1,33 @@
+"""Helpers to generate ulids."""
+from __future__ import annotations
+
+from random import getrandbits
+import re
+import time
+
+ULID_HEX = re.compile("[0-9a-f]{32}")
+
+
+def ulid_hex() -> str:
+    """Generate a ULID as 32 lowercase hex characters.
+
+    The first 48 bits are the milliseconds since the epoch, so ids sort in
+    the order they were generated, the other 80 bits are random. It has the
+    format of random_uuid_hex and should not be used for cryptographically
+    secure operations either.
+    """
+    return f"{int(time.time() * 1000):012x}{getrandbits(80):020x}"
+
+
+def ulid_hex_to_bytes(value: str | None) -> bytes | None:
+    """Return the 16 bytes of a ULID or UUID hex, None for other ids."""
+    if value is None or not ULID_HEX.fullmatch(value):
+        return None
+    return bytes.fromhex(value)
+
+
+def bytes_to_ulid_hex(value: bytes | None) -> str | None:
+    """Return the hex of the 16 bytes of a ULID or UUID."""
+    if value is None:
+        return None
+    return value.hex()
@@ -657,6 +657,16 @@ class MockEntityPlatform(entity_platform.EntityPlatform):
         # Otherwise the constructor will blow up.
         if isinstance(platform, Mock) and isinstance(platform.PARALLEL_UPDATES, Mock):
             platform.PARALLEL_UPDATES = 0
+        if isinstance(platform, Mock) and isinstance(
+            platform.COALESCE_STATE_WRITES, Mock
+        ):
+            platform.COALESCE_STATE_WRITES = False
+        if isinstance(platform, Mock) and isinstance(platform.SPREAD_UPDATES, Mock):
+            platform.SPREAD_UPDATES = False
+        if isinstance(platform, Mock) and isinstance(
+            platform.UPDATE_LATENCY_BUDGET, Mock
+        ):
+            platform.UPDATE_LATENCY_BUDGET = None
 
         super().__init__(
             hass=hass,
@@ -1020,6 +1030,23 @@ def mock_storage(data=None):
         """Remove data."""
         data.pop(store.key, None)
 
+    journals = {}
+
+    def mock_journal_load(journal):
+        """Mock version of loading a restore state journal."""
+        return [json.loads(line) for line in journals.get(journal.path, [])]
+
+    def mock_journal_append(journal, stored_states):
+        """Mock version of appending to a restore state journal."""
+        journals.setdefault(journal.path, []).extend(
+            json.dumps(stored_state.as_dict(), cls=JSONEncoder)
+            for stored_state in stored_states
+        )
+
+    def mock_journal_clear(journal):
+        """Mock version of clearing a restore state journal."""
+        journals.pop(journal.path, None)
+
     with patch(
         "homeassistant.helpers.storage.Store._async_load",
         side_effect=mock_async_load,
@@ -1032,6 +1059,18 @@ def mock_storage(data=None):
         "homeassistant.helpers.storage.Store.async_remove",
         side_effect=mock_remove,
         autospec=True,
+    ), patch(
+        "homeassistant.helpers.restore_state.StateJournal.load",
+        side_effect=mock_journal_load,
+        autospec=True,
+    ), patch(
+        "homeassistant.helpers.restore_state.StateJournal.append",
+        side_effect=mock_journal_append,
+        autospec=True,
+    ), patch(
+        "homeassistant.helpers.restore_state.StateJournal.clear",
+        side_effect=mock_journal_clear,
+        autospec=True,
     ):
         yield data
 
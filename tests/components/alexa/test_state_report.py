@@ -1,11 +1,15 @@
 """Test report state."""
+import asyncio
 from unittest.mock import patch
 
 from homeassistant import core
 from homeassistant.components.alexa import state_report
+from homeassistant.components.alexa.entities import BinarySensorCapabilities
 
 from . import DEFAULT_CONFIG, TEST_URL
 
+from tests.test_util.aiohttp import AiohttpClientMockResponse
+
 
 async def test_report_state(hass, aioclient_mock):
     """Test proactive state reports."""
@@ -305,3 +309,118 @@ async def test_proactive_mode_filter_states(hass, aioclient_mock):
 
         await hass.async_block_till_done()
     assert len(aioclient_mock.mock_calls) == 1
+
+
+async def test_report_state_coalesced(hass, aioclient_mock):
+    """Test changes of an entity in quick succession are reported once."""
+    aioclient_mock.post(TEST_URL, text="", status=202)
+
+    hass.states.async_set(
+        "binary_sensor.test_contact",
+        "on",
+        {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+    )
+
+    await state_report.async_enable_proactive_mode(hass, DEFAULT_CONFIG)
+    reporter = DEFAULT_CONFIG.state_reporter
+
+    for state in ("off", "on", "off"):
+        hass.states.async_set(
+            "binary_sensor.test_contact",
+            state,
+            {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+        )
+    await asyncio.sleep(0)
+    assert reporter.queue_depth == 1
+
+    await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 1
+    call_json = aioclient_mock.mock_calls[0][2]
+    assert (
+        call_json["event"]["payload"]["change"]["properties"][0]["value"]
+        == "NOT_DETECTED"
+    )
+    assert reporter.stats["queue_depth"] == 0
+    assert reporter.stats["sent"] == 1
+    assert reporter.stats["coalesced"] == 2
+    assert reporter.stats["latency_max"] > 0
+
+    reporter.async_stop()
+
+
+async def test_report_state_retry(hass, aioclient_mock):
+    """Test failed reports are retried."""
+    responses = [
+        AiohttpClientMockResponse("post", TEST_URL, status=500),
+        AiohttpClientMockResponse("post", TEST_URL, exc=asyncio.TimeoutError()),
+        AiohttpClientMockResponse("post", TEST_URL, status=202),
+    ]
+
+    async def event_gateway(method, url, data):
+        """Fail the first requests."""
+        return responses.pop(0)
+
+    aioclient_mock.post(TEST_URL, side_effect=event_gateway)
+
+    hass.states.async_set(
+        "binary_sensor.test_contact",
+        "on",
+        {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+    )
+
+    await state_report.async_enable_proactive_mode(hass, DEFAULT_CONFIG)
+    reporter = DEFAULT_CONFIG.state_reporter
+
+    with patch.object(state_report, "REPORT_RETRY_DELAY", 0):
+        hass.states.async_set(
+            "binary_sensor.test_contact",
+            "off",
+            {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+        )
+        await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 3
+    assert not responses
+    assert reporter.stats["sent"] == 1
+    assert reporter.stats["retried"] == 2
+    assert reporter.stats["failed"] == 0
+
+    reporter.async_stop()
+
+
+async def test_report_state_reuses_entity(hass, aioclient_mock):
+    """Test the Alexa entity is reused until the attributes change."""
+    aioclient_mock.post(TEST_URL, text="", status=202)
+
+    await state_report.async_enable_proactive_mode(hass, DEFAULT_CONFIG)
+
+    with patch(
+        "homeassistant.components.alexa.entities.BinarySensorCapabilities.interfaces",
+        autospec=True,
+        side_effect=BinarySensorCapabilities.interfaces,
+    ) as mock_interfaces:
+        for state in ("on", "off", "on"):
+            hass.states.async_set(
+                "binary_sensor.test_contact",
+                state,
+                {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+            )
+            await hass.async_block_till_done()
+        assert len(mock_interfaces.mock_calls) == 1
+
+        hass.states.async_set(
+            "binary_sensor.test_contact",
+            "off",
+            {"friendly_name": "Renamed Contact Sensor", "device_class": "door"},
+        )
+        await hass.async_block_till_done()
+        assert len(mock_interfaces.mock_calls) == 2
+
+    assert len(aioclient_mock.mock_calls) == 4
+    call_json = aioclient_mock.mock_calls[2][2]
+    assert (
+        call_json["event"]["payload"]["change"]["properties"][0]["value"] == "DETECTED"
+    )
+
+    DEFAULT_CONFIG.state_reporter.async_stop()
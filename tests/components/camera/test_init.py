@@ -7,7 +7,12 @@ from unittest.mock import Mock, PropertyMock, mock_open, patch
 import pytest
 
 from homeassistant.components import camera
-from homeassistant.components.camera.const import DOMAIN, PREF_PRELOAD_STREAM
+from homeassistant.components.camera import mjpeg
+from homeassistant.components.camera.const import (
+    DATA_STILL_STREAMS,
+    DOMAIN,
+    PREF_PRELOAD_STREAM,
+)
 from homeassistant.components.camera.prefs import CameraEntityPreferences
 from homeassistant.components.websocket_api.const import TYPE_RESULT
 from homeassistant.config import async_process_ha_core_config
@@ -375,3 +380,54 @@ async def test_camera_proxy_stream(hass, mock_camera, hass_client):
     ):
         response = await client.get("/api/camera_proxy_stream/camera.demo_camera")
         assert response.status == HTTP_BAD_GATEWAY
+
+
+async def test_still_stream_shared_between_clients(hass, mock_camera, hass_client):
+    """Test that clients of the same camera share a single polling loop."""
+    images = asyncio.Queue()
+    calls = 0
+
+    async def async_camera_image(self):
+        nonlocal calls
+        calls += 1
+        return await images.get()
+
+    client = await hass_client()
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        async_camera_image,
+    ), patch(
+        "homeassistant.components.camera.Camera.frame_interval",
+        new_callable=PropertyMock,
+        return_value=0,
+    ):
+        response_1 = await client.get("/api/camera_proxy_stream/camera.demo_camera")
+        response_2 = await client.get("/api/camera_proxy_stream/camera.demo_camera")
+        assert response_1.status == HTTP_OK
+        assert response_2.status == HTTP_OK
+
+        for image in (b"one", b"one", b"two", None):
+            images.put_nowait(image)
+
+        body_1 = await response_1.read()
+        body_2 = await response_2.read()
+
+    # Unchanged images are not sent, the first one is sent twice
+    assert calls == 4
+    frame = b"--frameboundary\r\nContent-Type: image/jpeg\r\nContent-Length: 3\r\n\r\n"
+    expected = frame + b"one\r\n" + frame + b"one\r\n" + frame + b"two\r\n"
+    assert body_1 == expected
+    assert body_2 == expected
+    assert not hass.data[DATA_STILL_STREAMS]
+
+
+async def test_still_stream_subscriber_drops_old_frames():
+    """Test that a slow client only keeps the latest frames."""
+    subscriber = mjpeg.StillStreamSubscriber()
+    for idx in range(5):
+        subscriber.async_put((b"header", bytes([idx])))
+
+    assert subscriber.dropped == 5 - mjpeg.CLIENT_BUFFER_SIZE
+    assert await subscriber.async_get() == (b"header", bytes([3]))
+    assert await subscriber.async_get() == (b"header", bytes([4]))
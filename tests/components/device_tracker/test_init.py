@@ -108,7 +108,17 @@ async def test_reading_yaml_config(hass, yaml_devices, enable_custom_integration
         icon="mdi:kettle",
     )
     await hass.async_add_executor_job(
-        legacy.update_config, yaml_devices, dev_id, device
+        legacy._write_yaml_devices,
+        yaml_devices,
+        {
+            dev_id: {
+                "name": device.name,
+                "mac": device.mac,
+                "icon": device.icon,
+                "picture": device.config_picture,
+                "track": device.track,
+            }
+        },
     )
     assert await async_setup_component(hass, device_tracker.DOMAIN, TEST_PLATFORM)
     config = (await legacy.async_load_config(yaml_devices, hass, device.consider_home))[
@@ -425,8 +435,8 @@ async def test_see_state(hass, yaml_devices, enable_custom_integrations):
     common.async_see(hass, **params)
     await hass.async_block_till_done()
 
-    config = await legacy.async_load_config(yaml_devices, hass, timedelta(seconds=0))
-    assert len(config) == 1
+    known_devices = await legacy.async_get_known_devices(hass)
+    assert len(known_devices.devices) == 1
 
     state = hass.states.get("device_tracker.example_com")
     attrs = state.attributes
@@ -539,6 +549,98 @@ async def test_see_failures(mock_warning, hass, mock_device_tracker_conf):
     assert len(devices) == 4
 
 
+async def test_known_devices_storage(
+    hass, hass_storage, yaml_devices, enable_custom_integrations
+):
+    """Test the known devices are imported and stored."""
+    with open(yaml_devices, "w") as out:
+        out.write(
+            "phone:\n  name: Phone\n  mac: aa:bb:cc:dd:ee:ff\n  track: true\n"
+            "  consider_home: 60\n"
+        )
+
+    assert await async_setup_component(hass, device_tracker.DOMAIN, TEST_PLATFORM)
+    await hass.async_block_till_done()
+
+    # known_devices.yaml is imported once and stored right away
+    stored = hass_storage[legacy.KNOWN_DEVICES_STORAGE_KEY]["data"]["devices"]
+    assert stored["phone"]["mac"] == "AA:BB:CC:DD:EE:FF"
+    assert stored["phone"]["consider_home"] == 60
+    assert hass.states.get("device_tracker.phone") is not None
+
+    known_devices = await legacy.async_get_known_devices(hass)
+    assert known_devices.devices["phone"]["name"] == "Phone"
+
+    # New devices are written in batches
+    common.async_see(hass, mac="11:22:33:44:55:66", host_name="laptop")
+    await hass.async_block_till_done()
+    assert "laptop" in known_devices.devices
+    assert (
+        "laptop"
+        not in hass_storage[legacy.KNOWN_DEVICES_STORAGE_KEY]["data"]["devices"]
+    )
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=legacy.KNOWN_DEVICES_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert "laptop" in hass_storage[legacy.KNOWN_DEVICES_STORAGE_KEY]["data"]["devices"]
+
+    await hass.services.async_call(
+        device_tracker.DOMAIN, legacy.SERVICE_EXPORT_KNOWN_DEVICES, blocking=True
+    )
+    exported = await legacy.async_load_config(yaml_devices, hass, timedelta(0))
+    assert {device.dev_id for device in exported} == {"phone", "laptop"}
+
+    # Importing a renamed device replaces the device with the same MAC
+    with open(yaml_devices, "w") as out:
+        out.write("my_phone:\n  name: My phone\n  mac: AA:BB:CC:DD:EE:FF\n")
+
+    await hass.services.async_call(
+        device_tracker.DOMAIN, legacy.SERVICE_IMPORT_KNOWN_DEVICES, blocking=True
+    )
+    assert set(known_devices.devices) == {"my_phone", "laptop"}
+    assert set(hass_storage[legacy.KNOWN_DEVICES_STORAGE_KEY]["data"]["devices"]) == {
+        "my_phone",
+        "laptop",
+    }
+
+
+async def test_known_devices_gravatar(hass, hass_storage):
+    """Test the gravatar of a device is stored instead of its picture."""
+    known_devices = await legacy.async_get_known_devices(hass)
+    device = legacy.Device(
+        hass, timedelta(seconds=180), True, "phone", None, gravatar="me@example.com"
+    )
+    known_devices.async_update_device(device)
+
+    assert known_devices.devices["phone"]["gravatar"] == "me@example.com"
+    assert known_devices.devices["phone"]["picture"] is None
+    created = known_devices.async_create_devices(timedelta(seconds=180))[0]
+    assert created.entity_picture == device.entity_picture
+
+
+async def test_known_devices_yaml_changed(hass, hass_storage, yaml_devices):
+    """Test a notification is created when known_devices.yaml changed."""
+    assert await async_setup_component(hass, "persistent_notification", {})
+    hass_storage[legacy.KNOWN_DEVICES_STORAGE_KEY] = {
+        "version": legacy.KNOWN_DEVICES_STORAGE_VERSION,
+        "key": legacy.KNOWN_DEVICES_STORAGE_KEY,
+        "data": {"devices": {}, "yaml_mtime": None},
+    }
+    with open(yaml_devices, "w") as out:
+        out.write("phone:\n  name: Phone\n")
+
+    known_devices = await legacy.async_get_known_devices(hass)
+    await hass.async_block_till_done()
+
+    assert known_devices.devices == {}
+    assert (
+        hass.states.get("persistent_notification.device_tracker_import_known_devices")
+        is not None
+    )
+
+
 async def test_async_added_to_hass(hass):
     """Test restoring state."""
     attr = {
@@ -3,10 +3,14 @@ from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
 from homeassistant.components.google_assistant import error, report_state
+from homeassistant.components.google_assistant.const import (
+    SIGNAL_EXPOSED_ENTITIES_UPDATED,
+)
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
-from . import BASIC_CONFIG
+from . import BASIC_CONFIG, MockConfig
 
 from tests.common import async_fire_time_changed
 
@@ -123,3 +127,79 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
         await hass.async_block_till_done()
 
     assert len(mock_report.mock_calls) == 0
+
+
+async def test_report_state_exposed_index(hass, legacy_patchable_time):
+    """Test only exposed entities are tracked and the initial report is chunked."""
+    for idx in range(3):
+        hass.states.async_set(f"light.exposed_{idx}", "off")
+    hass.states.async_set("light.hidden", "off")
+
+    config = MockConfig(
+        should_expose=lambda state: state.entity_id != "light.hidden",
+        agent_user_ids={"mock-user-id": {}},
+    )
+
+    with patch.object(
+        config, "async_report_state_all", AsyncMock()
+    ) as mock_report, patch.object(
+        report_state, "INITIAL_REPORT_DELAY", 0
+    ), patch.object(
+        report_state, "INITIAL_REPORT_CHUNK_SIZE", 2
+    ):
+        unsub = report_state.async_enable_report_state(hass, config)
+
+        async_fire_time_changed(hass, utcnow())
+        await hass.async_block_till_done()
+
+    assert len(mock_report.mock_calls) == 2
+    assert mock_report.mock_calls[0][1][0] == {
+        "devices": {
+            "states": {
+                "light.exposed_0": {"on": False, "online": True},
+                "light.exposed_1": {"on": False, "online": True},
+            }
+        }
+    }
+    assert mock_report.mock_calls[1][1][0] == {
+        "devices": {"states": {"light.exposed_2": {"on": False, "online": True}}}
+    }
+
+    with patch.object(
+        config, "async_report_state_all", AsyncMock()
+    ) as mock_report, patch.object(
+        report_state.GoogleEntity, "should_expose", side_effect=AssertionError
+    ):
+        # Decisions of known entities are reused, unexposed ones are ignored
+        hass.states.async_set("light.exposed_0", "on")
+        hass.states.async_set("light.hidden", "on")
+        await hass.async_block_till_done()
+        async_fire_time_changed(
+            hass, utcnow() + timedelta(seconds=report_state.REPORT_STATE_WINDOW)
+        )
+        await hass.async_block_till_done()
+
+    assert len(mock_report.mock_calls) == 1
+    assert mock_report.mock_calls[0][1][0] == {
+        "devices": {"states": {"light.exposed_0": {"on": True, "online": True}}}
+    }
+
+    # Exposing the entity through the config starts reporting it
+    config._should_expose = None
+    async_dispatcher_send(hass, SIGNAL_EXPOSED_ENTITIES_UPDATED)
+    await hass.async_block_till_done()
+
+    with patch.object(config, "async_report_state_all", AsyncMock()) as mock_report:
+        hass.states.async_set("light.hidden", "off")
+        await hass.async_block_till_done()
+        async_fire_time_changed(
+            hass, utcnow() + timedelta(seconds=report_state.REPORT_STATE_WINDOW)
+        )
+        await hass.async_block_till_done()
+
+    assert len(mock_report.mock_calls) == 1
+    assert mock_report.mock_calls[0][1][0] == {
+        "devices": {"states": {"light.hidden": {"on": False, "online": True}}}
+    }
+
+    unsub()
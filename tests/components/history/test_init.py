@@ -2,7 +2,7 @@
 # pylint: disable=protected-access,invalid-name
 from datetime import timedelta
 import json
-from unittest.mock import patch, sentinel
+from unittest.mock import AsyncMock, Mock, patch, sentinel
 
 import pytest
 from pytest import approx
@@ -17,7 +17,11 @@ import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
 
 from tests.common import init_recorder_component
-from tests.components.recorder.common import trigger_db_commit, wait_recording_done
+from tests.components.recorder.common import (
+    async_wait_purge_done,
+    trigger_db_commit,
+    wait_recording_done,
+)
 
 
 @pytest.mark.usefixtures("hass_history")
@@ -589,6 +593,76 @@ async def test_fetch_period_api(hass, hass_client):
     assert response.status == 200
 
 
+async def test_fetch_period_api_written_in_chunks(hass, hass_client):
+    """Test the fetch period view writes the states in chunks."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow()
+    for state in ("1", "2", "3"):
+        hass.states.async_set("sensor.one", state)
+        hass.states.async_set("sensor.two", state)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    with patch.object(history, "HISTORY_WRITE_SIZE", 2):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}?minimal_response"
+        )
+    assert response.status == 200
+    assert response.headers["Content-Type"].startswith("application/json")
+    result = await response.json()
+    assert [
+        [entity_states[0]["entity_id"]] + [state["state"] for state in entity_states]
+        for entity_states in result
+    ] == [["sensor.one", "1", "2", "3"], ["sensor.two", "1", "2", "3"]]
+
+
+def test_ordered_entity_states():
+    """Test the entities are yielded in order as soon as the ones before are."""
+    yielded = []
+
+    def entity_states():
+        for entity_id in ("light.a", "light.b", "light.c", "light.d"):
+            yield entity_id, [entity_id]
+            yielded.append(entity_id)
+
+    ordered = history._ordered_entity_states(
+        entity_states(), ["light.b", "light.missing", "light.a"]
+    )
+    assert next(ordered) == ["light.b"]
+    assert yielded == ["light.a"]
+    assert list(ordered) == [["light.a"], ["light.c"], ["light.d"]]
+
+    ordered = history._ordered_entity_states(entity_states(), ["light.b", "light.a"])
+    assert next(ordered) == ["light.b"]
+    assert next(ordered) == ["light.a"]
+    assert yielded == ["light.a", "light.b", "light.c", "light.d", "light.a"]
+
+
+async def test_stream_chunks_closed_when_write_fails(hass):
+    """Test the chunks are closed in the executor when the client goes away."""
+    closed = []
+
+    def chunks():
+        try:
+            yield "["
+            yield "]"
+        finally:
+            closed.append(True)
+
+    response = Mock(prepare=AsyncMock(), write=AsyncMock(side_effect=ConnectionError))
+    with patch.object(
+        history.web, "StreamResponse", return_value=response
+    ), pytest.raises(ConnectionError):
+        await history._async_stream_chunks(hass, Mock(), chunks())
+    await hass.async_block_till_done()
+
+    assert response.write.call_count == 1
+    assert closed == [True]
+
+
 async def test_fetch_period_api_with_use_include_order(hass, hass_client):
     """Test the fetch period view for history with include order."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -1043,3 +1117,112 @@ async def test_list_statistic_ids(hass, hass_ws_client, units, attributes, unit)
     response = await client.receive_json()
     assert response["success"]
     assert response["result"] == []
+
+
+async def test_read_pool_stats(hass, hass_ws_client, tmp_path):
+    """Test the read-only connections report their wait and query times."""
+    db_url = f"sqlite:///{tmp_path / 'read_pool.db'}"
+    assert await async_setup_component(
+        hass, recorder.DOMAIN, {recorder.DOMAIN: {recorder.CONF_DB_URL: db_url}}
+    )
+    await async_setup_component(hass, "history", {"history": {}})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.states.async_set("sensor.test", 10)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    states = await hass.async_add_executor_job(
+        get_significant_states, hass, dt_util.utcnow() - timedelta(hours=1)
+    )
+    assert list(states) == ["sensor.test"]
+
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, "type": "history/read_pool_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["checkouts"] >= 1
+    assert response["result"]["queries"] >= 1
+    assert response["result"]["max_wait_time"] >= 0
+
+
+async def test_read_pool_stats_without_pool(hass, hass_ws_client):
+    """Test databases without read-only connections have no read pool stats."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {}})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, "type": "history/read_pool_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] is None
+
+
+async def test_purge_progress(hass, hass_ws_client):
+    """Test the progress of the latest purge is reported."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {}})
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, "type": "history/purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] is None
+
+    hass.states.async_set("sensor.test", 10)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    await hass.services.async_call(recorder.DOMAIN, "purge", {"keep_days": 0})
+    await hass.async_block_till_done()
+    await async_wait_purge_done(hass, instance)
+
+    await client.send_json({"id": 2, "type": "history/purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["finished"] is not None
+    assert response["result"]["states_purged"] == 1
+    assert response["result"]["remaining_states"] == 0
+
+
+async def test_query_stats(hass, hass_ws_client, tmp_path):
+    """Test the recorder reports the stats of the queries of every call site."""
+    db_url = f"sqlite:///{tmp_path / 'query_stats.db'}"
+    assert await async_setup_component(
+        hass,
+        recorder.DOMAIN,
+        {
+            recorder.DOMAIN: {
+                recorder.CONF_DB_URL: db_url,
+                recorder.CONF_QUERY_INSTRUMENTATION: True,
+            }
+        },
+    )
+    await async_setup_component(hass, "history", {"history": {}})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.states.async_set("sensor.test", 10)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    states = await hass.async_add_executor_job(
+        get_significant_states, hass, dt_util.utcnow() - timedelta(hours=1)
+    )
+    assert list(states) == ["sensor.test"]
+
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, "type": "history/query_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    call_site = response["result"]["call_sites"][
+        "homeassistant.components.recorder.history._get_significant_states"
+    ]
+    assert call_site["count"] == 1
+    assert call_site["rows"] == 1
+    assert response["result"]["slow_queries"] == []
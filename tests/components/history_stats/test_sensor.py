@@ -293,55 +293,55 @@ async def test_measure_multiple(hass):
         ]
     }
 
-    await async_setup_component(
-        hass,
-        "sensor",
-        {
-            "sensor": [
-                {
-                    "platform": "history_stats",
-                    "entity_id": "input_select.test_id",
-                    "name": "sensor1",
-                    "state": ["orange", "blue"],
-                    "start": "{{ as_timestamp(now()) - 3600 }}",
-                    "end": "{{ now() }}",
-                    "type": "time",
-                },
-                {
-                    "platform": "history_stats",
-                    "entity_id": "unknown.test_id",
-                    "name": "sensor2",
-                    "state": ["orange", "blue"],
-                    "start": "{{ as_timestamp(now()) - 3600 }}",
-                    "end": "{{ now() }}",
-                    "type": "time",
-                },
-                {
-                    "platform": "history_stats",
-                    "entity_id": "input_select.test_id",
-                    "name": "sensor3",
-                    "state": ["orange", "blue"],
-                    "start": "{{ as_timestamp(now()) - 3600 }}",
-                    "end": "{{ now() }}",
-                    "type": "count",
-                },
-                {
-                    "platform": "history_stats",
-                    "entity_id": "input_select.test_id",
-                    "name": "sensor4",
-                    "state": ["orange", "blue"],
-                    "start": "{{ as_timestamp(now()) - 3600 }}",
-                    "end": "{{ now() }}",
-                    "type": "ratio",
-                },
-            ]
-        },
-    )
-
     with patch(
         "homeassistant.components.recorder.history.state_changes_during_period",
         return_value=fake_states,
     ), patch("homeassistant.components.recorder.history.get_state", return_value=None):
+        await async_setup_component(
+            hass,
+            "sensor",
+            {
+                "sensor": [
+                    {
+                        "platform": "history_stats",
+                        "entity_id": "input_select.test_id",
+                        "name": "sensor1",
+                        "state": ["orange", "blue"],
+                        "start": "{{ as_timestamp(now()) - 3600 }}",
+                        "end": "{{ now() }}",
+                        "type": "time",
+                    },
+                    {
+                        "platform": "history_stats",
+                        "entity_id": "unknown.test_id",
+                        "name": "sensor2",
+                        "state": ["orange", "blue"],
+                        "start": "{{ as_timestamp(now()) - 3600 }}",
+                        "end": "{{ now() }}",
+                        "type": "time",
+                    },
+                    {
+                        "platform": "history_stats",
+                        "entity_id": "input_select.test_id",
+                        "name": "sensor3",
+                        "state": ["orange", "blue"],
+                        "start": "{{ as_timestamp(now()) - 3600 }}",
+                        "end": "{{ now() }}",
+                        "type": "count",
+                    },
+                    {
+                        "platform": "history_stats",
+                        "entity_id": "input_select.test_id",
+                        "name": "sensor4",
+                        "state": ["orange", "blue"],
+                        "start": "{{ as_timestamp(now()) - 3600 }}",
+                        "end": "{{ now() }}",
+                        "type": "ratio",
+                    },
+                ]
+            },
+        )
+        await hass.async_block_till_done()
         for i in range(1, 5):
             await hass.helpers.entity_component.async_update_entity(f"sensor.sensor{i}")
         await hass.async_block_till_done()
@@ -352,6 +352,155 @@ async def test_measure_multiple(hass):
     assert hass.states.get("sensor.sensor4").state == "50.0"
 
 
+async def test_measure_from_state_changes(hass):
+    """Test the history is read once and then kept up to date from state changes."""
+    await async_init_recorder_component(hass)
+
+    t0 = dt_util.utcnow() - timedelta(minutes=40)
+    fake_states = {
+        "binary_sensor.test_id": [
+            ha.State("binary_sensor.test_id", "on", last_changed=t0),
+        ]
+    }
+
+    with patch(
+        "homeassistant.components.recorder.history.state_changes_during_period",
+        return_value=fake_states,
+    ) as mock_history:
+        await async_setup_component(
+            hass,
+            "sensor",
+            {
+                "sensor": [
+                    {
+                        "platform": "history_stats",
+                        "entity_id": "binary_sensor.test_id",
+                        "name": "sensor1",
+                        "state": "on",
+                        "start": "{{ as_timestamp(now()) - 3600 }}",
+                        "end": "{{ now() }}",
+                        "type": "count",
+                    },
+                ]
+            },
+        )
+        await hass.async_block_till_done()
+
+        state = hass.states.get("sensor.sensor1")
+        assert state.state == "1"
+        assert state.attributes["database_reads"] == 1
+
+        for value in ("off", "on", "off", "on"):
+            hass.states.async_set("binary_sensor.test_id", value)
+            await hass.async_block_till_done()
+
+        # Attribute changes don't count
+        hass.states.async_set("binary_sensor.test_id", "on", {"attr": 1})
+        await hass.async_block_till_done()
+
+    assert mock_history.call_count == 1
+    state = hass.states.get("sensor.sensor1")
+    assert state.state == "3"
+    assert state.attributes["database_reads"] == 1
+
+
+async def test_measure_on_at_period_start(hass):
+    """Test the state at the period start is not counted as a change."""
+    await async_init_recorder_component(hass)
+
+    t0 = dt_util.utcnow() - timedelta(minutes=90)
+    t1 = dt_util.utcnow() - timedelta(minutes=40)
+    t2 = dt_util.utcnow() - timedelta(minutes=20)
+
+    # t0        Start     t1        t2        End
+    # |--30min--|--20min--|--20min--|--20min--|
+    # |---on----|---on----|---off---|---on----|
+
+    fake_states = {
+        "binary_sensor.test_id": [
+            ha.State("binary_sensor.test_id", "on", last_changed=t0),
+            ha.State("binary_sensor.test_id", "off", last_changed=t1),
+            ha.State("binary_sensor.test_id", "on", last_changed=t2),
+        ]
+    }
+
+    with patch(
+        "homeassistant.components.recorder.history.state_changes_during_period",
+        return_value=fake_states,
+    ):
+        await async_setup_component(
+            hass,
+            "sensor",
+            {
+                "sensor": [
+                    {
+                        "platform": "history_stats",
+                        "entity_id": "binary_sensor.test_id",
+                        "name": "sensor1",
+                        "state": "on",
+                        "start": "{{ as_timestamp(now()) - 3600 }}",
+                        "end": "{{ now() }}",
+                        "type": "count",
+                    },
+                    {
+                        "platform": "history_stats",
+                        "entity_id": "binary_sensor.test_id",
+                        "name": "sensor2",
+                        "state": "on",
+                        "start": "{{ as_timestamp(now()) - 3600 }}",
+                        "end": "{{ now() }}",
+                        "type": "time",
+                    },
+                ]
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.sensor1").state == "1"
+    assert hass.states.get("sensor.sensor2").state == "0.67"
+
+
+async def test_measure_unrecorded_entity(hass):
+    """Test the history of an entity without recorded states is read once."""
+    await async_init_recorder_component(hass)
+
+    with patch(
+        "homeassistant.components.recorder.history.state_changes_during_period",
+        return_value={},
+    ) as mock_history:
+        await async_setup_component(
+            hass,
+            "sensor",
+            {
+                "sensor": [
+                    {
+                        "platform": "history_stats",
+                        "entity_id": "binary_sensor.test_id",
+                        "name": "sensor1",
+                        "state": "on",
+                        "start": "{{ as_timestamp(now()) - 3600 }}",
+                        "end": "{{ now() }}",
+                        "type": "count",
+                    },
+                ]
+            },
+        )
+        await hass.async_block_till_done()
+        for _ in range(3):
+            await hass.helpers.entity_component.async_update_entity("sensor.sensor1")
+        await hass.async_block_till_done()
+
+        assert hass.states.get("sensor.sensor1").state == STATE_UNKNOWN
+
+        hass.states.async_set("binary_sensor.test_id", "on")
+        await hass.async_block_till_done()
+
+    assert mock_history.call_count == 1
+    state = hass.states.get("sensor.sensor1")
+    assert state.state == "1"
+    assert state.attributes["database_reads"] == 1
+
+
 async def async_test_measure(hass):
     """Test the history statistics sensor measure."""
     t0 = dt_util.utcnow() - timedelta(minutes=40)
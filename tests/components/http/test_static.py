@@ -0,0 +1,272 @@
+"""Test static file handling."""
+import asyncio
+import gzip
+import os
+from unittest.mock import patch
+
+from aiohttp import web
+import pytest
+
+from homeassistant.components.http.static import CachingStaticResource
+
+
+@pytest.fixture(name="static_dir")
+def static_dir_fixture(tmp_path):
+    """Return a directory with static files."""
+    (tmp_path / "app.js").write_text("console.log('hello');\n" * 100)
+    (tmp_path / "image.png").write_bytes(b"\x89PNG" * 500)
+    (tmp_path / "sub").mkdir()
+    return tmp_path
+
+
+@pytest.fixture(name="mock_client")
+async def mock_client_fixture(aiohttp_client, static_dir):
+    """Return a client for a static resource."""
+    app = web.Application()
+    app.router.register_resource(CachingStaticResource("/static", str(static_dir)))
+    return await aiohttp_client(app, auto_decompress=False)
+
+
+async def test_serve_file(mock_client):
+    """Test serving a file with cache headers."""
+    resp = await mock_client.get(
+        "/static/image.png", headers={"Accept-Encoding": "identity"}
+    )
+    assert resp.status == 200
+    assert resp.headers["Cache-Control"] == "public, max-age=2678400"
+    assert resp.headers["Content-Type"] == "image/png"
+    assert "ETag" in resp.headers
+    assert "Last-Modified" in resp.headers
+    assert await resp.read() == b"\x89PNG" * 500
+
+    resp = await mock_client.get("/static/missing.png")
+    assert resp.status == 404
+
+
+async def test_stat_cached(mock_client, static_dir):
+    """Test that resolved paths are cached."""
+    resp = await mock_client.get("/static/image.png")
+    assert resp.status == 200
+
+    with patch(
+        "homeassistant.components.http.static._resolve_static_file"
+    ) as mock_resolve:
+        resp = await mock_client.get("/static/image.png")
+        assert resp.status == 200
+
+    assert not mock_resolve.called
+
+
+async def test_not_modified(mock_client):
+    """Test conditional requests are answered with 304."""
+    resp = await mock_client.get("/static/image.png")
+    etag = resp.headers["ETag"]
+    last_modified = resp.headers["Last-Modified"]
+
+    resp = await mock_client.get(
+        "/static/image.png", headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert resp.status == 304
+    assert resp.headers["ETag"] == etag
+
+    resp = await mock_client.get(
+        "/static/image.png", headers={"If-Modified-Since": last_modified}
+    )
+    assert resp.status == 304
+
+    resp = await mock_client.get(
+        "/static/image.png", headers={"If-None-Match": '"other"'}
+    )
+    assert resp.status == 200
+
+    resp = await mock_client.get(
+        "/static/image.png",
+        headers={"If-Unmodified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+    )
+    assert resp.status == 412
+
+    resp = await mock_client.get(
+        "/static/image.png", headers={"If-Unmodified-Since": last_modified}
+    )
+    assert resp.status == 200
+
+
+async def test_precompressed_sidecar(mock_client, static_dir):
+    """Test serving a brotli sidecar to clients that accept it."""
+    (static_dir / "app.js.br").write_bytes(b"brotli")
+
+    resp = await mock_client.get(
+        "/static/app.js", headers={"Accept-Encoding": "gzip, br"}
+    )
+    assert resp.status == 200
+    assert resp.headers["Content-Encoding"] == "br"
+    assert resp.headers["Content-Type"].endswith("/javascript")
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    assert await resp.read() == b"brotli"
+
+    resp = await mock_client.get(
+        "/static/app.js", headers={"Accept-Encoding": "identity, br;q=0"}
+    )
+    assert resp.status == 200
+    assert "Content-Encoding" not in resp.headers
+
+
+async def _async_wait_compressed(mock_client):
+    """Wait for the background compression of the served files."""
+    resource = next(iter(mock_client.server.app.router.resources()))
+    for _ in range(100):
+        if not resource._compressing:
+            break
+        await asyncio.sleep(0.01)
+
+
+async def test_compress_in_memory(mock_client, static_dir):
+    """Test files without a gzip sidecar are compressed in memory."""
+    resp = await mock_client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.status == 200
+    assert "Content-Encoding" not in resp.headers
+    etag = resp.headers["ETag"]
+    await _async_wait_compressed(mock_client)
+
+    resp = await mock_client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.status == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["ETag"] != etag
+    assert gzip.decompress(await resp.read()) == (static_dir / "app.js").read_bytes()
+    assert sorted(path.name for path in static_dir.iterdir()) == [
+        "app.js",
+        "image.png",
+        "sub",
+    ]
+
+    source = static_dir / "app.js"
+    source.write_text("console.log('changed');\n" * 100)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+    resp = await mock_client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+    assert await resp.read() == source.read_bytes()
+
+
+async def test_compress_failed(mock_client, static_dir):
+    """Test a file that fails to compress is served uncompressed."""
+    with patch(
+        "homeassistant.components.http.static._gzip_file",
+        side_effect=ValueError("boom"),
+    ) as mock_gzip:
+        resp = await mock_client.get(
+            "/static/app.js", headers={"Accept-Encoding": "gzip"}
+        )
+        assert resp.status == 200
+        await _async_wait_compressed(mock_client)
+
+        resp = await mock_client.get(
+            "/static/app.js", headers={"Accept-Encoding": "gzip"}
+        )
+        assert resp.status == 200
+        assert "Content-Encoding" not in resp.headers
+
+    assert mock_gzip.call_count == 1
+
+
+async def test_compress_cache_size(mock_client, static_dir):
+    """Test the compressed files kept in memory are bounded."""
+    for index in range(3):
+        (static_dir / f"{index}.js").write_text("console.log('hello');\n" * 100)
+
+    with patch("homeassistant.components.http.static.COMPRESS_CACHE_SIZE", 2):
+        for index in range(3):
+            await mock_client.get(
+                f"/static/{index}.js", headers={"Accept-Encoding": "gzip"}
+            )
+            await _async_wait_compressed(mock_client)
+
+    resource = next(iter(mock_client.server.app.router.resources()))
+    assert sorted(path.name for path in resource._compressed) == ["1.js", "2.js"]
+
+
+async def test_stale_sidecar_ignored(mock_client, static_dir):
+    """Test sidecars older than their source file are not served."""
+    sidecar = static_dir / "app.js.br"
+    sidecar.write_bytes(b"old")
+    stat = (static_dir / "app.js").stat()
+    os.utime(sidecar, (stat.st_atime - 10, stat.st_mtime - 10))
+
+    resp = await mock_client.get("/static/app.js", headers={"Accept-Encoding": "br"})
+    assert resp.status == 200
+    assert "Content-Encoding" not in resp.headers
+
+
+async def test_changed_file_not_served_from_cache(mock_client, static_dir):
+    """Test a file changed while its path is cached gets a new ETag."""
+    resp = await mock_client.get("/static/image.png")
+    etag = resp.headers["ETag"]
+
+    image = static_dir / "image.png"
+    image.write_bytes(b"new")
+    stat = image.stat()
+    os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    resp = await mock_client.get("/static/image.png", headers={"If-None-Match": etag})
+    assert resp.status == 200
+    assert resp.headers["ETag"] != etag
+    assert await resp.read() == b"new"
+
+
+async def test_sidecar_outdated_while_cached(mock_client, static_dir):
+    """Test a sidecar is no longer served once its source changed."""
+    (static_dir / "app.js.br").write_bytes(b"brotli")
+    resp = await mock_client.get("/static/app.js", headers={"Accept-Encoding": "br"})
+    assert resp.headers["Content-Encoding"] == "br"
+
+    source = static_dir / "app.js"
+    source.write_text("console.log('changed');")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+    resp = await mock_client.get("/static/app.js", headers={"Accept-Encoding": "br"})
+    assert resp.status == 200
+    assert "Content-Encoding" not in resp.headers
+    assert await resp.read() == b"console.log('changed');"
+
+
+async def test_range_and_head(mock_client):
+    """Test byte ranges and HEAD requests."""
+    resp = await mock_client.get(
+        "/static/image.png",
+        headers={"Accept-Encoding": "identity", "Range": "bytes=4-7"},
+    )
+    assert resp.status == 206
+    assert resp.headers["Content-Range"] == "bytes 4-7/2000"
+    assert await resp.read() == b"\x89PNG"
+    etag = resp.headers["ETag"]
+
+    resp = await mock_client.get("/static/image.png", headers={"Range": "bytes=-4"})
+    assert resp.status == 206
+    assert await resp.read() == b"\x89PNG"
+
+    resp = await mock_client.get("/static/image.png", headers={"Range": "bytes=5000-"})
+    assert resp.status == 416
+
+    resp = await mock_client.get(
+        "/static/image.png",
+        headers={"Range": "bytes=4-7", "If-Range": etag},
+    )
+    assert resp.status == 206
+
+    resp = await mock_client.get(
+        "/static/image.png", headers={"Range": "bytes=4-7", "If-Range": '"other"'}
+    )
+    assert resp.status == 200
+    assert await resp.read() == b"\x89PNG" * 500
+
+    resp = await mock_client.get(
+        "/static/image.png",
+        headers={"Range": "bytes=4-7", "If-Range": "Thu, 01 Jan 1970 00:00:00 GMT"},
+    )
+    assert resp.status == 200
+
+    resp = await mock_client.head("/static/image.png")
+    assert resp.status == 200
+    assert resp.headers["Content-Length"] == "2000"
+    assert await resp.read() == b""
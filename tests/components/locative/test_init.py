@@ -1,5 +1,4 @@
 """The tests the for Locative device tracker platform."""
-from unittest.mock import patch
 
 import pytest
 
@@ -27,8 +26,7 @@ async def locative_client(loop, hass, hass_client):
     assert await async_setup_component(hass, DOMAIN, {DOMAIN: {}})
     await hass.async_block_till_done()
 
-    with patch("homeassistant.components.device_tracker.legacy.update_config"):
-        return await hass_client()
+    return await hass_client()
 
 
 @pytest.fixture
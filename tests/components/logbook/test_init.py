@@ -3,7 +3,7 @@
 import collections
 from datetime import datetime, timedelta
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 import pytest
 import voluptuous as vol
@@ -279,10 +279,13 @@ def create_state_changed_event_from_old_new(
         [
             "event_type"
             "event_data"
-            "time_fired"
+            "time_fired_ts"
             "context_id"
             "context_user_id"
             "context_parent_id"
+            "context_id_bin"
+            "context_user_id_bin"
+            "context_parent_id_bin"
             "state"
             "entity_id"
             "domain"
@@ -295,13 +298,16 @@ def create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
-    row.time_fired = event_time_fired
+    row.time_fired_ts = event_time_fired.timestamp()
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
     row.domain = entity_id and ha.split_entity_id(entity_id)[0]
     row.context_id = None
     row.context_user_id = None
     row.context_parent_id = None
+    row.context_id_bin = None
+    row.context_user_id_bin = None
+    row.context_parent_id_bin = None
     row.old_state_id = old_state and 1
     row.state_id = new_state and 1
     return logbook.LazyEventPartialState(row)
@@ -1914,3 +1920,150 @@ class MockLazyEventPartialState(ha.Event):
     def time_fired_isoformat(self):
         """Time event was fired in utc isoformat."""
         return process_timestamp_to_utc_isoformat(self.time_fired)
+
+
+async def test_event_stream(hass, hass_ws_client):
+    """Test the event stream sends the recorded entries, then live entries."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.kitchen", STATE_ON)
+    hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.power", "11", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": (dt_util.utcnow() - timedelta(hours=1)).isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert response["type"] == "event"
+    assert [
+        (entry["entity_id"], entry["state"]) for entry in response["event"]["events"]
+    ] == [("light.kitchen", STATE_ON)]
+
+    context = ha.Context(id="ac5bd62de45711eaaeb351041eec8dd9")
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {ATTR_DOMAIN: "light", ATTR_SERVICE: "turn_off"},
+        context=context,
+    )
+    hass.states.async_set("light.kitchen", STATE_OFF, context=context)
+    hass.states.async_set("sensor.power", "12", {"unit_of_measurement": "W"})
+    logbook.async_log_entry(hass, "Alarm", "is armed", "alarm_control_panel")
+    await hass.async_block_till_done()
+
+    response = await client.receive_json()
+    assert response["event"]["events"] == [
+        {
+            "when": ANY,
+            "name": "kitchen",
+            "state": STATE_OFF,
+            "entity_id": "light.kitchen",
+            "context_domain": "light",
+            "context_service": "turn_off",
+            "context_event_type": EVENT_CALL_SERVICE,
+        }
+    ]
+    response = await client.receive_json()
+    assert response["event"]["events"] == [
+        {
+            "when": ANY,
+            "name": "Alarm",
+            "message": "is armed",
+            "domain": "alarm_control_panel",
+            "entity_id": None,
+        }
+    ]
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["success"]
+
+
+async def test_event_stream_waits_for_recorder_commit(hass, hass_ws_client, tmp_path):
+    """Test the event stream includes events the recorder did not commit yet."""
+    assert await async_setup_component(
+        hass,
+        recorder.DOMAIN,
+        {
+            recorder.DOMAIN: {
+                recorder.CONF_DB_URL: f"sqlite:///{tmp_path / 'test.db'}",
+                recorder.CONF_COMMIT_INTERVAL: 3600,
+            }
+        },
+    )
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.kitchen", STATE_ON)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": (dt_util.utcnow() - timedelta(hours=1)).isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert [
+        (entry["entity_id"], entry["state"]) for entry in response["event"]["events"]
+    ] == [("light.kitchen", STATE_ON)]
+
+
+async def test_event_stream_ended_period(hass, hass_ws_client):
+    """Test the event stream of a period that ended does not subscribe."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    end_time = dt_util.utcnow() - timedelta(hours=1)
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": (end_time - timedelta(hours=1)).isoformat(),
+            "end_time": end_time.isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    assert response["event"] == {"events": []}
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert not response["success"]
+
+
+async def test_event_stream_invalid_start_time(hass, hass_ws_client):
+    """Test the event stream rejects an invalid start time."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 1, "type": "logbook/event_stream", "start_time": "not a time"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
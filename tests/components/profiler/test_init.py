@@ -12,13 +12,20 @@ from homeassistant.components.profiler import (
     SERVICE_MEMORY,
     SERVICE_START,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_START_LOOP_MONITOR,
     SERVICE_STOP_LOG_OBJECTS,
+    SERVICE_STOP_LOOP_MONITOR,
 )
 from homeassistant.components.profiler.const import DOMAIN
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE, STATE_UNAVAILABLE
+from homeassistant.core import callback
 import homeassistant.util.dt as dt_util
 
-from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_init_recorder_component,
+)
 
 
 async def test_basic_usage(hass, tmpdir):
@@ -192,3 +199,79 @@ async def test_log_scheduled(hass, caplog):
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_loop_monitor(hass, hass_ws_client):
+    """Test we can sample the event loop and read the histograms."""
+    await setup.async_setup_component(hass, "persistent_notification", {})
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.event_loop_lag").state == STATE_UNAVAILABLE
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "profiler/loop_monitor"})
+    msg = await client.receive_json()
+    assert not msg["success"]
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_LOOP_MONITOR, {"sample_every": 1}, blocking=True
+    )
+    assert hass.job_instrumentation is not None
+
+    events = []
+
+    @callback
+    def _listener(event):
+        events.append(event)
+
+    # Jobs are grouped by the integration of the module they are defined in
+    _listener.__module__ = "homeassistant.components.test_owner.sensor"
+    hass.bus.async_listen("test_event", _listener)
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert len(events) == 1
+
+    await client.send_json({"id": 2, "type": "profiler/loop_monitor"})
+    msg = await client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["sample_every"] == 1
+    assert msg["result"]["integrations"]["test_owner"]["count"] == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.event_loop_lag").state != STATE_UNAVAILABLE
+
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_LOOP_MONITOR, {}, blocking=True)
+    assert hass.job_instrumentation is None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_database_query_sensors(hass):
+    """Test the sensors of the recorder database queries."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.database_query_time").state == STATE_UNAVAILABLE
+
+    await async_init_recorder_component(hass, {"query_instrumentation": True})
+    instrumentation = hass.data["recorder_instance"].query_instrumentation
+    instrumentation.record_query("homeassistant.components.history.slow", 0.5)
+    instrumentation.record_query("homeassistant.components.history.fast", 0.1)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert float(hass.states.get("sensor.database_query_time").state) >= 600
+    slowest = hass.states.get("sensor.slowest_database_query")
+    assert slowest.state == "homeassistant.components.history.slow"
+    assert slowest.attributes["homeassistant.components.history.fast"] == 100
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
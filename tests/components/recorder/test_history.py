@@ -6,7 +6,8 @@ import json
 from unittest.mock import patch, sentinel
 
 from homeassistant.components.recorder import history
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.models import StateCheckpoints, process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
@@ -64,6 +65,66 @@ def test_get_states(hass_recorder):
     assert history.get_state(hass, time_before_recorder_ran, "demo.id") is None
 
 
+def test_get_states_from_checkpoint(hass_recorder):
+    """Test getting states at a point in time starting from a state checkpoint."""
+    hass = hass_recorder()
+
+    def record_states(point_in_time, indexes):
+        """Record states of some entities at a point in time."""
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow",
+            return_value=point_in_time,
+        ):
+            for i in indexes:
+                mock_state_change_event(
+                    hass, ha.State(f"test.checkpoint_{i}", f"State {point_in_time}")
+                )
+            wait_recording_done(hass)
+
+    def get_states(point_in_time):
+        """Return the states at a point in time by entity_id."""
+        return {
+            state.entity_id: state.state
+            for state in history.get_states(hass, point_in_time)
+        }
+
+    now = dt_util.utcnow()
+    first = now + timedelta(hours=2)
+    second = first + timedelta(minutes=30)
+    record_states(now, range(5))
+    record_states(first, range(2))
+    record_states(second, range(1))
+
+    with session_scope(hass=hass) as session:
+        checkpoints = session.query(StateCheckpoints).all()
+        assert {checkpoint.entity_id for checkpoint in checkpoints} == {
+            f"test.checkpoint_{i}" for i in range(5)
+        }
+        assert {
+            process_timestamp(checkpoint.created) for checkpoint in checkpoints
+        } == {first}
+
+    for point_in_time in (
+        first + timedelta(seconds=30),
+        second - timedelta(seconds=1),
+        second + timedelta(seconds=1),
+    ):
+        states = get_states(point_in_time)
+        with patch(
+            "homeassistant.components.recorder.history._get_state_checkpoint",
+            return_value=None,
+        ):
+            assert get_states(point_in_time) == states
+
+    assert get_states(second + timedelta(seconds=1)) == {
+        "test.checkpoint_0": f"State {second}",
+        "test.checkpoint_1": f"State {first}",
+        "test.checkpoint_2": f"State {now}",
+        "test.checkpoint_3": f"State {now}",
+        "test.checkpoint_4": f"State {now}",
+    }
+
+
 def test_state_changes_during_period(hass_recorder):
     """Test state change during period."""
     hass = hass_recorder()
@@ -206,6 +267,63 @@ def test_get_significant_states_minimal_response(hass_recorder):
     assert states == hist
 
 
+def test_get_significant_states_json(hass_recorder):
+    """Test the JSON fragments match the serialized significant states."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    one = zero + timedelta(seconds=1)
+
+    for minimal_response in (False, True):
+        for start_time, include_start_time_state in ((zero, False), (one, True)):
+            hist = history.get_significant_states(
+                hass,
+                start_time,
+                four,
+                include_start_time_state=include_start_time_state,
+                minimal_response=minimal_response,
+            )
+            with session_scope(hass=hass) as session:
+                # pylint: disable=protected-access
+                fragments = dict(
+                    history._get_significant_states_json(
+                        hass,
+                        session,
+                        start_time,
+                        four,
+                        include_start_time_state=include_start_time_state,
+                        minimal_response=minimal_response,
+                    )
+                )
+
+            assert sorted(fragments) == sorted(hist)
+            for entity_id, states in hist.items():
+                assert [json.loads(state) for state in fragments[entity_id]] == (
+                    json.loads(json.dumps(states, cls=JSONEncoder))
+                )
+
+
+def test_get_significant_states_json_in_chunks(hass_recorder):
+    """Test the history rows can be fetched from the database in chunks."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    hist = history.get_significant_states(hass, zero, four, minimal_response=True)
+
+    with patch.object(history, "HISTORY_CHUNK_SIZE", 1), session_scope(
+        hass=hass
+    ) as session:
+        # pylint: disable=protected-access
+        fragments = dict(
+            history._get_significant_states_json(
+                hass, session, zero, four, minimal_response=True
+            )
+        )
+
+    assert {
+        entity_id: [json.loads(state) for state in states]
+        for entity_id, states in fragments.items()
+    } == json.loads(json.dumps(hist, cls=JSONEncoder))
+
+
 def test_get_significant_states_with_initial(hass_recorder):
     """Test that only significant states are returned.
 
@@ -0,0 +1,152 @@
+"""The tests for the recorder query instrumentation."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+from homeassistant.components.recorder import (
+    CONF_QUERY_INSTRUMENTATION,
+    history,
+    instrumentation,
+)
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.util import execute, session_scope
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+
+SIGNIFICANT_STATES_CALL_SITE = (
+    "homeassistant.components.recorder.history._get_significant_states"
+)
+STREAMED_STATES_CALL_SITE = (
+    "homeassistant.components.recorder.history._sorted_states_to_json"
+)
+
+
+def test_query_stats_histogram():
+    """Test query latencies are counted in their bucket."""
+    stats = instrumentation.QueryStats()
+    stats.record(0.0005)
+    stats.record(0.2)
+    stats.record(10)
+
+    result = stats.as_dict()
+    assert result["count"] == 3
+    assert result["max"] == 10
+    assert result["buckets"]["0.001"] == 1
+    assert result["buckets"]["0.5"] == 1
+    assert result["buckets"]["+Inf"] == 1
+    assert sum(result["buckets"].values()) == 3
+
+
+def test_estimate_size():
+    """Test the bytes of the rows are estimated from a sample of them."""
+    rows = [("sensor.one", "on", 1.0)] * 1000
+    with patch.object(instrumentation, "SIZE_SAMPLE_ROWS", 10):
+        assert instrumentation._estimate_size(rows) == 1000 * (10 + 2 + 8)
+    assert instrumentation._estimate_size([]) == 0
+
+
+def test_query_stats_per_call_site(hass_recorder):
+    """Test the latency, rows and bytes of the queries are recorded per call site."""
+    hass = hass_recorder({CONF_QUERY_INSTRUMENTATION: True})
+    hass.states.set("sensor.test", "10")
+    hass.states.set("sensor.test", "20")
+    wait_recording_done(hass)
+
+    states = history.get_significant_states(hass, dt_util.utcnow() - timedelta(hours=1))
+    assert len(states["sensor.test"]) == 2
+
+    stats = hass.data[DATA_INSTANCE].query_instrumentation.as_dict()
+    call_site = stats["call_sites"][SIGNIFICANT_STATES_CALL_SITE]
+    assert call_site["count"] == 1
+    assert call_site["rows"] == 2
+    assert call_site["bytes"] > 0
+    assert call_site["total"] > 0
+    assert stats["slow_queries"] == []
+
+
+def test_query_stats_of_streamed_rows(hass_recorder):
+    """Test the rows of the history streamed as JSON are recorded."""
+    hass = hass_recorder({CONF_QUERY_INSTRUMENTATION: True})
+    for state in ("10", "20", "30"):
+        hass.states.set("sensor.test", state)
+    wait_recording_done(hass)
+
+    with patch.object(history, "HISTORY_CHUNK_SIZE", 2), session_scope(
+        hass=hass
+    ) as session:
+        # pylint: disable=protected-access
+        states = dict(
+            history._get_significant_states_json(
+                hass,
+                session,
+                dt_util.utcnow() - timedelta(hours=1),
+                include_start_time_state=False,
+            )
+        )
+    assert len(states["sensor.test"]) == 3
+
+    stats = hass.data[DATA_INSTANCE].query_instrumentation.as_dict()
+    call_site = stats["call_sites"][STREAMED_STATES_CALL_SITE]
+    assert call_site["count"] == 1
+    assert call_site["rows"] == 3
+    assert call_site["bytes"] > 0
+
+
+def test_slow_query_plan(hass_recorder):
+    """Test the plan of a slow query is captured once."""
+    hass = hass_recorder({CONF_QUERY_INSTRUMENTATION: True})
+    hass.states.set("sensor.test", "10")
+    wait_recording_done(hass)
+
+    with patch.object(instrumentation, "SLOW_QUERY_TIME", 0), patch.object(
+        instrumentation, "_explain", wraps=instrumentation._explain
+    ) as explain, session_scope(hass=hass) as session:
+        for _ in range(2):
+            rows = execute(
+                session.query(States.state).filter(States.entity_id == "sensor.test")
+            )
+            assert len(rows) == 1
+
+    assert explain.call_count == 1
+    slow_queries = hass.data[DATA_INSTANCE].query_instrumentation.as_dict()[
+        "slow_queries"
+    ]
+    assert len(slow_queries) == 2
+    slow_query = slow_queries[-1]
+    assert slow_query["call_site"] == f"{__name__}.test_slow_query_plan"
+    assert slow_query["statement"].lstrip().startswith("SELECT")
+    assert any("states" in line for line in slow_query["plan"])
+
+
+def test_explain_unsupported_dialect():
+    """Test there is no plan for databases without a known EXPLAIN."""
+    assert instrumentation._explain(None, "mssql", "SELECT 1", ()) is None
+
+
+def test_instrumentation_disabled_by_default(hass_recorder):
+    """Test the queries are only instrumented when enabled."""
+    hass = hass_recorder()
+    assert hass.data[DATA_INSTANCE].query_instrumentation is None
+
+
+def test_query_time_listeners_share_timing():
+    """Test the statements of an engine are timed once for all listeners."""
+    engine = create_engine("sqlite://")
+    first = []
+    second = []
+    instrumentation.listen_query_time(
+        engine, lambda *args: first.append((args[1], args[4]))
+    )
+    instrumentation.listen_query_time(
+        engine, lambda *args: second.append((args[1], args[4]))
+    )
+
+    with engine.connect() as connection:
+        connection.execute("SELECT 1")
+
+    assert first == second
+    assert [statement for statement, _ in first] == ["SELECT 1"]
+    assert first[0][1] >= 0
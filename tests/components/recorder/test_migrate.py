@@ -257,6 +257,159 @@ async def test_schema_migrate(hass):
         assert setup_run.called
 
 
+def test_backfill_event_entity_ids_and_continuous_states():
+    """Test the backfill of the columns added in schema version 20."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for event_type, event_data in (
+            ("automation_triggered", '{"entity_id": "automation.hello"}'),
+            ("logbook_entry", '{"name": "Alarm", "entity_id": "alarm.home"}'),
+            ("call_service", '{"service_data": {"entity_id": "light.kitchen"}}'),
+            ("state_changed", '{"entity_id": "sensor.temperature"}'),
+            ("test_event", '{"some_data": 15}'),
+            ("test_event", '{"entity_id": ["light.kitchen"]}'),
+        ):
+            session.add(models.Events(event_type=event_type, event_data=event_data))
+        for entity_id, domain, attributes in (
+            ("sensor.temperature", "sensor", '{"unit_of_measurement": "\u00b0C"}'),
+            ("sensor.mode", "sensor", "{}"),
+            ("light.kitchen", "light", '{"unit_of_measurement": "%"}'),
+            ("sensor.humidity", "sensor", None),
+            ("sensor.power", None, '{"unit_of_measurement": "W"}'),
+        ):
+            session.add(
+                States(
+                    entity_id=entity_id,
+                    domain=domain,
+                    state="on",
+                    attributes=attributes,
+                )
+            )
+        session.commit()
+
+        with patch.object(migration, "BACKFILL_BATCH_SIZE", 2):
+            migration._backfill_event_entity_ids(session)
+            migration._backfill_continuous_states(session)
+
+        assert [
+            event.entity_id
+            for event in session.query(models.Events).order_by(models.Events.event_id)
+        ] == ["automation.hello", "alarm.home", "light.kitchen", None, None, None]
+        assert [
+            state.continuous
+            for state in session.query(States).order_by(States.state_id)
+        ] == [True, False, False, False, False]
+
+
+def test_backfill_timestamps():
+    """Test the backfill of the timestamp columns added in schema version 21."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    times = [
+        datetime.datetime(2016, 7, 9, 11, 0, 0, tzinfo=dt_util.UTC),
+        datetime.datetime(2021, 8, 1, 23, 59, 59, 999999, tzinfo=dt_util.UTC),
+        datetime.datetime(2021, 8, 2, 0, 0, 0, 123456, tzinfo=dt_util.UTC),
+    ]
+    with Session(engine) as session:
+        for time in times:
+            session.add(models.Events(event_type="test_event", time_fired=time))
+            session.add(
+                States(
+                    entity_id="sensor.temperature",
+                    state="18",
+                    last_changed=times[0],
+                    last_updated=time,
+                )
+            )
+        session.commit()
+
+        with patch.object(migration, "BACKFILL_BATCH_SIZE", 2):
+            migration._backfill_timestamps(
+                session,
+                "sqlite",
+                "events",
+                "event_id",
+                {"time_fired_ts": "time_fired"},
+            )
+            migration._backfill_timestamps(
+                session,
+                "sqlite",
+                "states",
+                "state_id",
+                {"last_changed_ts": "last_changed", "last_updated_ts": "last_updated"},
+            )
+
+        assert [
+            event.time_fired_ts
+            for event in session.query(models.Events).order_by(models.Events.event_id)
+        ] == pytest.approx([time.timestamp() for time in times], abs=1e-6)
+        states = session.query(States).order_by(States.state_id).all()
+        assert [state.last_changed_ts for state in states] == pytest.approx(
+            [times[0].timestamp()] * 3, abs=1e-6
+        )
+        assert [state.last_updated_ts for state in states] == pytest.approx(
+            [time.timestamp() for time in times], abs=1e-6
+        )
+
+
+def test_backfill_context_ids():
+    """Test the backfill of the binary context ids added in schema version 22."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for context_id, user_id, parent_id in (
+            ("ac5bd62de45711eaaeb351041eec8dd9", None, None),
+            (
+                "01723ed9b0a0a3f2c1d8e7b6a5f40312",
+                "9400facee45711eaa9308bfd3d19e474",
+                "ac5bd62de45711eaaeb351041eec8dd9",
+            ),
+            ("custom_context", "AC5BD62DE45711EAAEB351041EEC8DD9", None),
+        ):
+            session.add(
+                models.Events(
+                    event_type="test_event",
+                    event_data="{}",
+                    origin="LOCAL",
+                    context_id=context_id,
+                    context_user_id=user_id,
+                    context_parent_id=parent_id,
+                )
+            )
+        session.commit()
+
+        with patch.object(migration, "BACKFILL_BATCH_SIZE", 2):
+            migration._backfill_context_ids(session)
+
+        events = session.query(models.Events).order_by(models.Events.event_id).all()
+        assert [
+            (event.context_id, event.context_user_id, event.context_parent_id)
+            for event in events
+        ] == [
+            (None, None, None),
+            (None, None, None),
+            ("custom_context", "AC5BD62DE45711EAAEB351041EEC8DD9", None),
+        ]
+        assert [
+            (
+                event.context_id_bin,
+                event.context_user_id_bin,
+                event.context_parent_id_bin,
+            )
+            for event in events
+        ] == [
+            (bytes.fromhex("ac5bd62de45711eaaeb351041eec8dd9"), None, None),
+            (
+                bytes.fromhex("01723ed9b0a0a3f2c1d8e7b6a5f40312"),
+                bytes.fromhex("9400facee45711eaa9308bfd3d19e474"),
+                bytes.fromhex("ac5bd62de45711eaaeb351041eec8dd9"),
+            ),
+            (None, None, None),
+        ]
+        assert events[1].to_native().context.id == "01723ed9b0a0a3f2c1d8e7b6a5f40312"
+
+
 def test_invalid_update():
     """Test that an invalid new version raises an exception."""
     with pytest.raises(ValueError):
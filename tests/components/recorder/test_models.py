@@ -8,6 +8,7 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 from homeassistant.components.recorder.models import (
     Base,
     Events,
+    LazyState,
     RecorderRuns,
     States,
     process_timestamp,
@@ -26,6 +27,27 @@ def test_from_event_to_db_event():
     assert event == Events.from_event(event).to_native()
 
 
+def test_from_event_to_db_event_context_ids():
+    """Test context ids are stored as bytes unless they are not hex ids."""
+    context = ha.Context(user_id="9400facee45711eaa9308bfd3d19e474")
+    event = ha.Event("test_event", context=context)
+    dbevent = Events.from_event(event)
+    assert dbevent.context_id_bin == bytes.fromhex(context.id)
+    assert dbevent.context_user_id_bin == bytes.fromhex(context.user_id)
+    assert dbevent.context_parent_id_bin is None
+    assert dbevent.context_id is None
+    assert dbevent.context_user_id is None
+    assert dbevent.to_native().context == context
+
+    context = ha.Context(id="custom_context", parent_id=context.id)
+    event = ha.Event("test_event", context=context)
+    dbevent = Events.from_event(event)
+    assert dbevent.context_id_bin is None
+    assert dbevent.context_id == "custom_context"
+    assert dbevent.context_parent_id_bin == bytes.fromhex(context.parent_id)
+    assert dbevent.to_native().context == context
+
+
 def test_from_event_to_db_state():
     """Test converting event to db state."""
     state = ha.State("sensor.temperature", "18")
@@ -40,6 +62,45 @@ def test_from_event_to_db_state():
     assert state == States.from_event(event).to_native()
 
 
+@pytest.mark.parametrize(
+    "event_type,event_data,entity_id",
+    [
+        ("automation_triggered", {"entity_id": "automation.hello"}, "automation.hello"),
+        ("logbook_entry", {"entity_id": ["light.kitchen"]}, None),
+        ("logbook_entry", {"entity_id": "x" * 256}, None),
+        (
+            "call_service",
+            {"domain": "light", "service_data": {"entity_id": "light.kitchen"}},
+            "light.kitchen",
+        ),
+        (EVENT_STATE_CHANGED, {"entity_id": "sensor.temperature"}, None),
+        ("test_event", {"some_data": 15}, None),
+    ],
+)
+def test_from_event_to_db_event_entity_id(event_type, event_data, entity_id):
+    """Test the entity an event refers to is recorded."""
+    event = ha.Event(event_type, event_data)
+    assert Events.from_event(event).entity_id == entity_id
+
+
+@pytest.mark.parametrize(
+    "entity_id,attributes,continuous",
+    [
+        ("sensor.temperature", {"unit_of_measurement": "°C"}, True),
+        ("sensor.mode", {}, False),
+        ("light.kitchen", {"unit_of_measurement": "%"}, False),
+    ],
+)
+def test_from_event_to_db_state_continuous(entity_id, attributes, continuous):
+    """Test the states of continuous entities are flagged."""
+    state = ha.State(entity_id, "18", attributes)
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "old_state": None, "new_state": state},
+    )
+    assert States.from_event(event).continuous is continuous
+
+
 def test_from_event_to_delete_state():
     """Test converting deleting state event to db state."""
     event = ha.Event(
@@ -57,6 +118,9 @@ def test_from_event_to_delete_state():
     assert db_state.state == ""
     assert db_state.last_changed == event.time_fired
     assert db_state.last_updated == event.time_fired
+    assert db_state.last_changed_ts == event.time_fired.timestamp()
+    assert db_state.last_updated_ts == event.time_fired.timestamp()
+    assert db_state.continuous is False
 
 
 def test_entity_ids():
@@ -95,6 +159,8 @@ def test_entity_ids():
             state="20",
             last_changed=before_run,
             last_updated=before_run,
+            last_changed_ts=before_run.timestamp(),
+            last_updated_ts=before_run.timestamp(),
         )
     )
     session.add(
@@ -103,6 +169,8 @@ def test_entity_ids():
             state="10",
             last_changed=after_run,
             last_updated=after_run,
+            last_changed_ts=after_run.timestamp(),
+            last_updated_ts=after_run.timestamp(),
         )
     )
 
@@ -112,6 +180,8 @@ def test_entity_ids():
             state="76",
             last_changed=in_run,
             last_updated=in_run,
+            last_changed_ts=in_run.timestamp(),
+            last_updated_ts=in_run.timestamp(),
         )
     )
     session.add(
@@ -120,6 +190,8 @@ def test_entity_ids():
             state="5",
             last_changed=in_run3,
             last_updated=in_run3,
+            last_changed_ts=in_run3.timestamp(),
+            last_updated_ts=in_run3.timestamp(),
         )
     )
 
@@ -127,6 +199,32 @@ def test_entity_ids():
     assert run.entity_ids(in_run2) == ["sensor.humidity"]
 
 
+def test_lazy_state_from_timestamps():
+    """Test a lazy state reads the epoch timestamp columns of a row."""
+    state = ha.State(
+        "sensor.temperature",
+        "18",
+        {"unit_of_measurement": "°C"},
+        last_changed=datetime(2016, 7, 9, 11, 0, 0, 123456, tzinfo=dt.UTC),
+        last_updated=datetime(2016, 7, 9, 12, 0, 0, tzinfo=dt.UTC),
+    )
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+    )
+    lazy_state = LazyState(States.from_event(event))
+
+    assert lazy_state.last_changed == state.last_changed
+    assert lazy_state.last_updated == state.last_updated
+    assert lazy_state.as_dict() == {
+        "entity_id": "sensor.temperature",
+        "state": "18",
+        "attributes": {"unit_of_measurement": "°C"},
+        "last_changed": "2016-07-09T11:00:00.123456+00:00",
+        "last_updated": "2016-07-09T12:00:00+00:00",
+    }
+
+
 def test_states_from_native_invalid_entity_id():
     """Test loading a state from an invalid entity ID."""
     state = States()
@@ -1,10 +1,17 @@
 """Test pool."""
 import threading
 
-from sqlalchemy import create_engine
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
 
-from homeassistant.components.recorder.pool import RecorderPool
+from homeassistant.components.recorder.pool import (
+    READ_POOL_SIZE,
+    RecorderPool,
+    RecorderReadPool,
+)
+from homeassistant.components.recorder.util import setup_read_connection_for_sqlite
 
 
 def test_recorder_pool():
@@ -32,3 +39,39 @@ def test_recorder_pool():
     new_thread.join()
 
     assert connections[2] != connections[3]
+
+
+def test_recorder_read_pool(tmp_path):
+    """Test RecorderReadPool shares read-only connections between threads."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'read_pool.db'}",
+        poolclass=RecorderReadPool,
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(
+        engine,
+        "connect",
+        lambda dbapi_connection, _: setup_read_connection_for_sqlite(dbapi_connection),
+    )
+    get_session = sessionmaker(bind=engine)
+
+    connections = []
+
+    def _get_connection():
+        session = get_session()
+        connections.append(session.connection().connection.connection)
+        session.close()
+
+    _get_connection()
+    new_thread = threading.Thread(target=_get_connection)
+    new_thread.start()
+    new_thread.join()
+
+    assert connections[0] == connections[1]
+    assert engine.pool.size() == READ_POOL_SIZE
+    assert engine.pool.stats.checkouts == 2
+
+    session = get_session()
+    with pytest.raises(OperationalError):
+        session.execute(text("CREATE TABLE test (id INTEGER)"))
+    session.close()
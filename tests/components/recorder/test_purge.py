@@ -10,7 +10,12 @@ from sqlalchemy.orm.session import Session
 from homeassistant.components import recorder
 from homeassistant.components.recorder import PurgeTask
 from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateCheckpoints,
+    States,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED
@@ -154,6 +159,97 @@ async def test_purge_old_states_encounters_operational_error(
     assert "Error executing purge" in caplog.text
 
 
+async def test_purge_old_states_in_slices(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test purging yields once the slices used up the time budget."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass, instance)
+
+    with session_scope(hass=hass) as session, patch(
+        "homeassistant.components.recorder.purge.PURGE_SLICE_MAX_ROWS", 1
+    ), patch("homeassistant.components.recorder.purge.PURGE_TIME_BUDGET", timedelta(0)):
+        states = session.query(States)
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+        assert states.count() == 5
+
+        progress = instance.purge_progress
+        assert progress.purge_before == purge_before
+        assert progress.slices == 1
+        assert progress.states_purged == 1
+        assert progress.events_purged == 0
+        assert progress.remaining_states > 0
+        assert progress.remaining_events > 0
+
+        # Every call purges one slice until the last call finishes
+        calls = 1
+        while not purge_old_data(instance, purge_before, repack=False):
+            calls += 1
+        assert calls == 6
+        assert states.count() == 2
+
+        assert instance.purge_progress is progress
+        assert progress.finished is not None
+        assert progress.as_dict() == {
+            "purge_before": purge_before.isoformat(),
+            "started": progress.started.isoformat(),
+            "finished": progress.finished.isoformat(),
+            "slices": 6,
+            "states_purged": 4,
+            "events_purged": 4,
+            "remaining_states": 0,
+            "remaining_events": 0,
+        }
+
+
+async def test_purge_keeps_links_to_newer_states(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states kept in a purged id range stay linked to their new states."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done_without_instance(hass)
+    old = dt_util.utcnow() - timedelta(days=10)
+    new = dt_util.utcnow()
+
+    with session_scope(hass=hass) as session:
+        # The second state was recorded out of order, its id is between the
+        # ids of two old states
+        for state_id, timestamp, old_state_id in (
+            (1, old, None),
+            (2, new, None),
+            (3, old, 1),
+            (4, new, 2),
+        ):
+            session.add(
+                States(
+                    state_id=state_id,
+                    entity_id=f"sensor.test_{state_id % 2}",
+                    domain="sensor",
+                    state="on",
+                    attributes="{}",
+                    last_changed=timestamp,
+                    last_changed_ts=timestamp.timestamp(),
+                    last_updated=timestamp,
+                    last_updated_ts=timestamp.timestamp(),
+                    created=timestamp,
+                    old_state_id=old_state_id,
+                )
+            )
+
+    with session_scope(hass=hass) as session:
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+        while not purge_old_data(instance, purge_before, repack=False):
+            pass
+
+        assert [state.state_id for state in session.query(States)] == [2, 4]
+        assert session.query(States).get(4).old_state_id == 2
+        assert instance.purge_progress.states_purged == 2
+
+
 async def test_purge_old_events(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -203,6 +299,32 @@ async def test_purge_old_recorder_runs(
         assert recorder_runs.count() == 1
 
 
+async def test_purge_old_state_checkpoints(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting old state checkpoints."""
+    instance = await async_setup_recorder_instance(hass)
+
+    utcnow = dt_util.utcnow()
+    with recorder.session_scope(hass=hass) as session:
+        for days in (11, 5, 0):
+            session.add(
+                StateCheckpoints(
+                    entity_id="sensor.test",
+                    state_id=days,
+                    created=utcnow - timedelta(days=days),
+                )
+            )
+
+    with session_scope(hass=hass) as session:
+        checkpoints = session.query(StateCheckpoints)
+        assert checkpoints.count() == 3
+
+        finished = purge_old_data(instance, utcnow - timedelta(days=4), repack=False)
+        assert finished
+        assert [checkpoint.state_id for checkpoint in checkpoints] == [0]
+
+
 async def test_purge_method(
     hass: HomeAssistant,
     async_setup_recorder_instance: SetupRecorderInstanceT,
@@ -289,6 +411,7 @@ async def test_purge_edge_case(
                     origin="LOCAL",
                     created=timestamp,
                     time_fired=timestamp,
+                    time_fired_ts=timestamp.timestamp(),
                 )
             )
             session.add(
@@ -298,7 +421,9 @@ async def test_purge_edge_case(
                     state="purgeme",
                     attributes="{}",
                     last_changed=timestamp,
+                    last_changed_ts=timestamp.timestamp(),
                     last_updated=timestamp,
+                    last_updated_ts=timestamp.timestamp(),
                     created=timestamp,
                     event_id=1001,
                 )
@@ -349,6 +474,7 @@ async def test_purge_cutoff_date(
                     origin="LOCAL",
                     created=timestamp_keep,
                     time_fired=timestamp_keep,
+                    time_fired_ts=timestamp_keep.timestamp(),
                 )
             )
             session.add(
@@ -358,7 +484,9 @@ async def test_purge_cutoff_date(
                     state="keep",
                     attributes="{}",
                     last_changed=timestamp_keep,
+                    last_changed_ts=timestamp_keep.timestamp(),
                     last_updated=timestamp_keep,
+                    last_updated_ts=timestamp_keep.timestamp(),
                     created=timestamp_keep,
                     event_id=1000,
                 )
@@ -372,6 +500,7 @@ async def test_purge_cutoff_date(
                         origin="LOCAL",
                         created=timestamp_purge,
                         time_fired=timestamp_purge,
+                        time_fired_ts=timestamp_purge.timestamp(),
                     )
                 )
                 session.add(
@@ -381,7 +510,9 @@ async def test_purge_cutoff_date(
                         state="purge",
                         attributes="{}",
                         last_changed=timestamp_purge,
+                        last_changed_ts=timestamp_purge.timestamp(),
                         last_updated=timestamp_purge,
+                        last_updated_ts=timestamp_purge.timestamp(),
                         created=timestamp_purge,
                         event_id=1000 + row,
                     )
@@ -449,7 +580,9 @@ async def test_purge_filtered_states(
                     state="purgeme",
                     attributes="{}",
                     last_changed=timestamp,
+                    last_changed_ts=timestamp.timestamp(),
                     last_updated=timestamp,
+                    last_updated_ts=timestamp.timestamp(),
                     created=timestamp,
                 )
             )
@@ -471,7 +604,9 @@ async def test_purge_filtered_states(
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
+                last_changed_ts=timestamp.timestamp(),
                 last_updated=timestamp,
+                last_updated_ts=timestamp.timestamp(),
                 created=timestamp,
                 old_state_id=1,
             )
@@ -482,7 +617,9 @@ async def test_purge_filtered_states(
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
+                last_changed_ts=timestamp.timestamp(),
                 last_updated=timestamp,
+                last_updated_ts=timestamp.timestamp(),
                 created=timestamp,
                 old_state_id=2,
             )
@@ -492,7 +629,9 @@ async def test_purge_filtered_states(
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
+                last_changed_ts=timestamp.timestamp(),
                 last_updated=timestamp,
+                last_updated_ts=timestamp.timestamp(),
                 created=timestamp,
                 old_state_id=62,  # keep
             )
@@ -506,6 +645,7 @@ async def test_purge_filtered_states(
                     origin="LOCAL",
                     created=timestamp,
                     time_fired=timestamp,
+                    time_fired_ts=timestamp.timestamp(),
                 )
             )
 
@@ -585,6 +725,7 @@ async def test_purge_filtered_events(
                             origin="LOCAL",
                             created=timestamp,
                             time_fired=timestamp,
+                            time_fired_ts=timestamp.timestamp(),
                         )
                     )
 
@@ -678,6 +819,7 @@ async def test_purge_filtered_events_state_changed(
                         origin="LOCAL",
                         created=timestamp,
                         time_fired=timestamp,
+                        time_fired_ts=timestamp.timestamp(),
                     )
                 )
             # Add states with linked old_state_ids that need to be handled
@@ -688,7 +830,9 @@ async def test_purge_filtered_events_state_changed(
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
+                last_changed_ts=timestamp.timestamp(),
                 last_updated=timestamp,
+                last_updated_ts=timestamp.timestamp(),
                 created=timestamp,
                 old_state_id=1,
             )
@@ -699,7 +843,9 @@ async def test_purge_filtered_events_state_changed(
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
+                last_changed_ts=timestamp.timestamp(),
                 last_updated=timestamp,
+                last_updated_ts=timestamp.timestamp(),
                 created=timestamp,
                 old_state_id=2,
             )
@@ -709,7 +855,9 @@ async def test_purge_filtered_events_state_changed(
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
+                last_changed_ts=timestamp.timestamp(),
                 last_updated=timestamp,
+                last_updated_ts=timestamp.timestamp(),
                 created=timestamp,
                 old_state_id=62,  # keep
             )
@@ -894,6 +1042,7 @@ async def _add_test_states(hass: HomeAssistant, instance: recorder.Recorder):
                 origin="LOCAL",
                 created=timestamp,
                 time_fired=timestamp,
+                time_fired_ts=timestamp.timestamp(),
             )
             session.add(event)
             session.flush()
@@ -903,7 +1052,9 @@ async def _add_test_states(hass: HomeAssistant, instance: recorder.Recorder):
                 state=state,
                 attributes=json.dumps(attributes),
                 last_changed=timestamp,
+                last_changed_ts=timestamp.timestamp(),
                 last_updated=timestamp,
+                last_updated_ts=timestamp.timestamp(),
                 created=timestamp,
                 event_id=event.event_id,
                 old_state_id=old_state_id,
@@ -942,6 +1093,7 @@ async def _add_test_events(hass: HomeAssistant, instance: recorder.Recorder):
                     origin="LOCAL",
                     created=timestamp,
                     time_fired=timestamp,
+                    time_fired_ts=timestamp.timestamp(),
                 )
             )
 
@@ -988,7 +1140,9 @@ def _add_state_and_state_changed_event(
             state=state,
             attributes="{}",
             last_changed=timestamp,
+            last_changed_ts=timestamp.timestamp(),
             last_updated=timestamp,
+            last_updated_ts=timestamp.timestamp(),
             created=timestamp,
             event_id=event_id,
         )
@@ -1001,5 +1155,6 @@ def _add_state_and_state_changed_event(
             origin="LOCAL",
             created=timestamp,
             time_fired=timestamp,
+            time_fired_ts=timestamp.timestamp(),
         )
     )
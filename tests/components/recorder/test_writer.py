@@ -0,0 +1,164 @@
+"""The tests for the recorder writer process."""
+import asyncio
+from datetime import timedelta
+import pickle
+import sqlite3
+
+from homeassistant.components.recorder import (
+    CONF_DB_URL,
+    CONF_WRITER_PROCESS,
+    SERVICE_PURGE,
+    SQLITE_URL_PREFIX,
+    writer,
+)
+from homeassistant.components.recorder.const import DATA_INSTANCE, DOMAIN
+from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+import homeassistant.core as ha
+from homeassistant.setup import setup_component
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+
+from tests.common import get_test_home_assistant
+
+
+def test_serialize_event():
+    """Test events are serialized to the columns of their rows."""
+    state = ha.State("sensor.power", "10", {"unit_of_measurement": "W"})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.power", "new_state": state},
+        context=state.context,
+    )
+
+    event_columns, state_columns = pickle.loads(
+        pickle.dumps(writer.serialize_event(event))
+    )
+
+    dbevent = Events(**event_columns)
+    assert dbevent.event_data == "{}"
+    assert dbevent.event_type == EVENT_STATE_CHANGED
+    assert dbevent.to_native().context == state.context
+    dbstate = States(**state_columns)
+    assert dbstate.state == "10"
+    assert dbstate.attributes == '{"unit_of_measurement": "W"}'
+    assert dbstate.last_updated_ts == state.last_updated.timestamp()
+
+    removed = ha.Event(EVENT_STATE_CHANGED, {"entity_id": "sensor.power"})
+    _, state_columns = writer.serialize_event(removed)
+    assert state_columns["state"] is None
+
+
+def test_serialize_event_not_serializable(caplog):
+    """Test events that are not JSON serializable are not recorded."""
+    assert writer.serialize_event(ha.Event("bad", {"data": object()})) is None
+    assert "Event is not JSON serializable" in caplog.text
+
+
+def test_purge_entities_filter_can_be_pickled():
+    """Test the filter of the entities to purge survives a pickle."""
+    entity_filter = writer.PurgeEntitiesFilter(["sensor.one"], ["light"], ["*.two"])
+    assert entity_filter("sensor.one")
+
+    entity_filter = pickle.loads(pickle.dumps(entity_filter))
+    assert entity_filter("sensor.one")
+    assert entity_filter("light.kitchen")
+    assert entity_filter("switch.two")
+    assert not entity_filter("sensor.three")
+
+
+def test_writer_process_not_used_with_memory_database(hass_recorder, caplog):
+    """Test the writer process is not used with an in memory database."""
+    hass = hass_recorder({CONF_WRITER_PROCESS: True})
+
+    assert not hass.data[DATA_INSTANCE].writer_process
+    assert "not supported with an in memory database" in caplog.text
+
+
+def test_writer_process(tmpdir):
+    """Test events are recorded and tasks are run by the writer process."""
+    test_db_file = tmpdir.mkdir("sqlite").join("test_writer.db")
+    dburl = f"{SQLITE_URL_PREFIX}//{test_db_file}"
+
+    hass = get_test_home_assistant()
+    setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_DB_URL: dburl, CONF_WRITER_PROCESS: True}}
+    )
+    hass.start()
+    wait_recording_done(hass)
+    instance = hass.data[DATA_INSTANCE]
+    assert instance.writer_process
+
+    hass.states.set("light.kitchen", "on", {"brightness": 255})
+    hass.states.set("light.kitchen", "off")
+    hass.states.remove("light.kitchen")
+    hass.bus.fire("custom_event", {"some": "data"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(
+            session.query(States)
+            .filter(States.entity_id == "light.kitchen")
+            .order_by(States.state_id)
+        )
+        assert [db_state.state for db_state in db_states] == ["on", "off", None]
+        assert db_states[0].attributes == '{"brightness": 255}'
+        assert db_states[1].old_state_id == db_states[0].state_id
+        assert db_states[2].old_state_id == db_states[1].state_id
+        assert all(db_state.event_id for db_state in db_states)
+
+        db_event = (
+            session.query(Events).filter(Events.event_type == "custom_event").one()
+        )
+        assert db_event.event_data == '{"some": "data"}'
+
+    instance.do_adhoc_statistics(start=dt_util.utcnow() - timedelta(hours=1))
+    hass.services.call(DOMAIN, SERVICE_PURGE, {"keep_days": 0}, blocking=True)
+    wait_recording_done(hass)
+
+    assert instance.purge_progress is not None
+    with session_scope(hass=hass) as session:
+        assert (
+            session.query(States).filter(States.entity_id == "light.kitchen").count()
+            == 0
+        )
+
+    hass.stop()
+
+    with sqlite3.connect(test_db_file) as connection:
+        runs = connection.execute(
+            f"SELECT start, end FROM {RecorderRuns.__tablename__}"
+        ).fetchall()
+    assert len(runs) == 1
+    assert runs[0][1] is not None
+
+
+def test_writer_process_exited(tmpdir, caplog):
+    """Test waiting on the recorder does not block after the writer process died."""
+    test_db_file = tmpdir.mkdir("sqlite").join("test_writer.db")
+    dburl = f"{SQLITE_URL_PREFIX}//{test_db_file}"
+
+    hass = get_test_home_assistant()
+    setup_component(hass, "persistent_notification", {})
+    setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_DB_URL: dburl, CONF_WRITER_PROCESS: True}}
+    )
+    hass.start()
+    wait_recording_done(hass)
+    instance = hass.data[DATA_INSTANCE]
+
+    instance._writer._process.kill()
+    instance._writer._process.join()
+    hass.states.set("light.kitchen", "on")
+    wait_recording_done(hass)
+
+    async def _async_commit():
+        await instance.async_commit()
+
+    asyncio.run_coroutine_threadsafe(_async_commit(), hass.loop).result(timeout=5)
+    assert "events are no longer being recorded" in caplog.text
+    assert hass.states.get("persistent_notification.recorder_writer_process")
+
+    hass.stop()
@@ -1,6 +1,9 @@
 """The test for the statistics sensor platform."""
+from collections import deque
 from datetime import datetime, timedelta
+import math
 from os import path
+import random
 import statistics
 import unittest
 from unittest.mock import patch
@@ -9,7 +12,11 @@ import pytest
 
 from homeassistant import config as hass_config
 from homeassistant.components import recorder
-from homeassistant.components.statistics.sensor import DOMAIN, StatisticsSensor
+from homeassistant.components.statistics.sensor import (
+    DOMAIN,
+    StatisticsSensor,
+    StatisticsWindow,
+)
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
     SERVICE_RELOAD,
@@ -456,6 +463,57 @@ class TestStatisticsSensor(unittest.TestCase):
         )
 
 
+@pytest.mark.parametrize("method", ["exclusive", "inclusive"])
+def test_window_matches_statistics_module(method):
+    """Test the sliding window calculates what the statistics module does."""
+    rnd = random.Random(42)
+    samples = deque()
+    window = StatisticsWindow(samples)
+
+    for _ in range(500):
+        value = round(rnd.uniform(-50, 50), rnd.randint(0, 3))
+        samples.append(value)
+        window.add(value)
+        if len(samples) > 25:
+            window.remove(samples.popleft())
+
+        assert window.mean() == statistics.mean(samples)
+        assert window.median() == statistics.median(samples)
+        assert window.total == pytest.approx(sum(samples))
+        if len(samples) < 2:
+            continue
+        assert window.variance() == pytest.approx(statistics.variance(samples))
+        assert window.stdev() == pytest.approx(statistics.stdev(samples))
+        assert window.quantiles(4, method) == statistics.quantiles(
+            samples, n=4, method=method
+        )
+
+
+def test_window_non_finite_samples():
+    """Test infinite and NaN samples are accepted like the statistics module does."""
+    samples = deque([1.0, math.inf, 3.0])
+    window = StatisticsWindow(samples)
+    for value in samples:
+        window.add(value)
+
+    assert len(window) == 3
+    assert window.mean() == math.inf
+    assert window.median() == 3.0
+    assert window.total == math.inf
+    assert window.minimum() == 1.0
+    assert window.maximum() == math.inf
+
+    window.add(math.nan)
+    samples.append(math.nan)
+    assert math.isnan(window.mean())
+
+    window.remove(samples.popleft())
+    window.remove(samples.popleft())
+    window.remove(samples.pop())
+    assert window.mean() == 3.0
+    assert window.minimum() == window.maximum() == 3.0
+
+
 async def test_reload(hass):
     """Verify we can reload filter sensors."""
     await hass.async_add_executor_job(
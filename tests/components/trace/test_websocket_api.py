@@ -1,14 +1,29 @@
 """Test Trace websocket API."""
 import asyncio
+from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 
 from homeassistant.bootstrap import async_setup_component
-from homeassistant.components.trace.const import DEFAULT_STORED_TRACES
+from homeassistant.components.trace.const import (
+    DATA_TRACE,
+    DATA_TRACE_STORE,
+    DEFAULT_STORED_TRACES,
+)
+from homeassistant.components.trace.storage import (
+    SAVE_DELAY,
+    STORAGE_KEY,
+    TRACES_IN_MEMORY,
+    StoredTrace,
+    trace_storage_key,
+)
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import Context, callback
 from homeassistant.helpers.typing import UNDEFINED
+import homeassistant.util.dt as dt_util
 
-from tests.common import assert_lists_same
+from tests.common import assert_lists_same, async_fire_time_changed
 
 
 def _find_run_id(traces, trace_type, item_id):
@@ -1296,3 +1311,259 @@ async def test_trace_blueprint_automation(
     assert trace["script_execution"] == "error"
     assert trace["item_id"] == "sun"
     assert trace.get("trigger", UNDEFINED) == "event 'blueprint_event'"
+
+
+@pytest.mark.parametrize("domain", ["automation", "script"])
+async def test_store_traces_at_stop(hass, hass_storage, domain):
+    """Test finished traces are saved when Home Assistant stops."""
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"event": "some_event"},
+    }
+    await _setup_automation_or_script(hass, domain, [sun_config])
+
+    await _run_automation_or_script(hass, domain, sun_config, "test_event")
+    await hass.async_block_till_done()
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    index = hass_storage[STORAGE_KEY]["data"]
+    summaries = index["traces"][f"{domain}.sun"]
+    assert summaries["stored_traces"] == DEFAULT_STORED_TRACES
+    assert len(summaries["traces"]) == 1
+    run_id = summaries["traces"][0]["short_dict"]["run_id"]
+    assert index["next_run_id"] == int(run_id) + 1
+
+    saved_traces = hass_storage[trace_storage_key((domain, "sun"))]["data"]
+    assert len(saved_traces) == 1
+    assert saved_traces[0]["short_dict"]["item_id"] == "sun"
+    assert saved_traces[0]["short_dict"]["state"] == "stopped"
+    _assert_raw_config(domain, sun_config, saved_traces[0]["extended_dict"])
+    assert "trace" in saved_traces[0]["extended_dict"]
+
+
+@pytest.mark.parametrize("domain", ["automation", "script"])
+async def test_only_newest_traces_in_memory(hass, hass_ws_client, domain):
+    """Test older saved traces are loaded from storage when requested."""
+    id = 1
+
+    def next_id():
+        nonlocal id
+        id += 1
+        return id
+
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"event": "some_event"},
+    }
+    await _setup_automation_or_script(hass, domain, [sun_config], stored_traces=20)
+
+    for _ in range(TRACES_IN_MEMORY + 3):
+        await _run_automation_or_script(hass, domain, sun_config, "test_event")
+        await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY))
+    await hass.async_block_till_done()
+
+    traces = hass.data[DATA_TRACE][(domain, "sun")]
+    assert len(traces) == TRACES_IN_MEMORY + 3
+    stored = [trace for trace in traces.values() if isinstance(trace, StoredTrace)]
+    assert len(stored) == 3
+
+    client = await hass_ws_client()
+    await client.send_json({"id": next_id(), "type": "trace/list", "domain": domain})
+    response = await client.receive_json()
+    assert response["success"]
+    assert len(_find_traces(response["result"], domain, "sun")) == TRACES_IN_MEMORY + 3
+
+    await client.send_json(
+        {
+            "id": next_id(),
+            "type": "trace/get",
+            "domain": domain,
+            "item_id": "sun",
+            "run_id": stored[0].run_id,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["run_id"] == stored[0].run_id
+    assert response["result"]["state"] == "stopped"
+    assert response["result"]["config"]["id" if domain == "automation" else "sequence"]
+    assert response["result"]["trace"]
+
+
+@pytest.mark.parametrize("domain", ["automation", "script"])
+async def test_restore_traces(hass, hass_storage, hass_ws_client, domain):
+    """Test saved traces of the previous run are restored at startup."""
+    id = 1
+
+    def next_id():
+        nonlocal id
+        id += 1
+        return id
+
+    restored_context = {"id": "abcd", "parent_id": None, "user_id": None}
+    short_dict = {
+        "last_step": None,
+        "run_id": "1000",
+        "state": "stopped",
+        "script_execution": "finished",
+        "timestamp": {
+            "start": "2021-07-01T00:00:00+00:00",
+            "finish": "2021-07-01T00:00:01+00:00",
+        },
+        "domain": domain,
+        "item_id": "sun",
+    }
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "next_run_id": 1001,
+            "traces": {
+                f"{domain}.sun": {
+                    "stored_traces": 5,
+                    "traces": [{"short_dict": short_dict, "context": restored_context}],
+                }
+            },
+        },
+    }
+    hass_storage[trace_storage_key((domain, "sun"))] = {
+        "version": 1,
+        "key": trace_storage_key((domain, "sun")),
+        "data": [
+            {
+                "short_dict": short_dict,
+                "extended_dict": {
+                    "trace": {},
+                    "config": {"id": "sun"},
+                    "blueprint_inputs": None,
+                    "context": restored_context,
+                },
+            }
+        ],
+    }
+
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"event": "some_event"},
+    }
+    await _setup_automation_or_script(hass, domain, [sun_config])
+
+    # Runs before the first request don't reuse the run ids of restored traces
+    await _run_automation_or_script(hass, domain, sun_config, "test_event")
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client()
+
+    # Restored traces come before the traces of this run
+    await client.send_json({"id": next_id(), "type": "trace/list", "domain": domain})
+    response = await client.receive_json()
+    assert response["success"]
+    traces = _find_traces(response["result"], domain, "sun")
+    assert len(traces) == 2
+    assert traces[0]["run_id"] == "1000"
+    assert int(traces[1]["run_id"]) > 1000
+
+    await client.send_json(
+        {
+            "id": next_id(),
+            "type": "trace/get",
+            "domain": domain,
+            "item_id": "sun",
+            "run_id": "1000",
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["config"] == {"id": "sun"}
+    assert response["result"]["context"] == restored_context
+    assert response["result"]["state"] == "stopped"
+
+    await client.send_json({"id": next_id(), "type": "trace/contexts"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["abcd"] == {
+        "run_id": "1000",
+        "domain": domain,
+        "item_id": "sun",
+    }
+
+    # Restored traces are saved again with the traces of this run
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    saved_traces = hass_storage[trace_storage_key((domain, "sun"))]["data"]
+    assert [saved["short_dict"]["run_id"] for saved in saved_traces] == [
+        "1000",
+        traces[1]["run_id"],
+    ]
+
+
+@pytest.mark.parametrize("domain", ["automation", "script"])
+async def test_saved_traces_kept_loaded(hass, hass_storage, domain):
+    """Test the saved traces are only loaded from storage once."""
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"event": "some_event"},
+    }
+    await _setup_automation_or_script(hass, domain, [sun_config])
+    store_key = trace_storage_key((domain, "sun"))
+
+    for _ in range(2):
+        await _run_automation_or_script(hass, domain, sun_config, "test_event")
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY))
+        await hass.async_block_till_done()
+        # The saved traces are not read back from storage
+        hass_storage[store_key]["data"] = []
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert hass_storage[store_key]["data"] == []
+
+    await _run_automation_or_script(hass, domain, sun_config, "test_event")
+    await hass.async_block_till_done()
+    await hass.data[DATA_TRACE_STORE].async_save()
+    assert len(hass_storage[store_key]["data"]) == 3
+
+
+@pytest.mark.parametrize("domain", ["automation", "script"])
+async def test_remove_traces_of_removed_items(hass, hass_storage, domain):
+    """Test the traces of removed scripts and automations are removed."""
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"event": "some_event"},
+    }
+    moon_config = {
+        "id": "moon",
+        "trigger": {"platform": "event", "event_type": "test_event2"},
+        "action": {"event": "another_event"},
+    }
+    await _setup_automation_or_script(hass, domain, [sun_config, moon_config])
+    await _run_automation_or_script(hass, domain, sun_config, "test_event")
+    await _run_automation_or_script(hass, domain, moon_config, "test_event2")
+    await hass.async_block_till_done()
+    await hass.data[DATA_TRACE_STORE].async_save()
+    assert trace_storage_key((domain, "moon")) in hass_storage
+
+    if domain == "script":
+        config = {"moon": {"sequence": moon_config["action"]}}
+    else:
+        config = [moon_config]
+    with patch(
+        "homeassistant.config.load_yaml_config_file", return_value={domain: config}
+    ):
+        await hass.services.async_call(domain, "reload", blocking=True)
+    await hass.async_block_till_done()
+
+    assert trace_storage_key((domain, "sun")) not in hass_storage
+    assert trace_storage_key((domain, "moon")) in hass_storage
+    assert (domain, "sun") not in hass.data[DATA_TRACE]
+    assert list(hass_storage[STORAGE_KEY]["data"]["traces"]) == [f"{domain}.moon"]
@@ -1,6 +1,7 @@
 """Tests for WebSocket API commands."""
 import datetime
-from unittest.mock import ANY, patch
+import logging
+from unittest.mock import ANY, AsyncMock, patch
 
 from async_timeout import timeout
 import pytest
@@ -18,8 +19,10 @@ from homeassistant.core import Context, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
+import homeassistant.util.dt as dt_util
 
 from tests.common import MockEntity, MockEntityPlatform, async_mock_service
 
@@ -1189,3 +1192,56 @@ async def test_integration_setup_info(hass, websocket_client, hass_admin_user):
         {"domain": "august", "seconds": 12.5},
         {"domain": "isy994", "seconds": 12.8},
     ]
+
+
+async def test_refresh_diagnostics(hass, websocket_client):
+    """Test getting the refresh statistics of update coordinators."""
+    coordinator = DataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        name="test",
+        update_method=AsyncMock(return_value=1),
+        update_interval=datetime.timedelta(seconds=10),
+        resource_key="test_host",
+    )
+    coordinator.async_add_listener(lambda: None)
+    await coordinator.async_refresh()
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "update_coordinator/diagnostics"}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert msg["result"]["resources"] == [
+        {"key": "test_host", "concurrency": 1, "min_interval": 0, "active": 0}
+    ]
+    stats = msg["result"]["coordinators"][0]
+    assert stats["name"] == "test"
+    assert stats["refreshes"] == 1
+    assert stats["next_refresh"] == coordinator.refresh_stats.next_refresh.isoformat()
+
+
+async def test_entity_platform_diagnostics(hass, websocket_client):
+    """Test getting the update statistics of entity platforms."""
+    entity_platform = MockEntityPlatform(hass)
+    entity = MockEntity(should_poll=True)
+    await entity_platform.async_add_entities([entity])
+    await entity_platform._update_entity_states(dt_util.utcnow())
+
+    await websocket_client.send_json({"id": 5, "type": "entity_platform/diagnostics"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    platforms = [
+        platform
+        for platform in msg["result"]
+        if platform["platform"] == "test_platform"
+    ]
+    assert len(platforms) == 1
+    assert platforms[0]["scan_interval"] == 15
+    assert platforms[0]["entities"][entity.entity_id]["count"] == 1
@@ -1,7 +1,7 @@
 """Test ZHA Gateway."""
 import asyncio
 import time
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 import zigpy.profiles.zha as zha
@@ -10,6 +10,10 @@ import zigpy.zcl.clusters.lighting as lighting
 
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
 from homeassistant.components.zha.core.group import GroupMember
+from homeassistant.components.zha.core.initialization import (
+    INITIAL_CONCURRENCY,
+    DeviceInitScheduler,
+)
 from homeassistant.components.zha.core.store import TOMBSTONE_LIFETIME
 
 from .common import async_enable_traffic, async_find_group_entity_id, get_zha_gateway
@@ -251,3 +255,92 @@ async def test_cleaning_up_storage(hass, zigpy_dev_basic, zha_dev_basic, hass_st
     await zha_gateway.zha_storage.async_save()
     await hass.async_block_till_done()
     assert not hass_storage["zha.storage"]["data"]["devices"]
+
+
+def _init_mock_device(ieee, latency, success=True):
+    """Return a device mock whose initialization records a single read."""
+    zha_device = MagicMock(ieee=ieee)
+    zha_device.name = ieee
+
+    async def _initialize(from_cache):
+        await asyncio.sleep(0)
+        zha_device.init_timing.record_read(latency, success)
+
+    zha_device.async_initialize = _initialize
+    return zha_device
+
+
+async def test_device_init_scheduler_priority(hass):
+    """Test devices referenced by automations are initialized first."""
+    order = []
+    scheduler = DeviceInitScheduler("test", concurrency=1, adaptive=False)
+    for ieee in ("00:01", "00:02", "00:03"):
+        zha_device = _init_mock_device(ieee, 0.1)
+        zha_device.async_initialize = lambda from_cache, ieee=ieee: order.append(
+            ieee
+        ) or asyncio.sleep(0)
+        scheduler.add(zha_device, from_cache=False, priority=ieee == "00:03")
+
+    await scheduler.async_run()
+
+    assert order == ["00:03", "00:01", "00:02"]
+    progress = scheduler.as_dict()
+    assert progress["total"] == progress["done"] == 3
+    assert all(dev["status"] == "initialized" for dev in progress["devices"])
+
+
+async def test_device_init_scheduler_reprioritize(hass):
+    """Test devices referenced by automations loaded later are moved forward."""
+    order = []
+    scheduler = DeviceInitScheduler("test", concurrency=1, adaptive=False)
+    for ieee in ("00:01", "00:02", "00:03"):
+        zha_device = _init_mock_device(ieee, 0.1)
+        zha_device.async_initialize = lambda from_cache, ieee=ieee: order.append(
+            ieee
+        ) or asyncio.sleep(0)
+        scheduler.add(zha_device, from_cache=False, priority=False)
+
+    async def _initialize_first(from_cache):
+        order.append("00:01")
+        # The automations are loaded while the first device initializes
+        scheduler.async_prioritize({"00:03"})
+
+    scheduler.timings["00:01"].zha_device.async_initialize = _initialize_first
+
+    await scheduler.async_run()
+
+    assert order == ["00:01", "00:03", "00:02"]
+    assert scheduler.as_dict()["devices"][2]["priority"]
+
+
+async def test_device_init_scheduler_adapts(hass):
+    """Test the concurrency grows on fast reads and shrinks on failures."""
+    scheduler = DeviceInitScheduler("test")
+    for idx in range(20):
+        scheduler.add(_init_mock_device(f"00:{idx:02}", 0.1), False, False)
+    await scheduler.async_run()
+    assert scheduler.concurrency > INITIAL_CONCURRENCY
+
+    grown = scheduler.concurrency
+    scheduler.timings.clear()
+    for idx in range(grown):
+        scheduler.add(_init_mock_device(f"01:{idx:02}", 1, False), False, False)
+    await scheduler.async_run()
+    assert scheduler.concurrency < grown
+
+
+async def test_device_init_scheduler_failure(hass):
+    """Test a failing device does not stop the initialization of the others."""
+    failing = _init_mock_device("00:01", 0.1)
+    failing.async_initialize = MagicMock(side_effect=ValueError("boom"))
+    scheduler = DeviceInitScheduler("test")
+    scheduler.add(failing, False, False)
+    scheduler.add(_init_mock_device("00:02", 0.1), False, False)
+
+    await scheduler.async_run()
+
+    devices = {dev["ieee"]: dev for dev in scheduler.as_dict()["devices"]}
+    assert devices["00:01"]["status"] == "failed"
+    assert devices["00:01"]["error"] == "boom"
+    assert devices["00:02"]["status"] == "initialized"
+    assert failing.warning.called
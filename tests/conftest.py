@@ -214,7 +214,7 @@ def mock_device_tracker_conf():
     """Prevent device tracker from reading/writing data."""
     devices = []
 
-    async def mock_update_config(path, id, entity):
+    async def mock_update_config(id, entity):
         devices.append(entity)
 
     with patch(
@@ -222,7 +222,7 @@ def mock_device_tracker_conf():
         ".DeviceTracker.async_update_config",
         side_effect=mock_update_config,
     ), patch(
-        "homeassistant.components.device_tracker.legacy.async_load_config",
+        "homeassistant.components.device_tracker.legacy.async_load_known_devices",
         side_effect=lambda *args: devices,
     ):
         yield devices
@@ -105,11 +105,9 @@ class TestHelpersEntity:
         """Test device class attribute."""
         state = self.hass.states.get(self.entity.entity_id)
         assert state.attributes.get(ATTR_DEVICE_CLASS) is None
-        with patch(
-            "homeassistant.helpers.entity.Entity.device_class", new="test_class"
-        ):
-            self.entity.schedule_update_ha_state()
-            self.hass.block_till_done()
+        self.entity._attr_device_class = "test_class"
+        self.entity.schedule_update_ha_state()
+        self.hass.block_till_done()
         state = self.hass.states.get(self.entity.entity_id)
         assert state.attributes.get(ATTR_DEVICE_CLASS) == "test_class"
 
@@ -788,3 +786,79 @@ async def test_float_conversion(hass):
     state = hass.states.get("hello.world")
     assert state is not None
     assert state.state == "3.6"
+
+
+async def test_coalesce_state_writes(hass):
+    """Test state writes within one loop iteration are written once."""
+    platform = MockEntityPlatform(hass)
+    ent = entity.Entity()
+    ent.entity_id = "hello.world"
+    ent._attr_coalesce_state_writes = True
+    ent._attr_state = "initial"
+    await platform.async_add_entities([ent])
+    await hass.async_block_till_done()
+
+    states = []
+    hass.bus.async_listen("state_changed", lambda event: states.append(event))
+
+    ent._attr_state = "on"
+    ent.async_write_ha_state()
+    ent._attr_extra_state_attributes = {"brightness": 100}
+    ent.async_write_ha_state()
+    ent.async_write_ha_state()
+    await hass.async_block_till_done()
+
+    assert len(states) == 1
+    state = hass.states.get("hello.world")
+    assert state.state == "on"
+    assert state.attributes["brightness"] == 100
+    assert platform.coalesced_state_writes == 2
+
+    # A pending write is dropped once the entity is removed
+    ent.async_write_ha_state()
+    await ent.async_remove(force_remove=True)
+    await hass.async_block_till_done()
+    assert hass.states.get("hello.world") is None
+
+
+async def test_static_attributes_cache(hass):
+    """Test cached static state attributes follow changes of the entity."""
+
+    class IconEntity(entity.Entity):
+        """Entity calculating its icon itself."""
+
+        _attr_name = "Class name"
+
+        @property
+        def icon(self):
+            """Return the icon of the entity."""
+            return f"mdi:{self._attr_state}"
+
+    ent = IconEntity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent._attr_state = "one"
+    ent.async_write_ha_state()
+
+    state = hass.states.get("hello.world")
+    assert state.attributes["friendly_name"] == "Class name"
+    assert state.attributes["icon"] == "mdi:one"
+
+    ent._attr_state = "two"
+    ent._attr_name = "Instance name"
+    ent.async_write_ha_state()
+
+    state = hass.states.get("hello.world")
+    assert state.attributes["friendly_name"] == "Instance name"
+    assert state.attributes["icon"] == "mdi:two"
+
+    ent.registry_entry = entity_registry.RegistryEntry(
+        entity_id="hello.world",
+        unique_id="test-unique-id",
+        platform="test_platform",
+        name="Registry name",
+    )
+    ent.async_write_ha_state()
+
+    state = hass.states.get("hello.world")
+    assert state.attributes["friendly_name"] == "Registry name"
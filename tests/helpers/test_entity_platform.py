@@ -2,7 +2,7 @@
 import asyncio
 from datetime import timedelta
 import logging
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -19,6 +19,7 @@ from homeassistant.helpers.entity_component import (
     DEFAULT_SCAN_INTERVAL,
     EntityComponent,
 )
+from homeassistant.helpers.entity_platform import MAX_SPREAD_PARALLEL_UPDATES
 import homeassistant.util.dt as dt_util
 
 from tests.common import (
@@ -68,6 +69,68 @@ async def test_polling_disabled_by_config_entry(hass):
     assert entity_platform._async_unsub_polling is None
 
 
+async def test_polling_records_update_durations(hass):
+    """Test the polling records the update durations of entities."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    poll_ent = MockEntity(should_poll=True)
+    poll_ent.async_update = Mock()
+    await component.async_add_entities([poll_ent])
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+
+    platform = list(component._platforms.values())[-1]
+    diagnostics = platform.async_update_diagnostics()
+    assert diagnostics["spread_updates"] is False
+    assert diagnostics["latency_budget"] == 10
+    histogram = diagnostics["entities"][poll_ent.entity_id]
+    assert histogram["count"] == 1
+    assert histogram["buckets"]["0.1"] == 1
+    assert platform.update_latency is not None
+
+
+async def test_polling_spread_updates(hass):
+    """Test spread updates start evenly over the latency budget."""
+    platform = MockPlatform()
+    platform.SPREAD_UPDATES = True
+    platform.UPDATE_LATENCY_BUDGET = timedelta(seconds=0.06)
+    entity_platform = MockEntityPlatform(hass, platform=platform)
+
+    starts = []
+    entities = [MockEntity(should_poll=True) for _ in range(3)]
+    for entity in entities:
+        entity.async_update = AsyncMock(
+            side_effect=lambda: starts.append(asyncio.get_running_loop().time())
+        )
+    await entity_platform.async_add_entities(entities)
+    entity_platform.async_unsub_polling()
+
+    await entity_platform._update_entity_states(dt_util.utcnow())
+
+    assert len(starts) == 3
+    assert starts[1] - starts[0] >= 0.015
+    assert starts[2] - starts[1] >= 0.015
+    assert entity_platform.async_update_diagnostics()["concurrency"] >= 1
+
+
+async def test_spread_updates_concurrency(hass):
+    """Test the concurrency of spread updates follows the update latency."""
+    platform = MockPlatform()
+    platform.SPREAD_UPDATES = True
+    entity_platform = MockEntityPlatform(
+        hass, platform=platform, scan_interval=timedelta(seconds=20)
+    )
+
+    assert entity_platform.async_update_concurrency(30) == 1
+
+    entity_platform.update_latency = 1
+    assert entity_platform.async_update_concurrency(30) == 3
+
+    entity_platform.update_latency = 60
+    assert entity_platform.async_update_concurrency(30) == MAX_SPREAD_PARALLEL_UPDATES
+
+
 async def test_polling_updates_entities_with_exception(hass):
     """Test the updated entities that not break with an exception."""
     component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
@@ -302,6 +365,43 @@ async def test_parallel_updates_async_platform_with_constant(hass):
     assert entity.parallel_updates._value == 2
 
 
+async def test_coalesce_state_writes_platform_with_constant(hass):
+    """Test platform can coalesce state writes of its entities."""
+    platform = MockPlatform()
+    platform.COALESCE_STATE_WRITES = True
+
+    mock_entity_platform(hass, "test_domain.platform", platform)
+
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    component._platforms = {}
+
+    await component.async_setup({DOMAIN: {"platform": "platform"}})
+    await hass.async_block_till_done()
+
+    handle = list(component._platforms.values())[-1]
+    assert handle.coalesce_state_writes is True
+
+    entity = MockEntity(name="chatty", state="initial")
+    await handle.async_add_entities([entity])
+    # The initial state is written right away
+    assert hass.states.get(entity.entity_id).state == "initial"
+    assert entity.coalesce_state_writes is True
+
+    states = []
+    hass.bus.async_listen("state_changed", lambda event: states.append(event))
+
+    for state in ("one", "two", "three"):
+        entity._values["state"] = state
+        entity.async_write_ha_state()
+
+    assert hass.states.get(entity.entity_id).state == "initial"
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity.entity_id).state == "three"
+    assert len(states) == 1
+    assert handle.coalesced_state_writes == 2
+
+
 async def test_parallel_updates_sync_platform(hass):
     """Test sync platform parallel_updates default set to 1."""
     platform = MockPlatform()
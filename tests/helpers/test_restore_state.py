@@ -73,13 +73,23 @@ async def test_periodic_write(hass):
 
     assert mock_write_data.called
 
+    await entity.async_internal_added_to_hass()
+    hass.states.async_set("input_boolean.b1", "on")
+
     with patch(
         "homeassistant.helpers.restore_state.Store.async_save"
-    ) as mock_write_data:
+    ) as mock_write_data, patch(
+        "homeassistant.helpers.restore_state.StateJournal.append"
+    ) as mock_append:
         async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=15))
         await hass.async_block_till_done()
 
-    assert mock_write_data.called
+    # Only the changed state is appended to the journal
+    assert not mock_write_data.called
+    assert mock_append.called
+    assert [
+        stored_state.state.entity_id for stored_state in mock_append.mock_calls[0][1][0]
+    ] == ["input_boolean.b1"]
 
     with patch(
         "homeassistant.helpers.restore_state.Store.async_save"
@@ -319,3 +329,132 @@ async def test_restoring_invalid_entity_id(hass, hass_storage):
 
     state = await entity.async_get_last_state()
     assert state is None
+
+
+async def test_dump_changed_states(hass, hass_storage):
+    """Test that changed states are journaled and restored."""
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+
+    for entity_id in ("input_boolean.b0", "input_boolean.b1"):
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = entity_id
+        await entity.async_internal_added_to_hass()
+        hass.states.async_set(entity_id, "off")
+
+    await data.async_dump_states()
+    await hass.async_block_till_done()
+    assert len(hass_storage[STORAGE_KEY]["data"]) == 2
+
+    hass.states.async_set("input_boolean.b1", "on", {"level": 5})
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save"
+    ) as mock_write_data:
+        await data.async_dump_changed_states()
+        # Nothing changed since the last dump
+        await data.async_dump_changed_states()
+
+    assert not mock_write_data.called
+    assert [
+        state["state"]["entity_id"] for state in hass_storage[STORAGE_KEY]["data"]
+    ] == [
+        "input_boolean.b0",
+        "input_boolean.b1",
+    ]
+
+    # Emulate a fresh load, the journal is applied on top of the snapshot
+    hass.data[DATA_RESTORE_STATE_TASK] = None
+    data = await RestoreStateData.async_get_instance(hass)
+
+    assert data.last_states["input_boolean.b0"].state.state == "off"
+    assert data.last_states["input_boolean.b1"].state.state == "on"
+    assert data.last_states["input_boolean.b1"].state.attributes == {"level": 5}
+
+
+async def test_dump_changed_states_compacts(hass):
+    """Test that a large journal is compacted into a snapshot."""
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+    await entity.async_internal_added_to_hass()
+    hass.states.async_set("input_boolean.b0", "off")
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save"
+    ) as mock_write_data, patch(
+        "homeassistant.helpers.restore_state.JOURNAL_COMPACT_MIN_ENTRIES", 2
+    ):
+        await data.async_dump_changed_states()
+        assert not mock_write_data.called
+
+        hass.states.async_set("input_boolean.b0", "on")
+        await hass.async_block_till_done()
+        await data.async_dump_changed_states()
+        assert not mock_write_data.called
+
+        await data.async_dump_changed_states()
+        assert mock_write_data.called
+
+    written_states = mock_write_data.mock_calls[0][1][0]
+    assert len(written_states) == 1
+    assert written_states[0]["state"]["state"] == "on"
+
+
+async def test_dump_states_error_keeps_changes(hass):
+    """Test that changes are journaled again after a failed snapshot."""
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+    await entity.async_internal_added_to_hass()
+    hass.states.async_set("input_boolean.b0", "on")
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save",
+        side_effect=HomeAssistantError,
+    ):
+        await data.async_dump_states()
+
+    with patch.object(data.journal, "append") as mock_append:
+        await data.async_dump_changed_states()
+
+    assert mock_append.called
+    stored_states = mock_append.mock_calls[0][1][0]
+    assert [stored_state.state.entity_id for stored_state in stored_states] == [
+        "input_boolean.b0"
+    ]
+
+
+async def test_apply_journal_skips_invalid_entries(hass):
+    """Test invalid journal entries are skipped without dropping the others."""
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+    now = dt_util.utcnow()
+
+    data.async_apply_journal(
+        [
+            {"last_seen": now.isoformat()},
+            {"state": {"entity_id": "input_boolean.b0"}, "last_seen": now.isoformat()},
+            {
+                "state": {"entity_id": "input_boolean.b1", "state": "on"},
+                "last_seen": "not a date",
+            },
+            {
+                "state": State("input_boolean.b2", "on").as_dict(),
+                "last_seen": now.isoformat(),
+            },
+        ]
+    )
+
+    assert list(data.last_states) == ["input_boolean.b2"]
+    assert data.last_states["input_boolean.b2"].state.state == "on"
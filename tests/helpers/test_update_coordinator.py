@@ -381,3 +381,156 @@ async def test_not_schedule_refresh_if_system_option_disable_polling(hass):
     crd = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
     crd.async_add_listener(lambda: None)
     assert crd._unsub_refresh is None
+
+
+def get_resource_crd(hass, update_method, name="test"):
+    """Make a coordinator that shares the test resource."""
+    return update_coordinator.DataUpdateCoordinator[int](
+        hass,
+        _LOGGER,
+        name=name,
+        update_method=update_method,
+        update_interval=DEFAULT_UPDATE_INTERVAL,
+        resource_key="test_host",
+    )
+
+
+async def test_resource_refreshes_aligned(hass):
+    """Test coordinators of a resource are refreshed together."""
+    calls = []
+
+    def make_update(name):
+        async def update():
+            calls.append(name)
+            return len(calls)
+
+        return update
+
+    with patch(
+        "homeassistant.helpers.update_coordinator.random.uniform", return_value=0
+    ):
+        crd1 = get_resource_crd(hass, make_update("one"), "one")
+        crd1.async_add_listener(Mock())
+        await crd1.async_refresh()
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=4))
+    await hass.async_block_till_done()
+    crd2 = get_resource_crd(hass, make_update("two"), "two")
+    crd2.async_add_listener(Mock())
+    await crd2.async_refresh()
+
+    assert crd1.refresh_stats.next_refresh == crd2.refresh_stats.next_refresh
+    calls.clear()
+
+    async_fire_time_changed(
+        hass, crd1.refresh_stats.next_refresh + timedelta(seconds=1)
+    )
+    await hass.async_block_till_done()
+    assert sorted(calls) == ["one", "two"]
+
+
+async def test_resource_concurrency(hass):
+    """Test the concurrent refreshes of a resource are limited."""
+    update_coordinator.async_get_refresh_scheduler(hass).async_configure_resource(
+        "test_host", concurrency=1
+    )
+    release = asyncio.Event()
+    running = 0
+    max_running = 0
+
+    async def update():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await release.wait()
+        running -= 1
+        return 1
+
+    crd1 = get_resource_crd(hass, update)
+    crd2 = get_resource_crd(hass, update)
+    tasks = [
+        hass.async_create_task(crd1.async_refresh()),
+        hass.async_create_task(crd2.async_refresh()),
+    ]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert running == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert max_running == 1
+    assert crd1.data == crd2.data == 1
+
+
+async def test_resource_configure_while_refreshing(hass):
+    """Test changing the limits of a resource keeps the running refreshes."""
+    scheduler = update_coordinator.async_get_refresh_scheduler(hass)
+    scheduler.async_configure_resource("test_host", concurrency=1)
+    release = asyncio.Event()
+    running = 0
+
+    async def update():
+        nonlocal running
+        running += 1
+        await release.wait()
+        running -= 1
+        return 1
+
+    crds = [get_resource_crd(hass, update) for _ in range(3)]
+    tasks = [hass.async_create_task(crd.async_refresh()) for crd in crds]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert running == 1
+
+    # A larger limit starts a waiting refresh right away
+    scheduler.async_configure_resource("test_host", concurrency=2)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert running == 2
+
+    # A smaller limit lets the running refreshes finish
+    scheduler.async_configure_resource("test_host", concurrency=1)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert running == 0
+    assert all(crd.data == 1 for crd in crds)
+    assert scheduler.async_get_resource("test_host").active == 0
+
+
+async def test_resource_backoff(hass):
+    """Test failing coordinators of a resource refresh less often."""
+    update = AsyncMock(side_effect=update_coordinator.UpdateFailed)
+    crd = get_resource_crd(hass, update)
+    crd.async_add_listener(Mock())
+
+    await crd.async_refresh()
+    assert crd.refresh_stats.consecutive_failures == 1
+    first_delay = crd.refresh_stats.next_refresh - utcnow()
+    assert first_delay > DEFAULT_UPDATE_INTERVAL
+
+    await crd.async_refresh()
+    assert crd.refresh_stats.consecutive_failures == 2
+    assert crd.refresh_stats.next_refresh - utcnow() > first_delay
+
+    update.side_effect = None
+    update.return_value = 1
+    await crd.async_refresh()
+    assert crd.refresh_stats.consecutive_failures == 0
+    assert crd.refresh_stats.next_refresh - utcnow() <= DEFAULT_UPDATE_INTERVAL * 1.5
+
+
+async def test_refresh_diagnostics(hass, crd):
+    """Test the refresh statistics of coordinators."""
+    crd.async_add_listener(Mock())
+    await crd.async_refresh()
+
+    diagnostics = update_coordinator.async_get_refresh_scheduler(
+        hass
+    ).async_diagnostics()
+    assert diagnostics["resources"] == []
+    assert len(diagnostics["coordinators"]) == 1
+    stats = diagnostics["coordinators"][0]
+    assert stats["name"] == "test"
+    assert stats["refreshes"] == 1
+    assert stats["failures"] == 0
+    assert stats["next_refresh"] == crd.refresh_stats.next_refresh
@@ -76,7 +76,7 @@ def test_async_add_hass_job_schedule_partial_callback():
 
 def test_async_add_hass_job_schedule_coroutinefunction(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=loop))
+    hass = MagicMock(loop=MagicMock(wraps=loop), job_instrumentation=None)
 
     async def job():
         pass
@@ -89,7 +89,7 @@ def test_async_add_hass_job_schedule_coroutinefunction(loop):
 
 def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
     """Test that we schedule partial coros and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=loop))
+    hass = MagicMock(loop=MagicMock(wraps=loop), job_instrumentation=None)
 
     async def job():
         pass
@@ -130,7 +130,7 @@ def test_async_create_task_schedule_coroutine(loop):
 
 def test_async_run_hass_job_calls_callback():
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(job_instrumentation=None)
     calls = []
 
     def job():
@@ -154,6 +154,50 @@ def test_async_run_hass_job_delegates_non_async():
     assert len(hass.async_add_hass_job.mock_calls) == 1
 
 
+async def test_job_instrumentation(hass):
+    """Test jobs and event filters are run through the job instrumentation."""
+    wrapped = []
+
+    class Instrumentation:
+        def wrap_callback(self, target):
+            wrapped.append(("callback", target))
+            return target
+
+        def wrap_coroutine(self, target, coro):
+            wrapped.append(("coroutine", target))
+            return coro
+
+    calls = []
+
+    @ha.callback
+    def callback_job(*args):
+        calls.append("callback")
+
+    async def coroutine_job():
+        calls.append("coroutine")
+
+    @ha.callback
+    def event_filter(event):
+        return True
+
+    hass.job_instrumentation = Instrumentation()
+    hass.async_run_hass_job(ha.HassJob(callback_job))
+    hass.async_add_hass_job(ha.HassJob(coroutine_job))
+    hass.bus.async_listen("test_event", callback_job, event_filter)
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    hass.job_instrumentation = None
+
+    assert calls.count("callback") == 2
+    assert calls.count("coroutine") == 1
+    assert wrapped == [
+        ("callback", callback_job),
+        ("coroutine", coroutine_job),
+        ("callback", event_filter),
+        ("callback", callback_job),
+    ]
+
+
 async def test_stage_shutdown(hass):
     """Simulate a shutdown, test calling stuff."""
     test_stop = async_capture_events(hass, EVENT_HOMEASSISTANT_STOP)
@@ -0,0 +1,37 @@
+"""Test Home Assistant duration histograms."""
+from homeassistant.util.histogram import DurationHistogram
+
+
+def test_record():
+    """Test durations are counted in the bucket of their upper bound."""
+    histogram = DurationHistogram()
+    histogram.record(0.0005)
+    histogram.record(0.001)
+    histogram.record(0.2)
+    histogram.record(10)
+
+    result = histogram.as_dict()
+    assert result["count"] == 4
+    assert result["total"] == 0.0005 + 0.001 + 0.2 + 10
+    assert result["average"] == result["total"] / 4
+    assert result["max"] == 10
+    assert result["buckets"]["0.001"] == 2
+    assert result["buckets"]["0.5"] == 1
+    assert result["buckets"]["+Inf"] == 1
+    assert sum(result["buckets"].values()) == 4
+
+
+def test_custom_bounds():
+    """Test a histogram with its own bucket bounds."""
+    histogram = DurationHistogram((1, 10))
+    histogram.record(5)
+
+    assert histogram.as_dict()["buckets"] == {"1": 0, "10": 1, "+Inf": 0}
+
+
+def test_empty():
+    """Test an empty histogram has no average."""
+    result = DurationHistogram().as_dict()
+    assert result["count"] == 0
+    assert result["average"] is None
+    assert result["max"] == 0.0
@@ -0,0 +1,35 @@
+"""Test Home Assistant ulid util methods."""
+import time
+from unittest.mock import patch
+
+import homeassistant.util.ulid as ulid_util
+import homeassistant.util.uuid as uuid_util
+
+
+async def test_ulid_util_ulid_hex():
+    """Verify ulids are hex and sort by the time they were generated."""
+    with patch("homeassistant.util.ulid.time.time", return_value=1628000000.0):
+        first = ulid_util.ulid_hex()
+    with patch("homeassistant.util.ulid.time.time", return_value=1628000000.001):
+        second = ulid_util.ulid_hex()
+
+    assert len(first) == 32
+    assert int(first, 16)
+    assert first[:12] == f"{1628000000000:012x}"
+    assert first < second
+    assert ulid_util.ulid_hex() > second
+    assert abs(int(ulid_util.ulid_hex()[:12], 16) - time.time() * 1000) < 5000
+
+
+async def test_ulid_util_bytes_round_trip():
+    """Verify ulid and uuid hex convert to 16 bytes and back."""
+    for value in (ulid_util.ulid_hex(), uuid_util.random_uuid_hex()):
+        as_bytes = ulid_util.ulid_hex_to_bytes(value)
+        assert len(as_bytes) == 16
+        assert ulid_util.bytes_to_ulid_hex(as_bytes) == value
+
+    assert ulid_util.bytes_to_ulid_hex(None) is None
+    assert ulid_util.ulid_hex_to_bytes(None) is None
+    assert ulid_util.ulid_hex_to_bytes("not a ulid") is None
+    assert ulid_util.ulid_hex_to_bytes("AC5BD62DE45711EAAEB351041EEC8DD9") is None
+    assert ulid_util.ulid_hex_to_bytes("ac5bd62de45711eaaeb351041eec8dd9a") is None